@@ -1,262 +1,635 @@
-import requests
-import datetime
-import jwt
-import time
-import moodys_keys as mk
-import os
-from loguru import logger
-
-
-class AuthenticationError(Exception):
-    pass
-
-class EDFXClient():
-
-    #20 mintues for bearer token to be alive.
-    AUTH_TOKEN_RENEWAL_THRESHOLD_IN_SECONDS = 20*60
-
-
-    def __init__(self, api_publickey:str = None, api_privatekey:str = None, proxies = {}):
-
-        """
-        EDF-X Class.  For Continuous Authentication within an application that leverages the MOODYS
-        Analytics API.
-
-        Key functionality includes continuous bearer token authentication, and logging functionality while
-        a session is running.
-        """
-        self.api_publickey = api_publickey if api_publickey is not None else os.getenv('API_Public_Key')
-        self.api_privatekey = api_privatekey if api_privatekey is not None else os.getenv('API_Private_Key')
-        self.proxies = proxies
-        self.base_url = "https://api.edfx.moodysanalytics.com"
-        self.authentication_url = "https://sso.moodysanalytics.com/sso-api/v1/token"
-
-        self.bearer_token = None
-        self.auth_token = None
-        self.bearer_token_claimset= None
-        self.expiration_timestamp = None
-        self.expiration_datetime = None
-        self.expirattion_datetime = None
-
-    def get_bearer_token(self):
-
-        """
-        Check if bearer token exists and if it needs to be renewed.
-        Get bearer token. Then store authentication variable.
-        """
-        if self.api_publickey is None or self.api_privatekey is None:
-            raise AuthenticationError("API public key or private key is not set")
-
-        if self.bearer_token is None:
-            # this is the 'result' object from self.request_new_bearer_token()
-            self.bearer_token = self.request_new_bearer_token()
-            logger.info("Security token has been generated.")
-            self.update_bearer_token_claimset_expiration_info()
-            bearer = self.bearer_token
-            return bearer
-
-        #If it's a time to renew bearer token, renew bearer token.
-        if self.is_bearer_token_renewal():
-            try:
-                self.bearer_token = self.renew_bearer_token()
-                self.update_bearer_token_claimset_expiration_info()
-                return self.bearer_token
-            except AuthenticationError:
-                # Note, This apparently can happen if token is fully expired.  In this case, we can request a new token
-                self.bearer_token = self.request_new_bearer_token()
-                self.update_bearer_token_claimset_expiration_info()
-                result = self.bearer_token
-                return result
-        else:
-            return self.bearer_token
-
-    def request_new_bearer_token(self):
-        """
-        This gives you the Bearer Token.
-        Initial Code found here may have incorrectly been trying to
-        pull access token: https://github.com/moodysanalytics/apic/edit/master/api_client/security.py
-        """
-
-        url = self.authentication_url
-
-        bearer_token_params  = {
-                                'client_id': self.api_publickey,
-                                'client_secret': self.api_privatekey,
-                                'grant_type': 'client_credentials',
-                                'scope': 'openid'
-                                }
-        headers = {
-                    'Content-Type': 'application/x-www-form-urlencoded'
-                    }
-
-        response = requests.post(
-                                url,
-                                data=bearer_token_params,
-                                headers=headers,
-                                auth=(self.api_publickey, self.api_privatekey),
-                                proxies=self.proxies
-                                )
-
-        if response.status_code != 200:
-            response_detail = response.json() if response.content else {}
-            raise AuthenticationError(
-                                        f"Error in response. Status code: {response.status_code}, message: {response.reason}, detail: {response_detail}"
-                                        )
-        response_body_json = response.json()
-        # new python dictionary query bearer token
-        bearer = response_body_json.get('id_token')
-
-        # print(f"Bearer token: {bearer}")
-        # print(f"Type: {type(bearer)}")
-
-        # Check1: See if I get a result
-        if bearer is None or bearer == "":
-            raise AuthenticationError(
-                f"Authorization token is empty. "
-                f"Authentication token has not been retrieved from "
-                f".env or is incorrect for {self.api_publickey}"
-            )
-        token_type = response_body_json.get('token_type')
-        #Check2: If I get a result, check and see if the token_type is 'Bearer'
-        if token_type != 'Bearer':
-            raise AuthenticationError(f"Wrong token type '{token_type}'. Expected token type is 'Bearer'. ")
-
-        # Here we set the authentication parameters
-        self.auth_token = response_body_json.get('access_token')
-
-        if self.auth_token is None or self.auth_token == "":
-            raise AuthenticationError(
-                f"Access token is empty. "
-                f"Access token has not been retrieved from"
-                f".env or is incorrect for {self.api_publickey} and/or {self.api_privatekey}."
-                )
-
-        return bearer
-
-    def update_bearer_token_claimset_expiration_info(self):
-
-        """
-        This method is updated to jwt.decode the bearer token to self.bearer_token_claimsetparamater
-
-        UNDERSTAND: Users may need to converst public and/or private key to PEM Format.  Currently
-        Moodys Public and Private keys are not in this format and as such verify_signature must be
-        set to False.
-        """
-
-        if self.bearer_token is None:
-            raise AuthenticationError("The auth token is None, cannot decode it.")
-
-        # encode to bytes if it's a string
-        if isinstance(self.bearer_token, str):
-            self.bearer_token = self.bearer_token.encode('utf-8')
-
-        try:
-            # This line decodes the bearer_token attribute of the class instance (represented by self.bearer_token) using the decode method from the jwt (JSON Web Token) library.
-            # The verify=False parameter indicates that the token should be decoded without verifying its signature.
-            self.bearer_token_claimset= jwt.decode(self.bearer_token, options={"verify_signature": False})
-            self.expiration_timestamp = self.bearer_token_claimset['exp']
-            # print(f"Self.expiration_timestamp: {self.expiration_timestamp}/n")
-            self.expiration_datetime = datetime.datetime.fromtimestamp(self.expiration_timestamp)
-            # print(f"Self.expiration_datetime: {self.expiration_datetime}/n")
-            # print(f"This is the whole self.bearer_token_claimset: {self.bearer_token_claimset}")
-
-        except Exception as e:
-            raise AuthenticationError(f"Error decoding auth token: {e}")
-
-    def revoke_bearer_token(self):
-    #     """
-    #     Revoke authentication token
-            # Do not un-edit these are up for deletion
-    #     """
-        # self.delete_bearer_token(self.auth_token)
-        # Here we just set all variables related to the authentication token back to None
-        self.auth_token = None
-        self.bearer_token_claimset= None
-        self.expiration_timestamp = None
-        self.expirattion_datetime = None
-
-    def renew_bearer_token(self):
-        """
-        Ends an existing authentication and provides a new authication token "bearer"
-        """
-        #Revoke current token
-        self.revoke_bearer_token()
-        #Wait 5 seconds for token revocation process
-        time.sleep(5)
-        # request a new token
-        result = self.request_new_bearer_token()
-        return result
-
-    def is_bearer_token_renewal(self):
-
-        # this method is complete
-
-        if self.expiration_datetime is None:
-            raise AuthenticationError(
-                "Error checking renewal time of the authentication token."
-                "The Token's expiration date/time is empty."
-                "Get authentication token calling get_auth_token() first.")
-
-        time_left = self.expiration_datetime - self.get_current_date_time()
-
-        if time_left.days == -1:
-            return True
-        if time_left.seconds < EDFXClient.AUTH_TOKEN_RENEWAL_THRESHOLD_IN_SECONDS:
-            return True
-        #else return False is the logic
-        return False
-
-    def __enter__(self):
-
-        """
-        The __enter__ method logs a message and then returns self,
-        which is the instance of the EDFXClient. This instance is
-        then used as client within the with statement.
-        """
-
-        logger.info("Entered authtication session.")
-        return self
-
-    def __exit__(self, exit_type, exit_value, traceback):
-
-        """
-        EX Case:
-
-        with EDFXClient(api_publickey, api_privatekey) as client:
-        client.ping()
-
-        When the with statement ends (either normally or due to an exception),
-        Python automatically calls the __exit__ method, which in this case calls self.close()
-        """
-        self.close()
-
-    def close(self):
-        if self.auth_token is None:
-            return
-        self.revoke_bearer_token()
-
-    def get_current_date_time(self):
-        result = datetime.datetime.now()
-        return result
-
-
-if __name__ == '__main__':
-    # not linking to os.environ() check Xing Yuan
-    # I'm not using public and private key here because I don't want a circular reference for ENDPoint Class
-
-
-    #---------------Below Works-----------------------------
-    public  = mk.EDF_X()['Client'],# EDFX public key
-    private = mk.EDF_X()['Client_Secret'], # EDFX private key.
-    client = EDFXClient(public, private)
-    token = client.get_bearer_token()
-
-    print("Bearer token:", token)
-    print('Bearer Token TypeObject:' ,type(token))
-
-    #----------Requesting a relevant Ping Endpoing------------
-    # I need t find a light endpoint to ping.
-    # if client.ping():
-    #     print("Ping was successful.")
-    # else:
+import requests
+import requests.adapters
+import datetime
+import jwt
+import time
+import asyncio
+import threading
+import concurrent.futures
+import contextlib
+import hashlib
+import json
+import tempfile
+import moodys_keys as mk
+import os
+from loguru import logger
+from EDFXTransport import RetryPolicy, RetryingSession
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+class AuthenticationError(Exception):
+    pass
+
+
+def decode_bearer_token_claimset(bearer_token) -> dict:
+
+    """
+    Decodes the claimset of a bearer token without verifying its signature (see update_bearer_token_claimset_expiration_info).
+    """
+    if isinstance(bearer_token, str):
+        bearer_token = bearer_token.encode('utf-8')
+    try:
+        return jwt.decode(bearer_token, options={"verify_signature": False})
+    except Exception as e:
+        raise AuthenticationError(f"Error decoding auth token: {e}")
+
+
+class EDFXTokenCache():
+
+    """
+    Optional file backed bearer token cache shared by every process of the host (notebook kernels,
+    multiprocessing workers, short lived jobs...).
+
+    Entries are keyed by a sha256 digest of the public key, the key itself is never written. The file is
+    guarded by an exclusive lock on a sibling .lock file: the first process that needs a token requests it
+    from SSO while the others wait on the lock and then re-use it.
+
+        path: Location of the cache file. Defaults to ~/.edfx/token_cache.json
+        encrypt/decrypt: Optional encryption-at-rest hooks, bytes -> bytes, applied to the whole file content.
+                         ex: encrypt=Fernet(key).encrypt, decrypt=Fernet(key).decrypt
+        min_ttl_seconds: Cached tokens expiring sooner than this are ignored. It defaults to the client's renewal
+                         threshold so a re-used token is never already due for renewal.
+    """
+
+    def __init__(self, path:str = None, encrypt = None, decrypt = None, min_ttl_seconds:int = None):
+        self.path = path if path is not None else os.path.join(os.path.expanduser('~'), '.edfx', 'token_cache.json')
+        self.encrypt = encrypt
+        self.decrypt = decrypt
+        self.min_ttl_seconds = min_ttl_seconds if min_ttl_seconds is not None else EDFXClient.AUTH_TOKEN_RENEWAL_THRESHOLD_IN_SECONDS
+
+    @staticmethod
+    def cache_key(api_publickey:str) -> str:
+        return hashlib.sha256(str(api_publickey).encode('utf-8')).hexdigest()
+
+    @contextlib.contextmanager
+    def lock(self):
+
+        """
+        Exclusive inter-process lock held while a process reads, requests and writes a token.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path + '.lock', 'a+b') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                # LK_LOCK retries for 10 seconds before raising, keep trying until the owner is done
+                while True:
+                    try:
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def read_entries(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'rb') as cache_file:
+                content = cache_file.read()
+            if self.decrypt is not None:
+                content = self.decrypt(content)
+            return json.loads(content)
+        except Exception as e:
+            logger.warning(f"Token cache {self.path} could not be read and is ignored: {e}")
+            return {}
+
+    def write_entries(self, entries:dict):
+
+        """
+        Atomically replaces the cache file (write to a temporary file then rename), readable by the owner only.
+        """
+        content = json.dumps(entries).encode('utf-8')
+        if self.encrypt is not None:
+            content = self.encrypt(content)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.token_cache')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temp_file:
+                temp_file.write(content)
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def load(self, api_publickey:str) -> dict:
+
+        """
+        Returns the cached {'id_token', 'access_token', 'exp'} entry of the public key if it is still valid for
+        at least min_ttl_seconds, else None. Call it while holding lock().
+        """
+        entry = self.read_entries().get(self.cache_key(api_publickey))
+        if not entry or entry.get('exp', 0) - time.time() <= self.min_ttl_seconds:
+            return None
+        return entry
+
+    def store(self, api_publickey:str, id_token, access_token:str, expiration_timestamp:int):
+
+        """
+        Saves a token for the public key and drops every expired entry. Call it while holding lock().
+        """
+        if isinstance(id_token, bytes):
+            id_token = id_token.decode('utf-8')
+        now = time.time()
+        entries = {key: entry for key, entry in self.read_entries().items() if entry.get('exp', 0) > now}
+        entries[self.cache_key(api_publickey)] = {'id_token': id_token, 'access_token': access_token,
+                                                  'exp': expiration_timestamp}
+        self.write_entries(entries)
+
+class EDFXClient():
+
+    #20 mintues for bearer token to be alive.
+    AUTH_TOKEN_RENEWAL_THRESHOLD_IN_SECONDS = 20*60
+    # When a background renewal fails it is retried after this many seconds (the token is still valid meanwhile).
+    BACKGROUND_RENEWAL_RETRY_IN_SECONDS = 30
+
+
+    def __init__(self, api_publickey:str = None, api_privatekey:str = None, proxies = {}, pool_connections:int = 10,
+                 pool_maxsize:int = 100, max_retries:int = 0, background_token_renewal:bool = True,
+                 token_cache:EDFXTokenCache = None, retry_policy:RetryPolicy = None):
+
+        """
+        EDF-X Class.  For Continuous Authentication within an application that leverages the MOODYS
+        Analytics API.
+
+        Key functionality includes continuous bearer token authentication, and logging functionality while
+        a session is running.
+
+        Every HTTP call made by the client (and the EDFXEndpoints subclass) goes through self.session, a single
+        requests.Session whose connections are kept alive and pooled per host.
+
+            pool_connections: Number of host pools to cache (api, sso and the presigned S3 hosts).
+            pool_maxsize: Maximum number of keep-alive connections kept per host. Set this to at least the number
+                          of threads you share the client with.
+            max_retries: Connection level retries handed to urllib3 (failed DNS lookups, refused connections).
+            background_token_renewal: Once a token is issued, renew it on a daemon timer AUTH_TOKEN_RENEWAL_THRESHOLD_IN_SECONDS
+                                      ahead of its expiry so request paths never wait on the SSO endpoint.
+            token_cache: Optional EDFXTokenCache (or the path of its file) so processes of the same host share a valid
+                         token instead of each requesting one from SSO at start up.
+            retry_policy: RetryPolicy (backoff with jitter, retry budgets, Retry-After) applied to every sync and async
+                          call of the client. Defaults to RetryPolicy().
+        """
+        self.api_publickey = api_publickey if api_publickey is not None else os.getenv('API_Public_Key')
+        self.api_privatekey = api_privatekey if api_privatekey is not None else os.getenv('API_Private_Key')
+        self.proxies = proxies
+        self.token_cache = EDFXTokenCache(token_cache) if isinstance(token_cache, str) else token_cache
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.session = self.create_session(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                           max_retries=max_retries)
+        self.base_url = "https://api.edfx.moodysanalytics.com"
+        self.authentication_url = "https://sso.moodysanalytics.com/sso-api/v1/token"
+
+        self.bearer_token = None
+        self.auth_token = None
+        self.bearer_token_claimset= None
+        self.expiration_timestamp = None
+        self.expiration_datetime = None
+        self.expirattion_datetime = None
+
+        # Single-flight renewal: _token_lock guards _refresh_future, the one in-flight refresh every caller
+        # (threads and coroutines alike) waits on instead of starting its own.
+        self._token_lock = threading.Lock()
+        self._refresh_future = None
+
+        # epoch seconds after which the token is due for renewal, checked by the request hot path
+        self.renewal_timestamp = None
+        self.background_token_renewal = background_token_renewal
+        self._renewal_timer = None
+
+    def create_session(self, pool_connections:int = 10, pool_maxsize:int = 100, max_retries:int = 0) -> requests.Session:
+
+        """
+        Builds the pooled keep-alive transport shared by every request of this client.
+
+        requests (urllib3) speaks HTTP/1.1 only, so the gain here comes from re-using the TCP+TLS
+        connection instead of opening a new one per call. HTTP level retries follow self.retry_policy.
+        """
+        session = RetryingSession(self.retry_policy)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                                max_retries=max_retries)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if self.proxies:
+            session.proxies.update(self.proxies)
+        return session
+
+    def get_bearer_token(self):
+
+        """
+        Check if bearer token exists and if it needs to be renewed.
+        Get bearer token. Then store authentication variable.
+
+        The renewal is single-flight and thread safe: exactly one caller requests a new token while the
+        other callers either keep using the still-valid token or wait for the renewal result.
+        """
+        if self.api_publickey is None or self.api_privatekey is None:
+            raise AuthenticationError("API public key or private key is not set")
+
+        bearer = self.bearer_token
+        if bearer is not None and not self.is_bearer_token_renewal():
+            return bearer
+
+        future, owner = self.claim_bearer_token_refresh()
+        if owner:
+            self.run_bearer_token_refresh(future)
+        elif bearer is not None and not self.is_bearer_token_expired():
+            # Someone else is renewing, the current token is still good for this request.
+            return bearer
+
+        try:
+            return future.result()
+        except AuthenticationError as e:
+            return self.bearer_token_after_failed_refresh(bearer, e)
+
+    async def get_bearer_token_async(self):
+
+        """
+        asyncio-aware version of get_bearer_token for the coroutine paths.
+
+        The renewal request runs in a worker thread so the event loop keeps serving the other coroutines.
+        Callers holding a still-valid token continue with it and only callers without a usable token await the renewal.
+        """
+        if self.api_publickey is None or self.api_privatekey is None:
+            raise AuthenticationError("API public key or private key is not set")
+
+        bearer = self.bearer_token
+        if bearer is not None and not self.is_bearer_token_renewal():
+            return bearer
+
+        future, owner = self.claim_bearer_token_refresh()
+        if owner:
+            asyncio.get_running_loop().run_in_executor(None, self.run_bearer_token_refresh, future)
+        if bearer is not None and not self.is_bearer_token_expired():
+            return bearer
+
+        try:
+            return await asyncio.wrap_future(future)
+        except AuthenticationError as e:
+            return self.bearer_token_after_failed_refresh(bearer, e)
+
+    def claim_bearer_token_refresh(self) -> tuple[concurrent.futures.Future, bool]:
+
+        """
+        Returns the in-flight refresh future and whether the caller owns it (and therefore must run it).
+        If a refresh completed while the caller was waiting for the lock, a resolved future is returned instead.
+        """
+        with self._token_lock:
+            if self._refresh_future is not None:
+                return self._refresh_future, False
+
+            if self.bearer_token is not None and not self.is_bearer_token_renewal():
+                future = concurrent.futures.Future()
+                future.set_result(self.bearer_token)
+                return future, False
+
+            self._refresh_future = concurrent.futures.Future()
+            return self._refresh_future, True
+
+    def run_bearer_token_refresh(self, future:concurrent.futures.Future):
+
+        """
+        Requests a new token, swaps it in and publishes the result (or the error) to every waiting caller.
+        """
+        try:
+            first_token = self.bearer_token is None
+            self.set_bearer_token(self.acquire_bearer_token())
+            logger.info("Security token has been generated." if first_token else "Security token has been renewed.")
+            future.set_result(self.bearer_token)
+        except Exception as e:
+            logger.error(f"Bearer token request failed: {e}")
+            future.set_exception(e)
+        finally:
+            with self._token_lock:
+                self._refresh_future = None
+
+    def acquire_bearer_token(self):
+
+        """
+        Returns a new bearer token, from the shared on-disk token cache when it holds a valid one, else from SSO.
+        With a cache the SSO request happens under the cache lock so concurrent processes wait for it and re-use the result.
+        """
+        if self.token_cache is None:
+            return self.request_new_bearer_token()
+
+        with self.token_cache.lock():
+            entry = self.token_cache.load(self.api_publickey)
+            if entry is not None:
+                self.auth_token = entry['access_token']
+                logger.info("Security token has been loaded from the token cache.")
+                return entry['id_token']
+
+            bearer = self.request_new_bearer_token()
+            # the expiry comes from the token's own claimset
+            claimset = decode_bearer_token_claimset(bearer)
+            try:
+                self.token_cache.store(self.api_publickey, bearer, self.auth_token, claimset['exp'])
+            except Exception as e:
+                logger.warning(f"Token could not be saved to the token cache {self.token_cache.path}: {e}")
+            return bearer
+
+    def bearer_token_after_failed_refresh(self, bearer, error:AuthenticationError):
+
+        """
+        A failed renewal is not fatal as long as the token we started with has not expired yet.
+        """
+        if bearer is not None and not self.is_bearer_token_expired():
+            logger.warning("Bearer token renewal failed. The current token is still valid and will be used.")
+            return bearer
+        raise error
+
+    def request_new_bearer_token(self):
+        """
+        This gives you the Bearer Token.
+        Initial Code found here may have incorrectly been trying to
+        pull access token: https://github.com/moodysanalytics/apic/edit/master/api_client/security.py
+        """
+
+        url = self.authentication_url
+
+        bearer_token_params  = {
+                                'client_id': self.api_publickey,
+                                'client_secret': self.api_privatekey,
+                                'grant_type': 'client_credentials',
+                                'scope': 'openid'
+                                }
+        headers = {
+                    'Content-Type': 'application/x-www-form-urlencoded'
+                    }
+
+        response = self.session.post(
+                                url,
+                                data=bearer_token_params,
+                                headers=headers,
+                                auth=(self.api_publickey, self.api_privatekey),
+                                proxies=self.proxies
+                                )
+
+        if response.status_code != 200:
+            response_detail = response.json() if response.content else {}
+            raise AuthenticationError(
+                                        f"Error in response. Status code: {response.status_code}, message: {response.reason}, detail: {response_detail}"
+                                        )
+        response_body_json = response.json()
+        # new python dictionary query bearer token
+        bearer = response_body_json.get('id_token')
+
+        # print(f"Bearer token: {bearer}")
+        # print(f"Type: {type(bearer)}")
+
+        # Check1: See if I get a result
+        if bearer is None or bearer == "":
+            raise AuthenticationError(
+                f"Authorization token is empty. "
+                f"Authentication token has not been retrieved from "
+                f".env or is incorrect for {self.api_publickey}"
+            )
+        token_type = response_body_json.get('token_type')
+        #Check2: If I get a result, check and see if the token_type is 'Bearer'
+        if token_type != 'Bearer':
+            raise AuthenticationError(f"Wrong token type '{token_type}'. Expected token type is 'Bearer'. ")
+
+        # Here we set the authentication parameters
+        self.auth_token = response_body_json.get('access_token')
+
+        if self.auth_token is None or self.auth_token == "":
+            raise AuthenticationError(
+                f"Access token is empty. "
+                f"Access token has not been retrieved from"
+                f".env or is incorrect for {self.api_publickey} and/or {self.api_privatekey}."
+                )
+
+        return bearer
+
+    def set_bearer_token(self, bearer_token):
+
+        """
+        Decodes a freshly issued bearer token and swaps it in. The claimset and expiration are assigned before
+        the token itself, so concurrent readers never pair the new token with a missing expiration.
+        """
+        if bearer_token is None:
+            raise AuthenticationError("The auth token is None, cannot decode it.")
+
+        # encode to bytes if it's a string
+        if isinstance(bearer_token, str):
+            bearer_token = bearer_token.encode('utf-8')
+
+        claimset = decode_bearer_token_claimset(bearer_token)
+        try:
+            expiration_timestamp = claimset['exp']
+        except Exception as e:
+            raise AuthenticationError(f"Error decoding auth token: {e}")
+
+        self.bearer_token_claimset = claimset
+        self.expiration_timestamp = expiration_timestamp
+        self.expiration_datetime = datetime.datetime.fromtimestamp(expiration_timestamp)
+        self.bearer_token = bearer_token
+        self.renewal_timestamp = expiration_timestamp - EDFXClient.AUTH_TOKEN_RENEWAL_THRESHOLD_IN_SECONDS
+        self.on_bearer_token_refreshed(bearer_token)
+        self.schedule_token_renewal()
+
+    def on_bearer_token_refreshed(self, bearer_token:bytes):
+
+        """
+        Hook called every time a new token has been swapped in. EDFXEndpoints uses it to rebuild its cached headers.
+        """
+        pass
+
+    def schedule_token_renewal(self, delay:float = None):
+
+        """
+        (Re)arms the daemon timer that renews the token ahead of its expiry.
+        By default the timer fires when the token enters the renewal window.
+        """
+        if not self.background_token_renewal or self.renewal_timestamp is None:
+            return
+        if delay is None:
+            # one second of slack so the timer never fires before is_bearer_token_renewal() agrees
+            delay = max(self.renewal_timestamp - time.time(), 0) + 1
+
+        timer = threading.Timer(delay, self.renew_bearer_token_in_background)
+        timer.daemon = True
+        with self._token_lock:
+            if self._renewal_timer is not None:
+                self._renewal_timer.cancel()
+            self._renewal_timer = timer
+        timer.start()
+
+    def cancel_token_renewal(self):
+
+        """
+        Stops the background renewal timer if one is armed.
+        """
+        with self._token_lock:
+            timer, self._renewal_timer = self._renewal_timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def renew_bearer_token_in_background(self):
+
+        """
+        Body of the renewal timer. Goes through the same single-flight refresh as the request paths.
+        """
+        future, owner = self.claim_bearer_token_refresh()
+        if owner:
+            self.run_bearer_token_refresh(future)
+
+        if future.exception() is not None:
+            logger.warning(f"Background token renewal failed, retrying in {EDFXClient.BACKGROUND_RENEWAL_RETRY_IN_SECONDS} seconds.")
+            self.schedule_token_renewal(delay=EDFXClient.BACKGROUND_RENEWAL_RETRY_IN_SECONDS)
+        elif not owner:
+            # The token was renewed elsewhere (or is not due yet), make sure a timer is armed for the next renewal.
+            self.schedule_token_renewal()
+
+    def update_bearer_token_claimset_expiration_info(self):
+
+        """
+        This method is updated to jwt.decode the bearer token to self.bearer_token_claimsetparamater
+
+        UNDERSTAND: Users may need to converst public and/or private key to PEM Format.  Currently
+        Moodys Public and Private keys are not in this format and as such verify_signature must be
+        set to False.
+        """
+
+        if self.bearer_token is None:
+            raise AuthenticationError("The auth token is None, cannot decode it.")
+
+        # encode to bytes if it's a string
+        if isinstance(self.bearer_token, str):
+            self.bearer_token = self.bearer_token.encode('utf-8')
+
+        try:
+            # This line decodes the bearer_token attribute of the class instance (represented by self.bearer_token) using the decode method from the jwt (JSON Web Token) library.
+            # The verify=False parameter indicates that the token should be decoded without verifying its signature.
+            self.bearer_token_claimset= jwt.decode(self.bearer_token, options={"verify_signature": False})
+            self.expiration_timestamp = self.bearer_token_claimset['exp']
+            # print(f"Self.expiration_timestamp: {self.expiration_timestamp}/n")
+            self.expiration_datetime = datetime.datetime.fromtimestamp(self.expiration_timestamp)
+            # print(f"Self.expiration_datetime: {self.expiration_datetime}/n")
+            # print(f"This is the whole self.bearer_token_claimset: {self.bearer_token_claimset}")
+
+        except Exception as e:
+            raise AuthenticationError(f"Error decoding auth token: {e}")
+
+    def revoke_bearer_token(self):
+    #     """
+    #     Revoke authentication token
+            # Do not un-edit these are up for deletion
+    #     """
+        # self.delete_bearer_token(self.auth_token)
+        # Here we just set all variables related to the authentication token back to None
+        self.auth_token = None
+        self.bearer_token_claimset= None
+        self.expiration_timestamp = None
+        self.expirattion_datetime = None
+
+    def renew_bearer_token(self):
+        """
+        Ends an existing authentication and provides a new authication token "bearer"
+        """
+        #Revoke current token
+        self.revoke_bearer_token()
+        # request a new token
+        result = self.request_new_bearer_token()
+        return result
+
+    def is_bearer_token_expired(self):
+
+        """
+        True when the token has no expiration information or its expiration is in the past.
+        """
+        if self.expiration_datetime is None:
+            return True
+        return self.expiration_datetime <= self.get_current_date_time()
+
+    def is_bearer_token_renewal(self):
+
+        # this method is complete
+
+        if self.expiration_datetime is None:
+            raise AuthenticationError(
+                "Error checking renewal time of the authentication token."
+                "The Token's expiration date/time is empty."
+                "Get authentication token calling get_auth_token() first.")
+
+        time_left = self.expiration_datetime - self.get_current_date_time()
+
+        if time_left.days == -1:
+            return True
+        if time_left.seconds < EDFXClient.AUTH_TOKEN_RENEWAL_THRESHOLD_IN_SECONDS:
+            return True
+        #else return False is the logic
+        return False
+
+    def __enter__(self):
+
+        """
+        The __enter__ method logs a message and then returns self,
+        which is the instance of the EDFXClient. This instance is
+        then used as client within the with statement.
+        """
+
+        logger.info("Entered authtication session.")
+        return self
+
+    def __exit__(self, exit_type, exit_value, traceback):
+
+        """
+        EX Case:
+
+        with EDFXClient(api_publickey, api_privatekey) as client:
+        client.ping()
+
+        When the with statement ends (either normally or due to an exception),
+        Python automatically calls the __exit__ method, which in this case calls self.close()
+        """
+        self.close()
+
+    def close(self):
+        self.cancel_token_renewal()
+        # release the pooled connections, the session re-opens them if the client is used again.
+        self.session.close()
+        if self.auth_token is None:
+            return
+        self.revoke_bearer_token()
+
+    def get_current_date_time(self):
+        result = datetime.datetime.now()
+        return result
+
+
+if __name__ == '__main__':
+    # not linking to os.environ() check Xing Yuan
+    # I'm not using public and private key here because I don't want a circular reference for ENDPoint Class
+
+
+    #---------------Below Works-----------------------------
+    public  = mk.EDF_X()['Client'],# EDFX public key
+    private = mk.EDF_X()['Client_Secret'], # EDFX private key.
+    client = EDFXClient(public, private)
+    token = client.get_bearer_token()
+
+    print("Bearer token:", token)
+    print('Bearer Token TypeObject:' ,type(token))
+
+    #----------Requesting a relevant Ping Endpoing------------
+    # I need t find a light endpoint to ping.
+    # if client.ping():
+    #     print("Ping was successful.")
+    # else:
     #     print("Ping failed.")
\ No newline at end of file
@@ -0,0 +1,502 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import datetime
+import threading
+import pandas as pd
+from collections import OrderedDict
+
+# =============================================================================================================
+# ATTENTION: Before you continue UNDERSTAND:
+# Moodys Analytics DOES NOT support this code. This code is for assistance and demonstration purposes only.
+# Licensed Clients should reference https://hub.moodysanalytics.com/products
+# and the functional endpoint examples when formatting their exact questions to support.
+# ==============================================================================================================
+
+
+def canonical_key(*parts) -> str:
+
+    """
+    Content hash of parts: dictionaries are serialised with sorted keys, so the same request always gives the same key
+    whatever the order its parameters were built in.
+    """
+    canonical = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+class CacheStats():
+
+    """
+    Hit/miss counters of a cache. Expired entries are counted as misses (and in expired).
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def snapshot(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 4), "expired": self.expired,
+                "writes": self.writes, "evictions": self.evictions}
+
+    def __repr__(self):
+        return f"CacheStats({self.snapshot()})"
+
+
+class MemoryCache():
+
+    """
+    In-process LRU cache with optional time to live.
+
+    Params:
+        maxsize: Number of entries kept, the least recently used ones are evicted beyond it (None for no bound).
+        ttl: Seconds an entry stays valid, None for no expiry. set() can override it per entry.
+
+    Usage:
+        endpoints = EDFXEndpoints(public, private, entity_cache=MemoryCache(maxsize=200_000, ttl=7 * 24 * 3600))
+        endpoints.entity_cache.stats  # CacheStats(hits, misses, hit_rate, ...)
+    """
+
+    def __init__(self, maxsize:int = 100_000, ttl:float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        # key -> (expires_at, value), most recently used last
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _lookup(self, key, now:float):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return False, None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= now:
+            del self.entries[key]
+            self.stats.expired += 1
+            self.stats.misses += 1
+            return False, None
+        self.entries.move_to_end(key)
+        self.stats.hits += 1
+        return True, value
+
+    def get(self, key:str, default=None):
+        with self.lock:
+            found, value = self._lookup(key, time.time())
+        return value if found else default
+
+    def get_many(self, keys:list) -> dict:
+
+        """
+        Returns {key: value} of the keys found (and not expired).
+        """
+        now = time.time()
+        found = {}
+        with self.lock:
+            for key in keys:
+                hit, value = self._lookup(key, now)
+                if hit:
+                    found[key] = value
+        return found
+
+    def set(self, key:str, value, ttl:float = None):
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items:dict, ttl:float = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self.lock:
+            for key, value in items.items():
+                self.entries[key] = (expires_at, value)
+                self.entries.move_to_end(key)
+                self.stats.writes += 1
+            while self.maxsize is not None and len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key:str):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"MemoryCache(entries={len(self)}, maxsize={self.maxsize}, ttl={self.ttl}, {self.stats.snapshot()})"
+
+
+class SQLiteCache():
+
+    """
+    On-disk cache shared between runs and processes, same interface as MemoryCache. Values must be JSON serialisable
+    (API responses are). Entries expire after their ttl; with maxsize the least recently read entries are evicted.
+
+    Params:
+        path: SQLite file, defaults to ~/.edfx/cache.sqlite.
+        namespace: Keeps several caches apart in one file (e.g. 'mapping', 'search').
+        ttl: Seconds an entry stays valid, None for no expiry.
+        maxsize: Maximum number of entries of the namespace, None for no bound.
+        mmap_size: Bytes of the database file SQLite reads through a memory map (PRAGMA mmap_size), 0 to disable.
+                   Worth setting for large read-mostly caches such as the PD history.
+    """
+
+    def __init__(self, path:str = None, namespace:str = 'default', ttl:float = None, maxsize:int = None,
+                 mmap_size:int = 0):
+        self.path = path or os.path.join(os.path.expanduser("~"), ".edfx", "cache.sqlite")
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.namespace = namespace
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        if mmap_size:
+            self.connection.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        with self.connection:
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS cache (
+                                       namespace TEXT, key TEXT, value TEXT, expires_at REAL, accessed_at REAL,
+                                       PRIMARY KEY (namespace, key))""")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (namespace, accessed_at)")
+
+    def get(self, key:str, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys:list) -> dict:
+
+        """
+        Returns {key: value} of the keys found (and not expired).
+        """
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found = {}
+        expired = []
+        with self.lock:
+            # SQLite limits the number of bound variables of a statement
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self.connection.execute(f"""SELECT key, value, expires_at FROM cache WHERE namespace = ?
+                                                   AND key IN ({','.join('?' * len(chunk))})""",
+                                               (self.namespace, *chunk))
+                for key, value, expires_at in rows:
+                    if expires_at is not None and expires_at <= now:
+                        expired.append(key)
+                    else:
+                        found[key] = json.loads(value)
+            with self.connection:
+                if found:
+                    self.connection.executemany("UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                                                [(now, self.namespace, key) for key in found])
+                if expired:
+                    self.connection.executemany("DELETE FROM cache WHERE namespace = ? AND key = ?",
+                                                [(self.namespace, key) for key in expired])
+            self.stats.hits += len(found)
+            self.stats.misses += len(keys) - len(found)
+            self.stats.expired += len(expired)
+        return found
+
+    def set(self, key:str, value, ttl:float = None):
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items:dict, ttl:float = None):
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        rows = [(self.namespace, key, json.dumps(value), expires_at, now) for key, value in items.items()]
+        with self.lock, self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)", rows)
+            self.stats.writes += len(rows)
+            if self.maxsize is not None:
+                evicted = self.connection.execute("""DELETE FROM cache WHERE namespace = ? AND key IN (
+                                                     SELECT key FROM cache WHERE namespace = ?
+                                                     ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)""",
+                                                  (self.namespace, self.namespace, self.maxsize)).rowcount
+                self.stats.evictions += max(evicted, 0)
+
+    def delete(self, key:str):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+
+    def clear(self):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+
+    def purge_expired(self) -> int:
+        with self.lock, self.connection:
+            return self.connection.execute("DELETE FROM cache WHERE namespace = ? AND expires_at <= ?",
+                                           (self.namespace, time.time())).rowcount
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)).fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def __repr__(self):
+        return f"SQLiteCache({self.path!r}, namespace={self.namespace!r}, ttl={self.ttl}, {self.stats.snapshot()})"
+
+
+# query keys of the mapping endpoint answered by another field of the returned entity
+MAPPING_ALIASES = {
+    'entityidentifierbvd': ('identifierbvd', 'entityid'),
+    'entityidentifierorbis': ('identifierorbis',),
+    'entityid': ('identifierbvd',),
+    'entityinternationalname': ('internationalname',),
+}
+
+def _identifier(value) -> str:
+    return str(value).strip().upper()
+
+def match_mapping_queries(queries:list, entities:list) -> list:
+
+    """
+    The entity of the mapping response answering each query (None when the API did not resolve it). The mapping
+    endpoint does not echo the queries, so a query such as {"lei": "5493..."} is matched on the fields of the
+    returned entities, their nationalId items included.
+    """
+    index = {}
+    for entity in entities:
+        if not isinstance(entity, dict):
+            continue
+        for name, value in entity.items():
+            if value is not None and not isinstance(value, (dict, list)):
+                index.setdefault((name.lower(), _identifier(value)), entity)
+        for item in entity.get('nationalId') or []:
+            if isinstance(item, dict) and item.get('idName') and item.get('idValue') is not None:
+                index.setdefault((item['idName'].lower(), _identifier(item['idValue'])), entity)
+
+    matches = []
+    for query in queries:
+        candidates = None
+        for name, value in query.items():
+            name = name.lower()
+            found = {id(entity): entity for field in (name, *MAPPING_ALIASES.get(name, ()))
+                     if (entity := index.get((field, _identifier(value)))) is not None}
+            candidates = found if candidates is None else {key: candidates[key] for key in candidates if key in found}
+        matches.append(next(iter(candidates.values())) if candidates else None)
+    return matches
+
+
+class PDCache():
+
+    """
+    Per-entity cache of the PD endpoints (EDFXPD_Endpoint and EDFXPD_Endpoint_async).
+
+    Every entity of a response is stored under the content hash of (endpoint, normalised request parameters, entity),
+    so a batch of 1,000 entities with 990 cached only sends the 10 others; the response is then rebuilt in the order
+    of the requested entities. Server side (asyncResponse / processId) requests are never cached.
+
+    How long an entry stays valid follows the staleness rule. The default one treats a window ending before the
+    current month as immutable (published month-end PDs do not change) and keeps anything else (latest PDs, windows
+    reaching into the current month) for recent_ttl seconds.
+
+    Params:
+        backend: MemoryCache or SQLiteCache holding the entities, by default an in-memory LRU of 100,000 entries.
+                 SQLiteCache(namespace='pds', mmap_size=1 << 30) keeps them between runs behind a memory map.
+        recent_ttl: Seconds PDs that may still change are kept.
+        staleness: Optional callable(params) -> seconds to keep, None for immutable or 0 to skip caching, replacing
+                   the month-end rule. params are the normalised request parameters (dates as YYYY-MM-DD).
+
+    Usage:
+        endpoints = EDFXEndpoints(public, private, pd_cache=PDCache(SQLiteCache(namespace='pds')))
+        endpoints.pd_cache.stats
+    """
+
+    def __init__(self, backend = None, recent_ttl:float = 24 * 3600, staleness = None):
+        self.backend = backend if backend is not None else MemoryCache(maxsize=100_000)
+        self.recent_ttl = recent_ttl
+        self.staleness = staleness or self.month_end_staleness
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.backend.stats
+
+    @staticmethod
+    def normalise(params:dict) -> dict:
+
+        """
+        Request parameters without the entities and the unset values, dates as YYYY-MM-DD and lower case frequency,
+        so equivalent requests share their cache entries.
+        """
+        normalised = {}
+        for name, value in params.items():
+            if name == 'entities' or value is None:
+                continue
+            if name in ('startDate', 'endDate'):
+                value = datetime.date.fromisoformat(str(value)[:10]).isoformat()
+            elif name == 'historyFrequency':
+                value = str(value).lower()
+            normalised[name] = value
+        return normalised
+
+    def month_end_staleness(self, params:dict):
+        end_date = params.get('endDate')
+        if end_date is not None and datetime.date.fromisoformat(end_date) < datetime.date.today().replace(day=1):
+            return None
+        return self.recent_ttl
+
+    def lookup(self, endpoint:str, params:dict, entities:list):
+
+        """
+        Splits the entities of a PD request into the cached ones and the ones to send.
+        Returns None when the request cannot be cached, else (keys, cached, misses, ttl) to pass back to merge.
+        """
+        if not entities or params.get('asyncResponse') or params.get('processId'):
+            return None
+        normalised = self.normalise(params)
+        ttl = self.staleness(normalised)
+        if ttl == 0:
+            return None
+        keys = [canonical_key(endpoint, normalised, entity) for entity in entities]
+        cached = self.backend.get_many(keys)
+        misses = [(key, entity) for key, entity in zip(keys, entities) if key not in cached]
+        return keys, cached, misses, ttl
+
+    def merge(self, lookup:tuple, response:dict) -> dict:
+
+        """
+        Stores the entities of the response to the uncached entities and returns the response of the whole request,
+        entities in request order. A response without 'entities' (an error) is returned unchanged.
+        """
+        keys, cached, misses, ttl = lookup
+        if misses and (not isinstance(response, dict) or 'entities' not in response):
+            return response
+        returned = {}
+        for entity in (response or {}).get('entities') or []:
+            if isinstance(entity, dict) and 'entityId' in entity:
+                returned.setdefault(entity['entityId'], entity)
+        fresh = {key: returned[entity['entityId']] for key, entity in misses if entity.get('entityId') in returned}
+        # entities the API answered with an error message are passed on but not cached
+        storable = {key: entity for key, entity in fresh.items() if not entity.get('message')}
+        if storable:
+            self.backend.set_many(storable, ttl)
+        if not cached:
+            return response
+        entities = [cached[key] if key in cached else fresh[key] for key in keys if key in cached or key in fresh]
+        return {**(response or {}), 'entities': entities}
+
+
+class PDHistoryStore():
+
+    """
+    Local store of the PD history rows already fetched, per entity and asOfDate, for the incremental PD pulls of
+    EDFXEndpoints.SynchronousBatchMVP_incremental.
+
+    Rows are kept per series, the hash of the request parameters other than the dates (frequency, model flags,
+    details), so histories fetched with different settings never mix. For every entity the store also records from
+    which date its history was fetched, so a window reaching further back than what was fetched is pulled again.
+
+    Params:
+        path: SQLite file, defaults to ~/.edfx/pd_history.sqlite.
+    """
+
+    def __init__(self, path:str = None):
+        self.path = path or os.path.join(os.path.expanduser("~"), ".edfx", "pd_history.sqlite")
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS history (
+                                       series TEXT, entityId TEXT, asOfDate TEXT, record TEXT,
+                                       PRIMARY KEY (series, entityId, asOfDate))""")
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS coverage (
+                                       series TEXT, entityId TEXT, covered_from TEXT, PRIMARY KEY (series, entityId))""")
+
+    @staticmethod
+    def series_key(pd_params:dict) -> str:
+        params = PDCache.normalise(pd_params)
+        params.pop('startDate', None)
+        params.pop('endDate', None)
+        return canonical_key('pd_history', params)
+
+    @staticmethod
+    def _date(value) -> datetime.date:
+        return datetime.date.fromisoformat(str(value)[:10])
+
+    def _select(self, query:str, series:str, entity_ids:list, *params):
+        # SQLite limits the number of bound variables of a statement
+        for start in range(0, len(entity_ids), 500):
+            chunk = entity_ids[start:start + 500]
+            yield from self.connection.execute(query.format(ids=','.join('?' * len(chunk))), (series, *chunk, *params))
+
+    def gaps(self, series:str, entity_ids:list, startDate, endDate) -> dict:
+
+        """
+        Windows still to fetch, grouped: {(start, end): [entityId, ...]}. An entity fetched since startDate or earlier
+        only needs the days after its last stored asOfDate, any other entity the whole window.
+        """
+        start, end = self._date(startDate), self._date(endDate)
+        with self.lock:
+            covered = dict(self._select("SELECT entityId, covered_from FROM coverage WHERE series = ? AND entityId IN ({ids})",
+                                        series, entity_ids))
+            last = dict(self._select("""SELECT entityId, MAX(asOfDate) FROM history WHERE series = ?
+                                        AND entityId IN ({ids}) GROUP BY entityId""", series, entity_ids))
+        gaps = {}
+        for entity_id in dict.fromkeys(entity_ids):
+            window_start = start
+            if entity_id in covered and entity_id in last and self._date(covered[entity_id]) <= start:
+                window_start = max(start, self._date(last[entity_id]) + datetime.timedelta(days=1))
+            if window_start <= end:
+                gaps.setdefault((window_start.isoformat(), end.isoformat()), []).append(entity_id)
+        return gaps
+
+    def write(self, series:str, df:pd.DataFrame, fetched_from):
+
+        """
+        Stores the rows of a parsed PD batch (EDFXPDParse output) fetched from the date fetched_from onwards.
+        """
+        if df is None or df.empty:
+            return
+        df = df.reset_index(drop=True)
+        records = df.astype(object).where(df.notna(), None).to_dict('records')
+        rows = [(series, str(record['entityId']), str(record['asOfDate'])[:10], json.dumps(record, default=str))
+                for record in records]
+        fetched_from = self._date(fetched_from).isoformat()
+        with self.lock, self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO history VALUES (?, ?, ?, ?)", rows)
+            self.connection.executemany("""INSERT INTO coverage VALUES (?, ?, ?) ON CONFLICT (series, entityId)
+                                           DO UPDATE SET covered_from = MIN(covered_from, excluded.covered_from)""",
+                                        [(series, entity_id, fetched_from) for entity_id in dict.fromkeys(row[1] for row in rows)])
+
+    def load(self, series:str, entity_ids:list, startDate, endDate) -> pd.DataFrame:
+
+        """
+        Stored rows of the entities between startDate and endDate, shaped like the EDFXPDParse output
+        (asOfDate index), in entity then date order. None when nothing is stored.
+        """
+        start, end = self._date(startDate).isoformat(), self._date(endDate).isoformat()
+        with self.lock:
+            rows = list(self._select("""SELECT entityId, asOfDate, record FROM history WHERE series = ?
+                                        AND entityId IN ({ids}) AND asOfDate BETWEEN ? AND ?""",
+                                     series, list(dict.fromkeys(entity_ids)), start, end))
+        if not rows:
+            return None
+        order = {entity_id: index for index, entity_id in enumerate(dict.fromkeys(entity_ids))}
+        rows.sort(key=lambda row: (order[row[0]], row[1]))
+        df = pd.DataFrame.from_records([json.loads(record) for _, _, record in rows])
+        return df.set_index(pd.to_datetime(df['asOfDate']))
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,194 @@
+import re
+import difflib
+import numpy as np
+import pandas as pd
+from types import MappingProxyType
+from loguru import logger
+
+# =============================================================================================================
+# ATTENTION: Before you continue UNDERSTAND:
+# Moodys Analytics DOES NOT support this code. This code is for assistance and demonstration purposes only.
+# Licensed Clients should reference https://hub.moodysanalytics.com/products
+# and the functional endpoint examples when formatting their exact questions to support.
+# ==============================================================================================================
+
+# description -> code tables of the industry classifications, built once at import and read only
+
+NDY_TABLE = MappingProxyType({
+    'AEROSPACE & DEFENSE': 'N01', 'AGRICULTURE': 'N02', 'AIR TRANSPORTATION': 'N03', 'APPAREL & SHOES': 'N04',
+    'AUTOMOTIVE': 'N05', 'BANKS AND S&LS': 'N06', 'BROADCAST MEDIA': 'N07', 'BUSINESS PRODUCTS WHSL': 'N08',
+    'BUSINESS SERVICES': 'N09', 'CHEMICALS': 'N10', 'COMPUTER HARDWARE': 'N11', 'COMPUTER SOFTWARE': 'N12',
+    'CONSTRUCTION': 'N13', 'CONSTRUCTION MATERIALS': 'N14', 'CONSUMER DURABLES': 'N15',
+    'CONSUMER DURABLES RETL/WHSL': 'N16', 'CONSUMER PRODUCTS': 'N17', 'CONSUMER PRODUCTS RETL/WHSL': 'N18',
+    'CONSUMER SERVICES': 'N19', 'ELECTRICAL EQUIPMENT': 'N20', 'ELECTRONIC EQUIPMENT': 'N21',
+    'ENTERTAINMENT & LEISURE': 'N22', 'FINANCE COMPANIES': 'N23', 'FINANCE NEC': 'N24', 'FOOD & BEVERAGE': 'N25',
+    'FOOD & BEVERAGE RETL/WHSL': 'N26', 'FURNITURE & APPLIANCES': 'N27', 'HOTELS & RESTAURANTS': 'N28',
+    'INSURANCE - LIFE': 'N29', 'INSURANCE - PROP/CAS/HEALTH': 'N30', 'INVESTMENT MANAGEMENT': 'N31', 'LESSORS': 'N32',
+    'LUMBER & FORESTRY': 'N33', 'MACHINERY & EQUIPMENT': 'N34', 'MEASURE & TEST EQUIPMENT': 'N35',
+    'MEDICAL EQUIPMENT': 'N36', 'MEDICAL SERVICES': 'N37', 'MINING': 'N38', 'OIL REFINING': 'N39',
+    'OIL, GAS & COAL EXPL/PROD': 'N40', 'PAPER': 'N41', 'PHARMACEUTICALS': 'N42', 'PLASTIC & RUBBER': 'N43',
+    'PRINTING': 'N44', 'PUBLISHING': 'N45', 'REAL ESTATE': 'N46', 'REAL ESTATE INVESTMENT TRUSTS': 'N47',
+    'SECURITY BROKERS & DEALERS': 'N48', 'SEMICONDUCTORS': 'N49', 'STEEL & METAL PRODUCTS': 'N50', 'TELEPHONE': 'N51',
+    'TEXTILES': 'N52', 'TOBACCO': 'N53', 'TRANSPORTATION EQUIPMENT': 'N54', 'TRANSPORTATION': 'N55', 'TRUCKING': 'N56',
+    'UNASSIGNED': 'N57', 'UTILITIES NEC': 'N58', 'UTILITIES, ELECTRIC': 'N59', 'UTILITIES, GAS': 'N60',
+    'CABLE TV': 'N61', 'IT SERVICES': 'N62',
+})
+
+# NAICS 2017 sectors
+NAICS2017_TABLE = MappingProxyType({
+    'Agriculture, Forestry, Fishing and Hunting': '11',
+    'Mining, Quarrying, and Oil and Gas Extraction': '21',
+    'Utilities': '22',
+    'Construction': '23',
+    'Manufacturing': '31-33',
+    'Wholesale Trade': '42',
+    'Retail Trade': '44-45',
+    'Transportation and Warehousing': '48-49',
+    'Information': '51',
+    'Finance and Insurance': '52',
+    'Real Estate and Rental and Leasing': '53',
+    'Professional, Scientific, and Technical Services': '54',
+    'Management of Companies and Enterprises': '55',
+    'Administrative and Support and Waste Management and Remediation Services': '56',
+    'Educational Services': '61',
+    'Health Care and Social Assistance': '62',
+    'Arts, Entertainment, and Recreation': '71',
+    'Accommodation and Food Services': '72',
+    'Other Services (except Public Administration)': '81',
+    'Public Administration': '92',
+})
+
+# NACE Rev. 2 sections
+NACE2_TABLE = MappingProxyType({
+    'Agriculture, forestry and fishing': 'A',
+    'Mining and quarrying': 'B',
+    'Manufacturing': 'C',
+    'Electricity, gas, steam and air conditioning supply': 'D',
+    'Water supply; sewerage, waste management and remediation activities': 'E',
+    'Construction': 'F',
+    'Wholesale and retail trade; repair of motor vehicles and motorcycles': 'G',
+    'Transportation and storage': 'H',
+    'Accommodation and food service activities': 'I',
+    'Information and communication': 'J',
+    'Financial and insurance activities': 'K',
+    'Real estate activities': 'L',
+    'Professional, scientific and technical activities': 'M',
+    'Administrative and support service activities': 'N',
+    'Public administration and defence; compulsory social security': 'O',
+    'Education': 'P',
+    'Human health and social work activities': 'Q',
+    'Arts, entertainment and recreation': 'R',
+    'Other service activities': 'S',
+    'Activities of households as employers; undifferentiated goods- and services-producing activities of households for own use': 'T',
+    'Activities of extraterritorial organisations and bodies': 'U',
+})
+
+# SIC (1987) divisions, coded by their range of major groups as the NAICS sectors
+SIC_TABLE = MappingProxyType({
+    'Agriculture, Forestry, and Fishing': '01-09',
+    'Mining': '10-14',
+    'Construction': '15-17',
+    'Manufacturing': '20-39',
+    'Transportation, Communications, Electric, Gas, and Sanitary Services': '40-49',
+    'Wholesale Trade': '50-51',
+    'Retail Trade': '52-59',
+    'Finance, Insurance, and Real Estate': '60-67',
+    'Services': '70-89',
+    'Public Administration': '91-97',
+    'Nonclassifiable Establishments': '99',
+})
+
+_PUNCTUATION = re.compile(r'[^0-9A-Z]+')
+
+
+def normalise_label(label:str) -> str:
+
+    """
+    Upper case, '&' spelled AND, punctuation and repeated whitespace collapsed to single spaces:
+    'Oil, Gas & Coal Expl/Prod ' -> 'OIL GAS AND COAL EXPL PROD'.
+    """
+    return _PUNCTUATION.sub(' ', label.upper().replace('&', ' AND ')).strip()
+
+
+class IndustryMapper():
+
+    """
+    Categorical lookup of industry descriptions (or codes) to the codes of one classification table.
+
+    Matching goes through normalise_label, so case, whitespace and punctuation differences are ignored. Descriptions
+    still unmatched fall back to a fuzzy match (difflib ratio >= cutoff) among the table entries sharing a word with
+    them, found through a word index built with the mapper. Every distinct value is resolved once, so a 100k row
+    export with a few dozen industries costs a few dozen lookups.
+
+        INDUSTRY_MAPPERS['NDY'].map(df['Industry'])   # categorical Series of NDY codes, NaN when unmatched
+    """
+
+    def __init__(self, name:str, table:MappingProxyType, cutoff:float = 0.85):
+        self.name = name
+        self.table = table
+        self.cutoff = cutoff
+        self.dtype = pd.CategoricalDtype(list(dict.fromkeys(table.values())))
+        lookup = {}
+        for description, code in table.items():
+            key = normalise_label(description)
+            if lookup.get(key, code) != code:
+                raise ValueError(f"{name}: '{description}' collides with another description once normalised.")
+            lookup[key] = code
+        # codes map to themselves so already coded columns pass through
+        for code in table.values():
+            lookup.setdefault(normalise_label(code), code)
+        self.lookup = MappingProxyType(lookup)
+        words = {}
+        for key in lookup:
+            for word in key.split():
+                words.setdefault(word, set()).add(key)
+        self.words = MappingProxyType({word: frozenset(keys) for word, keys in words.items()})
+        # normalised value -> code (or None) of the fuzzy matches made so far
+        self.fuzzy_cache = {}
+
+    def fuzzy(self, key:str) -> str:
+
+        """
+        Code of the closest table entry to a normalised value, None below the cutoff.
+        """
+        if key not in self.fuzzy_cache:
+            candidates = set().union(*(self.words.get(word, ()) for word in key.split())) or self.lookup.keys()
+            match = difflib.get_close_matches(key, list(candidates), n=1, cutoff=self.cutoff)
+            self.fuzzy_cache[key] = self.lookup[match[0]] if match else None
+        return self.fuzzy_cache[key]
+
+    def map(self, industrySeries:pd.Series, fuzzy:bool = True) -> pd.Series:
+
+        """
+        Categorical Series of the codes of industrySeries (same index), NaN where nothing matched.
+        """
+        codes, uniques = pd.factorize(industrySeries)
+        keys = pd.Series(uniques, dtype=object).astype(str).map(normalise_label)
+        resolved = keys.map(self.lookup)
+        if fuzzy and resolved.isna().any():
+            missing = resolved.isna()
+            resolved[missing] = keys[missing].map(self.fuzzy)
+            matched = keys[missing & resolved.notna()]
+            if len(matched):
+                logger.info(f"{self.name}: fuzzy matched {dict(zip(pd.Series(uniques)[matched.index], resolved[matched.index]))}")
+        unmatched = pd.Series(uniques)[resolved.isna().to_numpy()]
+        if len(unmatched):
+            logger.warning(f"{self.name}: no code for {list(unmatched)}")
+        category_codes = pd.Categorical(resolved, dtype=self.dtype).codes
+        # missing values (factorize code -1) stay missing
+        row_codes = np.where(codes >= 0, category_codes[codes], -1) if len(category_codes) else codes
+        values = pd.Categorical.from_codes(row_codes, dtype=self.dtype)
+        return pd.Series(values, index=industrySeries.index, name=industrySeries.name)
+
+    def __repr__(self):
+        return f"IndustryMapper({self.name}, {len(self.table)} entries)"
+
+
+NDY_MAPPER = IndustryMapper('NDY', NDY_TABLE)
+NAICS2017_MAPPER = IndustryMapper('NAICS2017', NAICS2017_TABLE)
+NACE2_MAPPER = IndustryMapper('NACE2', NACE2_TABLE)
+SIC_MAPPER = IndustryMapper('SIC', SIC_TABLE)
+
+# IndustryClassification of the LGD class -> mapper of its DataFrame input
+INDUSTRY_MAPPERS = MappingProxyType({'NDY': NDY_MAPPER, 'NAICS2017': NAICS2017_MAPPER, 'NACE': NACE2_MAPPER,
+                                     'NACE2': NACE2_MAPPER, 'SIC': SIC_MAPPER})
@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import pandas as pd
+from loguru import logger
+
+# =============================================================================================================
+# ATTENTION: Before you continue UNDERSTAND:
+# Moodys Analytics DOES NOT support this code. This code is for assistance and demonstration purposes only.
+# Licensed Clients should reference https://hub.moodysanalytics.com/products
+# and the functional endpoint examples when formatting their exact questions to support.
+# ==============================================================================================================
+
+
+class BatchJournal():
+
+    """
+    Durable progress journal of a bulk run, keyed by run id.
+
+    Every batch is identified by a hash of its entities and recorded in a local SQLite database with its status
+    ('pending', 'done', 'failed'), row count and the location of its parsed output (a pickled DataFrame written
+    next to the database). A rerun with the same run id skips the finished batches and only sends the pending and
+    failed ones again; load_results() merges every finished batch in input order.
+
+        df = await endpoints.SynchronousBatchMVP_async(entities, 100, run_id="pd-2024-06")
+        # after a crash, the same call resumes; progress can be inspected with
+        BatchJournal("pd-2024-06").summary()
+
+    Params:
+        run_id: Name of the run, reuse it to resume.
+        directory: Folder of the run. Defaults to ~/.edfx/runs/<run_id>.
+    """
+
+    STATUSES = ('pending', 'done', 'failed')
+
+    def __init__(self, run_id:str, directory:str = None):
+
+        self.run_id = run_id
+        self.directory = directory or os.path.join(os.path.expanduser("~"), ".edfx", "runs", run_id)
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, "journal.sqlite")
+
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS runs (
+                                       run_id TEXT PRIMARY KEY, params TEXT, created_at REAL)""")
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS batches (
+                                       run_id TEXT, batch_key TEXT, batch_index INTEGER, status TEXT, rows INTEGER,
+                                       output_path TEXT, attempts INTEGER DEFAULT 0, error TEXT, updated_at REAL,
+                                       PRIMARY KEY (run_id, batch_key))""")
+
+    def start_run(self, params:dict):
+
+        """
+        Records the request parameters of the run. Resuming a run id with different parameters raises a ValueError
+        since its finished batches would not match the new request.
+        """
+        params = json.dumps(params, sort_keys=True, default=str)
+        row = self.connection.execute("SELECT params FROM runs WHERE run_id = ?", (self.run_id,)).fetchone()
+        if row is None:
+            with self.connection:
+                self.connection.execute("INSERT INTO runs VALUES (?, ?, ?)", (self.run_id, params, time.time()))
+        elif row[0] != params:
+            raise ValueError(f"Run {self.run_id} was started with different parameters: {row[0]}")
+        else:
+            logger.info(f"Resuming run {self.run_id}: {self.summary()}")
+
+    @staticmethod
+    def batch_key(entities:list) -> str:
+        return hashlib.sha1(json.dumps(entities, sort_keys=True).encode()).hexdigest()
+
+    def finished_keys(self) -> set:
+        rows = self.connection.execute("SELECT batch_key FROM batches WHERE run_id = ? AND status = 'done'", (self.run_id,))
+        return {row[0] for row in rows}
+
+    def mark_pending(self, batch_key:str, batch_index:int):
+        with self.connection:
+            self.connection.execute("""INSERT INTO batches (run_id, batch_key, batch_index, status, attempts, updated_at)
+                                       VALUES (?, ?, ?, 'pending', 1, ?)
+                                       ON CONFLICT (run_id, batch_key) DO UPDATE SET
+                                       batch_index = excluded.batch_index, status = 'pending',
+                                       attempts = attempts + 1, updated_at = excluded.updated_at""",
+                                    (self.run_id, batch_key, batch_index, time.time()))
+
+    def mark_done(self, batch_key:str, df:pd.DataFrame = None):
+
+        """
+        Writes the parsed batch next to the journal (atomically) before recording it as done, so a done batch
+        always has its output on disk. df None records a batch without data.
+        """
+        output_path = None
+        rows = 0
+        if df is not None:
+            output_path = os.path.join(self.directory, f"{batch_key}.pkl")
+            df.to_pickle(output_path + ".tmp")
+            os.replace(output_path + ".tmp", output_path)
+            rows = len(df)
+        with self.connection:
+            self.connection.execute("""UPDATE batches SET status = 'done', rows = ?, output_path = ?, error = NULL,
+                                       updated_at = ? WHERE run_id = ? AND batch_key = ?""",
+                                    (rows, output_path, time.time(), self.run_id, batch_key))
+
+    def mark_failed(self, batch_key:str, error:str = None):
+        with self.connection:
+            self.connection.execute("""UPDATE batches SET status = 'failed', error = ?, updated_at = ?
+                                       WHERE run_id = ? AND batch_key = ?""",
+                                    (error, time.time(), self.run_id, batch_key))
+
+    def summary(self) -> dict:
+        rows = self.connection.execute("""SELECT status, COUNT(*), COALESCE(SUM(rows), 0) FROM batches
+                                          WHERE run_id = ? GROUP BY status""", (self.run_id,))
+        summary = {status: {"batches": 0, "rows": 0} for status in self.STATUSES}
+        for status, batches, rows_count in rows:
+            summary[status] = {"batches": batches, "rows": rows_count}
+        return summary
+
+    def iter_results(self):
+
+        """
+        Yields the outputs of the finished batches one at a time, in input order.
+        """
+        paths = self.connection.execute("""SELECT output_path FROM batches WHERE run_id = ? AND status = 'done'
+                                           AND output_path IS NOT NULL ORDER BY batch_index""", (self.run_id,)).fetchall()
+        for (path,) in paths:
+            yield pd.read_pickle(path)
+
+    def load_results(self) -> pd.DataFrame:
+
+        """
+        Merges the outputs of every finished batch in input order, None when nothing was finished.
+        """
+        dfs = list(self.iter_results())
+        if dfs:
+            return pd.concat(dfs)
+        return None
+
+    def close(self):
+        self.connection.close()
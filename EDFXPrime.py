@@ -1,2985 +1,4270 @@
-import io
-import os
-import requests
-import warnings
-import urllib.parse
-import datetime
-import time
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import moodys_keys as mk
-import requests
-import json
-import asyncio
-import aiohttp
-from enum import Enum
-from loguru import logger
-from traceback import format_exc
-from aiohttp import ClientTimeout, ClientError, ServerTimeoutError
-from aiohttp import ClientSession
-from urllib.parse import urljoin,urlencode,quote_plus
-from EDFXAuthentication import EDFXClient
-import nest_asyncio
-nest_asyncio.apply()
-
-# =============================================================================================================
-# ATTENTION: Before you continue UNDERSTAND:
-# Moodys Analytics DOES NOT support this code. This code is for assistance and demonstration purposes only.
-# Licensed Clients should reference https://hub.moodysanalytics.com/products
-# and the functional endpoint examples when formatting their exact questions to support.
-# ==============================================================================================================
-
-
-# Helper function to flatten dictionaries.
-# It is not a static method because it is using recursion and will require hard coding the class name, better to keep it external
-def flatten_dict(input_dict:dict, separator:str='_',  parent_name:str='')->dict:
-
-    """
-    Recursively flattens a dictionary.
-    Each key in the flattened dictionary is a concatenation of the parent key and the current key.
-    If a key has multiple levels of dicts/lists, the keys are concatenated using underscores as ParentNames.
-    Values are converted to strings.
-    Args:
-        input_dict: The dictionary to be flattened.
-        separator: The separator used to concatenate keys.
-        parent_name: The parent name that will be added as prefix key
-    Return:
-        dict: flattened_dict
-
-    """
-    flattened_dict = {}
-    for key, value in input_dict.items():
-        if isinstance(value, dict):
-            flattened_dict.update(flatten_dict(value, separator, key))
-        elif isinstance(value, list):
-            for index, item in enumerate(value):
-                item_key = f"{key}{separator}{index}"
-                if isinstance(item, dict):
-                    flattened_dict.update(flatten_dict(item, separator, item_key))
-                else:
-                    flattened_dict[item_key] = item
-        else:
-            if parent_name:
-                flattened_dict[f'{parent_name}{separator}{key}'] = value
-            else:
-                flattened_dict[key] = value
-    return flattened_dict
-
-def filter_out_list_and_dict(dictionary: dict, prefix: str = ''):
-    '''
-    Returns a version of dictionary that has only keys that are not dict or list type.
-    If prefix is provided it will be added to keys.
-    '''
-    return {
-        f'{prefix}_{key}' if prefix else key: value for key, value in dictionary.items()
-        if not isinstance(value, (list, dict))}
-
-def PDDrivers_extract_ratios(entity: dict) -> list:
-    """
-    HelperFunction to Parse Pd History Json
-    """
-    ratios = []
-    if not isinstance(entity, dict):
-        raise TypeError(f'Expected entity to be a dict, but got {type(entity)}: {entity}')
-
-    # Handle inputData section
-    input_data = entity.get('inputData', [])
-    for item in input_data:
-        if isinstance(item, dict) and "message" in item:
-            ratio_data = {
-                "entityId": entity['entityId'],
-                "asOfDate": None,
-                "Type": "Error",
-                "ErrorMessage": item["message"]
-            }
-            ratios.append(ratio_data)
-    #handle results section
-    result_data = entity.get('resultData', {})
-    for key, items in result_data.items():
-        # Check if the item is not a list of dictionaries, then convert it to one
-        if not isinstance(items, list):
-            items = [items]
-
-        for item in items:
-            # Check if the item is a dictionary
-            if not isinstance(item, dict):
-                continue
-
-            if key == 'relativeContribution':  # Check for current data
-                ratio_data = {"entityId": entity['entityId'], "asOfDate": item['asOfDate'], 'Type': 'Current'}
-            else:
-                ratio_data = {"entityId": entity['entityId'], "asOfDate": item['asOfDate'], 'Type': key}
-
-            for k, value in item.items():
-                ratio_data[k] = value
-            ratios.append(ratio_data)
-
-    return ratios
-
-
-class FinancialTemplate(Enum):
-
-    """
-    Use of Enums:
-
-    Purpose: Enums can represent a set of named values, ensuring that only those values can be used.
-
-    Benefit: Prevents arbitrary string values from being passed to the function. This leads to more
-    predictable behavior and reduces potential bugs.
-
-    """
-
-    UNIVERSAL = 'Universal'
-    BANK = 'Bank'
-
-class OutputFormat(Enum):
-    PANDAS = 'Pandas'
-    EXCEL = 'Excel'
-    CSV = 'Csv'
-
-class EDFXEndpoints(EDFXClient):
-
-    """
-    EDFXEndpoints Class provides all EDF-X Endopints.
-
-    Class attributes will be constructed with the unique
-    headers and payloads for EDF-X
-
-    """
-    EDFXProxies = {}
-
-    def __init__(self, api_publickey:str = None, api_privatekey:str=None, proxies={}, *args, **kwargs):
-        super().__init__(api_publickey, api_privatekey, proxies, *args, **kwargs)
-        # this token is in bytes that needs to be in str type
-
-    def EDFXHeaders(self, process_id=None):
-
-        """
-        This method calls get_bearer_token() to get the current bearer token and returns the headers.
-        NOTE: get_bearer_token() checks if the token needs to be renewed on each call.
-
-        If you're using the ModelInputsUploadProcess be sure to feed the process_id
-        Some of these parameters appear obnoxious but that's due to the fact the EDF-X API
-        Requires them to be passed as such (see boundry in ModelInputsProcess)
-
-        """
-        bearer_token = self.get_bearer_token()
-        bearer = bearer_token.decode('utf-8') if bearer_token else None
-
-        if bearer is not None:
-            return  {
-                    "JSONBasic": {
-                        "headers" : {
-                                "accept": "application/json",
-                                "content-type": "application/json",
-                                "authorization": "Bearer " + bearer
-                                }
-                            },
-                    "JSONMultipart":{
-                        "headers" : {
-                                "accept": "application/json",
-                                "content-type": "multipart/form-data",
-                                "authorization": "Bearer " + bearer
-                                }
-                            },
-                    "JSONGet": {
-                        "headers": {
-                                "accept": "application/json",
-                                "authorization": "Bearer " + bearer
-                                    }
-                            },
-                    "ModelInputsProcess": {
-                        "headers": {
-                                    "accept": "application/json",
-                                    "content-type": "multipart/form-data; boundary=---011000010111000001101001",
-                                    "authorization": "Bearer " + bearer
-                                    }
-                        },
-                    "ModelInputsUploadProcess":{
-                        "headers": {
-                                        'x-amz-tagging': 'edfx_process_id=' + process_id if process_id else 'process_id_not_used.',
-                                        'content-type': 'text/csv'
-                                    }
-                        }
-                    }
-        else:
-            raise ValueError('bearer is None')
-
-    def create_params_dict(self, params: dict):
-        """
-        Helper Function to select params
-        """
-        params = {key: value for key, value in params.items() if value is not None}
-        return params
-
-
-
-    def format_PDpayload(self, entity_series:pd.Series ):
-
-        """
-        Takes in a Pandas Series and outputs the relevant Payload.
-
-        This can also be a list not just a pandas series.
-        """
-
-        return [{"entityId": entity} for entity in entity_series]
-    
-
-
-    def format_BatchMappingpayload(self, entity_series: pd.Series, identifier_type:str = "identifierBvd"):
-        """
-        Takes in a Pandas Series and outputs the relevant Payload based on the identifier type.
-
-        Parameters:
-        - entity_series: pd.Series or list, containing the entity identifiers.
-        - identifier_type: str, specifying the type of identifier (e.g., 'identifierBvd', 'pid', etc.).
-
-        Returns:
-        - dict: Payload for the API request.
-
-        Example:
-        - format_BatchMappingpayload(entity_series, 'identifierBvd')
-        """
-
-        # Validate identifier_type
-        valid_identifiers = [
-            "identifierBvd",
-            "entityidentifierorbis",
-            "entityIdentifierTaxNumber",
-            "entityIdentifierEin",
-            "isin",
-            "cusip",
-            "lei",
-            "pid",
-            "ticker"
-        ]
-
-        if identifier_type not in valid_identifiers:
-            raise ValueError(f"Invalid identifier type. Must be one of: {valid_identifiers}")
-
-        # Construct the payload
-        queries = [{identifier_type: entity} for entity in entity_series]
-
-        return queries
-
-
-    def split_list(self, input_list:list[dict[str,str]], BatchSize:int):
-
-        """
-        Splits input list into batches of size <batchsize> returning a generator
-
-        This is used within our batch function SynchronousBatchMVP
-
-        """
-
-        for ii in range(0, len(input_list), BatchSize):
-            yield input_list[ii:ii + BatchSize]
-
-    def EDFXEntitySearchEndpoint(self,query:str, limit:int=None, offset:int=None):
-
-        """
-        Entity Search Endpoint:
-
-            query:required Param
-
-            limit: 	Specify the maximum number of results returned in single call.
-
-            offset: 	Specify the index from which to start returning results.
-                        Use with the limit parameter to get result batches to process.
-                        For example, limit= 10, offset = 20, returns the results indexed
-                        from 20-29.
-        """
-        search = "/entity/v1/search"
-        base = self.base_url
-        Searchurl = urljoin(base,search)
-        #general post headers for RESTFUL API's
-        headers = self.EDFXHeaders()['JSONBasic']['headers']
-
-        params = {
-                    'query': query,
-                    'limit': limit,
-                    'offset':offset
-                }
-        params = self.create_params_dict(params)
-        response = requests.post(Searchurl, headers=headers, json=params)
-        params = response.json()
-
-        return params
-
-    def EDFXBatchEntitySearch(self,queries:list[dict[str,str]]):
-
-        """
-        Batch Entity Explanation,
-
-        An object containing the companies identifiers. The currently supported identifiers
-        are listed in "Appendix: Supported Identifiers";
-        the keys accepted by the json for the main ones are:
-
-        - entityidentifierbvd- Identifier from Orbis
-        - entityidentifierorbis - Identifier from Orbis
-        - entityIdentifierTaxNumber
-        - entityIdentifierEin - Employer Reference Number
-        - isin - International Securities Identification Number
-        - cusip - Committee on Uniform Securities Identification Procedures
-        - lei - Legal Entity Identifier
-        - pid - CreditEdge Identifier
-        - ticker - Stock symbol
-
-        Provide the keys and the related values. ==> Example of a request of eac,
-
-            EX of query to feed:
-            [{ "entityIdentifierPartitaIva": 1959680388 }, { "lei": "549300CRVT18MXX0AG93" }, { "cusip": 594918 }, { "isin": "US3453708600" }, { "pid": "34537A" }]
-
-        """
-        base = self.base_url
-        batch = "/entity/v1/mapping"
-        batchurl = urljoin(base,batch)
-        #general post headers for RESTFUL API's
-        headers = self.EDFXHeaders()['JSONBasic']['headers']
-        # Simple error handling: It's just saying if they don't feed a list of dictionary elements return that message
-        if not isinstance(queries, list) or not all(isinstance(q, dict) for q in queries):
-            print("You need to feed a list of dictionary elements. For example: queries = [{'pid': '34537A'}, {'cusip': 594918}]")
-            return
-        else:
-        
-            payload = { "queries" : queries}
-            response = requests.post(batchurl, headers=headers, json=payload)
-
-            # Handle failed batch request by procesing entities one by one
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.warning(f'Batch call failed: {response.text}')
-                data = {}
-                for i, query in enumerate(queries):
-                    print(f'Pocessing query {i} of {len(queries)}')
-                    partial_payload = { "queries" : [query]}
-                    response = requests.post(batchurl, headers=headers, json=partial_payload)
-                    if response.status_code == 200:
-                        if data:
-                            data['entities'].append(response.json()['entities'])
-                        else:
-                            data = response.json()
-                    else:
-                        logger.warning(f"API call failed: {partial_payload} Error: {response.text}")
-
-                return data
-
-    async def EDFXBatchEntitySearch_async(self, queries: list[dict[str, str]]):
-
-        """
-        This is Async Functionality for the EDFXBatchEntitySearch Function.
-        """
-
-        if not isinstance(queries, list) or not all(isinstance(q, dict) for q in queries):
-            logger.warning("You need to feed a list of dictionary elements.")
-            return
-
-        async with ClientSession() as session:
-            for i in range(10, 0, -1):
-                try:
-                    return await self._post_batch(session, queries)
-                except:
-                    print(f'EDFXBatchEntitySearch_async call failed, {i} retries left')
-
-
-    async def _post_async(self, session: ClientSession, url: str, headers: dict, payload: dict):
-        """
-        Helper function for _post_batch async funciton
-        """
-        async with session.post(url, headers=headers, json=payload) as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                logger.warning(f"Batch call failed: response status: {response.status}")
-                raise ValueError
-
-    async def _post_batch(self, session: ClientSession, queries: list):
-
-        """
-         Async Batch function for search
-        """
-
-        base = self.base_url
-        batch = "/entity/v1/mapping"
-        batchurl = urljoin(base, batch)
-        headers = self.EDFXHeaders()['JSONBasic']['headers']
-        payload = {"queries": queries}
-
-        # Try the batch request first
-        return await self._post_async(session, batchurl, headers, payload)
-
-    async def BatchingBatchSearch_async(self, EntityPayload: list[dict[str, str]], BatchSize: int):
-
-        """This isnt' quite right """
-        batches = list(self.split_list(EntityPayload, BatchSize=BatchSize))
-        responses = await asyncio.gather(*(self.EDFXBatchEntitySearch_async(
-            queries=b) for b in batches
-        ), return_exceptions=False
-        )
-
-        dfs = []
-        for search_dict in responses:
-            if not search_dict:
-                 logger.warning(f"API returned a NONE response. {search_dict.status_code} + {search_dict.response}+{search_dict.text} .")
-            Batchdf = self.EDFXBatchParse(search_dict)
-            dfs.append(Batchdf)
-
-        if dfs:
-            return pd.concat(dfs)
-        else:
-            logger.info("No dataframes were created.")
-            return None
-
-    def BatchingBatchSearch(self, EntityPayload:list[dict[str,str]], BatchSize:int):
-
-        """
-        Batches the EDFXBatchParse Function
-        """
-        dfs = []
-        for entities_batch in self.split_list(EntityPayload,BatchSize=BatchSize):
-            # try:
-            Batch_dict = self.EDFXBatchEntitySearch(queries=entities_batch)
-            if not Batch_dict:
-                logger.warning("API Returned None Response.")
-            Batchdf = self.EDFXBatchParse(Batch_dict)
-            dfs.append(Batchdf)
-            # except Exception as e:
-            #     logger.error(f"An error occured with Batch at index {entities_batch[0]}: {e}.")
-        if dfs:
-            return pd.concat(dfs)
-        else:
-            logger.info(f"No dataframes were created. dfs: {dfs}")
-            return None
-
-    def EDFXPD_Endpoint(self, entities:list[dict[str,str]]=None, startDate:str=None, endDate:str=None, historyFrequency:str='monthly',
-                        asyncResponse:bool=False, asReported:bool=False, modelParameters:bool=False, includeDetailResult:bool=False,
-                        includeDetailInput:bool = False, includeDetailModel:bool=False, includeTermStructure: bool=True, processId:str=None,
-                        CreditEdge:bool=False, RiskCalc:bool=False, TradePayment:bool=False, timeout:float=None):
-
-        """
-        Params: These are the values of the paramater dictionary you are feeding the method.
-
-            Entities: The object is a list of dictionary elements: value = [{'entityId': 'identifier'}]
-                        multiple entities exmampe:
-                        [{ "entityId": "DELEI421244" }, { "entityId": "US800890963" }, { "entityId": "FR813755949" }]
-
-            startDate: If provided, generates a history of PD values in the format YYYY-MM-DD.
-
-            endDate: The date of the PD you are retrieving in the format YYYY-MM-DD.
-
-            historyFrequency: reference APIHUB FOR FULL details:
-                            This endpoint defines the frequency of the PD value history.
-                            Allowed values are: "daily"; "monthly"; "quarterly"; or "annual". Default = 'monthly'
-
-            modelParameters: This is referring to Financial Statement Only.  Set to TRUE if you need FSO EDF
-            processID: This parameter is alternative to providing the list of entities.
-                        The values accepted are process IDs received when uploading a csv file through the /modelInput endpoint.
-
-            includeDetail: options:
-                                i) 'resultDetail'
-                                ii) 'inputDetai'
-                                iii) 'modelDetail'
-            includeTermStructure: True returns 10 year term structurs for cumulative, forward, and annualized outputs
-
-            CreditEdge: = True if you would like the CE Structural EDF. Only listed companies appear since the
-                          model relies on equity market prices.
-
-            RiskCalc: = True if you would like the RiskCalc EDF returned mapped to the model internally allocated
-
-            TradePayment: = True if you would like the TradePayment EDF returned (given it exists)
-                            Payment PDs are only calculated for US companies with netSales < 500mln USD
-                            for which payment information is available.
-
-        ---------------FOR YOUR REFERENCE----------------------------------------------------------
-        When no startDate and endDate is provided, the API serves the latest PD available considered.
-        For private firms this is the latest available month, while for active public firms this is
-        the latest available day within the last 10 days. Dates beyond these can be accessed in the
-        history by specifying startDate and endDate.
-
-        """
-        if entities is not None and startDate is None and endDate is None:
-            raise ValueError('You must include either a startDate or endDate when entities is provided.')
-
-        if entities:
-            if isinstance(entities, dict):
-                for key, value in entities.items():
-                    if not isinstance(key,str) or not isinstance(value,str):
-                        print("Error: you need to either feed a dictionary of 'EntityID' as key and an EDFX Qualified ID as the value." )
-                        return None
-                entities = [entities]
-
-                # Check if entities is a list of dictionaries with the key "entityId"
-            if not isinstance(entities, list) or not all(isinstance(e, dict) and "entityId" in e for e in entities):
-                print("Error: entities parameter must be a list of dictionaries with an 'entityId' key")
-                return None
-
-        # Define initial parameters
-        params = {
-            'startDate': startDate,
-            'endDate': endDate,
-            'historyFrequency': historyFrequency,
-            'asyncResponse': asyncResponse,
-            'asReported': asReported,
-            'modelParameters':
-                                {'fso': modelParameters} if modelParameters is not None else None,
-            'includeDetail': {
-                "resultDetail":includeDetailResult,
-                "inputDetail": includeDetailInput,
-                "modelDetail": includeDetailModel,
-                "includeTermStructure": includeTermStructure
-            }
-        }
-        if entities:
-            params['entities'] = entities
-
-
-        EDFXPDEnpoints = {
-            'CreditEdge':   '/edfx/v1/entities/pds/creditedge',
-            'RiskCalc':     '/edfx/v1/entities/pds/riskcalc',
-            'TradePayment': '/edfx/v1/entities/pds/payment',
-            'default':      '/edfx/v1/entities/pds'
-        }
-
-        if CreditEdge:
-            endpoint = EDFXPDEnpoints['CreditEdge']
-        elif RiskCalc:
-            endpoint = EDFXPDEnpoints['RiskCalc']
-        elif TradePayment:
-            endpoint = EDFXPDEnpoints['TradePayment']
-        else:
-            endpoint = EDFXPDEnpoints['default']
-
-        if processId:
-            params['processId'] = processId
-
-
-        headers = self.EDFXHeaders()['JSONBasic']['headers']
-        base = self.base_url
-        url = urljoin(base, endpoint)
-        response = requests.post(url, headers=headers, json=params)
-
-        try:
-            payload = response.json()
-            if payload.get('message'):
-                logger.error(f"I'm sorry but the API Returned {payload}. Please re-check your input variables.")
-            else:
-                return payload
-
-
-        except:
-            logger.error(f"An error occurred while processing the API response: {payload}")
-
-    async def EDFXPD_Endpoint_async(self,semaphore:asyncio.Semaphore, entities:list[dict[str,str]]=None, startDate:str=None, endDate:str=None, historyFrequency:str='monthly',
-                                    asyncResponse:bool=False, asReported:bool=False, modelParameters:bool=False, includeDetailResult:bool=False,
-                                    includeDetailInput:bool = False, includeDetailModel:bool=False, includeTermStructure: bool=True, processId:str=None,
-                                    CreditEdge:bool=False, RiskCalc:bool=False, TradePayment:bool=False, timeout:float=10000, asyncretries1:int=2,
-                                    asyncretries2:int=15):
-
-        """
-        This is async version of the EDFXPD_Endpoint method. See the docsting of that method for params.
-
-        """
-        
-        if entities is not None and startDate is None and endDate is None:
-            raise ValueError('You must include either a startDate or endDate when entities is provided.')
-
-        if entities:
-            if isinstance(entities, dict):
-                for key, value in entities.items():
-                    if not isinstance(key,str) or not isinstance(value,str):
-                        print("Error: you need to either feed a dictionary of 'EntityID' as key and an EDFX Qualified ID as the value." )
-                        return None
-                entities = [entities]
-
-                # Check if entities is a list of dictionaries with the key "entityId"
-            if not isinstance(entities, list) or not all(isinstance(e, dict) and "entityId" in e for e in entities):
-                print("Error: entities parameter must be a list of dictionaries with an 'entityId' key")
-                return None
-
-        headers = self.EDFXHeaders()['JSONBasic']['headers']
-
-        # Define initial parameters
-        params = {
-            'startDate': startDate,
-            'endDate': endDate,
-            'historyFrequency': historyFrequency,
-            'asyncResponse': asyncResponse,
-            'asReported': asReported,
-            'modelParameters':
-                                {'fso': modelParameters} if modelParameters is not None else None,
-            'includeDetail': {
-                "resultDetail":includeDetailResult,
-                "inputDetail": includeDetailInput,
-                "modelDetail": includeDetailModel,
-                "includeTermStructure": includeTermStructure
-            }
-        }
-        if entities:
-            params['entities'] = entities
-        if processId:
-            params['processId'] = processId
-
-        base = self.base_url
-
-        EDFXPDEnpoints = {
-            'CreditEdge':   '/edfx/v1/entities/pds/creditedge',
-            'RiskCalc':     '/edfx/v1/entities/pds/riskcalc',
-            'TradePayment': '/edfx/v1/entities/pds/payment',
-            'default':      '/edfx/v1/entities/pds'
-        }
-
-        if CreditEdge:
-            endpoint = EDFXPDEnpoints['CreditEdge']
-        elif RiskCalc:
-            endpoint = EDFXPDEnpoints['RiskCalc']
-        elif TradePayment:
-            endpoint = EDFXPDEnpoints['TradePayment']
-        else:
-            endpoint = EDFXPDEnpoints['default']
-
-        url = urljoin(base, endpoint)
-
-
-        failedparams = []
-        async def _post_async(params, asyncretries1:int=asyncretries1):
-            # we have to add retry logic. Thanks updates!
-            for attempt in range(asyncretries1):
-                # limit concurrent approach with semaphore
-                async with semaphore:
-                    try:
-                        # one approach try times to receive the data and also log the errors if the data is not returned while saving the params to a dataframe
-                        async with session.post(url, headers=headers, json=params) as response:
-                            # When the response is received it will be processed and the payload will be returned
-                            payload = await response.json()
-                            if 'entities' not in payload:
-                                logger.error(f"Server Response {payload}\n params for the failedentity is: {params}")
-                                # logger error
-                                failedparams.append(params)
-
-                            else:
-                                return payload  
-
-                    except ServerTimeoutError as e:
-                        logger.error(f"ServerTimeoutError encountered: {str(e)} | Attempt {attempt+1} of {asyncretries1}")                        
-                    except ClientError as e:  
-                        logger.error(f"ClientError encountered: {str(e)} | Attempt {attempt+1} of {asyncretries1}")
-                    
-                    except Exception as e:    
-                        logger.error(f"Unexpected error encountered: {type(e).__name__}: {str(e)}")
-
-                    await asyncio.sleep(2)
-
-        async with aiohttp.ClientSession(timeout=ClientTimeout(total=timeout)) as session:
-            # Retry on error logic
-            for ii in range(asyncretries2, 0, -1):
-                try:
-                    return await _post_async(params)
-                except:
-                    logger.info(f'Batch call failed, {ii} retries left')
-
-        if failedparams:
-            Failedparams = {"FailedPDParms": failedparams}
-            Failedparams = pd.DataFrame(Failedparams).drop_duplicates()
-            Failedparams.to_csv(f"{datetime.datetime.now()}_FailedPDParams.csv")
-
-
-    def SynchronousBatchMVP(self,EntityPayload:list[dict[str,str]], BatchSize:int,historyFrequency:str='monthly',startDate:str=None,
-                            endDate:str=None, asReported:bool=False, modelParameters:bool=False,includeDetailResult:bool=True,
-                            includeDetailInput:bool = False, includeDetailModel:bool=False,includeTermStructure:bool = True ):
-        """
-        This method allows us to batch API calls within a certain size providing flexibility for
-        times when a user may have a large amount of entities that they would like to retrieve a
-        batch output synchronously.
-
-        endDate: is a datetime object and is typically fed from the relevant method
-        """
-        dfs = []
-        for entities_batch in self.split_list(EntityPayload, BatchSize=BatchSize):
-            try:
-                # grab the python dictionary output (30 of them)
-                pd_dict = self.EDFXPD_Endpoint(entities=entities_batch,startDate=startDate, endDate=endDate, historyFrequency=historyFrequency,
-                                                asReported=asReported, modelParameters=modelParameters, includeDetailResult=includeDetailResult,
-                                                includeDetailInput=includeDetailInput, includeDetailModel=includeDetailModel, includeTermStructure=includeTermStructure)
-
-                if not pd_dict:
-                    logger.warning("API returned a NONE response.  Check the whether API PDs endpoints is working on EDFXPrime.py or Moodys APIHub.")
-                # parse the dictionary object to a pandas dataframe
-                pd_df = self.EDFXPDParse(pd_dict)
-                # append them to a list, 300 row object elements per appending
-                dfs.append(pd_df)
-            # concat everythin rowwise.
-            except Exception as e:
-                logger.error(f"An error occurred with batch starting at index {entities_batch[0]}: {e}.")
-
-        if dfs:
-            return pd.concat(dfs)
-        else:
-            logger.info("No data frames were created.")
-            return None
-
-    async def SynchronousBatchMVP_async(self, EntityPayload:list[dict[str,str]], BatchSize:int,semaphore:int=500, historyFrequency:str='monthly',includeTermStructure:bool=True,
-                                        startDate:str=None, endDate:str=None, asReported:bool=False, modelParameters:bool=False,includeDetailResult:bool=True,
-                                        includeDetailInput:bool = False, includeDetailModel:bool=False, asyncretries1:int=2, asyncretries2:int=15):
-        """
-        This is the async version of the method with the same name that will run multiple API calls in parallel using async.
-        This method must be called with await, e.g. await SynchronousBatchMVP_async(...)
-        See the probability of default docsting of that method for params.
-        """
-
-        semaphore = asyncio.Semaphore(semaphore)
-        dfs = []
-        # Generate list of batches.
-        batches = list(self.split_list(EntityPayload, BatchSize=BatchSize))
-
-        # Gather the results of calling EDFXPD_Endpoint_async for each batch in the batches list.
-        # This is async method so the API calls made by EDFXPD_Endpoint_async will be made in parallel.
-        responses = await asyncio.gather(
-            *(self.EDFXPD_Endpoint_async
-              ( semaphore=semaphore,
-                entities=b,
-                startDate=startDate,
-                endDate=endDate,
-                historyFrequency=historyFrequency,
-                asReported=asReported,
-                modelParameters=modelParameters,
-                includeDetailResult=includeDetailResult,
-                includeDetailInput=includeDetailInput,
-                includeDetailModel=includeDetailModel,
-                includeTermStructure = includeTermStructure,
-                asyncretries1=asyncretries1,
-                asyncretries2=asyncretries2
-                ) for b in batches
-            ), return_exceptions=False
-        )
-
-        for pd_dict in responses:
-            if pd_dict is None:
-                continue
-            try:
-                # parse the dictionary object to a pandas dataframe
-                pd_df = self.EDFXPDParse(pd_dict)
-                if pd_df is None:
-                    #continue within a conditional just goes into the next loop. Breaks an append if you're appending df that is a None Object.
-                    continue
-                dfs.append(pd_df)
-            except:
-                logger.error(f'Parsing batch response failed: {format_exc(1, False)}')
-
-        if dfs:
-            return pd.concat(dfs)
-        else:
-            logger.info("No data frames were created.")
-            return None
-
-    def EDFXPD_Drivers(self, entities:list[dict[str,str]], historyFrequency:str="monthly" ,startDate:str=None, endDate:str=None,
-                        asyncResponse:bool=False, asReported:bool=False, modelParameters:bool=False,includeDetailResult:bool=True,
-                        includeDetailInput:bool=False, includeDetailModel:bool=False, processId:str=None):
-
-        """
-        I need to determine the above method to know the following structure for the below.
-
-        We MUST set the boolean values otherwise the parameter function will not return appropriately
-
-        Required arguments are: entities, startDate
-
-        """
-
-        if processId and entities:
-            raise ValueError('Both processId and entities provided')
-
-        if processId:
-            entities = [{"entityId": processId}]
-
-        # Check if entities is a list of dictionaries with the key "entityId"
-        if not isinstance(entities, list) or not all(isinstance(e, dict) and "entityId" in e for e in entities):
-            raise ValueError("entities parameter must be a list of dictionaries with an 'entityId' key")
-
-        headers = self.EDFXHeaders()['JSONBasic']['headers']
-        params = {
-                "entities": entities,
-                "startDate": startDate,
-                "endDate": endDate,
-                "historyFrequency": historyFrequency,
-                "asyncResponse": asyncResponse,
-                "asReported": asReported,
-                "modelParameters":
-                                    {'fso': modelParameters} if modelParameters is not None else None,
-                "includeDetail": {
-                    "resultDetail": includeDetailResult,
-                    "inputDetail": includeDetailInput,
-                    "modelDetail": includeDetailModel
-                }
-            }
-        # Remove None values from params
-        # params = {k: v for k, v in params.items() if v is not None}
-        base = self.base_url
-        endpoint = '/edfx/v1/entities/pds/detailHistory'
-        url = urljoin(base, endpoint)
-        response = requests.post(url, headers=headers, json=params)
-
-        if response.status_code == 200:
-            payload = response.json()
-            return payload
-        else:
-            print(f"Request failed with status code {response.status_code} {response.text}")
-            return None
-
-    def EDFXClimatePD(self,scenarioCategory:str,transition:bool,physical:bool,combined:bool,entityName:str,entityId:str,
-                        primaryCountry:str,primaryCountryWeight:str,primaryIndustryClassification:str,primaryIndustry:str,
-                        industryWeight:str,pd:float,impliedRating:str,financialStatementDate:str=None,
-                        carbonEmissionDate:str=None,asOfDate:str=None,totalAssets:float=None,netSales:float=None,
-                        scope1Emission:float=None,scope2Emission:float=None,carbonFootPrint:float=None,
-                        physicalRiskScoreOverwrite:int=None,resultDetailMain:bool=False,resultDetailTransition:bool=False):
-
-        """
-        Important Params:
-        scenarioCategory: Valid values: "NGFS", "NGFS2", "NGFS3","NGFS3_REMIND","MAS", See Appendix: Climate Scenarios
-                        for more information about the supported scenarios.
-        TYPES OF RISK: Desired risk type. At least one of these parameter has to be set to true.
-        transition: Type of Risk
-        physical: TYpe of Risk
-        combined: Type of Risk
-        carbonEmissionDate: Represents the snapshot date relative to the carbon foot print provided.
-        scope1Emission:These are direct emissions from sources that are owned or controlled by the company.
-                        For example, emissions from a company's own vehicles, boilers, or manufacturing processes.
-
-        scope2Emission: These are indirect emissions that come from the consumption of purchased electricity, heat, or steam.
-                        For example, emissions from the power plants that generate the electricity used by the company.
-
-        Use the /climate/v2/entities/pds endpoint to access the climate-adjusted PDs. These are credit risk metrics adjusted
-        to incorporate the climate risk impact. The climate-adjusted PDs are the result of a stress testing exercise following
-        some pre-defined scenarios sets, typically released by regulators or relevant institutions (ex. NGFS III).
-        The output are separate for physical risk, transition risk, and combined risk.
-
-        We do maintain a set of pre-calculated and ready available results: currently, this universe corresponds to actively
-        traded public firms. For any other firm, i.e. private firms, the API request triggers an on-demand calculator
-        that outputs climate adjusted metrics starting from the set of user-provided inputs. Hence, more input parameters are
-        required for private firms
-
-        For comprehensive param understanding see:
-        https://docs.moodysanalytics.com/moodys-edfx-climate/docs/retrieving-climate-adjusted-pds
-        within EDF-X API Hub
-
-        """
-
-        params = {"entities": [
-                    {
-                        "entityId": entityId,
-                        "entityName": entityName,
-                        "financialStatementDate": financialStatementDate,
-                        "pd": pd,
-                        "impliedRating": impliedRating,
-                        "asOfDate": asOfDate,
-                        "carbonEmissionDate": carbonEmissionDate,
-                        "qualitativeInputs": {
-                            "industriesDetails": [
-                                {
-                                    "industryWeight": industryWeight,
-                                    "primaryIndustry": primaryIndustry,
-                                    "primaryIndustryClassification": primaryIndustryClassification
-                                }
-                            ],
-                            "regionDetails": [
-                                {
-                                    "primaryCountry": primaryCountry,
-                                    "primaryCountryWeight": primaryCountryWeight
-                                }
-                            ]
-                        },
-                        "quantitativeInputs": {
-                            "carbonFootPrint": carbonFootPrint,
-                            "netSales": netSales,
-                            "scope1Emission": scope1Emission,
-                            "scope2Emission": scope2Emission,
-                            "totalAssets": totalAssets,
-                        },
-                        "physicalRiskScore": { "physicalRiskScoreOverwrite": physicalRiskScoreOverwrite }
-                    }
-                ],
-                "scenarios": { "scenarioCategory": scenarioCategory },
-                "riskTypes": {
-                    "combined": combined,
-                    "physical": physical,
-                    "transition": transition
-                },
-                "includeDetail": {
-                    "resultDetailMain": resultDetailMain,
-                    "resultDetailTransition": resultDetailTransition
-                }}
-
-        headers = self.EDFXHeaders()['JSONBasic']['headers']
-        endpoint = "/climate/v2/entities/pds"
-        url = urljoin(self.base_url, endpoint)
-        response = requests.post(url, json=params, headers=headers)
-
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Request failed with status code {response.status_code} {response.text}")
-            return None
-
-    def EDFXClimateIndustryTransitionRiskDrivers(self, industry:str, scenarioCategory:str,scenario:str=None):
-
-        """
-        The drivers for transition risk at region/country and
-        industry granularity level are pre-calculated and can be accessed using the following endpoints.
-
-        Required Params:
-
-            - industry  ex: 'N40'  ex: See Appendix Climate Sectors for the list of valid values.
-            - scenarioCategory  ex: 'NGFS' ; Valid values: "NGFS",”MAS”,”NGFS2”,"NGFS3","NGFS2_REMIND".
-            - senario ex: Valid for NGFS: “orderlyScenario”, “disorderlyScenario”, “hothouseScenario”, “hotHouseTailScenario”.
-        """
-        # Construct the endpoint
-        scenario_param = f"&scenario={scenario}" if scenario else ""
-        endpoint = f"/climate/v2/industry/industryTransitionPaths?scenarioCategory={scenarioCategory}&industry={industry}{scenario_param}"
-        headers = self.EDFXHeaders()["JSONGet"]['headers']
-        url = urljoin(self.base_url, endpoint)
-
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()  # Raise an error for bad responses
-            return response.json()
-
-        except requests.RequestException as e:
-            # Handle the exception as you see fit
-            print(f"Error fetching data: {e}")
-            return None
-
-    def EDFXClimateRegionTransitionPaths(self,scenarioCategory:str,regionIndustry:tuple[str,str], industry: str, scenario:str=None):
-
-        """
-        The drivers for transition risk at region/country and industry
-        granularity level are pre-calculated and can be accessed using the following endpoints.
-
-        see appendix for full details here:
-        https://docs.moodysanalytics.com/moodys-edfx-climate/docs/retrieving-transition-risk-drivers-for-sector-and-region
-
-        params:
-            scenarioCategory: example => "NGFS"
-            regionIndustry: example => ("USA","N30") # no space
-            scenario: example => "noAdditionalPolicyScenario"
-            industry: example => "N13"
-        """
-
-        # Format the tuple
-        regionIndustry_str = f"({regionIndustry[0]},{regionIndustry[1]})"
-        # URL encode the tuple string
-        regionIndustry_encoded = quote_plus(regionIndustry_str)
-        endpoint = "/climate/v2/industry/industryTransitionPaths"
-        params = {
-            'scenarioCategory': scenarioCategory,
-            'regionIndustry': regionIndustry_encoded,
-            'industry': industry
-        }
-        params = self.create_params_dict(params)
-        if scenario:
-            params['scenario'] = scenario
-        headers = self.EDFXHeaders()["JSONGet"]['headers']
-        url = urljoin(self.base_url, endpoint)
-        # error handling
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()  # Raise an error for bad responses
-            return response.json()
-
-        except requests.RequestException as e:
-            # Handle the exception as you see fit
-            print(f"Error fetching data: {e}")
-            return None
-
-    def EDFXClimateReportPublic(self,reportType:str,reportFormat:str,scenarioCategory:list[str],entities:list[dict[str:str]]):
-
-        """
-        The Reports endpoint allows access to PDF and CSV files that explains the analytics
-        and data available via other endpoints. These reports are pre-defined. As a user you can
-        request the download of the file but you cannot define the content yet.
-
-        Params:
-                ALL PARAMS REQUIRED:
-
-                reportType: example => 'climate'
-                scenarioCategory: example => 'NGFS3'
-                reportFormat: example => 'pdf'
-                entities: example => [{"entityId": "CN46262PC"]
-
-            Sample Json Request:
-
-                    {
-                        "reportType": "climate",
-                        "reportFormat": "pdf",
-                        "scenarioCategory": ["NGFS3"],
-                        "entities": [
-                            {
-                                "entityId": "CN46262PC"
-                            }
-                        ]
-                    }
-        """
-        #error handle entities variable
-        if isinstance(entities, dict):
-            for key, value in entities.items():
-                if not isinstance(key,str) or not isinstance(value,str):
-                    print("Error: you need to either feed a dictionary of 'EntityID' as key and an EDFX Qualified ID as the value." )
-                    return None
-            entities = [entities]
-
-            # Check if entities is a list of dictionaries with the key "entityId"
-        if not isinstance(entities, list) or not all(isinstance(e, dict) and "entityId" in e for e in entities):
-            print("Error: entities parameter must be a list of dictionaries with an 'entityId' key")
-            return None
-
-        endpoint = "/edfx/v1/reports"
-        url= urljoin(self.base_url, endpoint)
-        params = {
-            "reportType": reportType,
-            "reportFormat": reportFormat,
-            "scenarioCategory": scenarioCategory,
-            "entities": entities
-        }
-        params = self.create_params_dict(params)
-        headers = self.EDFXHeaders()['JSONBasic']['headers']
-        response = requests.post(url, json=params, headers=headers)
-        return response.json()
-
-    def EDFXTemplateDownload(self, financialtemplate = 'Universal', output_format = 'Pandas'):
-
-
-        """
-        Specify what template you'd like to retrieve and the output format you'd like to use.
-
-        Proper FinancialTemplate options: FinancialTemplate.UNIVERSAL, FinancialTemplate.BANK
-        Proper OutputFormat: OutputFormat.PANDAS, OutputFormat.EXCEL, OutputFormat.CSV
-
-        """
-        financialtemplate = financialtemplate.title()
-        output_format = output_format.title()
-
-        if financialtemplate == FinancialTemplate.UNIVERSAL.value:
-            endpoint = '/edfx/v1/entities/financials/template/universal'
-        elif financialtemplate == FinancialTemplate.BANK.value:
-            endpoint = '/edfx/v1/entities/financials/template/bank'
-        else:
-            raise ValueError(f"Invalid financial template: {financialtemplate}")
-
-        base = self.base_url
-        url = urllib.parse.urljoin(base, endpoint)
-        headers = self.EDFXHeaders()['JSONGet']['headers']
-        response = requests.get(url, headers=headers)
-        text = response.text
-        try:
-            # Convert text to a dataframe
-            data = io.StringIO(text)
-            df = pd.read_csv(data, sep=",")
-
-        except Exception as e:
-            print(f"Error: Unable to convert the response to a DataFrame/CSV. {e}")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, financialtemplate)
-
-
-    def EDFXModelInputs(self, uploadFilename: str, localFilename: str, largeFile:bool = False ) -> dict:
-
-        """
-        Allows the user to upload financials for either an existing BVDID or a company that is unknown to Orbis.
-
-        The API responds with a processId, which can be used in the following ways to check the process status and retrieve the value.
-
-        Requried Params:
-
-            uploadedFile: 'The template file containing the financial data'  ex: UniversalTemplateMyFinancials.csv
-
-
-        With the /processes/{processId}/status endpoint to access the status of the upload, when they are ready
-        the processId can be used as per point 2 and 3 below
-
-        In the /pds, /pds/riskcalc, /pds/creditedge endpoints as value for the parameter processId  Using it to access the PD, implied ratings, etc.
-        for all the companies in the uploaded file.
-
-        By combining the entityIdentifier provided as input with the processid
-        as follows: {entityIdentifiier}-{processId}. Using it as the identifier for the PD, trade credit limits, etc.,
-        endpoints to access the metrics calculated using the information uploaded for a subset of the companies in the
-        uploaded file (See Retrieving PD values page for more information).
-
-        If a process is started the method will return a dict containing processId and uploadLink
-
-        """
-        ## call model input profile
-        endpoint = "/edfx/v1/entities/modelInputs"
-        url = urljoin(self.base_url, endpoint)
-        payload = "-----011000010111000001101001\r\nContent-Disposition: form-data; name=\"uploadFilename\"\r\n\r\n" + uploadFilename + "\r\n-----011000010111000001101001\r\nContent-Disposition: form-data; name=\"largeFile\"\r\n\r\ntrue\r\n-----011000010111000001101001--\r\n\r\n"
-        headers = self.EDFXHeaders()['ModelInputsProcess']['headers']
-        response = requests.post(url, data=payload, headers=headers)
-
-        if response.status_code == 200:
-            try:
-                payload = response.json()
-                if payload.get('message'):
-                    print(f"I'm sorry but the API Returned {payload} , which implies the server, for whatever reason did not like the payload. Please debug or check your input variables.")
-                    return
-            except:
-                print(f"An error occurred while processing the API response: {format_exc()}")
-                return
-
-            process_id = payload['processId']
-            upload_link = payload['uploadLink']
-
-            upload_headers = self.EDFXHeaders(process_id=process_id)['ModelInputsUploadProcess']['headers']
-
-            #Upload local large file using the process id and upload link retrieved from last step.
-            with open(localFilename, 'rb') as file:
-                response = requests.put(upload_link, headers=upload_headers, data=file)
-                if response.status_code == 200:
-                    print(response.status_code)
-                    return payload
-                else:
-                    print(response.text)
-
-    def EDFXModelInputsGetStatus(self, processID: str) -> dict:
-        """
-        Gets the status of a process that was started with the EDFXModelInputs() method
-        If the process is still running the method will return {'status': 'Processing'}
-        """
-        endpoint = f"/edfx/v1/processes/{processID}/status"
-        url = urljoin(self.base_url, endpoint)
-        headers = self.EDFXHeaders()['JSONGet']['headers']
-        response = requests.get(url, headers=headers)
-        try:
-            if response.status_code == 200:
-                status = response.json()
-                print(status)
-                return status
-            else:
-                print(response.status_code)
-                print(response.text)
-        except:
-            print(f"An error occurred while processing the API response: {format_exc()}")
-
-    def EDFXModelInputsGetFiles(self, processID: str) -> dict:
-        """
-        Gets the output/files of a process that was started with the EDFXModelInputs() method
-
-        Response
-
-        The JSON format response will contain a download link URL. A GET request with this URL will
-        return the results for the asynchronous request in JSON format. The response from the
-        download link will have the same structure as the equivalent synchronous data request.
-
-        """
-        endpoint = f"/edfx/v1/processes/{processID}/files"
-        url = urljoin(self.base_url, endpoint)
-        headers = self.EDFXHeaders()['JSONGet']['headers']
-        response = requests.get(url, headers=headers)
-
-        try:
-            payload = response.json()
-            # 'downloadLink' boolean check is on the payload key as the payload is assumed to be a dictonary object.
-            if payload.get('message') or 'downloadLink' not in payload:
-                print(f"I'm sorry but the API Returned {payload} , which implies the server, for whatever reason did not like the payload. Please debug or check your input variables.")
-                return
-        except:
-            print(f"An error occurred while processing the API response: {format_exc()}")
-            return
-        download_link = payload['downloadLink']
-
-        try:
-            file = requests.get(download_link)
-            return json.loads(file.content)
-        except:
-            print(f"An error occurred while processing the API response: {format_exc()}")
-
-
-    def EDFXRetrievinglimtsfortradecredit(self, entities:list[dict], startDate:str=None, endDate:str=None)->dict:
-
-        """
-        Required Params:
-        entities.
-
-        Use the /tools/creditLimit endpoint to access estimated limits for trade credit.
-        For each company except for financial institutions, we provide trade credit limits based on conservative,
-        balanced, and aggressive risk appetites. Limits provide corporate users with guidance on how much trade
-        credit to extend to a firm, and when to consider being paid upfront.
-
-        Limits are only implemented for entities that we have information on, either from Orbis or uploaded as custom
-        financials. It is not possible to calculate limits based on custom PD inputs.
-        """
-
-        if isinstance(entities, dict):
-            for key, value in entities.items():
-                if not isinstance(key,str) or not isinstance(value,str):
-                    print("Error: you need to either feed a dictionary of 'EntityID' as key and an EDFX Qualified ID as the value." )
-                    return None
-            entities = [entities]
-
-            # Check if entities is a list of dictionaries with the key "entityId"
-        if not isinstance(entities, list) or not all(isinstance(e, dict) and "entityId" in e for e in entities):
-            print("Error: entities parameter must be a list of dictionaries with an 'entityId' key")
-            return None
-
-        params = {
-                    "startDate": startDate,
-                    "endDate": endDate,
-                    "entities": entities
-                    }
-        endpoint = "/edfx/v1/tools/tradeCreditLimit"
-        url = urljoin(self.base_url, endpoint)
-        headers = self.EDFXHeaders()["JSONBasic"]['headers']
-        response = requests.post(url, json=params, headers=headers)
-        return response.json()
-
-    def EDFXRetrievingpeergroups_IDS(self,peerRegion:str, ownershipType:str, industryClassification:str=None, industryCode:str=None,
-                                     country:str=None) -> dict:
-
-        """
-        See Peer Groups - country to region mapping for more information:
-
-        Params: peerRegion: required
-                ownershipType: required
-                industryClassification: required
-                industryCode: required
-                country, Not required.
-
-            Sample JSON request:
-
-                                {
-                                "peerRegion":"WESTEUR",
-                                "industryClassification":"NDY",
-                                "industryCode":"N55",
-                                "ownershipType":"UNLISTED"
-                                }
-
-        """
-
-        params = {"peerRegion":peerRegion,
-                  "ownershipType":ownershipType,
-                  "industryClassification":industryClassification,
-                  "industryCode":industryCode,
-                  "country":country
-                  }
-
-        endpoint = "/edfx/v1/entities/peers/id"
-        url = urljoin(self.base_url, endpoint)
-        headers = self.EDFXHeaders()["JSONBasic"]['headers']
-        response = requests.post(url, json=params, headers=headers)
-        return response.json()
-
-    def EDFXRetrievingpeergroups_Metrics(self, peerId:str, metrics:list[str], variables:list[str]=None,startDate:str=None,
-                                         endDate:str=None) -> dict:
-
-
-        """
-            Use this endpoint to retrieve metrics about variables (e.g. PD) within the peer group.
-
-            Method: POST
-
-            Params peerId: Required
-                   metrics: Required
-                   variables:Required
-                   startDate: Required
-                   endDate: Required
-
-            Sample Payload:
-                            payload = {
-                                "peerId": "832ec933-28e0-47c9-85a2-a8b5c2ca02b5",
-                                "variables": ["annualizedcumulativepd1y"],
-                                "metrics": ["P025", "P050"],
-                                "startDate": "2022-11-01",
-                                "endDate": "2023-01-01"
-                            }
-
-
-        """
-        params = {
-                    "peerId": peerId,
-                    "variables": variables,
-                    "metrics": metrics,
-                    "startDate": startDate,
-                    "endDate": endDate
-                }
-
-        headers = self.EDFXHeaders()["JSONBasic"]["headers"]
-        endpoint = "/edfx/v1/entities/peers/metrics"
-        url = urljoin(self.base_url, endpoint)
-        response = requests.post(url, json=params, headers=headers)
-        return response.json()
-
-    def EDFXRetrievingpeergroups_Percentile(self,peerId:str,variableName:list[str], value:list[float]) -> dict:
-
-
-        """
-            For a specific variable, use this endpoint to retrieve the percentile of a given value.
-
-            Use this endpoint to retrieve metrics about variables (e.g. PD) within the peer group.
-
-            Params: peerId, variableName, value all required
-
-            sample payload:
-
-            payload = {
-                "peerId": "832ec933-28e0-47c9-85a2-a8b5c2ca02b5",
-                "request": {
-                    "variableName": ["annualizedcumulativepd1y"],
-                    "value": [0.023]
-                }
-            }
-
-        """
-        params = {
-                "peerId": peerId,
-                "request":
-                        {
-                        "variableName": variableName,
-                        "value": value
-                        }
-                    }
-        headers = self.EDFXHeaders()["JSONBasic"]["headers"]
-        endpoint = "/edfx/v1/entities/peers/percentile"
-        url = urljoin(self.base_url, endpoint)
-        response = requests.post(url, json=params, headers=headers)
-        return response.json()
-
-    def EDFXRetrievingpeergroups_Metadata(self, peerId:str) -> dict:
-
-        """
-        Use this endpoint to retrieve information about a peer group.
-
-        Sample JSON Request
-
-
-                {
-                    "peerId":"6cef0ad5-5f1b-40bc-85a9-0a071143fd3b"
-                }
-        """
-
-
-        params =    {
-                    "peerId":peerId
-                    }
-        headers = self.EDFXHeaders()["JSONBasic"]['headers']
-        endpoint = "/edfx/v1/entities/peers/metadata"
-        url = urljoin(self.base_url, endpoint)
-        response = requests.post(url, json=params, headers=headers)
-        return response.json()
-
-    def EDFXRetrievingpeergroups_Recommended(self,industryClassification:str,industryCode:str, ownershipType:str, country:str)->dict:
-
-        """
-        Params Required:
-
-            industryClassification
-            industryCode
-            ownershipType
-            country
-
-            Sample JSON request
-
-                    {
-                    "industryClassification":"NDY",
-                    "industryCode":"N17",
-                    "ownershipType":"UNLISTED",
-                    "country":"USA"
-                    }
-
-        Response Important Note:
-
-        Access the peer group ID that Moody's Analytics recommends as most appropriate according to both the criteria in the
-        request and some pre-set criteria. The pre-set criteria currently in place is:
-
-            - the recommended peer groups always include 10 or more constituents.
-
-        Given the Country, Industry and Ownership type in the request, this endpoint only returns the Country level peer group
-        that fits the criteria above; else the Region level peer group is looked up, and if that is not fitting the criteria
-        either then the Global-wide peer group is returned as the recommended one. In many cases, this response is the
-        same as /entity/peer/id.
-
-        """
-        params =    {
-                    "industryClassification":industryClassification,
-                    "industryCode":industryCode,
-                    "ownershipType":ownershipType,
-                    "country":country
-                    }
-
-        headers = self.EDFXHeaders()["JSONBasic"]['headers']
-        endpoint = "/edfx/v1/entities/peers/id/recommended"
-        url = urljoin(self.base_url, endpoint)
-        response = requests.post(url, json=params, headers=headers)
-        return response.json()
-
-    def EDFXRetrievingpeergroups_Constituents(self, peerId:str)->dict:
-
-        """
-        Required Param:
-
-                peerId
-
-            The ID of the peer group for which you want to get information such as
-            - the number of companies in the peer group
-            - the country, in ISO code standard
-            - the industry, in NDY classification
-            - whether the peer groups concerns listed or not listed companies
-
-            The response is a pre-signed URL to the S3 bucket where the file with the constituents list is.
-
-        """
-        headers = self.EDFXHeaders()['JSONGet']['headers']
-        endpoint = f"/edfx/v1/entities/peers/{peerId}/constituents"
-        url = urljoin(self.base_url, endpoint)
-        response = requests.get(url, headers=headers)
-        return response.text
-
-    def EDFXEarlyWarningScore(self, entities:list[dict[str,str]],asOfDate:str=None,prevAsOfDate:str=None,
-                               targetPercentile:float=None)->list:
-        """
-        The riskCategory endpoint allows you to access an early warning category for a given company.
-        This category is chosen based on changes in a company's risk, as indicated by its implied rating, and how it compares to its peers.
-        We use a target PD percentile of the peer group to define a trigger level and determine if a company's PD is above this level.
-        The trigger methodology uses a Bayesian-adjustment to leverage information from more broadly defined peer groups to control for situations
-        when a granular peer group has insufficient data. Additionally, it includes a procyclical adjustment that takes into account the position of
-        the industry in the credit cycle.
-
-        Possible risk categories are:
-            Severe: PD above triggerStable or worsening
-            High: PD above triggerImproving
-            Medium: PD at or below triggerWorsening
-            Low: PD at or below triggerStable or improving
-
-        Required Params:
-            entities: A list of either:
-                      - entityId. We support BvD IDs and CreditEdge PIDs and the API automatically determines which one is being used.
-                      − A dictionary of:
-                          1.entityId: A unique string used by requester to identify the entity.
-                          2.pd: A PD value for the as of date. PDs should be a number between 0 and 1.
-                          3.pdPrev: A PD value for a previous date (optional). PDs should be a number between 0 and 1.
-                          4.peerId: A valid peer group identifier. This can be generated using the /edfx/v1/entities/peers/id endpoint
-        Optional Params:
-            asOfDate: Date of PD value in the format YYYY-MM-DD. If this is not provided, this will default to the 1st day of the current month.
-            prevAsOfDate: Date of previous PD value in the format YYYY-MM-DD. This is used to calculate the change in implied rating
-            targetPercentile: Target percentile used for trigger level. Percentiles are represented as numbers i.e. the 63rd percentile is represented as 0.63.
-                              Values should be between 0.60 and 0.95 and given to two decimal place precision. This depends on the peer group chosen:
-                                  1.Private company peer group 0.80
-                                  2.Public financial company peer group 0.85
-                                  3.Public nonfinancial company peer group 0.75
-
-
-        """
-        headers = self.EDFXHeaders()['JSONGet']['headers']
-        endpoint = "/edfx/v1/tools/riskCategory"
-        url = urljoin(self.base_url, endpoint)
-        params = {
-            "entities": entities
-        }
-        if asOfDate:
-            params['asOfDate'] = asOfDate
-        if prevAsOfDate:
-            params['prevAsOfDate'] = prevAsOfDate
-        if targetPercentile:
-            params['targetPercentile'] = targetPercentile
-        response = requests.post(url, headers=headers, json=params)
-        return response.json()
-
-    def EDFXEarlyWarningTriggers(self,peerId:str,endDate:str = None, startDate:str=None,targetPercentile:float=None)->dict:
-        """
-        The purpose of this endpoint to is provide a timeseries of triggers for a given peer group.
-
-        Sample Json:
-
-        {
-            "peerId":"89a28088-7952-4b15-8ff3-f963e36d7cfd",
-            "startDate":"2020-11-01",
-            "endDate":"2021-01-01",
-            "targetPercentile":0.80
-        }
-
-        """
-        headers = self.EDFXHeaders()['JSONGet']['headers']
-        endpoint = "/edfx/v1/tools/triggers"
-        url = urljoin(self.base_url, endpoint)
-        payload = {
-                    "peerId": peerId,
-                    "startDate": startDate,
-                    "endDate": endDate,
-                    "targetPercentile": targetPercentile
-                    }
-        response = requests.post(url, json=payload, headers=headers)
-        return response.json()
-
-
-    def EDFXRetrievingStatements(self, entities: list, asOfDate: str = None, endData: str = None) -> list:
-        """
-        Access a summary of the financial statement for entities we have data on.
-
-        Required Params:
-            entities: A list of either:
-                      - entityId. We support BvD IDs and CreditEdge PIDs and the API automatically determines which one is being used.
-                      - A dictionary of:
-                          1.entityId: A unique string used by requester to identify the entity.
-                          2.pd: A PD value for the as of date. PDs should be a number between 0 and 1.
-                          3.pdPrev: A PD value for a previous date (optional). PDs should be a number between 0 and 1.
-                          4.peerId: A valid peer group identifier. This can be generated using the /edfx/v1/entities/peers/id endpoint
-        Optional Params:
-            asOfDate: If provided, generates a history of limit values to be generated in the format YYYY-MM-DD.
-            endData: The date of the limit you are retrieving in the format YYYY-MM-DD.
-
-
-        """
-        headers = self.EDFXHeaders()['JSONGet']['headers']
-        endpoint = "/edfx/v1/entities/financials/statements"
-        url = urljoin(self.base_url, endpoint)
-        params = {
-            "entities": entities
-        }
-        if asOfDate:
-            params['asOfDate'] = asOfDate
-        if endData:
-            params['endData'] = endData
-        response = requests.post(url, headers=headers, json=params)
-        return response.json()
-
-    def EDFXRetrievingRatios(self, entities: list, asOfDate: str = None, endData: str = None) -> list:
-        """
-        Access key financial ratios for entities we have data on.
-
-        Required Params:
-            entities: A list of either:
-                      - entityId. We support BvD IDs and CreditEdge PIDs and the API automatically determines which one is being used.
-                      - A dictionary of:
-                          1.entityId: A unique string used by requester to identify the entity.
-                          2.pd: A PD value for the as of date. PDs should be a number between 0 and 1.
-                          3.pdPrev: A PD value for a previous date (optional). PDs should be a number between 0 and 1.
-                          4.peerId: A valid peer group identifier. This can be generated using the /edfx/v1/entities/peers/id endpoint
-        Optional Params:
-            asOfDate: If provided, generates a history of limit values to be generated in the format YYYY-MM-DD.
-            endData: The date of the limit you are retrieving in the format YYYY-MM-DD.
-
-
-        """
-        headers = self.EDFXHeaders()['JSONGet']['headers']
-        endpoint = "/edfx/v1/entities/financials/ratios"
-        url = urljoin(self.base_url, endpoint)
-        params = {
-            "entities": entities
-        }
-        if asOfDate:
-            params['asOfDate'] = asOfDate
-        if endData:
-            params['endData'] = endData
-        response = requests.post(url, headers=headers, json=params)
-        return response.json()
-
-    def EDFXRetrievingRatioCalculations(self, statements: list) -> dict:
-        """
-        Calculate key ratios using your own financial statement inputs
-
-        Required Params:
-            statements: A list of statements. Each statement is a list of financial statement items
-            - financialStatementDate
-            - ebitda
-            - financeCosts
-            - grossIncome
-            - netIncome
-            - netSales
-            - netWorth
-            - profitBeforeTaxesAndExtraordinaryExpenses
-            - shortTermDebt
-            - totalAssets
-            - totalAssetsPreviousYear
-            - totalCostOfGoodsSold
-            - totalCurrentAssets
-            - totalCurrentLiabilities
-            - totalInventory
-            - totalInventoryPreviousYear
-            - totalLiabilities
-            - totalLongTermDebt
-            All items are optional. Missing values should not be sent and resulting ratios will be calculated as NA
-
-
-        """
-        headers = self.EDFXHeaders()['JSONGet']['headers']
-        endpoint = "/edfx/v1/entities/financials/ratios/calculate"
-        url = urljoin(self.base_url, endpoint)
-        params = {
-            "statements": statements
-        }
-        response = requests.post(url, headers=headers, json=params)
-        return response.json()
-
-    def EDFXRetrievingSmartProjection(self, entities: list, projectionYears: int, assumptions: dict,
-                                      resultDetail: bool = False, inputDetail: bool = False, includeRatios: bool = False) -> dict:
-        """
-        Calculate key ratios using your own financial statement inputs
-
-        Required Params:
-            entities: A list of either:
-                      - entityId. We support BvD IDs and CreditEdge PIDs and the API automatically determines which one is being used.
-                      - A dictionary of:
-                          1.entityId: A unique string used by requester to identify the entity.
-                          2.pd: A PD value for the as of date. PDs should be a number between 0 and 1.
-                          3.pdPrev: A PD value for a previous date (optional). PDs should be a number between 0 and 1.
-                          4.peerId: A valid peer group identifier. This can be generated using the /edfx/v1/entities/peers/id endpoint
-            projectionYears: The number of years the projection is requested to cover. This must be whole years.
-            assumptions: Dict of assumtions, for example:
-                         {
-                            "sales": {
-                                "valuesType": "variable",
-                                "frequency": "annual",
-                                "value": [0.9, 1]
-                            },
-                            "newDebt": {
-                                "useProportion": {
-                                    "cash": 0.5,
-                                    "inventory": 0.25,
-                                    "fixedAssets": 0.25
-                                },
-                                "percentage": 0.03,
-                                "maturity": 60,
-                                "debtStart": 3,
-                                "interestRate": 0.03
-                            },
-                            "dividendPayoutRatio": {
-                                "valuesType": "fixed",
-                                "absChange": False,
-                                "value": 0.11
-                            }
-                        }
-            resultDetail: Should result detais be included in output
-            inputDetail: Should input details be included in output
-            includeRatios: Should ratios be included in output
-
-
-        """
-        headers = self.EDFXHeaders()['JSONGet']['headers']
-        endpoint = "/edfx/v1/entities/financials/smartProjection"
-        url = urljoin(self.base_url, endpoint)
-        params = {
-            "entities": entities,
-            "projectionYears": projectionYears,
-            "assumptions": assumptions,
-            "includeDetail": {
-                "resultDetail": resultDetail,
-                "inputDetail": inputDetail,
-                "includeRatios": includeRatios
-            }
-        }
-        response = requests.post(url, headers=headers, json=params)
-        return response.json()
-
-    def EDFXScenarioConditionHelper(self, entity: dict) -> bool:
-
-        """ Helper Script To parse the entity Dictionary"""
-
-        required_fields = ['pd', 'pdPrev', 'primaryCountry', 'primaryIndustryClassification', 'primaryIndustry']
-        fields_present = [field for field in required_fields if field in entity and entity[field] is not None]
-
-        return len(fields_present) == 0 or len(fields_present) == len(required_fields)
-
-
-    def EDFXScenarioConditionedPds(self,includeScenario:list[dict[str,str]],entityId:str=None, projectionYear:int=None, pd:float=None,pdPrev:float=None,
-                                    primaryCountry:str=None, primaryIndustryClassification:str=None,primaryIndustry:str=None,resultDetail:bool=False,
-                                    inputDetail:bool=False, processId:str=None):
-
-
-        """
-        The endpoint provides the capability to observe PD stress evaluations aligned with Moody's economics scenarios.
-        You have the option to view the applied stress conditions for three distinct cases:
-
-            1- Orbis Entities: This refers to predefined entities available within the system.
-            2- Custom Entities from /modelInputs: users can apply stress conditions to custom entities they have previously established using the /modelInputs feature.
-            3- On-Demand Stress Testing Calculation: you have the flexibility to directly provide the necessary inputs for Stress PD calculations through the API;
-            you can provide your own credit risk metric, which will be stressed according to Moody’s Analytics Standard Global Scenarios.
-            This empowers you to perform stress testing calculations as needed.
-
-        Required Params:
-
-            includeScenario: The compilation of scenarios for which the user seeks to view PD results. Possible values: "Baseline", "S1", "S2", "S3", "S4".
-            entityId: The ID (BVD ID or PID) of the entities of interest. This should accept both the identifier mentioned above and custom companies.
-
-        Optional Params:
-
-            asOfDate: If provided, generates a history of limit values to be generated in the format YYYY-MM-DD.
-            projectionYears: Parameter to define the number of years of the projection. Ex. If the user selects 3, the response should only show 3 years of projections. Possible values: 1 to 5. Defaults to 5 if not provided.
-            pd_at_time_t: The PD at time t. This is the PD to which the macro stress test will be applied in on demand calculations. This input is only needed for Case 3.
-            pdLag: The PD at time t - 3 months. This input is only needed for Case 3. Only relevant if pd is also provided.
-            primaryCountry: The primary country for the entity's economic activity. Valid values are the three-letter country codes from ISO 3166. This input is only needed for Case 3.
-            primaryIndustryClassification: The primary industry code for the entity's economic activity. Possible values: NDY. Preset value: NDY. This input is only needed for Case 3
-            primaryIndustry: The primary industry code for the entity's economic activity. Possible values: NDY codes. This input is only needed for Case 3.
-
-        """
-
-        entity = {
-                "entityId": entityId,
-                "pd": pd,
-                "pdPrev": pdPrev,
-                "primaryCountry": primaryCountry,
-                "primaryIndustryClassification": primaryIndustryClassification,
-                "primaryIndustry": primaryIndustry
-                }
-        entity = self.create_params_dict(entity)
-        if not entity:
-            entity = None
-
-        params = {
-                "scenarios": {"includeScenario": includeScenario},
-                "projectionYear": projectionYear,
-                "includeDetail": {
-                    "resultDetail": resultDetail,
-                    "inputDetail": inputDetail
-                },
-                "processId": processId,
-                "entities": [entity] if entity else None
-                }
-
-        params = self.create_params_dict(params)
-
-        if 'entities' in params and 'entityId' in params['entities'][0] and 'processId' in params:
-            return "You cannot have both entityId and ProcessID as Params"
-        elif 'entities' in params and 'entityId' in params['entities'][0] and not self.EDFXScenarioConditionHelper(params['entities'][0]):
-            return "When entityId is provided, either none or all of the parameters (pd, pdPrev, primaryCountry, primaryIndustryClassification, primaryIndustry) must be included."
-        else:
-            headers = self.EDFXHeaders()['JSONGet']['headers']
-            endpoint = "/edfx/v1/tools/scenarioConditionedPds"
-            url = urljoin(self.base_url, endpoint)
-            try:
-
-                response = requests.post(url, headers=headers, json=params)
-                response.raise_for_status()
-                return response.json()
-
-            except requests.RequestException as e:
-                return{f"There is an error:\n {e}"}
-
-    def EDFXCalculatingLGD(self, entities: list) -> dict:
-        """
-        Use this endpoint to calculate LGD in EDF-X API, the calculations are on-demand and use Loss Given Default 4.0 (LGD 4.0) model.
-        Suggest Edits The main metrics currently accessible are:
-        LGD (Loss Give Default) EL (Expected Loss) EL IR (Expected Loss Implied Rating)
-
-        Required Params:
-            entities: A list of entities.
-
-        Examples:
-        Minimum Inputs with Company & Loan Inputs
-        [
-            {
-                "entityId": "Custom Company",
-                "country": "USA",
-                "primaryIndustry": "N02",
-                "primaryIndustryClassification": "NDY",
-                "loans": [
-                    {
-                        "loanParameters": {
-                            "loanId": "loan1",
-                            "loanName": "loan1",
-                            "asOfDate": "2012-12-01",
-                            "instrumentType": "Senior Bond",
-                            "securedUnsecured": "Unsecured",
-                            "recoveryCalculationMode": "Ultimate Recovery",
-                            "capitalStructure": "Unknown"
-                        },
-                        "termStructureCumulativePd": { "cumulativePd1y": 0.0034 }
-                    }
-                ]
-            }
-        ]
-
-        Full Inputs all company and Loan Information
-        [
-            {
-                "entityId": "Custom Company",
-                "country": "USA",
-                "primaryIndustry": "N02",
-                "primaryIndustryClassification": "NDY",
-                "loans": [
-                    {
-                        "loanParameters": {
-                            "loanId": "loan1",
-                            "loanName": "loan1",
-                            "asOfDate": "2012-12-01",
-                            "exposure": 1000000,
-                            "originationDate": "2022-12-31",
-                            "maturityDate": "2025-06-30",
-                            "exposureCurrency": "USD",
-                            "instrumentType": "Senior Bond",
-                            "securedUnsecured": "Unsecured",
-                            "recoveryCalculationMode": "Ultimate Recovery",
-                            "capitalStructure": "Unknown"
-                        },
-                        "termStructureCumulativePd": {
-                            "cumulativePd1y": 0.0028,
-                            "cumulativePd2y": 0.0058,
-                            "cumulativePd3y": 0.0089,
-                            "cumulativePd4y": 0.012,
-                            "cumulativePd5y": 0.0152,
-                            "cumulativePd6y": 0.0184,
-                            "cumulativePd7y": 0.0216,
-                            "cumulativePd8y": 0.0248,
-                            "cumulativePd9y": 0.0279,
-                            "cumulativePd10y": 0.0311
-                        }
-                    }
-                ]
-            }
-        ]
-
-        Full Inputs all company, Loan Information, and Collateral
-        [
-            {
-                "entityId": "Custom Company",
-                "country": "USA",
-                "primaryIndustry": "N02",
-                "primaryIndustryClassification": "NDY",
-                "loans": [
-                    {
-                        "loanParameters": {
-                            "loanId": "1a19c5a4-67c8-441d-b3be-7fd150ab82fb",
-                            "loanName": "",
-                            "asOfDate": "2023-06-01",
-                            "originationDate": "2022-06-01",
-                            "maturityDate": "2023-06-01",
-                            "exposure": 1000000,
-                            "exposureCurrency": "USD",
-                            "instrumentType": "Term Loan",
-                            "securedUnsecured": "Secured",
-                            "recoveryCalculationMode": "Post-default Price",
-                            "capitalStructure": "Unknown",
-                            "loanScorecard": {
-                                "loanScorecardId": "2b77f0d7-b0e4-4dbc-844d-aabb4376a688",
-                                "blanketLien": "No",
-                                "collateral": [
-                                    {
-                                        "customCollateralId": "1234",
-                                        "loanId": "1a19c5a4-67c8-441d-b3be-7fd150ab82fb",
-                                        "collateralName": "",
-                                        "collateralType": "Accounts Receivable",
-                                        "amount": 100000,
-                                        "questionAnswers": [
-                                            {
-                                                "name": "Standard Payment Terms",
-                                                "value": "Not Available"
-                                            },
-                                            {
-                                                "name": "Customer Concentration",
-                                                "value": "Not Available"
-                                            },
-                                            {
-                                                "name": "Customer Credit Quality",
-                                                "value": "Not Available"
-                                            },
-                                            {
-                                                "name": "Borrowing Base",
-                                                "value": "Not Available"
-                                            },
-                                            {
-                                                "name": "Report Frequency",
-                                                "value": "Not Available"
-                                            },
-                                            {
-                                                "name": "Field Audit Frequency",
-                                                "value": "Not Available"
-                                            },
-                                            {
-                                                "name": "Dominion of Funds",
-                                                "value": "Not Available"
-                                            }
-                                        ]
-                                    }
-                                ],
-                                "guarantee": None,
-                                "lgdQualitativeFactors": {
-                                    "enterpriseValuation": None,
-                                    "covenantStructure": None
-                                }
-                            }
-                        },
-                        "termStructureCumulativePd": {
-                            "pdType": "pit",
-                            "cumulativePd1y": 0.0027,
-                            "cumulativePd2y": 0.0056,
-                            "cumulativePd3y": 0.0087,
-                            "cumulativePd4y": 0.0118,
-                            "cumulativePd5y": 0.015,
-                            "cumulativePd6y": 0.0181,
-                            "cumulativePd7y": 0.0213,
-                            "cumulativePd8y": 0.02439,
-                            "cumulativePd9y": 0.0275,
-                            "cumulativePd10y": 0.03062
-                        }
-                    }
-                ]
-            }
-        ]
-
-        """
-        headers = self.EDFXHeaders()['JSONGet']['headers']
-        endpoint = "/edfx/v1/entities/loans"
-        url = urljoin(self.base_url, endpoint)
-        params = {
-            "entities": entities
-        }
-        response = requests.post(url, headers=headers, json=params)
-        assert response.status_code == 200, f"API call failed: {response.text}"
-        return response.json()
-
-    def EDFXRetrievingLoanMedianCreditSpreads(self, currency: str, referenceRate: str, rating: str, startDate: str, endDate: str, tenor: int) -> dict:
-        """
-        Use this endpoint to retrieve Moody's Implied Ratings Median Credit Spreads (MIR Credit Spreads) for a specific date and rating.
-        Provide information about the counterparty's loan(s) to calculate Loss Given Default metrics.
-        The calculations leverage the Loss Given Default 4.0 (LGD 4.0) model. In this same endpoint you can also use Moody’s Loan Scorecard.
-
-        Required Params:
-        currency
-        referenceRate
-        rating
-        startDate
-        endDate
-        tenor
-
-        """
-        headers = self.EDFXHeaders()['JSONGet']['headers']
-        endpoint = "/edfx/v1/tools/loanSpreads"
-        url = urljoin(self.base_url, endpoint)
-        params = {
-            "spreadCalculation": {
-                    "currency": currency,
-                    "referenceRate": referenceRate,
-                    "rating": rating,
-                    "startDate": startDate,
-                    "endDate": endDate,
-                    "tenor": tenor
-            }
-        }
-        params = self.create_params_dict(params)
-        response = requests.post(url, headers=headers, json=params)
-        return response.json()
-
-    def EDFXDeteriorationProbability(self, entities:list[dict[str,str]],asyncResponse:bool=False,
-                                     startDate:str=None, endDate:str=None,
-                                     historyFrequency:str='monthly'):
-        """
-        Use this endpoint to access the latest available Deterioration Probability for the entity.
-
-        Understand in this current iteration Deterioration Probability DOES NOT allow for timeseries and/or a historyFrequency.
-        The values will be ignored if given however this is on the roadmap.  We will have this functionality
-        in the Coming 2024.
-
-        min sample request:
-        {
-            "asyncResponse":false,
-            "entities":[
-                {
-                    "entityId":"US942404110"
-                }
-            ]
-        }
-        """
-        headers = self.EDFXHeaders()['JSONBasic']['headers']
-        endpoint = "/edfx/v1/tools/deteriorationProbability"
-        url = urljoin(self.base_url, endpoint)
-        params = {
-                    "startDate": startDate,
-                    "endDate": endDate,
-                    "historyFrequency": historyFrequency,
-                    "asyncResponse": asyncResponse,
-                    "entities": entities
-                            }
-
-        params = self.create_params_dict(params)
-        response = requests.post(url, headers=headers, json=params)
-        return response.json()
-
-    def EDFXMoodysRating(self,entities:list[dict[str,str]],ratingType:str="SRA"):
-
-        """
-        Use this endpoint to access the latest value available for Moody's Rating:
-
-        SRA rating.
-        In this payload it can handle ratingType as a param
-
-        Understand in this current iteration Moodys Rating DOES NOT allow for timeseries and/or a historyFrequency.
-
-        Entities: The object is a list of dictionary elements: value = [{'entityId': 'identifier'}]
-            multiple entities exmampe:
-            [{ "entityId": "DELEI421244" }, { "entityId": "US800890963" }, { "entityId": "FR813755949" }]
-
-
-        Sample Request:
-
-                {
-                "ratingType":"SRA",
-                "entities":[
-                    {
-                        "entityId":"US942404110"
-                    }
-                ]
-                }
-        """
-
-        if entities:
-            if isinstance(entities, dict):
-                for key, value in entities.items():
-                    if not isinstance(key,str) or not isinstance(value,str):
-                        print("Error: you need to either feed a dictionary of 'EntityID' as key and an EDFX Qualified ID as the value." )
-                        return None
-
-                entities = [entities]
-
-        headers = self.EDFXHeaders()['JSONBasic']['headers']
-        endpoint = "/edfx/v1/entities/moodysRating"
-        url = urljoin(self.base_url, endpoint)
-        params = {
-                    "ratingType": ratingType,
-                    "entities": entities
-                }
-        params = self.create_params_dict(params)
-        response = requests.post(url, json=params, headers=headers)
-        return response.json()
-
-    def EDFXMoodysBondImpliedRating(self,entities:list[dict[str,str]],historyFrequency:str="monthly",
-                                    asyncResponse:bool=False,startDate:str=None, endDate:str=None):
-
-        """
-        This endpoint give access to the latest Bonds-implied Rating for the firm.
-        Sample JSON Request:
-
-        This endpoint Cannot handle ratingType as a param
-
-        {
-        "entities":[
-                        {
-                            "entityId":"US942404110"
-                        }
-                    ]
-                    }
-        """
-        headers = self.EDFXHeaders()['JSONBasic']['headers']
-        endpoint = "/edfx/v1/entities/bonds"
-        url = urljoin(self.base_url, endpoint)
-        params = {
-            "startDate": startDate,
-            "endDate": endDate,
-            "historyFrequency": historyFrequency,
-            "asyncResponse": asyncResponse,
-            "entities": entities
-        }
-        params = { key:value for key,value in params.items() if value is not None}
-        response = requests.post(url, json=params, headers=headers)
-        return response.json()
-
-    def EDFXCDSImpliedRatings(self,entities:list[dict[str,str]],historyFrequency:str="monthly",
-                              asyncResponse:bool=False,startDate:str=None, endDate:str=None):
-
-        """
-        Access the latest CDS-Implied PD and IR for the firm under analysis using this endpoint.
-
-        {
-        "entities":[
-            {
-                "entityId":"34537A"
-            }
-        ]
-        }
-        """
-
-        headers = self.EDFXHeaders()['JSONBasic']['headers']
-        endpoint = "/edfx/v1/entities/cds"
-        url = urljoin(self.base_url, endpoint)
-        params = {
-                    "startDate": startDate,
-                    "endDate": endDate,
-                    "historyFrequency": historyFrequency,
-                    "asyncResponse": asyncResponse,
-                    "entities": entities
-                }
-        params = { key:value for key,value in params.items() if value is not None}
-        response = requests.post(url, json=params, headers=headers)
-        return response.json()
-
-    @staticmethod
-    def EDFXExportData(df:pd.DataFrame, output_format:str, file_name:str):
-        """
-        This is how we can export the data either in a pandas, csv, or excel dataframe
-        depending on what the user selects in their parse methods.
-        """
-        if output_format == OutputFormat.PANDAS.value:
-            return df
-
-        elif output_format == OutputFormat.EXCEL.value:
-            df.to_excel(f"{file_name}.xlsx", index=False)
-            print(f"Data saved as {file_name}.xlsx")
-
-        elif output_format == OutputFormat.CSV.value:
-            df.to_csv(f"{file_name}.csv", index=False)
-            print(f"Data Saved as {file_name}.csv")
-
-        else:
-            raise ValueError(f"Unsupported OutputFormat: {output_format}.")
-
-    @staticmethod
-    def EDFXSearchParse(jsonresponse:dict, output_format:str = "pandas", file_name="SearchOutput"):
-
-        """
-        Leverage recursive helper functions to parse data frame
-
-        """
-        output_format = output_format.title()
-        try:
-
-            if not isinstance(jsonresponse,dict) or not jsonresponse:
-                print(f"The API did not return a valid response or data. Response Below:\n {jsonresponse}")
-                return None
-            else:
-                flat_data = [flatten_dict(entity) for entity in jsonresponse['entities']]
-                df = pd.DataFrame(flat_data)
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occured while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-
-    @staticmethod
-    def EDFXBatchParse(batch:json, output_format:str = "pandas", file_name = "batchoutput"):
-        """
-        Parses the Json Batch output and transforms it to either a pandas dataframe, .csv, or .xlsx file.
-
-
-        Params:
-        - JSONB  EDFXBatchEntitySearch dictionary object: dict
-        - output_format:str (your choice of either'Pandas', 'Excel', 'Csv'), where csv and excel options save
-        to your local path.
-
-        THIS WILL BREAK IF MOODYS ANALYTICS CHANGES THE EDFX BATCH OUTPUT RESPONSE
-        RECALL:
-        If you're using iterrows() with a pandas DataFrame, each row is a Series, and accessing its elements
-        by column labels returns the values in those columns for the current row.
-
-        """
-
-        output_format = output_format.title()
-        try:
-            if not isinstance(batch,dict) or not batch:
-
-                print(f"The API did not return a valid response or data. Response Below:\n {batch}")
-                return None
-
-            else:
-
-                df = pd.DataFrame(batch['entities'])
-                #Extract national ID into separate columns (I can vectorize this but this is clearer)
-                for index, row in df.iterrows():
-                    # This is saying if the column name is present and if that column is a list object
-                    if 'nationalId' in row and isinstance(row['nationalId'],list):
-                        #supress FutureWarnings in this block
-                        with warnings.catch_warnings():
-                            warnings.simplefilter('ignore', category = FutureWarning)
-
-                            # now iterate the values within the list
-                            for item in row['nationalId']:
-                                col_name = 'nationalId_'+ item['idName']
-                                # this is faster than .loc[index,col]
-                                df.at[index, col_name] = item['idValue']
-
-                # drop the original nationalId col if it exists
-                if 'nationalId' in df.columns:
-                    df.drop(columns=['nationalId'], inplace=True)
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-    @staticmethod
-    def EDFXPDParse(data: dict, output_format:str = "pandas", file_name = "pd"):
-
-        """
-        Parses the provided JSON data into a pandas DataFrame.
-
-        Parameters:
-        - data (dict): The JSON data to be parsed.
-        - TimeSeries: If set to True returned DataFrame will have datetime index
-
-        Returns:
-        - DataFrame: A pandas DataFrame
-        """
-
-        output_format = output_format.title()
-        file_name = file_name.title()
-        try:
-            # Try seeing if there is an error.
-            if not isinstance(data,dict) or not data:
-                print(f"The API did not return a valid response or data. Response Below:\n {data}")
-                return None
-            # else perform the parse.
-            if "entities" not in data:
-                logger.error(f"Possible Serverside Issue:  Error message from server as: \n {data}")
-
-            else:
-                flat_data = []
-                for entity in data['entities']:
-                    if 'history' in entity:
-                        entity_data = flatten_dict({
-                            k: v for k, v in entity.items()
-                            if k != 'history' and
-                            k not in entity['history'][0]
-                        })
-                        for history_record in entity['history']:
-                            flat_data_record = entity_data.copy()
-                            flat_data_record.update(flatten_dict(history_record))
-                            flat_data.append(flat_data_record)
-                    else:
-                        # if there is no history you can't append the history.
-                        flat_data.append(flatten_dict(entity))
-
-                df = pd.DataFrame(flat_data)
-                df = df.set_index(pd.to_datetime(df['asOfDate']))
-                # TODO: Check if we need to drop asOfDate
-                # now just get rid of the column asOfDate
-                # df = df.drop(columns = ['asOfDate'])
-        # print API exception if a global error occurs
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while parsing.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-    @staticmethod
-    def EDFXPD_DriversParse(json:dict, output_format:str = 'pandas', file_name="pdHistory"):
-
-        """
-        This parses, public, private, and multiple public and private Json Responses
-        """
-        # Extract data for all entities
-        output_format = output_format.title()
-        try:
-            if not isinstance(json,dict) or not json:
-                print(f"The API did not return a valid response or data. Response Below:\n {json}")
-                return None
-
-            else:
-                all_ratios = []
-                for entity in json['entities']:
-                    all_ratios.extend(PDDrivers_extract_ratios(entity))
-
-                # Convert the list of dictionaries into a DataFrame
-                df = pd.DataFrame(all_ratios)
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-    @staticmethod
-    def EDFXParseTradeCredit(json:dict, output_format:str = "pandas", file_name = "TradeCredit"):
-
-        """
-        Parses the response of the EDFXRetrievinglimtsfortradecredit method to extract trade credit information
-        and returns either Pandas DF, CSV, or Excel file.
-
-        Parameters:
-        - response (dict): The response object returned by EDFXRetrievinglimtsfortradecredit method
-        - output_format: Pandas DataFrame, Excel, or Csv
-
-        Returns:
-        - DataFrame: A DataFrame with trade credit information
-        """
-        output_format = output_format.title()
-        try:
-            if not isinstance(json, dict) or not json:
-                print(f"The API did not return a valid response or data. Response Below:\n {json}")
-                return None
-            else:
-                # Extract the list of entities
-                entities = json.get("entities", [])
-                # Create an empty dataframe to store all entities' data
-                full_df = pd.DataFrame()
-                # Create an empty list to store entityIds without credit information
-                missing_data_ids = []
-                # Loop through each entity and extract relevant data
-                for entity_data in entities:
-                    credit_limits = entity_data.get("creditLimits", [])
-                    if credit_limits:
-                        df = pd.DataFrame(credit_limits)
-                        df["entityId"] = entity_data.get("entityId")
-
-                        # Reordering the columns to have 'entityId' as the first column
-                        cols = df.columns.tolist()
-                        cols = [cols[-1]] + cols[:-1]
-                        df = df[cols]
-
-                        # Append to the main dataframe
-                        full_df = pd.concat([full_df, df], ignore_index=True)
-                    else:
-                        missing_data_ids.append(entity_data.get("entityId"))
-
-                # Print warning messages for entityIds without credit information
-                for entity_id in missing_data_ids:
-                    print(f"Unfortunately: {entity_id} has no credit information.")
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(full_df, output_format, file_name)
-
-    @staticmethod
-    def EDFXParsePeerGroupMetrics(json:dict, output_format='pandas', file_name = "PeerGroupMetrics"):
-
-        """
-        Parses the json of the EDFXRetrievingpeergroups_Metrics method to extract peer group metrics
-        and return it as either a Pandas DataFrame, Excel or CSV file.
-
-        Required Params:
-        dictionary json response object and pandas Pd
-        """
-        output_format = output_format.title()
-        try:
-            if not isinstance(json, dict) or not json:
-                print(f"The API did not return a valid response or data. Response Below:\n {json}")
-                return None
-
-            else:
-                # Extract the list of results
-                results = json.get("results", [])
-                # Check if results are present
-                if not results:
-                    print(f"Unfortunately: No data found for peerId {json.get('peerId')}.")
-                    return pd.DataFrame()
-                # Create an empty dataframe to store all the data
-                full_df = pd.DataFrame()
-                # Loop through each result and extract relevant data
-                for result_data in results:
-                    as_of_date = result_data.get("asOfDate")
-                    variable_name = result_data.get("variableName")
-                    unit = result_data.get("unit")
-                    currency = result_data.get("currency")
-                    metric_list = result_data.get("metricList", [])
-                    values = result_data.get("values", [])
-                    # Convert metricList and values into a dictionary
-                    data_dict = dict(zip(metric_list, values))
-                    # Add other fields to this dictionary
-                    data_dict.update({
-                        "asOfDate": as_of_date,
-                        "variableName": variable_name,
-                        "unit": unit,
-                        "currency": currency
-                    })
-
-                    # Convert the dictionary to DataFrame and append to the main dataframe
-                    df = pd.DataFrame([data_dict])
-                    full_df = pd.concat([full_df, df], ignore_index=True)
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(full_df, output_format, file_name)
-
-
-
-    @staticmethod
-    def EDFXParsePeerGroupPercentile(json:dict, output_format:str = 'Pandas', file_name = "PeerGroupPercentile"):
-
-        """
-        Parses the response of the EDFXRetrievingpeergroups_Percentile method to extract variable name and percentile
-        and return it as a Pandas DataFrame.
-
-        Parameters:
-
-        - response (dict): The response object returned by EDFXRetrievingpeergroups_Percentile method
-        - output_format: Pandas, Excel, Csv
-
-        Returns:
-        - DataFrame: A DataFrame with variable name and percentile information, Excel or Csv File.
-        """
-        output_format = output_format.title()
-        try:
-
-            if not isinstance(json, dict) or not json:
-                print(f"The API did not return a valid response or data. Response Below:\n {json}")
-                return None
-
-            else:
-                # get me the value for the 'results' key if it exists, else return me an empty list.
-                #  Using "get" method with a default value avoids this potential KeyError issue thus is employed here.
-                results = json.get('results',[])
-                if not results:
-                    print(f"Unfortunately No data found for peerId {json.get('peerId')}.")
-                    return pd.Dataframe()
-
-                full_df = pd.DataFrame()
-                for result_data in results:
-                    variable_name = result_data.get("variableName")
-                    percentile = result_data.get("percentile")
-                    # Convert the extracted data into a dictionary
-                    data_dict = {
-                        "variableName": variable_name,
-                        "percentile": percentile
-                        }
-                    # Convert the dictionary to DataFrame and append to the main dataframe
-                    df = pd.DataFrame([data_dict])
-                    full_df = pd.concat([full_df, df], ignore_index=True)
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(full_df, output_format, file_name)
-
-
-    @staticmethod
-    def EDFXParsePeerGroupMetaData(json:dict, output_format:str = 'Pandas', file_name = "PeerGroupMetaData"):
-        """
-        Parses the response of the EDFXRetrievingpeergroups_MetaData method to extract variable name and percentile
-        and return it as a Pandas DataFrame.
-
-        Parameters:
-
-        - response (dict): The response object returned by EDFXRetrievingpeergroups_MetaData method
-        - output_format: Pandas, Excel, Csv
-
-        Returns:
-        - DataFrame: A DataFrame with variable name and percentile information, Excel or Csv File.
-        """
-        output_format = output_format.title()
-        try:
-            if not isinstance(json, dict) or not json:
-                print(f"The API did not return a valid response or data. Response Below:\n {json}")
-                return None
-            else:
-                keys = ["peerId", "peerName", "count", "country", "region", "industryCode", "ownershipType"]
-                # Check if peerId exists in the response
-                if not json.get("peerId"):
-                    print(f"Warning: No data found.")
-                    # return pd.DataFrame()
-                # Extract the metadata using list comprehension
-                metadata = {key: json.get(key) for key in keys}
-                # Convert the metadata dictionary into a DataFrame
-                df = pd.DataFrame([metadata])
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-    @staticmethod
-    def EDFXParsePeerGroupRecommended(json:dict, output_format:str="Pandas", file_name="PeerGroupRecommended"):
-        """
-        Peer Group Parse.
-        """
-        output_format = output_format.title()
-
-        try:
-            if not isinstance(json, dict) or not json:
-                print(f"The API did not return a valid response or data. Response Below:\n {json}")
-                return None
-            else:
-                # Extracting the results: this is a list of a long dictionary so i'm just taking the entire dictionary
-                results = json.get("results", [{}])[0]
-                if not results:
-                    print(f"Warning: No data found.")
-                    return pd.DataFrame()
-                # Convert the results dictionary into a list of tuples (key, value) format
-                data = list(results.items())
-                # Convert the list into a DataFrame
-                df = pd.DataFrame(data, columns=['peerId_name', 'peerId_value'])
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-    @staticmethod
-    def EDFXEarlyWarningScoreParse(EDFXEarlyWarningScoreJSON:dict, output_format='Pandas',
-                                   file_name = "EarlyWarningScore"):
-        """
-        Parses the provided JSON data into a pandas DataFrame.
-
-        Parameters:
-        - EDFXEarlyWarningScoreJSON (dict): The JSON data to be parsed.
-        - output_format (str): The putput format, can be "Pandas", "Excel", "CSV".
-
-        Returns:
-        - DataFrame: A pandas DataFrame.
-        """
-        # catches errors.
-        output_format = output_format.title()
-        try:
-            if not isinstance(EDFXEarlyWarningScoreJSON,dict) or not EDFXEarlyWarningScoreJSON:
-                print(f"The API did not return a valid response or data. Response Below:\n {EDFXEarlyWarningScoreJSON}")
-                return None
-            else:
-                 df = pd.DataFrame(EDFXEarlyWarningScoreJSON['entities'])
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-
-    @staticmethod
-    def EDFXEarlyWarningTriggersParse(TriggerJson:dict,output_format:str='pandas',file_name = 'EarlyWarningTrigger'):
-
-        """
-        Parses Triggers Dictionary
-        """
-        output_format = output_format.title()
-        try:
-            if not isinstance(TriggerJson,dict) or not TriggerJson:
-                print(f"The API did not return a valid response or data. Response Below:\n {TriggerJson}")
-                return None
-            else:
-                df = pd.DataFrame(TriggerJson['triggers'])
-                # Convert 'asOfDate' column to datetime format
-                df['asOfDate'] = pd.to_datetime(df['asOfDate'])
-                # # Sort the DataFrame based on 'asOfDate'
-                df = df.sort_values(by='asOfDate').reset_index(drop=True)
-                # Check OutputFormat
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-    @staticmethod
-    def EDFXStatementsParse(StatementsJSON: dict, FormatType: str = 'Long', output_format='Pandas',
-                            file_name = 'FinancialStatement'):
-        """
-        Parses the provided JSON data into a pandas DataFrame.
-
-        Parameters:
-        - data (dict): The JSON data to be parsed.
-        - FormatType (str): The format to which the data should be parsed. Either "wide" or "long".
-
-        Returns:
-        - DataFrame: A pandas DataFrame in the specified format.
-        """
-        # catches errors.
-        FormatType = FormatType.title()
-        output_format = output_format.title()
-        try:
-            if not isinstance(StatementsJSON, dict) or not StatementsJSON:
-                print(f"The API did not return a valid response or data. Response Below:\n {StatementsJSON}")
-                return None
-
-            # Check for error response in JSON
-            elif 'message' in StatementsJSON:
-                print(f"Error in received data: {StatementsJSON['message']}")
-                return None
-            # Make sure 'entities' key exists in StatementsJSON
-            elif 'entities' not in StatementsJSON:
-                raise ValueError("The provided data does not contain 'entities'. Ensure the correct data format.")
-            else:
-                if FormatType not in ('Long', 'Wide'):
-                    raise ValueError("Invalid FormatType provided. Choose either 'Wide' or 'Long'.")
-                # Build Out
-                flat_data = []
-                for entity in StatementsJSON['entities']:
-                    if FormatType == 'Long':
-                        for statement in entity['statements']:
-                            # gives me key,value pairs as dictionary elements within the list that are not nested
-                            flat_data.append(filter_out_list_and_dict(entity))
-                            #flat_data[-1] maps to the last element (a dictionary) in the flat_data list and updates
-                            # that element
-                            flat_data[-1].update(filter_out_list_and_dict(statement, 'statement'))
-                            flat_data[-1].update(filter_out_list_and_dict(statement['balanceSheet'], 'balanceSheet'))
-                            flat_data[-1].update(filter_out_list_and_dict(statement['incomeStatement'], 'incomeStatement'))
-                    elif FormatType == 'Wide':
-                        flat_data.append(filter_out_list_and_dict(entity))
-                        for statement in entity['statements']:
-                            flat_data[-1].update(filter_out_list_and_dict(statement, f'{statement["financialStatementDate"]}_statement'))
-                            flat_data[-1].update(filter_out_list_and_dict(statement['balanceSheet'], f'{statement["financialStatementDate"]}_balanceSheet'))
-                            flat_data[-1].update(filter_out_list_and_dict(statement['incomeStatement'], f'{statement["financialStatementDate"]}_incomeStatement'))
-
-                df = pd.DataFrame(flat_data)
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-    @staticmethod
-    def EDFXRatiosParse(RatiosJSON: dict, FormatType: str = 'Long', output_format='Pandas',
-                        file_name = "FinancialRatios"):
-        """
-        Parses the provided JSON data into a pandas DataFrame.
-
-        Parameters:
-        - data (dict): The JSON data to be parsed.
-        - FormatType (str): The format to which the data should be parsed. Either "wide" or "long".
-
-        Returns:
-        - DataFrame: A pandas DataFrame in the specified format.
-        """
-        # catches errors.
-        FormatType = FormatType.title()
-        output_format = output_format.title()
-
-        try:
-            if not isinstance(RatiosJSON, dict) or not RatiosJSON:
-                print(f"The API did not return a valid response or data. Response Below:\n {RatiosJSON}")
-                return None
-            # Make sure 'entities' key exists in StatementsJSON
-            elif 'entities' not in RatiosJSON:
-                raise ValueError("The provided data does not contain 'entities'. Ensure the correct data format.")
-
-            elif FormatType not in ('Long', 'Wide'):
-                raise ValueError("Invalid FormatType provided. Choose either 'Wide' or 'Long'.")
-            else:
-        # Build Out
-                flat_data = []
-                for entity in RatiosJSON['entities']:
-                    if FormatType == 'Long':
-                        for ratio in entity['ratios']:
-                            flat_data.append(filter_out_list_and_dict(entity))
-                            flat_data[-1].update(filter_out_list_and_dict(ratio['leverage'], 'leverage'))
-                            flat_data[-1].update(filter_out_list_and_dict(ratio['liquidity'], 'liquidity'))
-                            flat_data[-1].update(filter_out_list_and_dict(ratio['operational'], 'operational'))
-                            flat_data[-1].update(filter_out_list_and_dict(ratio['profitability'], 'profitability'))
-                    elif FormatType == 'Wide':
-                        flat_data.append(filter_out_list_and_dict(entity))
-                        for ratio in entity['ratios']:
-                            flat_data[-1].update(filter_out_list_and_dict(ratio['leverage'], f'{ratio["financialStatementDate"]}_leverage'))
-                            flat_data[-1].update(filter_out_list_and_dict(ratio['liquidity'], f'{ratio["financialStatementDate"]}_liquidity'))
-                            flat_data[-1].update(filter_out_list_and_dict(ratio['operational'], f'{ratio["financialStatementDate"]}_operational'))
-                            flat_data[-1].update(filter_out_list_and_dict(ratio['profitability'], f'{ratio["financialStatementDate"]}_profitability'))
-
-                df = pd.DataFrame(flat_data)
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-    @staticmethod
-    def EDFXRatioCalculationsParse(RatiosCalculationJson: dict, FormatType: str = 'Long', output_format='Pandas',
-                                   file_name="RatioCalculations"):
-        """
-        Parses the provided JSON data into a pandas DataFrame.
-
-        Parameters:
-        - data (dict): The JSON data to be parsed.
-        - FormatType (str): The format to which the data should be parsed. Either "wide" or "long".
-
-        Returns:
-        - DataFrame: A pandas DataFrame in the specified format.
-        """
-        # catches errors.
-        FormatType = FormatType.title()
-        output_format = output_format.title()
-        try:
-            if not isinstance(RatiosCalculationJson, dict) or not RatiosCalculationJson:
-                    print(f"The API did not return a valid response or data. Response Below:\n {RatiosCalculationJson}")
-                    return None
-            else:
-                if FormatType not in ('Long', 'Wide'):
-                    raise ValueError("Invalid FormatType provided. Choose either 'Wide' or 'Long'.")
-
-                # Build Out
-                flat_data = []
-                if FormatType == 'Long':
-                    for ratio in RatiosCalculationJson['ratios']:
-                        flat_data.append(filter_out_list_and_dict(ratio))
-                        flat_data[-1].update(filter_out_list_and_dict(ratio['leverage'], 'leverage'))
-                        flat_data[-1].update(filter_out_list_and_dict(ratio['liquidity'], 'liquidity'))
-                        flat_data[-1].update(filter_out_list_and_dict(ratio['operational'], 'operational'))
-                        flat_data[-1].update(filter_out_list_and_dict(ratio['profitability'], 'profitability'))
-                elif FormatType == 'Wide':
-                    flat_data.append(filter_out_list_and_dict(ratio))
-                    for ratio in RatiosCalculationJson['ratios']:
-                        flat_data[-1].update(filter_out_list_and_dict(ratio['leverage'], f'{ratio["financialStatementDate"]}_leverage'))
-                        flat_data[-1].update(filter_out_list_and_dict(ratio['liquidity'], f'{ratio["financialStatementDate"]}_liquidity'))
-                        flat_data[-1].update(filter_out_list_and_dict(ratio['operational'], f'{ratio["financialStatementDate"]}_operational'))
-                        flat_data[-1].update(filter_out_list_and_dict(ratio['profitability'], f'{ratio["financialStatementDate"]}_profitability'))
-
-                df = pd.DataFrame(flat_data)
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-
-    @staticmethod
-    def EDFXSmartProjectionParse(SmartProjectionJSON: dict, FormatType: str = 'Long', output_format='Pandas',
-                                 file_name = "SmartProjects"):
-        """
-        Parses the provided JSON data into a pandas DataFrame.
-
-        Parameters:
-        - data (dict): The JSON data to be parsed.
-        - FormatType (str): The format to which the data should be parsed. Either "wide" or "long".
-
-        Returns:
-        - DataFrame: A pandas DataFrame in the specified format.
-        """
-        # catches errors.
-        FormatType = FormatType.title()
-        output_format = output_format.title()
-        try:
-            if not isinstance(SmartProjectionJSON, dict) or not SmartProjectionJSON:
-                    print(f"The API did not return a valid response or data. Response Below:\n {SmartProjectionJSON}")
-                    return None
-            else:
-
-                if FormatType not in ('Long', 'Wide'):
-                    raise ValueError("Invalid FormatType provided. Choose either 'Wide' or 'Long'.")
-                # Build Out
-                flat_data = []
-                for entity in SmartProjectionJSON['entities']:
-                    if FormatType == 'Long':
-                        for projection in entity['projections']:
-                            statement = projection['statement']
-                            flat_data.append(filter_out_list_and_dict(entity))
-                            flat_data[-1].update(filter_out_list_and_dict(projection, 'projection'))
-                            flat_data[-1].update(filter_out_list_and_dict(statement['balanceSheet'], 'balanceSheet'))
-                            flat_data[-1].update(filter_out_list_and_dict(statement['incomeStatement'], 'incomeStatement'))
-                    elif FormatType == 'Wide':
-                        flat_data.append(filter_out_list_and_dict(entity))
-                        for projection in entity['projections']:
-                            statement = projection['statement']
-                            flat_data[-1].update(filter_out_list_and_dict(projection, f'{projection["financialStatementDate"]}_projection'))
-                            flat_data[-1].update(filter_out_list_and_dict(statement['balanceSheet'], f'{projection["financialStatementDate"]}_balanceSheet'))
-                            flat_data[-1].update(filter_out_list_and_dict(statement['incomeStatement'], f'{projection["financialStatementDate"]}_incomeStatement'))
-
-                df = pd.DataFrame(flat_data)
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-    @staticmethod
-    def EDFXScenarioPDParse(Scenariojson:dict, output_format:str = 'pandas', file_name="ScenarioConditionedPds"):
-
-        """Parses Dictionary output form EDFXScenarioConditionedPds endpoint"""
-        output_format = output_format.title()
-
-        try:
-            if not isinstance(Scenariojson,dict) or not Scenariojson:
-                print(f"The API did not return a valid response or data.  Response Below:\n {Scenariojson}.")
-            else:
-                data_list = []
-                for entity in Scenariojson['entities']:
-                    entityId = entity['entityId']
-                    for scenario_name, scenario_data in entity['scenarios'].items():
-                        for record in scenario_data:
-                            record_dict = {
-                                "asOfDate": record['asOfDate'],
-                                "Scenario": scenario_name,
-                                "PD1yr": record["pd"],
-                                "impliedRating": record['impliedRating'],
-                                'entityId': entityId
-                            }
-                            data_list.append(record_dict)
-
-                # Convert list of dictionaries to dataframe
-                df_long = pd.DataFrame(data_list)
-                df_wide = df_long.pivot(index=["asOfDate", "entityId"],
-                                        columns='Scenario',
-                                        values=["PD1yr", "impliedRating"]).reset_index()
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-        return EDFXEndpoints.EDFXExportData(df_wide, output_format, file_name)
-
-    @staticmethod
-    def EDFXLGDParse(LGDJSON: dict, FormatType: str = 'Long', output_format='Pandas',file_name = "LGD"):
-
-        """
-        Parses the provided JSON data into a pandas DataFrame.
-
-        Parameters:
-        - data (dict): The JSON data to be parsed.
-        - FormatType (str): The format to which the data should be parsed. Either "wide" or "long".
-
-        Returns:
-        - DataFrame: A pandas DataFrame in the specified format.
-        """
-        # catches errors.
-        FormatType = FormatType.title()
-        output_format = output_format.title()
-        try:
-            if not isinstance(LGDJSON, dict) or not LGDJSON:
-                    logger.error(f"The API did not return a valid response or data. Response Below:\n {LGDJSON}")
-                    return None
-            if 'entities' not in LGDJSON:
-                logger.error(f"Possbile Server-side error message from server.  Description: \n {LGDJSON}.")
-            else:
-                if FormatType not in ('Long', 'Wide'):
-                    raise ValueError("Invalid FormatType provided. Choose either 'Wide' or 'Long'.")
-                # Build Out
-                flat_data = []
-                for entity in LGDJSON['entities']:
-                    if FormatType == 'Long':
-                        for loan in entity['loans']:
-                            flat_data.append(filter_out_list_and_dict(entity))
-                            flat_data[-1].update(filter_out_list_and_dict(loan['tenorMatchedResults'], 'tenorMatchedResults'))
-                            for term_structure in ('annualized', 'cumulative'):
-                                for inner_term_structure in loan['termStructureLgd'][term_structure]:
-                                    if loan['termStructureLgd'][term_structure][inner_term_structure]:
-                                        flat_data[-1].update(filter_out_list_and_dict(loan['termStructureLgd'][term_structure][inner_term_structure], f'termStructureLgd_{term_structure}_{inner_term_structure}'))
-
-                            if loan['termStructureLgd']['longRun']:
-                                flat_data[-1].update(filter_out_list_and_dict(loan['termStructureLgd']['longRun'], 'termStructureLgd_longRun'))
-                            if loan['termStructureCumulativePd']:
-                                flat_data[-1].update(filter_out_list_and_dict(loan['termStructureCumulativePd'], 'termStructureCumulativePd'))
-                            if loan['scoreCardResults']:
-                                flat_data[-1].update(filter_out_list_and_dict(loan['scoreCardResults'], 'scoreCardResults'))
-
-                    elif FormatType == 'Wide':
-                        flat_data.append(filter_out_list_and_dict(entity))
-                        for loan in entity['loans']:
-                            flat_data[-1].update(filter_out_list_and_dict(loan['tenorMatchedResults'], 'tenorMatchedResults'))
-                            for term_structure in ('annualized', 'cumulative'):
-                                for inner_term_structure in loan['termStructureLgd'][term_structure]:
-                                    if loan['termStructureLgd'][term_structure][inner_term_structure]:
-                                        flat_data[-1].update(filter_out_list_and_dict(loan['termStructureLgd'][term_structure][inner_term_structure], f'termStructureLgd_{term_structure}_{inner_term_structure}'))
-
-                            if loan['termStructureLgd']['longRun']:
-                                flat_data[-1].update(filter_out_list_and_dict(loan['termStructureLgd']['longRun'], 'termStructureLgd_longRun'))
-                            if loan['termStructureCumulativePd']:
-                                flat_data[-1].update(filter_out_list_and_dict(loan['termStructureCumulativePd'], 'termStructureCumulativePd'))
-                            if loan['scoreCardResults']:
-                                flat_data[-1].update(filter_out_list_and_dict(loan['scoreCardResults'], 'scoreCardResults'))
-
-                df = pd.DataFrame(flat_data)
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-    @staticmethod
-    def EDFXClimateIndustryTransitionRiskDriversParse(data: dict, output_format: str = 'Pandas', file_name: str = 'ClimateIndustryTransitionRiskDriversParse'):
-
-        """
-        Parses Climate Transition Risk Drivers
-        """
-        try:
-            if not isinstance(data, dict) or not data:
-                print(f"The API did not return a valid response or data. Response Below:\n {data}")
-                return None
-            else:
-                flat_data = []
-                for scenario_name, scenario_items in data.items():
-                    for scenario_item in scenario_items:
-                        flat_data_item = {'scenario': scenario_name}
-                        flat_data_item.update(scenario_item)
-                        flat_data.append(flat_data_item)
-
-                df = pd.DataFrame(flat_data)
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-    @staticmethod
-    def EDFXClimatePDParse(data: dict, output_format: str = 'Pandas', file_name: str = 'ClimatePD'):
-
-        """
-        Parses Climate PD
-        Parameters:
-        - data (dict): The JSON data to be parsed.
-        - output_format (str): The output format.
-        - file_name (str): Name of the file to be created.
-
-        Returns:
-        - DataFrame: A pandas DataFrame in the specified format.
-        """
-        try:
-            if not isinstance(data, dict) or not data:
-                print(f"The API did not return a valid response or data. Response Below:\n {data}")
-                return None
-            else:
-                flat_data = []
-                for entity in data['entities']:
-                    flat_data.append(flatten_dict(entity))
-                df = pd.DataFrame(flat_data)
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-    @staticmethod
-    def EDFXClimateReportPublicParse(data: str, output_format: str = 'Pandas', file_name: str = 'ClimateReportPublic'):
-
-        """
-        Parses Climate Report Public
-        Parameters:
-        - data (str): CSV data retreived from EDFXClimateReportPublic
-        - output_format (str): The output format.
-        - file_name (str): Name of the file to be created.
-
-        Returns:
-        - DataFrame: A pandas DataFrame in the specified format.
-        """
-        try:
-            if not data:
-                print(f"The API did not return a valid response or data. Response Below:\n {data}")
-                return None
-            else:
-                df = pd.read_csv(io.StringIO(data), sep=',')
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("An error occurred while processing the API response.")
-            return None
-
-        return EDFXEndpoints.EDFXExportData(df, output_format, file_name)
-
-
-
-if __name__ == "__main__":
-
-    public  = mk.EDF_X()['Client'],# EDFX public key
-    private = mk.EDF_X()['Client_Secret'], # EDFX private key.
-    endpoints = EDFXEndpoints(public, private)
-
-
-
-
-
-
-
-
-
-
-
+import io
+import os
+import requests
+import warnings
+import urllib.parse
+import datetime
+import time
+import tempfile
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+import seaborn as sns
+import moodys_keys as mk
+import requests
+import json
+import asyncio
+import operator
+import itertools
+import functools
+import aiohttp
+from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from contextlib import asynccontextmanager
+from loguru import logger
+from traceback import format_exc
+from aiohttp import ClientTimeout, ClientError, ServerTimeoutError
+from aiohttp import ClientSession
+from urllib.parse import urljoin,urlencode,quote_plus
+from EDFXAuthentication import EDFXClient
+from EDFXTransport import AdaptiveConcurrencyLimiter, MicroBatchLoader, RequestCoalescer, as_concurrency_limiter
+from EDFXJournal import BatchJournal
+from EDFXSinks import as_sink, columnar_table
+from EDFXProcesses import ProcessManager
+from EDFXTemplate import FinancialsTemplateBuilder
+from EDFXUpload import FileRangeReader, UploadError, UploadProgress, csv_parts, put_file
+from EDFXCache import PDCache, PDHistoryStore, canonical_key, match_mapping_queries
+import nest_asyncio
+nest_asyncio.apply()
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# =============================================================================================================
+# ATTENTION: Before you continue UNDERSTAND:
+# Moodys Analytics DOES NOT support this code. This code is for assistance and demonstration purposes only.
+# Licensed Clients should reference https://hub.moodysanalytics.com/products
+# and the functional endpoint examples when formatting their exact questions to support.
+# ==============================================================================================================
+
+
+# Helper function to flatten dictionaries.
+# It is not a static method because it is using recursion and will require hard coding the class name, better to keep it external
+def flatten_dict(input_dict:dict, separator:str='_',  parent_name:str='')->dict:
+
+    """
+    Recursively flattens a dictionary.
+    Each key in the flattened dictionary is a concatenation of the parent key and the current key.
+    If a key has multiple levels of dicts/lists, the keys are concatenated using underscores as ParentNames.
+    Values are converted to strings.
+    Args:
+        input_dict: The dictionary to be flattened.
+        separator: The separator used to concatenate keys.
+        parent_name: The parent name that will be added as prefix key
+    Return:
+        dict: flattened_dict
+
+    """
+    flattened_dict = {}
+    for key, value in input_dict.items():
+        if isinstance(value, dict):
+            flattened_dict.update(flatten_dict(value, separator, key))
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                item_key = f"{key}{separator}{index}"
+                if isinstance(item, dict):
+                    flattened_dict.update(flatten_dict(item, separator, item_key))
+                else:
+                    flattened_dict[item_key] = item
+        else:
+            if parent_name:
+                flattened_dict[f'{parent_name}{separator}{key}'] = value
+            else:
+                flattened_dict[key] = value
+    return flattened_dict
+
+def _layout_entries(input_dict:dict, separator:str, parent_name:str, path:tuple):
+
+    """
+    One level of the flatten_dict traversal: yields (nested dict or None for a leaf, flattened name, key path).
+    """
+    for key, value in input_dict.items():
+        if isinstance(value, dict):
+            yield value, key, path + (key,)
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                item_key = f"{key}{separator}{index}"
+                yield (item if isinstance(item, dict) else None), item_key, path + (key, index)
+        else:
+            yield None, f'{parent_name}{separator}{key}' if parent_name else key, path + (key,)
+
+def flatten_key_paths(input_dict:dict, separator:str='_')->dict:
+
+    """
+    Same traversal as flatten_dict (iterative, depth first), but maps every flattened key to the path of keys/indices
+    leading to its value instead of the value itself. Used to compile a record layout once and extract the other
+    records without flattening them.
+    """
+    key_paths = {}
+    stack = [_layout_entries(input_dict, separator, '', ())]
+    while stack:
+        for node, name, path in stack[-1]:
+            if node is None:
+                key_paths[name] = path
+            else:
+                stack.append(_layout_entries(node, separator, name, path))
+                break
+        else:
+            stack.pop()
+    return key_paths
+
+def record_shape(record:dict) -> tuple:
+
+    """
+    Hashable signature of the structure of record: keys, list lengths and where the leaves are. Empty containers
+    count, and a scalar (None included) differs from a dict or list, so two records of the same shape flatten to the
+    same columns. Records with the same shape share a RecordLayout.
+    """
+    shape = []
+    stack = [record]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            shape.append(tuple(value))
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            shape.append(len(value))
+            stack.extend(value)
+        else:
+            shape.append(None)
+    return tuple(shape)
+
+# layouts by (endpoint, record shape), shared by every parse of the process
+RECORD_LAYOUTS = {}
+RECORD_LAYOUTS_MAXSIZE = 256
+
+def record_layout(record:dict, endpoint:str='') -> 'RecordLayout':
+
+    """
+    Returns the RecordLayout of record, from the cache when a record of the same endpoint and shape was seen before.
+    """
+    key = (endpoint, record_shape(record))
+    layout = RECORD_LAYOUTS.get(key)
+    if layout is None:
+        if len(RECORD_LAYOUTS) >= RECORD_LAYOUTS_MAXSIZE:
+            # drop the oldest layout
+            del RECORD_LAYOUTS[next(iter(RECORD_LAYOUTS))]
+        layout = RECORD_LAYOUTS[key] = RecordLayout(record, endpoint=endpoint)
+    return layout
+
+# types of the values flatten_dict keeps as they are, a value of any other type sends its record to flatten_dict
+LEAF_TYPES = frozenset({str, int, float, bool, type(None)})
+
+def path_getter(path:tuple):
+
+    """
+    Function returning the value at path (keys / list indices) of a record, the record itself for an empty path.
+    """
+    if not path:
+        return lambda record: record
+    if len(path) == 1:
+        return operator.itemgetter(path[0])
+    if len(path) == 2:
+        first, second = path
+        return lambda record: record[first][second]
+
+    def getter(record):
+        for step in path:
+            record = record[step]
+        return record
+    return getter
+
+def _layout_checks(record:dict) -> list:
+
+    """
+    (getter, type, keys or length, leaves) of every container of record, the record first and every container
+    before the ones inside it. leaves returns the values of the container expected to be leaves.
+    """
+    checks = []
+    stack = [((), record)]
+    while stack:
+        path, value = stack.pop()
+        items = value.items() if isinstance(value, dict) else enumerate(value)
+        leaves = []
+        for key, item in items:
+            if isinstance(item, (dict, list)):
+                stack.append((path + (key,), item))
+            else:
+                leaves.append(key)
+        if len(leaves) == len(value):
+            leaf_values = dict.values if isinstance(value, dict) else tuple
+        elif not leaves:
+            leaf_values = lambda container: ()
+        elif len(leaves) == 1:
+            leaf_values = lambda container, key=leaves[0]: (container[key],)
+        else:
+            leaf_values = operator.itemgetter(*leaves)
+        expected = tuple(value) if isinstance(value, dict) else len(value)
+        checks.append((path_getter(path), type(value), expected, leaf_values))
+    return checks
+
+class RecordLayout():
+
+    """
+    Layout of one record shape: the flattened column names flatten_dict would produce and one getter per column
+    reading its value straight from a record, without recursion or building key strings. Before a record is read,
+    every container of the sample is checked in it (same type, keys or list length, empty ones included, and plain
+    JSON scalars where the sample had leaves); a record that differs has another shape, and another layout.
+    Use record_layout() to get the cached layout of a record.
+    """
+
+    def __init__(self, record:dict, separator:str='_', endpoint:str=''):
+
+        self.endpoint = endpoint
+        key_paths = flatten_key_paths(record, separator)
+        self.columns = list(key_paths)
+        self.paths = list(key_paths.values())
+        self.checks = _layout_checks(record)
+        self.getters = [path_getter(path) for path in self.paths]
+
+    def matches(self, record) -> bool:
+
+        """
+        True when record flattens to the columns of the layout, with the values the getters read.
+        """
+        for getter, kind, expected, leaf_values in self.checks:
+            container = getter(record)
+            if type(container) is not kind:
+                return False
+            if (tuple(container) if kind is dict else len(container)) != expected:
+                return False
+            if not LEAF_TYPES.issuperset(map(type, leaf_values(container))):
+                return False
+        return True
+
+    def all_match(self, records:list) -> bool:
+
+        """
+        matches() of all records at once, every check running over the whole list.
+        """
+        for getter, kind, expected, leaf_values in self.checks:
+            containers = list(map(getter, records))
+            if not {kind}.issuperset(map(type, containers)):
+                return False
+            if any(map(expected.__ne__, map(tuple if kind is dict else len, containers))):
+                return False
+            if not LEAF_TYPES.issuperset(map(type, itertools.chain.from_iterable(map(leaf_values, containers)))):
+                return False
+        return True
+
+    def match_end(self, records:list, start:int) -> int:
+
+        """
+        Index of the first record from start on which does not match the layout, len(records) when they all do.
+        """
+        matches = self.matches
+        stop = start
+        while stop < len(records) and matches(records[stop]):
+            stop += 1
+        return stop
+
+class ColumnarFrame():
+
+    """
+    Accumulates flattened records one list per column, so the DataFrame (or Arrow table) is built column-wise in
+    a single step instead of from a list of per-row dicts. Columns missing from a block of rows are padded with NaN.
+    """
+
+    # shortest run of records of one shape worth reading through its layout, see extend_flattened
+    MIN_LAYOUT_RUN = 16
+
+    def __init__(self):
+        self.columns = {}
+        self.rows = 0
+        # (layout, constant names) -> constant names not overridden by the layout, layout columns
+        self.targets = {}
+
+    def extend(self, names:list, values:list, count:int):
+
+        """
+        Appends count rows: values[i] holds the count values of column names[i].
+        """
+        for name, column_values in zip(names, values):
+            self.column(name).extend(column_values)
+        self.rows += count
+        if len(self.columns) != len(names):
+            for column in self.columns.values():
+                if len(column) < self.rows:
+                    column.extend([np.nan] * (self.rows - len(column)))
+
+    def column(self, name:str) -> list:
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = [np.nan] * self.rows
+        return column
+
+    def extend_flattened(self, records:list, layout:RecordLayout, constants:dict=None):
+
+        """
+        Appends records flattened like flatten_dict, with the constants (column: value) in front of every row
+        ({**constants, **flatten_dict(record)}). layout is the cached layout of the first record: when every record
+        matches it (checked over the whole list at once) they are read column by column. Otherwise the records are
+        taken run by run, one pass with a cursor, each run of records of one shape going through the cached layout of
+        that shape. Once a run shorter than MIN_LAYOUT_RUN ends, shapes alternate too often for layouts to pay off and
+        the rest of the records are flattened with flatten_dict.
+        """
+        constants = constants or {}
+        if layout.all_match(records):
+            self.extend_layout(records, layout, constants)
+            return
+        start = 0
+        while start < len(records):
+            stop = layout.match_end(records, start)
+            if stop > start:
+                self.extend_layout(records[start:stop], layout, constants)
+            if stop < len(records) and stop - start < self.MIN_LAYOUT_RUN:
+                self.extend_records([{**constants, **flatten_dict(record)} for record in records[stop:]])
+                return
+            if stop < len(records):
+                record = records[stop]
+                layout = record_layout(record, layout.endpoint)
+                if not layout.matches(record):
+                    # same shape but leaves of other types (e.g. a tuple), only flatten_dict reads it like the parsers did
+                    self.append_record({**constants, **flatten_dict(record)})
+                    stop += 1
+            start = stop
+
+    def extend_layout(self, records:list, layout:RecordLayout, constants:dict):
+
+        """
+        Appends records all matching layout, column by column.
+        """
+        key = (layout, tuple(constants))
+        if key not in self.targets:
+            # columns created in the order of {**constants, **flattened record}, a flattened value wins over a constant
+            names = list(dict.fromkeys([*constants, *layout.columns]))
+            for name in names:
+                self.column(name)
+            layout_names = set(layout.columns)
+            constant_names = [name for name in constants if name not in layout_names]
+            self.targets[key] = constant_names, [self.columns[name] for name in layout.columns]
+        constant_names, targets = self.targets[key]
+
+        count = len(records)
+        for column, getter in zip(targets, layout.getters):
+            column.extend(map(getter, records))
+        for name in constant_names:
+            self.columns[name].extend([constants[name]] * count)
+        self.rows += count
+        if len(self.columns) != len(targets) + len(constant_names):
+            for column in self.columns.values():
+                if len(column) < self.rows:
+                    column.extend([np.nan] * (self.rows - len(column)))
+
+    def append_record(self, record:dict):
+        for name, value in record.items():
+            self.column(name).append(value)
+        self.rows += 1
+        if len(record) != len(self.columns):
+            for column in self.columns.values():
+                if len(column) < self.rows:
+                    column.append(np.nan)
+
+    def extend_records(self, records:list):
+        names = list(dict.fromkeys(itertools.chain.from_iterable(records)))
+        missing = itertools.repeat(np.nan)
+        self.extend(names, [list(map(dict.get, records, itertools.repeat(name), missing)) for name in names],
+                    len(records))
+
+    @staticmethod
+    def column_array(column:list):
+        # numeric columns (the PDs and term structures) are converted in one numpy call instead of being inferred by pandas
+        sample = column[0] if column else None
+        if type(sample) is float and sample == sample:
+            try:
+                return np.fromiter(column, dtype=np.float64, count=len(column))
+            except (TypeError, ValueError):
+                pass
+        return column
+
+    def to_pandas(self) -> pd.DataFrame:
+        return pd.DataFrame({name: self.column_array(column) for name, column in self.columns.items()})
+
+    def to_arrow(self):
+        if pa is None:
+            raise ImportError("pyarrow is required for the Arrow output format: pip install pyarrow")
+        return pa.table({name: pa.array(column, from_pandas=True) for name, column in self.columns.items()})
+
+def pd_columns(entities, frame:ColumnarFrame = None) -> ColumnarFrame:
+
+    """
+    Appends the rows of PD entities (one per history record) to frame, a new ColumnarFrame by default.
+    entities may be any iterable, e.g. the entities of a result file streamed by iter_json_items.
+    Every history record is still checked against its layout, so EDFXPDParse is ~2-2.5x the row-by-row
+    flatten_dict parse on uniform histories, not more.
+    """
+    frame = ColumnarFrame() if frame is None else frame
+    layout = None
+    for entity in entities:
+        if 'history' in entity:
+            history = entity['history']
+            if not history:
+                continue
+            entity_data = flatten_dict({
+                k: v for k, v in entity.items()
+                if k != 'history' and
+                k not in history[0]
+            })
+            # consecutive entities usually have histories of the same shape, the previous layout is tried first
+            if layout is None or not layout.matches(history[0]):
+                layout = record_layout(history[0], 'pds/history')
+            frame.extend_flattened(history, layout, entity_data)
+        else:
+            # if there is no history you can't append the history.
+            frame.extend_records([flatten_dict(entity)])
+    return frame
+
+def iter_json_items(path:str, prefix:str = 'entities.item'):
+
+    """
+    Yields the items found at prefix (ijson syntax, 'entities.item' is every element of the top level entities list)
+    of a JSON file one at a time, so only the current item is held in memory whatever the size of the file.
+    Requires the optional ijson package.
+    """
+    if ijson is None:
+        raise ImportError("ijson is required to parse result files incrementally: pip install ijson")
+    with open(path, 'rb') as file:
+        yield from ijson.items(file, prefix, use_float=True)
+
+def write_columnar(df:pd.DataFrame, file_format:str, file_name:str, compression:str = None,
+                   row_group_size:int = None, partition_by = None) -> str:
+
+    """
+    Writes df as Parquet or Feather (Arrow IPC) and returns the written path.
+
+    file_format: 'parquet' or 'feather'.
+    compression: Codec name (Parquet: snappy, zstd, gzip, brotli, lz4, none; Feather: zstd, lz4, uncompressed).
+                 None keeps the pyarrow default.
+    row_group_size: Rows per Parquet row group / Feather record batch.
+    partition_by: Column name or list of names (e.g. 'entityId', 'asOfDate'). The output is then a hive partitioned
+                  directory file_name/ (file_name/asOfDate=2024-01-31/part-0.parquet) instead of a single file.
+    """
+    if pa is None:
+        raise ImportError(f"pyarrow is required for the {file_format.title()} output format: pip install pyarrow")
+    import pyarrow.dataset as ds
+    if isinstance(partition_by, str):
+        partition_by = [partition_by]
+    table = columnar_table(df, partition_by)
+    if file_format not in ('parquet', 'feather'):
+        raise ValueError(f"Unsupported columnar format: {file_format}.")
+    extension = file_format
+
+    if not partition_by:
+        path = f"{file_name}.{extension}"
+        if file_format == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table, path, compression=compression or 'snappy', row_group_size=row_group_size)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(table, path, compression=compression, chunksize=row_group_size)
+        return path
+
+    if file_format == 'parquet':
+        file_options = ds.ParquetFileFormat().make_write_options(compression=compression or 'snappy')
+    else:
+        file_options = ds.IpcFileFormat().make_write_options(compression=compression)
+    # one directory per entityId can exceed the 1024 partitions pyarrow allows by default
+    partitions = table.select(partition_by).group_by(partition_by).aggregate([]).num_rows
+    group_options = {'max_partitions': max(partitions, 1024)}
+    if row_group_size:
+        group_options.update(max_rows_per_group=row_group_size, min_rows_per_group=min(row_group_size, 1 << 14))
+    ds.write_dataset(table, file_name, format='parquet' if file_format == 'parquet' else 'ipc',
+                     partitioning=partition_by, partitioning_flavor='hive', file_options=file_options,
+                     basename_template=f"part-{{i}}.{extension}", existing_data_behavior='delete_matching',
+                     **group_options)
+    return file_name
+
+def filter_out_list_and_dict(dictionary: dict, prefix: str = ''):
+    '''
+    Returns a version of dictionary that has only keys that are not dict or list type.
+    If prefix is provided it will be added to keys.
+    '''
+    return {
+        f'{prefix}_{key}' if prefix else key: value for key, value in dictionary.items()
+        if not isinstance(value, (list, dict))}
+
+def PDDrivers_extract_ratios(entity: dict) -> list:
+    """
+    HelperFunction to Parse Pd History Json
+    """
+    ratios = []
+    if not isinstance(entity, dict):
+        raise TypeError(f'Expected entity to be a dict, but got {type(entity)}: {entity}')
+
+    # Handle inputData section
+    input_data = entity.get('inputData', [])
+    for item in input_data:
+        if isinstance(item, dict) and "message" in item:
+            ratio_data = {
+                "entityId": entity['entityId'],
+                "asOfDate": None,
+                "Type": "Error",
+                "ErrorMessage": item["message"]
+            }
+            ratios.append(ratio_data)
+    #handle results section
+    result_data = entity.get('resultData', {})
+    for key, items in result_data.items():
+        # Check if the item is not a list of dictionaries, then convert it to one
+        if not isinstance(items, list):
+            items = [items]
+
+        for item in items:
+            # Check if the item is a dictionary
+            if not isinstance(item, dict):
+                continue
+
+            if key == 'relativeContribution':  # Check for current data
+                ratio_data = {"entityId": entity['entityId'], "asOfDate": item['asOfDate'], 'Type': 'Current'}
+            else:
+                ratio_data = {"entityId": entity['entityId'], "asOfDate": item['asOfDate'], 'Type': key}
+
+            for k, value in item.items():
+                ratio_data[k] = value
+            ratios.append(ratio_data)
+
+    return ratios
+
+
+class FinancialTemplate(Enum):
+
+    """
+    Use of Enums:
+
+    Purpose: Enums can represent a set of named values, ensuring that only those values can be used.
+
+    Benefit: Prevents arbitrary string values from being passed to the function. This leads to more
+    predictable behavior and reduces potential bugs.
+
+    """
+
+    UNIVERSAL = 'Universal'
+    BANK = 'Bank'
+
+class OutputFormat(Enum):
+    PANDAS = 'Pandas'
+    EXCEL = 'Excel'
+    CSV = 'Csv'
+    ARROW = 'Arrow'
+    PARQUET = 'Parquet'
+    FEATHER = 'Feather'
+
+class EDFXEndpoints(EDFXClient):
+
+    """
+    EDFXEndpoints Class provides all EDF-X Endopints.
+
+    Class attributes will be constructed with the unique
+    headers and payloads for EDF-X
+
+    """
+    EDFXProxies = {}
+
+    def __init__(self, api_publickey:str = None, api_privatekey:str=None, proxies={}, async_limit:int=100,
+                 async_limit_per_host:int=0, async_ttl_dns_cache:int=300, entity_cache=None, pd_cache:PDCache=None,
+                 coalesce_window:float=None, *args, **kwargs):
+
+        """
+        async_limit: Total number of simultaneous connections of the shared aiohttp connector.
+        async_limit_per_host: Simultaneous connections to the same host (0 means no per host cap).
+        async_ttl_dns_cache: Seconds a resolved DNS entry is cached by the connector.
+        entity_cache: Optional EDFXCache.MemoryCache or EDFXCache.SQLiteCache of the entity search and mapping
+                      responses. Mapping calls then only send the identifiers missing from the cache, e.g.
+                      entity_cache=SQLiteCache(namespace='entities', ttl=7 * 24 * 3600) shares them between runs.
+        pd_cache: Optional EDFXCache.PDCache. The PD endpoints (sync and async) then only send the entities whose PDs
+                  for the same request parameters are not cached yet.
+        coalesce_window: Seconds EDFXPD_Endpoint and EDFXRetrievinglimtsfortradecredit wait to merge concurrent calls
+                         (threads or coroutines) with the same parameters into one upstream request; entities already
+                         in flight are not requested twice. None (default) sends every call on its own.
+
+        The async session is opened once per client lifetime and shared by every coroutine path:
+
+            async with EDFXEndpoints(public, private) as endpoints:
+                df = await endpoints.SynchronousBatchMVP_async(...)
+        """
+        # pool_connections, pool_maxsize and max_retries are forwarded to EDFXClient which owns the pooled self.session
+        super().__init__(api_publickey, api_privatekey, proxies, *args, **kwargs)
+        # this token is in bytes that needs to be in str type
+        self.async_limit = async_limit
+        self.async_limit_per_host = async_limit_per_host
+        self.async_ttl_dns_cache = async_ttl_dns_cache
+        self.async_session = None
+        # number of open scopes (async with blocks) currently sharing self.async_session
+        self.async_session_users = 0
+        # immutable header sets for the current token, swapped as a whole by on_bearer_token_refreshed
+        self.header_sets = None
+        # adaptive concurrency limiters of the async fan-outs by name, kept between runs so the learned window carries over
+        self.concurrency_limiters = {}
+        # identifier -> entity mappings and search responses, see EDFXCache
+        self.entity_cache = entity_cache
+        # per-entity PD responses
+        self.pd_cache = pd_cache
+        # single-flight request coalescers by endpoint, see request_coalescer
+        self.coalesce_window = coalesce_window
+        self.request_coalescers = {}
+
+    def create_async_session(self) -> ClientSession:
+
+        """
+        Builds the aiohttp session (and its TCPConnector) shared by every coroutine of this client.
+        Timeouts are passed per request so one session serves calls with different timeouts.
+        """
+        connector = aiohttp.TCPConnector(limit=self.async_limit, limit_per_host=self.async_limit_per_host,
+                                         ttl_dns_cache=self.async_ttl_dns_cache)
+        return ClientSession(connector=connector)
+
+    async def open_async_session(self) -> ClientSession:
+        """
+        Opens the shared async session if needed and registers one more user of it.
+        """
+        if self.async_session is None or self.async_session.closed:
+            self.async_session = self.create_async_session()
+        self.async_session_users += 1
+        return self.async_session
+
+    async def close_async_session(self):
+        """
+        Unregisters one user of the shared async session and closes it when nobody uses it anymore.
+        """
+        self.async_session_users = max(self.async_session_users - 1, 0)
+        if self.async_session_users == 0 and self.async_session is not None:
+            await self.async_session.close()
+            self.async_session = None
+
+    @asynccontextmanager
+    async def async_session_scope(self):
+        """
+        Yields the shared aiohttp session. If the client was not entered with 'async with' the session
+        lives for the outermost scope, e.g. a whole SynchronousBatchMVP_async run, instead of a single batch.
+        """
+        session = await self.open_async_session()
+        try:
+            yield session
+        finally:
+            await self.close_async_session()
+
+    async def __aenter__(self):
+        await self.open_async_session()
+        return self
+
+    async def __aexit__(self, exit_type, exit_value, traceback):
+        await self.close_async_session()
+        # the coalescer threads may still be finishing a call, don't block the loop on them
+        await asyncio.to_thread(self.close_request_coalescers)
+
+    def close_request_coalescers(self):
+        """
+        Sends the batches still collecting entities and shuts the request coalescers down, they are created again if
+        the client is used afterwards.
+        """
+        while self.request_coalescers:
+            _, coalescer = self.request_coalescers.popitem()
+            coalescer.close()
+
+    def close(self):
+        self.close_request_coalescers()
+        super().close()
+
+    def EDFXHeaders(self, process_id=None):
+
+        """
+        Returns the header sets for the current bearer token.
+
+        The header sets are pre-built and immutable, they are rebuilt and swapped in only when the token
+        is renewed (ahead of expiry by the background timer of EDFXClient), so on the hot path this is
+        a timestamp check and a dictionary lookup. get_bearer_token() is only called when no token exists
+        yet or the token is due for renewal.
+
+        If you're using the ModelInputsUploadProcess be sure to feed the process_id
+        Some of these parameters appear obnoxious but that's due to the fact the EDF-X API
+        Requires them to be passed as such (see boundry in ModelInputsProcess)
+
+        """
+        header_sets = self.header_sets
+        if header_sets is None or time.time() >= self.renewal_timestamp:
+            bearer_token = self.get_bearer_token()
+            header_sets = self.current_header_sets(bearer_token)
+        return self.with_upload_headers(header_sets, process_id)
+
+    async def EDFXHeaders_async(self, process_id=None):
+
+        """
+        Coroutine version of EDFXHeaders. get_bearer_token_async() renews the token without blocking the event loop
+        and lets the other coroutines keep the still-valid token while one renewal is in flight.
+        """
+        header_sets = self.header_sets
+        if header_sets is None or time.time() >= self.renewal_timestamp:
+            bearer_token = await self.get_bearer_token_async()
+            header_sets = self.current_header_sets(bearer_token)
+        return self.with_upload_headers(header_sets, process_id)
+
+    def on_bearer_token_refreshed(self, bearer_token:bytes):
+
+        """
+        Rebuilds the header sets for the new token and swaps them in with a single assignment.
+        """
+        self.header_sets = self.build_headers(bearer_token)
+
+    def current_header_sets(self, bearer_token:bytes):
+
+        """
+        Header sets matching bearer_token. While a renewal is in flight get_bearer_token() may hand back the
+        still-valid previous token whose header sets are the ones currently cached.
+        """
+        header_sets = self.header_sets
+        if header_sets is None or header_sets['bearer_token'] != bearer_token:
+            header_sets = self.build_headers(bearer_token)
+        return header_sets
+
+    def with_upload_headers(self, header_sets, process_id=None):
+
+        """
+        The ModelInputsUploadProcess headers carry the process_id so they are the only ones built per call.
+        """
+        if not process_id:
+            return header_sets
+        upload_headers = MappingProxyType({
+                                "headers": MappingProxyType({
+                                        'x-amz-tagging': 'edfx_process_id=' + process_id,
+                                        'content-type': 'text/csv'
+                                    })
+                                })
+        return MappingProxyType({**header_sets, "ModelInputsUploadProcess": upload_headers})
+
+    def build_headers(self, bearer_token:bytes):
+
+        """
+        Builds the immutable header sets used by the EDFX endpoints for the given bearer token.
+        """
+        bearer = bearer_token.decode('utf-8') if bearer_token else None
+
+        if bearer is not None:
+            header_sets =  {
+                    "JSONBasic": {
+                        "headers" : {
+                                "accept": "application/json",
+                                "content-type": "application/json",
+                                "authorization": "Bearer " + bearer
+                                }
+                            },
+                    "JSONMultipart":{
+                        "headers" : {
+                                "accept": "application/json",
+                                "content-type": "multipart/form-data",
+                                "authorization": "Bearer " + bearer
+                                }
+                            },
+                    "JSONGet": {
+                        "headers": {
+                                "accept": "application/json",
+                                "authorization": "Bearer " + bearer
+                                    }
+                            },
+                    "ModelInputsProcess": {
+                        "headers": {
+                                    "accept": "application/json",
+                                    "content-type": "multipart/form-data; boundary=---011000010111000001101001",
+                                    "authorization": "Bearer " + bearer
+                                    }
+                        },
+                    "ModelInputsUploadProcess":{
+                        "headers": {
+                                        'x-amz-tagging': 'process_id_not_used.',
+                                        'content-type': 'text/csv'
+                                    }
+                        }
+                    }
+            header_sets = {name: MappingProxyType({"headers": MappingProxyType(value["headers"])})
+                           for name, value in header_sets.items()}
+            header_sets["bearer_token"] = bearer_token
+            return MappingProxyType(header_sets)
+        else:
+            raise ValueError('bearer is None')
+
+    def create_params_dict(self, params: dict):
+        """
+        Helper Function to select params
+        """
+        params = {key: value for key, value in params.items() if value is not None}
+        return params
+
+
+
+    def format_PDpayload(self, entity_series:pd.Series ):
+
+        """
+        Takes in a Pandas Series and outputs the relevant Payload.
+
+        This can also be a list not just a pandas series.
+        """
+
+        return [{"entityId": entity} for entity in entity_series]
+    
+
+
+    def format_BatchMappingpayload(self, entity_series: pd.Series, identifier_type:str = "identifierBvd"):
+        """
+        Takes in a Pandas Series and outputs the relevant Payload based on the identifier type.
+
+        Parameters:
+        - entity_series: pd.Series or list, containing the entity identifiers.
+        - identifier_type: str, specifying the type of identifier (e.g., 'identifierBvd', 'pid', etc.).
+
+        Returns:
+        - dict: Payload for the API request.
+
+        Example:
+        - format_BatchMappingpayload(entity_series, 'identifierBvd')
+        """
+
+        # Validate identifier_type
+        valid_identifiers = [
+            "identifierBvd",
+            "entityidentifierorbis",
+            "entityIdentifierTaxNumber",
+            "entityIdentifierEin",
+            "isin",
+            "cusip",
+            "lei",
+            "pid",
+            "ticker"
+        ]
+
+        if identifier_type not in valid_identifiers:
+            raise ValueError(f"Invalid identifier type. Must be one of: {valid_identifiers}")
+
+        # Construct the payload
+        queries = [{identifier_type: entity} for entity in entity_series]
+
+        return queries
+
+
+    def split_list(self, input_list:list[dict[str,str]], BatchSize:int):
+
+        """
+        Splits input list into batches of size <batchsize> returning a generator
+
+        This is used within our batch function SynchronousBatchMVP. input_list may also be any iterable (a generator
+        reading entities from a file for example), it is then consumed lazily one batch at a time.
+
+        """
+
+        if not isinstance(input_list, (list, tuple)):
+            iterator = iter(input_list)
+            while batch := list(itertools.islice(iterator, BatchSize)):
+                yield batch
+            return
+
+        for ii in range(0, len(input_list), BatchSize):
+            yield input_list[ii:ii + BatchSize]
+
+    def EDFXEntitySearchEndpoint(self,query:str, limit:int=None, offset:int=None):
+
+        """
+        Entity Search Endpoint:
+
+            query:required Param
+
+            limit: 	Specify the maximum number of results returned in single call.
+
+            offset: 	Specify the index from which to start returning results.
+                        Use with the limit parameter to get result batches to process.
+                        For example, limit= 10, offset = 20, returns the results indexed
+                        from 20-29.
+        """
+        search = "/entity/v1/search"
+        base = self.base_url
+        Searchurl = urljoin(base,search)
+        #general post headers for RESTFUL API's
+        headers = self.EDFXHeaders()['JSONBasic']['headers']
+
+        params = {
+                    'query': query,
+                    'limit': limit,
+                    'offset':offset
+                }
+        params = self.create_params_dict(params)
+        cache = self.entity_cache
+        key = canonical_key(search, params)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        response = self.session.post(Searchurl, headers=headers, json=params, idempotent=True)
+        params = response.json()
+        if cache is not None and isinstance(params, dict) and 'entities' in params:
+            cache.set(key, params)
+
+        return params
+
+    def EDFXBatchEntitySearch(self,queries:list[dict[str,str]]):
+
+        """
+        Batch Entity Explanation,
+
+        An object containing the companies identifiers. The currently supported identifiers
+        are listed in "Appendix: Supported Identifiers";
+        the keys accepted by the json for the main ones are:
+
+        - entityidentifierbvd- Identifier from Orbis
+        - entityidentifierorbis - Identifier from Orbis
+        - entityIdentifierTaxNumber
+        - entityIdentifierEin - Employer Reference Number
+        - isin - International Securities Identification Number
+        - cusip - Committee on Uniform Securities Identification Procedures
+        - lei - Legal Entity Identifier
+        - pid - CreditEdge Identifier
+        - ticker - Stock symbol
+
+        Provide the keys and the related values. ==> Example of a request of eac,
+
+            EX of query to feed:
+            [{ "entityIdentifierPartitaIva": 1959680388 }, { "lei": "549300CRVT18MXX0AG93" }, { "cusip": 594918 }, { "isin": "US3453708600" }, { "pid": "34537A" }]
+
+        With an entity_cache only the queries missing from the cache are sent. The returned entities then follow the
+        order of the queries (one per resolved query) followed by any returned entity no query could be matched to.
+
+        """
+        # Simple error handling: It's just saying if they don't feed a list of dictionary elements return that message
+        if not isinstance(queries, list) or not all(isinstance(q, dict) for q in queries):
+            print("You need to feed a list of dictionary elements. For example: queries = [{'pid': '34537A'}, {'cusip': 594918}]")
+            return
+        if self.entity_cache is None:
+            return self._post_mapping(queries)
+
+        keys, cached, misses = self._mapping_cache_lookup(queries)
+        response = self._post_mapping([query for _, query in misses]) if misses else {}
+        return self._mapping_cache_merge(keys, cached, misses, response)
+
+    def _mapping_cache_lookup(self, queries:list):
+
+        """
+        Splits the mapping queries into the entities found in the entity cache and the queries to send.
+        """
+        keys = [canonical_key("/entity/v1/mapping", query) for query in queries]
+        cached = self.entity_cache.get_many(keys)
+        misses = [(key, query) for key, query in zip(keys, queries) if key not in cached]
+        logger.debug(f"Mapping cache: {len(queries) - len(misses)} of {len(queries)} queries cached.")
+        return keys, cached, misses
+
+    def _mapping_cache_merge(self, keys:list, cached:dict, misses:list, response:dict):
+
+        """
+        Caches the entities resolving the sent queries and merges them with the cached ones in query order.
+        A response to uncached queries only is returned as the API sent it.
+        """
+        fresh = response.get('entities') or [] if isinstance(response, dict) else []
+        miss_keys = [key for key, _ in misses]
+        matches = match_mapping_queries([query for _, query in misses], fresh)
+        resolved = {key: entity for key, entity in zip(miss_keys, matches) if entity is not None}
+        if resolved:
+            self.entity_cache.set_many(resolved)
+        if not cached:
+            return response
+
+        entities = [cached[key] if key in cached else resolved[key] for key in keys if key in cached or key in resolved]
+        matched = {id(entity) for entity in resolved.values()}
+        entities.extend(entity for entity in fresh if id(entity) not in matched)
+        return {**(response if isinstance(response, dict) else {}), "entities": entities}
+
+    def _post_mapping(self, queries:list):
+
+        """
+        POST of the queries to the mapping endpoint, one query at a time if the batch call fails.
+        """
+        base = self.base_url
+        batch = "/entity/v1/mapping"
+        batchurl = urljoin(base,batch)
+        #general post headers for RESTFUL API's
+        headers = self.EDFXHeaders()['JSONBasic']['headers']
+        payload = { "queries" : queries}
+        response = self.session.post(batchurl, headers=headers, json=payload, idempotent=True)
+
+        # Handle failed batch request by procesing entities one by one
+        if response.status_code == 200:
+            return response.json()
+        else:
+            logger.warning(f'Batch call failed: {response.text}')
+            data = {}
+            for i, query in enumerate(queries):
+                print(f'Pocessing query {i} of {len(queries)}')
+                partial_payload = { "queries" : [query]}
+                response = self.session.post(batchurl, headers=headers, json=partial_payload, idempotent=True)
+                if response.status_code == 200:
+                    if data:
+                        data['entities'].append(response.json()['entities'])
+                    else:
+                        data = response.json()
+                else:
+                    logger.warning(f"API call failed: {partial_payload} Error: {response.text}")
+
+            return data
+
+    async def EDFXBatchEntitySearch_async(self, queries: list[dict[str, str]]):
+
+        """
+        This is Async Functionality for the EDFXBatchEntitySearch Function.
+        With an entity_cache only the queries missing from the cache are sent (see EDFXBatchEntitySearch).
+        """
+
+        if not isinstance(queries, list) or not all(isinstance(q, dict) for q in queries):
+            logger.warning("You need to feed a list of dictionary elements.")
+            return
+        if self.entity_cache is None:
+            return await self._post_mapping_async(queries)
+
+        keys, cached, misses = self._mapping_cache_lookup(queries)
+        response = await self._post_mapping_async([query for _, query in misses]) if misses else {}
+        return self._mapping_cache_merge(keys, cached, misses, response)
+
+    async def _post_mapping_async(self, queries: list):
+
+        """
+        Async POST of the queries to the mapping endpoint under the client's retry policy.
+        """
+        policy = self.retry_policy
+        policy.record_request()
+        async with self.async_session_scope() as session:
+            for attempt in range(policy.max_attempts):
+                await policy.wait_for_pause_async()
+                try:
+                    return await self._post_batch(session, queries)
+                except Exception as e:
+                    logger.warning(f'EDFXBatchEntitySearch_async call failed: {type(e).__name__} | Attempt {attempt+1} of {policy.max_attempts}')
+                    if not policy.should_retry(attempt, error=e):
+                        return
+                    await asyncio.sleep(policy.delay(attempt, getattr(e, 'headers', None)))
+
+
+    async def _post_async(self, session: ClientSession, url: str, headers: dict, payload: dict):
+        """
+        Helper function for _post_batch async funciton
+        """
+        async with session.post(url, headers=headers, json=payload) as response:
+            if response.status == 200:
+                return await response.json()
+            else:
+                logger.warning(f"Batch call failed: response status: {response.status}")
+                # ClientResponseError carries the status and headers the retry policy classifies
+                response.raise_for_status()
+                raise ValueError(f"Unexpected response status {response.status}")
+
+    async def _post_batch(self, session: ClientSession, queries: list):
+
+        """
+         Async Batch function for search
+        """
+
+        base = self.base_url
+        batch = "/entity/v1/mapping"
+        batchurl = urljoin(base, batch)
+        headers = (await self.EDFXHeaders_async())['JSONBasic']['headers']
+        payload = {"queries": queries}
+
+        # Try the batch request first
+        return await self._post_async(session, batchurl, headers, payload)
+
+    async def BatchingBatchSearch_async(self, EntityPayload: list[dict[str, str]], BatchSize: int):
+
+        """This isnt' quite right """
+        batches = list(self.split_list(EntityPayload, BatchSize=BatchSize))
+        # one session for every batch of the run
+        async with self.async_session_scope():
+            responses = await asyncio.gather(*(self.EDFXBatchEntitySearch_async(
+                queries=b) for b in batches
+            ), return_exceptions=False
+            )
+
+        dfs = []
+        for search_dict in responses:
+            if not search_dict:
+                 logger.warning(f"API returned a NONE response. {search_dict.status_code} + {search_dict.response}+{search_dict.text} .")
+            Batchdf = self.EDFXBatchParse(search_dict)
+            dfs.append(Batchdf)
+
+        if dfs:
+            return pd.concat(dfs)
+        else:
+            logger.info("No dataframes were created.")
+            return None
+
+    def BatchingBatchSearch(self, EntityPayload:list[dict[str,str]], BatchSize:int):
+
+        """
+        Batches the EDFXBatchParse Function
+        """
+        dfs = []
+        for entities_batch in self.split_list(EntityPayload,BatchSize=BatchSize):
+            # try:
+            Batch_dict = self.EDFXBatchEntitySearch(queries=entities_batch)
+            if not Batch_dict:
+                logger.warning("API Returned None Response.")
+            Batchdf = self.EDFXBatchParse(Batch_dict)
+            dfs.append(Batchdf)
+            # except Exception as e:
+            #     logger.error(f"An error occured with Batch at index {entities_batch[0]}: {e}.")
+        if dfs:
+            return pd.concat(dfs)
+        else:
+            logger.info(f"No dataframes were created. dfs: {dfs}")
+            return None
+
+    def EDFXPD_Endpoint(self, entities:list[dict[str,str]]=None, startDate:str=None, endDate:str=None, historyFrequency:str='monthly',
+                        asyncResponse:bool=False, asReported:bool=False, modelParameters:bool=False, includeDetailResult:bool=False,
+                        includeDetailInput:bool = False, includeDetailModel:bool=False, includeTermStructure: bool=True, processId:str=None,
+                        CreditEdge:bool=False, RiskCalc:bool=False, TradePayment:bool=False, timeout:float=None):
+
+        """
+        Params: These are the values of the paramater dictionary you are feeding the method.
+
+            Entities: The object is a list of dictionary elements: value = [{'entityId': 'identifier'}]
+                        multiple entities exmampe:
+                        [{ "entityId": "DELEI421244" }, { "entityId": "US800890963" }, { "entityId": "FR813755949" }]
+
+            startDate: If provided, generates a history of PD values in the format YYYY-MM-DD.
+
+            endDate: The date of the PD you are retrieving in the format YYYY-MM-DD.
+
+            historyFrequency: reference APIHUB FOR FULL details:
+                            This endpoint defines the frequency of the PD value history.
+                            Allowed values are: "daily"; "monthly"; "quarterly"; or "annual". Default = 'monthly'
+
+            modelParameters: This is referring to Financial Statement Only.  Set to TRUE if you need FSO EDF
+            processID: This parameter is alternative to providing the list of entities.
+                        The values accepted are process IDs received when uploading a csv file through the /modelInput endpoint.
+
+            includeDetail: options:
+                                i) 'resultDetail'
+                                ii) 'inputDetai'
+                                iii) 'modelDetail'
+            includeTermStructure: True returns 10 year term structurs for cumulative, forward, and annualized outputs
+
+            CreditEdge: = True if you would like the CE Structural EDF. Only listed companies appear since the
+                          model relies on equity market prices.
+
+            RiskCalc: = True if you would like the RiskCalc EDF returned mapped to the model internally allocated
+
+            TradePayment: = True if you would like the TradePayment EDF returned (given it exists)
+                            Payment PDs are only calculated for US companies with netSales < 500mln USD
+                            for which payment information is available.
+
+        With a pd_cache (see EDFXCache.PDCache) the entities already cached for the same parameters are not sent,
+        the response holds every requested entity in request order.
+
+        ---------------FOR YOUR REFERENCE----------------------------------------------------------
+        When no startDate and endDate is provided, the API serves the latest PD available considered.
+        For private firms this is the latest available month, while for active public firms this is
+        the latest available day within the last 10 days. Dates beyond these can be accessed in the
+        history by specifying startDate and endDate.
+
+        """
+        request = self._pd_request(entities=entities, startDate=startDate, endDate=endDate, historyFrequency=historyFrequency,
+                                   asyncResponse=asyncResponse, asReported=asReported, modelParameters=modelParameters,
+                                   includeDetailResult=includeDetailResult, includeDetailInput=includeDetailInput,
+                                   includeDetailModel=includeDetailModel, includeTermStructure=includeTermStructure,
+                                   processId=processId, CreditEdge=CreditEdge, RiskCalc=RiskCalc, TradePayment=TradePayment)
+        if request is None:
+            return None
+        endpoint, params, cached = request
+        if cached is not None and not cached[2]:
+            return self.pd_cache.merge(cached, None)
+
+        # concurrent requests of overlapping entities share one upstream call, see EDFXTransport.RequestCoalescer
+        if self.coalesce_window is not None and 'entities' in params and not asyncResponse and not processId:
+            try:
+                payload = self.request_coalescer('pd').request(canonical_key(endpoint, {**params, 'entities': None}), params,
+                                                               params['entities'], functools.partial(self._post_json, endpoint, timeout=timeout))
+                return self._pd_payload(payload, cached)
+            except Exception as e:
+                logger.error(f"An error occurred while processing the API response: {e}")
+                return None
+
+        headers = self.EDFXHeaders()['JSONBasic']['headers']
+        base = self.base_url
+        url = urljoin(base, endpoint)
+        # a PD query can be sent again, an asyncResponse request starts a server-side process and can't
+        response = self.session.post(url, headers=headers, json=params, timeout=timeout, idempotent=not asyncResponse)
+
+        try:
+            payload = response.json()
+            return self._pd_payload(payload, cached)
+
+        except:
+            logger.error(f"An error occurred while processing the API response: {response.text}")
+
+    async def EDFXPD_Endpoint_coalesced_async(self, entities:list[dict[str,str]], startDate:str=None, endDate:str=None,
+                                              historyFrequency:str='monthly', asReported:bool=False, modelParameters:bool=False,
+                                              includeDetailResult:bool=False, includeDetailInput:bool = False,
+                                              includeDetailModel:bool=False, includeTermStructure: bool=True, CreditEdge:bool=False,
+                                              RiskCalc:bool=False, TradePayment:bool=False, timeout:float=None):
+
+        """
+        EDFXPD_Endpoint for asyncio callers, always through the request coalescer: concurrent coroutines (and threads)
+        asking for overlapping entities with the same parameters within coalesce_window seconds share one upstream
+        call and each gets the response of its own entities. Awaiting does not block the event loop.
+        See EDFXPD_Endpoint for the params.
+        """
+        request = self._pd_request(entities=entities, startDate=startDate, endDate=endDate, historyFrequency=historyFrequency,
+                                   asReported=asReported, modelParameters=modelParameters, includeDetailResult=includeDetailResult,
+                                   includeDetailInput=includeDetailInput, includeDetailModel=includeDetailModel,
+                                   includeTermStructure=includeTermStructure, CreditEdge=CreditEdge, RiskCalc=RiskCalc,
+                                   TradePayment=TradePayment)
+        if request is None:
+            return None
+        endpoint, params, cached = request
+        if cached is not None and not cached[2]:
+            return self.pd_cache.merge(cached, None)
+        if not params.get('entities'):
+            print("Error: entities parameter must be a list of dictionaries with an 'entityId' key")
+            return None
+        try:
+            payload = await self.request_coalescer('pd').request_async(canonical_key(endpoint, {**params, 'entities': None}), params,
+                                                                       params['entities'], functools.partial(self._post_json, endpoint, timeout=timeout))
+            return self._pd_payload(payload, cached)
+        except Exception as e:
+            logger.error(f"An error occurred while processing the API response: {e}")
+            return None
+
+    def _pd_request(self, entities:list[dict[str,str]]=None, startDate:str=None, endDate:str=None, historyFrequency:str='monthly',
+                    asyncResponse:bool=False, asReported:bool=False, modelParameters:bool=False, includeDetailResult:bool=False,
+                    includeDetailInput:bool = False, includeDetailModel:bool=False, includeTermStructure: bool=True, processId:str=None,
+                    CreditEdge:bool=False, RiskCalc:bool=False, TradePayment:bool=False):
+
+        """
+        Validates a PD request and returns (endpoint, params, PD cache lookup), None for an invalid entities payload.
+        """
+        if entities is not None and startDate is None and endDate is None:
+            raise ValueError('You must include either a startDate or endDate when entities is provided.')
+
+        if entities:
+            if isinstance(entities, dict):
+                for key, value in entities.items():
+                    if not isinstance(key,str) or not isinstance(value,str):
+                        print("Error: you need to either feed a dictionary of 'EntityID' as key and an EDFX Qualified ID as the value." )
+                        return None
+                entities = [entities]
+
+                # Check if entities is a list of dictionaries with the key "entityId"
+            if not isinstance(entities, list) or not all(isinstance(e, dict) and "entityId" in e for e in entities):
+                print("Error: entities parameter must be a list of dictionaries with an 'entityId' key")
+                return None
+
+        # Define initial parameters
+        params = {
+            'startDate': startDate,
+            'endDate': endDate,
+            'historyFrequency': historyFrequency,
+            'asyncResponse': asyncResponse,
+            'asReported': asReported,
+            'modelParameters':
+                                {'fso': modelParameters} if modelParameters is not None else None,
+            'includeDetail': {
+                "resultDetail":includeDetailResult,
+                "inputDetail": includeDetailInput,
+                "modelDetail": includeDetailModel,
+                "includeTermStructure": includeTermStructure
+            }
+        }
+        if entities:
+            params['entities'] = entities
+
+
+        EDFXPDEnpoints = {
+            'CreditEdge':   '/edfx/v1/entities/pds/creditedge',
+            'RiskCalc':     '/edfx/v1/entities/pds/riskcalc',
+            'TradePayment': '/edfx/v1/entities/pds/payment',
+            'default':      '/edfx/v1/entities/pds'
+        }
+
+        if CreditEdge:
+            endpoint = EDFXPDEnpoints['CreditEdge']
+        elif RiskCalc:
+            endpoint = EDFXPDEnpoints['RiskCalc']
+        elif TradePayment:
+            endpoint = EDFXPDEnpoints['TradePayment']
+        else:
+            endpoint = EDFXPDEnpoints['default']
+
+        if processId:
+            params['processId'] = processId
+
+        # only the entities missing from the PD cache are sent
+        cached = self.pd_cache.lookup(endpoint, params, entities) if self.pd_cache is not None else None
+        if cached is not None and cached[2]:
+            params['entities'] = [entity for _, entity in cached[2]]
+
+        return endpoint, params, cached
+
+    def _pd_payload(self, payload:dict, cached:tuple):
+
+        """
+        Checks a PD response and merges it with the cached entities of the request.
+        """
+        if not isinstance(payload, dict) or payload.get('message'):
+            logger.error(f"I'm sorry but the API Returned {payload}. Please re-check your input variables.")
+        elif cached is not None:
+            return self.pd_cache.merge(cached, payload)
+        else:
+            return payload
+
+    def _post_json(self, endpoint:str, params:dict, timeout:float = None):
+
+        """
+        POST of params to an EDF-X endpoint through the pooled session, returns the decoded response.
+        """
+        headers = self.EDFXHeaders()['JSONBasic']['headers']
+        response = self.session.post(urljoin(self.base_url, endpoint), headers=headers, json=params, timeout=timeout,
+                                     idempotent=True)
+        try:
+            return response.json()
+        except ValueError:
+            logger.error(f"An error occurred while processing the API response: {response.text}")
+            raise
+
+    def request_coalescer(self, name:str) -> RequestCoalescer:
+
+        """
+        Returns the request coalescer of an endpoint ('pd', 'tradecredit'), created on first use with the client's
+        coalesce_window. Its stats attribute counts the requests, the entities served from calls already in flight
+        and the upstream calls made.
+        """
+        coalescer = self.request_coalescers.get(name)
+        if coalescer is None:
+            window = self.coalesce_window if self.coalesce_window is not None else 0.005
+            coalescer = self.request_coalescers[name] = RequestCoalescer(window=window)
+        return coalescer
+
+    def EDFXPDLoader(self, max_wait_ms:float = 5, max_batch:int = 100, max_workers:int = 8, parse:bool = True,
+                     **pd_params) -> MicroBatchLoader:
+
+        """
+        Micro-batching loader of single entity PD lookups (see EDFXTransport.MicroBatchLoader): load(entityId) returns
+        a Future and load_async(entityId) an awaitable, the queued lookups being sent together through EDFXPD_Endpoint
+        every max_wait_ms milliseconds or max_batch entities.
+
+        Params:
+            max_wait_ms: Latency budget of a lookup in the queue.
+            max_batch: Entities per EDFXPD_Endpoint call (the pd_cache, if any, still applies).
+            max_workers: EDFXPD_Endpoint calls running at the same time.
+            parse: Resolve to the EDFXPDParse rows of the entity, otherwise to its raw response record.
+            **pd_params: startDate, endDate, historyFrequency, ... of EDFXPD_Endpoint, shared by every lookup.
+        """
+        # the loader already batches the lookups, its calls don't go through the request coalescer as well
+        fetch = functools.partial(self._pd_batch, **pd_params)
+        return MicroBatchLoader(fetch, parse=EDFXEndpoints.EDFXPDParse if parse else None, max_wait_ms=max_wait_ms,
+                                max_batch=max_batch, max_workers=max_workers)
+
+    def _pd_batch(self, entities:list[dict[str,str]], timeout:float = None, **pd_params):
+
+        """
+        EDFXPD_Endpoint sent straight to the API, bypassing the request coalescer, for callers batching the entities
+        themselves. See EDFXPD_Endpoint for the params.
+        """
+        request = self._pd_request(entities=entities, **pd_params)
+        if request is None:
+            return None
+        endpoint, params, cached = request
+        if cached is not None and not cached[2]:
+            return self.pd_cache.merge(cached, None)
+        try:
+            return self._pd_payload(self._post_json(endpoint, params, timeout=timeout), cached)
+        except Exception as e:
+            logger.error(f"An error occurred while processing the API response: {e}")
+            return None
+
+    def concurrency_limiter(self, name:str, max_limit:int) -> AdaptiveConcurrencyLimiter:
+
+        """
+        Returns the AIMD limiter of an async fan-out ('pd', 'lgd', ...), created on first use.
+        The current window can be monitored while a run is going: endpoints.concurrency_limiters['pd'].snapshot()
+        """
+        limiter = self.concurrency_limiters.get(name)
+        if limiter is None:
+            limiter = AdaptiveConcurrencyLimiter(max_limit=max_limit)
+            self.concurrency_limiters[name] = limiter
+        else:
+            limiter.max_limit = max(max_limit, limiter.min_limit)
+        return limiter
+
+    async def EDFXPD_Endpoint_async(self,semaphore:AdaptiveConcurrencyLimiter, entities:list[dict[str,str]]=None, startDate:str=None, endDate:str=None, historyFrequency:str='monthly',
+                                    asyncResponse:bool=False, asReported:bool=False, modelParameters:bool=False, includeDetailResult:bool=False,
+                                    includeDetailInput:bool = False, includeDetailModel:bool=False, includeTermStructure: bool=True, processId:str=None,
+                                    CreditEdge:bool=False, RiskCalc:bool=False, TradePayment:bool=False, timeout:float=10000, asyncretries1:int=None,
+                                    asyncretries2:int=None, failed_params_file:str=None):
+
+        """
+        This is async version of the EDFXPD_Endpoint method. See the docsting of that method for params.
+
+        semaphore: AdaptiveConcurrencyLimiter shared by the batches of a run (an asyncio.Semaphore or an int still work).
+        asyncretries1: Attempts for this batch, defaults to self.retry_policy.max_attempts.
+        asyncretries2: Deprecated and ignored, the retry policy and its global budget bound the retries.
+        failed_params_file: Optional csv the params of a batch that still failed after its retries are appended to.
+                            Failed batches are always logged, and journaled by the batch methods run with a run_id.
+        """
+        if asyncretries2 is not None:
+            warnings.warn("asyncretries2 is ignored, retries are bounded by the client's retry_policy.", DeprecationWarning)
+        
+        if entities is not None and startDate is None and endDate is None:
+            raise ValueError('You must include either a startDate or endDate when entities is provided.')
+
+        if entities:
+            if isinstance(entities, dict):
+                for key, value in entities.items():
+                    if not isinstance(key,str) or not isinstance(value,str):
+                        print("Error: you need to either feed a dictionary of 'EntityID' as key and an EDFX Qualified ID as the value." )
+                        return None
+                entities = [entities]
+
+                # Check if entities is a list of dictionaries with the key "entityId"
+            if not isinstance(entities, list) or not all(isinstance(e, dict) and "entityId" in e for e in entities):
+                print("Error: entities parameter must be a list of dictionaries with an 'entityId' key")
+                return None
+
+        headers = (await self.EDFXHeaders_async())['JSONBasic']['headers']
+
+        # Define initial parameters
+        params = {
+            'startDate': startDate,
+            'endDate': endDate,
+            'historyFrequency': historyFrequency,
+            'asyncResponse': asyncResponse,
+            'asReported': asReported,
+            'modelParameters':
+                                {'fso': modelParameters} if modelParameters is not None else None,
+            'includeDetail': {
+                "resultDetail":includeDetailResult,
+                "inputDetail": includeDetailInput,
+                "modelDetail": includeDetailModel,
+                "includeTermStructure": includeTermStructure
+            }
+        }
+        if entities:
+            params['entities'] = entities
+        if processId:
+            params['processId'] = processId
+
+        base = self.base_url
+
+        EDFXPDEnpoints = {
+            'CreditEdge':   '/edfx/v1/entities/pds/creditedge',
+            'RiskCalc':     '/edfx/v1/entities/pds/riskcalc',
+            'TradePayment': '/edfx/v1/entities/pds/payment',
+            'default':      '/edfx/v1/entities/pds'
+        }
+
+        if CreditEdge:
+            endpoint = EDFXPDEnpoints['CreditEdge']
+        elif RiskCalc:
+            endpoint = EDFXPDEnpoints['RiskCalc']
+        elif TradePayment:
+            endpoint = EDFXPDEnpoints['TradePayment']
+        else:
+            endpoint = EDFXPDEnpoints['default']
+
+        url = urljoin(base, endpoint)
+
+        # only the entities missing from the PD cache are sent
+        cached = self.pd_cache.lookup(endpoint, params, entities) if self.pd_cache is not None else None
+        if cached is not None:
+            if not cached[2]:
+                return self.pd_cache.merge(cached, None)
+            params['entities'] = [entity for _, entity in cached[2]]
+
+        failedparams = []
+        limiter = as_concurrency_limiter(semaphore)
+        policy = self.retry_policy
+        max_attempts = asyncretries1 or policy.max_attempts
+        async def _post_async(params):
+            # retries follow the client's retry policy: jittered exponential backoff, Retry-After and the global budget
+            policy.record_request()
+            for attempt in range(max_attempts):
+                await policy.wait_for_pause_async()
+                status = error = response_headers = None
+                # limit concurrent approach with the adaptive limiter, the outcome of each call adjusts its window
+                async with limiter.request() as outcome:
+                    try:
+                        # one approach try times to receive the data and also log the errors if the data is not returned while saving the params to a dataframe
+                        async with session.post(url, headers=headers, json=params, timeout=ClientTimeout(total=timeout)) as response:
+                            outcome.status = status = response.status
+                            response_headers = response.headers
+                            # When the response is received it will be processed and the payload will be returned
+                            payload = await response.json()
+                            if 'entities' not in payload:
+                                logger.error(f"Server Response {payload}\n params for the failedentity is: {params}")
+                            else:
+                                return payload  
+
+                    except ServerTimeoutError as e:
+                        outcome.error = error = e
+                        logger.error(f"ServerTimeoutError encountered: {str(e)} | Attempt {attempt+1} of {max_attempts}")                        
+                    except ClientError as e:  
+                        outcome.error = error = e
+                        logger.error(f"ClientError encountered: {str(e)} | Attempt {attempt+1} of {max_attempts}")
+                    
+                    except Exception as e:    
+                        outcome.error = error = e
+                        logger.error(f"Unexpected error encountered: {type(e).__name__}: {str(e)}")
+
+                if not policy.should_retry(attempt, status=status, error=error, max_attempts=max_attempts):
+                    break
+                # wait outside the limiter so a sleeping retry does not hold a slot of the window
+                await asyncio.sleep(policy.delay(attempt, response_headers))
+
+            # logger error
+            failedparams.append(params)
+
+        async with self.async_session_scope() as session:
+            result = await _post_async(params)
+            if result is not None:
+                return self.pd_cache.merge(cached, result) if cached is not None else result
+
+        if failedparams:
+            logger.error(f"PD batch of {len(params.get('entities') or [])} entities failed after its retries, params: {params}")
+            if failed_params_file:
+                Failedparams = {"FailedPDParms": [json.dumps(failed, default=str) for failed in failedparams]}
+                Failedparams = pd.DataFrame(Failedparams).drop_duplicates()
+                Failedparams.to_csv(failed_params_file, mode='a', index=False, header=not os.path.exists(failed_params_file))
+
+
+    def SynchronousBatchMVP(self,EntityPayload:list[dict[str,str]], BatchSize:int,historyFrequency:str='monthly',startDate:str=None,
+                            endDate:str=None, asReported:bool=False, modelParameters:bool=False,includeDetailResult:bool=True,
+                            includeDetailInput:bool = False, includeDetailModel:bool=False,includeTermStructure:bool = True, sink=None):
+        """
+        This method allows us to batch API calls within a certain size providing flexibility for
+        times when a user may have a large amount of entities that they would like to retrieve a
+        batch output synchronously.
+
+        endDate: is a datetime object and is typically fed from the relevant method
+        sink: Optional destination of each parsed batch as it completes instead of a final concatenated DataFrame:
+              an EDFXSinks.Sink (CSVSink, ParquetDatasetSink, SQLiteSink, DuckDBSink), a callable or a file path
+              (see EDFXSinks.as_sink). The method then returns the number of rows written.
+        """
+        dfs = []
+        output = as_sink(sink)
+        try:
+            for entities_batch in self.split_list(EntityPayload, BatchSize=BatchSize):
+                try:
+                    # grab the python dictionary output (30 of them)
+                    pd_dict = self.EDFXPD_Endpoint(entities=entities_batch,startDate=startDate, endDate=endDate, historyFrequency=historyFrequency,
+                                                    asReported=asReported, modelParameters=modelParameters, includeDetailResult=includeDetailResult,
+                                                    includeDetailInput=includeDetailInput, includeDetailModel=includeDetailModel, includeTermStructure=includeTermStructure)
+
+                    if not pd_dict:
+                        logger.warning("API returned a NONE response.  Check the whether API PDs endpoints is working on EDFXPrime.py or Moodys APIHub.")
+                    # parse the dictionary object to a pandas dataframe
+                    pd_df = self.EDFXPDParse(pd_dict)
+                    if output is not None:
+                        output.write(pd_df)
+                    else:
+                        # append them to a list, 300 row object elements per appending
+                        dfs.append(pd_df)
+                # concat everythin rowwise.
+                except Exception as e:
+                    logger.error(f"An error occurred with batch starting at index {entities_batch[0]}: {e}.")
+        finally:
+            # sinks built here from a path are closed here, Sink instances belong to the caller
+            if output is not None and output is not sink:
+                output.close()
+
+        if output is not None:
+            logger.info(f"{output.rows} rows written to {output}.")
+            return output.rows
+        if dfs:
+            return pd.concat(dfs)
+        else:
+            logger.info("No data frames were created.")
+            return None
+
+    async def SynchronousBatchMVP_async(self, EntityPayload:list[dict[str,str]], BatchSize:int,semaphore:int=500, historyFrequency:str='monthly',includeTermStructure:bool=True,
+                                        startDate:str=None, endDate:str=None, asReported:bool=False, modelParameters:bool=False,includeDetailResult:bool=True,
+                                        includeDetailInput:bool = False, includeDetailModel:bool=False, asyncretries1:int=None, asyncretries2:int=None,
+                                        window:int=None, sink=None, run_id:str=None, journal_dir:str=None, replay_finished:bool=True):
+        """
+        This is the async version of the method with the same name that will run multiple API calls in parallel using async.
+        This method must be called with await, e.g. await SynchronousBatchMVP_async(...)
+        See the probability of default docsting of that method for params.
+
+        semaphore: Upper bound of in-flight requests. Concurrency adapts below it (AIMD): it widens while responses are
+                   fast and successful and backs off on 429/5xx, timeouts or a rising p95 latency.
+                   The current window is exposed through self.concurrency_limiters['pd'].
+        window: Maximum number of batches scheduled at once (defaults to semaphore). Each response is parsed as soon as
+                it completes, so raw JSON held in memory is bounded by the window, not by the portfolio.
+        sink: Optional destination of each parsed batch DataFrame as it completes (in completion order) instead of
+              keeping it: an EDFXSinks.Sink (CSVSink, ParquetDatasetSink, SQLiteSink, DuckDBSink), a callable or a file
+              path (see EDFXSinks.as_sink). The method then returns the number of rows written. See
+              SynchronousBatchMVP_stream for an async generator over the same chunks.
+        run_id: Journals the run (see EDFXJournal.BatchJournal) so it can be resumed: every finished batch is saved under
+                journal_dir as it completes and a rerun with the same run_id only sends the pending and failed batches.
+                The merged result of all finished batches is returned.
+        journal_dir: Folder of the journal, defaults to ~/.edfx/runs/<run_id>.
+        replay_finished: With both run_id and sink, the batches finished by earlier attempts of the run are read back
+                         from the journal and written to the sink first, so a resumed run can go to a new sink (a CSV
+                         path sink starts a new file). Set it to False when resuming into a sink that appends and
+                         already holds them, e.g. SQLiteSink or ParquetDatasetSink on the same table or folder.
+        """
+
+        journal = None
+        if run_id is not None:
+            journal = BatchJournal(run_id, journal_dir)
+            journal.start_run({'BatchSize': BatchSize, 'startDate': startDate, 'endDate': endDate, 'historyFrequency': historyFrequency,
+                               'asReported': asReported, 'modelParameters': modelParameters, 'includeDetailResult': includeDetailResult,
+                               'includeDetailInput': includeDetailInput, 'includeDetailModel': includeDetailModel,
+                               'includeTermStructure': includeTermStructure})
+
+        results = self._pd_batch_results(EntityPayload, BatchSize, semaphore=semaphore, window=window, journal=journal, startDate=startDate,
+                                         endDate=endDate, historyFrequency=historyFrequency, asReported=asReported,
+                                         modelParameters=modelParameters, includeDetailResult=includeDetailResult,
+                                         includeDetailInput=includeDetailInput, includeDetailModel=includeDetailModel,
+                                         includeTermStructure=includeTermStructure, asyncretries1=asyncretries1,
+                                         asyncretries2=asyncretries2)
+
+        output = as_sink(sink)
+        try:
+            if output is not None:
+                if journal is not None and replay_finished:
+                    # the generator has not started yet, the journal only holds the batches of earlier attempts
+                    for pd_df in journal.iter_results():
+                        output.write(pd_df)
+                async for _, pd_df in results:
+                    output.write(pd_df)
+                logger.info(f"{output.rows} rows written to {output}.")
+                return output.rows
+
+            if journal is not None:
+                # outputs are already on disk, merge them (with those of earlier attempts of the run) at the end
+                async for _ in results:
+                    pass
+                logger.info(f"Run {run_id}: {journal.summary()}")
+                return journal.load_results()
+
+            # keep the batch order of the input in the concatenated output
+            dfs = [pd_df for _, pd_df in sorted([item async for item in results], key=lambda item: item[0])]
+        finally:
+            await results.aclose()
+            if journal is not None:
+                journal.close()
+            # sinks built here from a path are closed here, Sink instances belong to the caller
+            if output is not None and output is not sink:
+                output.close()
+
+        if dfs:
+            return pd.concat(dfs)
+        else:
+            logger.info("No data frames were created.")
+            return None
+
+    async def SynchronousBatchMVP_stream(self, EntityPayload:list[dict[str,str]], BatchSize:int, semaphore:int=500, window:int=None,
+                                         historyFrequency:str='monthly', includeTermStructure:bool=True, startDate:str=None,
+                                         endDate:str=None, asReported:bool=False, modelParameters:bool=False, includeDetailResult:bool=True,
+                                         includeDetailInput:bool = False, includeDetailModel:bool=False, asyncretries1:int=None):
+        """
+        Streaming version of SynchronousBatchMVP_async. An async generator yielding one parsed DataFrame per batch as soon
+        as the batch completes (completion order, not input order), with at most <window> batches in flight.
+        Peak memory follows the window size instead of the portfolio size. EntityPayload may be a lazy iterable.
+
+            async for chunk in endpoints.SynchronousBatchMVP_stream(entities, BatchSize=100, window=200):
+                chunk.to_csv('pds.csv', mode='a', header=False)
+
+        nest_asyncio (applied by this module) disables asyncio's async generator finalizer, so a consumer leaving the
+        loop early should close the stream itself (await stream.aclose() or contextlib.aclosing) to cancel the batches
+        still in flight.
+        """
+        results = self._pd_batch_results(EntityPayload, BatchSize, semaphore=semaphore, window=window, startDate=startDate,
+                                         endDate=endDate, historyFrequency=historyFrequency, asReported=asReported,
+                                         modelParameters=modelParameters, includeDetailResult=includeDetailResult,
+                                         includeDetailInput=includeDetailInput, includeDetailModel=includeDetailModel,
+                                         includeTermStructure=includeTermStructure, asyncretries1=asyncretries1)
+        try:
+            async for _, pd_df in results:
+                yield pd_df
+        finally:
+            # close explicitly so pending batches are cancelled and the session released when the consumer stops early
+            await results.aclose()
+
+    async def SynchronousBatchMVP_incremental(self, EntityPayload:list[dict[str,str]], BatchSize:int, startDate:str, endDate:str,
+                                              store:PDHistoryStore=None, semaphore:int=500, window:int=None,
+                                              historyFrequency:str='monthly', includeTermStructure:bool=True, asReported:bool=False,
+                                              modelParameters:bool=False, includeDetailResult:bool=True, includeDetailInput:bool = False,
+                                              includeDetailModel:bool=False, asyncretries1:int=None):
+        """
+        Incremental version of SynchronousBatchMVP_async for recurring history pulls: only the part of the
+        startDate-endDate window not already in the local store is requested.
+
+        For every entity the store gives the date of its last stored observation; the entities are then grouped by
+        identical gap (e.g. everything after 2024-05-31 for most of a portfolio, the full window for new entities) and
+        each group is fetched through the same windowed async batches with startDate set to the start of its gap.
+        New rows are saved as batches complete, the whole window is then returned from the store.
+
+            store = PDHistoryStore()
+            df = await endpoints.SynchronousBatchMVP_incremental(entities, 100, '2015-01-01', '2024-06-30', store=store)
+            # next month only the new month-end is requested
+            df = await endpoints.SynchronousBatchMVP_incremental(entities, 100, '2015-01-01', '2024-07-31', store=store)
+
+        store: EDFXCache.PDHistoryStore, defaults to ~/.edfx/pd_history.sqlite.
+        See SynchronousBatchMVP_async for the other params.
+        """
+        store = store or PDHistoryStore()
+        pd_params = {'historyFrequency': historyFrequency, 'asReported': asReported, 'modelParameters': modelParameters,
+                     'includeDetailResult': includeDetailResult, 'includeDetailInput': includeDetailInput,
+                     'includeDetailModel': includeDetailModel, 'includeTermStructure': includeTermStructure}
+        series = store.series_key(pd_params)
+        payload = {entity['entityId']: entity for entity in EntityPayload}
+        gaps = store.gaps(series, list(payload), startDate, endDate)
+        logger.info(f"Incremental PDs: {sum(len(ids) for ids in gaps.values())} of {len(payload)} entities in {len(gaps)} windows to fetch.")
+
+        for (gap_start, gap_end), entity_ids in gaps.items():
+            results = self._pd_batch_results([payload[entity_id] for entity_id in entity_ids], BatchSize, semaphore=semaphore,
+                                             window=window, startDate=gap_start, endDate=gap_end, asyncretries1=asyncretries1,
+                                             **pd_params)
+            try:
+                async for _, pd_df in results:
+                    store.write(series, pd_df, gap_start)
+            finally:
+                await results.aclose()
+
+        return store.load(series, list(payload), startDate, endDate)
+
+    async def _pd_batch_results(self, EntityPayload, BatchSize:int, semaphore:int=500, window:int=None, journal:BatchJournal=None,
+                                **pd_params):
+
+        """
+        Producer/consumer core of the async PD batch methods: keeps at most <window> EDFXPD_Endpoint_async batches
+        scheduled, parses every response as it completes and yields (batch index, DataFrame).
+        With a journal, batches it already finished are skipped and every outcome is recorded.
+        """
+        limiter = self.concurrency_limiter('pd', max_limit=semaphore)
+        window = window or semaphore
+        batches = enumerate(self.split_list(EntityPayload, BatchSize=BatchSize))
+        batch_keys = {}
+        if journal is not None:
+            finished = journal.finished_keys()
+            def unfinished(batches):
+                for index, batch in batches:
+                    key = journal.batch_key(batch)
+                    if key in finished:
+                        continue
+                    journal.mark_pending(key, index)
+                    batch_keys[index] = key
+                    yield index, batch
+            batches = unfinished(batches)
+        pending = {}
+
+        # one session for every batch of the run
+        async with self.async_session_scope():
+            try:
+                while True:
+                    # top the window up with the next batches
+                    for index, batch in itertools.islice(batches, window - len(pending)):
+                        pending[asyncio.ensure_future(self.EDFXPD_Endpoint_async(semaphore=limiter, entities=batch, **pd_params))] = index
+                    if not pending:
+                        break
+
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        index = pending.pop(task)
+                        key = batch_keys.pop(index, None)
+                        pd_dict = task.result()
+                        if pd_dict is None:
+                            if key:
+                                journal.mark_failed(key, "no response")
+                            continue
+                        try:
+                            # parse the dictionary object to a pandas dataframe
+                            pd_df = self.EDFXPDParse(pd_dict)
+                        except:
+                            logger.error(f'Parsing batch response failed: {format_exc(1, False)}')
+                            if key:
+                                journal.mark_failed(key, format_exc(1, False))
+                            continue
+                        if key:
+                            journal.mark_done(key, pd_df)
+                        if pd_df is None:
+                            continue
+                        yield index, pd_df
+            finally:
+                # the consumer stopped early or a batch raised: don't leave orphaned requests behind
+                for task in pending:
+                    task.cancel()
+                # let the cancelled batches unwind before the shared session is released
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def EDFXPD_Drivers(self, entities:list[dict[str,str]], historyFrequency:str="monthly" ,startDate:str=None, endDate:str=None,
+                        asyncResponse:bool=False, asReported:bool=False, modelParameters:bool=False,includeDetailResult:bool=True,
+                        includeDetailInput:bool=False, includeDetailModel:bool=False, processId:str=None):
+
+        """
+        I need to determine the above method to know the following structure for the below.
+
+        We MUST set the boolean values otherwise the parameter function will not return appropriately
+
+        Required arguments are: entities, startDate
+
+        """
+
+        if processId and entities:
+            raise ValueError('Both processId and entities provided')
+
+        if processId:
+            entities = [{"entityId": processId}]
+
+        # Check if entities is a list of dictionaries with the key "entityId"
+        if not isinstance(entities, list) or not all(isinstance(e, dict) and "entityId" in e for e in entities):
+            raise ValueError("entities parameter must be a list of dictionaries with an 'entityId' key")
+
+        headers = self.EDFXHeaders()['JSONBasic']['headers']
+        params = {
+                "entities": entities,
+                "startDate": startDate,
+                "endDate": endDate,
+                "historyFrequency": historyFrequency,
+                "asyncResponse": asyncResponse,
+                "asReported": asReported,
+                "modelParameters":
+                                    {'fso': modelParameters} if modelParameters is not None else None,
+                "includeDetail": {
+                    "resultDetail": includeDetailResult,
+                    "inputDetail": includeDetailInput,
+                    "modelDetail": includeDetailModel
+                }
+            }
+        # Remove None values from params
+        # params = {k: v for k, v in params.items() if v is not None}
+        base = self.base_url
+        endpoint = '/edfx/v1/entities/pds/detailHistory'
+        url = urljoin(base, endpoint)
+        response = self.session.post(url, headers=headers, json=params, idempotent=True)
+
+        if response.status_code == 200:
+            payload = response.json()
+            return payload
+        else:
+            print(f"Request failed with status code {response.status_code} {response.text}")
+            return None
+
+    def EDFXClimatePD(self,scenarioCategory:str,transition:bool,physical:bool,combined:bool,entityName:str,entityId:str,
+                        primaryCountry:str,primaryCountryWeight:str,primaryIndustryClassification:str,primaryIndustry:str,
+                        industryWeight:str,pd:float,impliedRating:str,financialStatementDate:str=None,
+                        carbonEmissionDate:str=None,asOfDate:str=None,totalAssets:float=None,netSales:float=None,
+                        scope1Emission:float=None,scope2Emission:float=None,carbonFootPrint:float=None,
+                        physicalRiskScoreOverwrite:int=None,resultDetailMain:bool=False,resultDetailTransition:bool=False):
+
+        """
+        Important Params:
+        scenarioCategory: Valid values: "NGFS", "NGFS2", "NGFS3","NGFS3_REMIND","MAS", See Appendix: Climate Scenarios
+                        for more information about the supported scenarios.
+        TYPES OF RISK: Desired risk type. At least one of these parameter has to be set to true.
+        transition: Type of Risk
+        physical: TYpe of Risk
+        combined: Type of Risk
+        carbonEmissionDate: Represents the snapshot date relative to the carbon foot print provided.
+        scope1Emission:These are direct emissions from sources that are owned or controlled by the company.
+                        For example, emissions from a company's own vehicles, boilers, or manufacturing processes.
+
+        scope2Emission: These are indirect emissions that come from the consumption of purchased electricity, heat, or steam.
+                        For example, emissions from the power plants that generate the electricity used by the company.
+
+        Use the /climate/v2/entities/pds endpoint to access the climate-adjusted PDs. These are credit risk metrics adjusted
+        to incorporate the climate risk impact. The climate-adjusted PDs are the result of a stress testing exercise following
+        some pre-defined scenarios sets, typically released by regulators or relevant institutions (ex. NGFS III).
+        The output are separate for physical risk, transition risk, and combined risk.
+
+        We do maintain a set of pre-calculated and ready available results: currently, this universe corresponds to actively
+        traded public firms. For any other firm, i.e. private firms, the API request triggers an on-demand calculator
+        that outputs climate adjusted metrics starting from the set of user-provided inputs. Hence, more input parameters are
+        required for private firms
+
+        For comprehensive param understanding see:
+        https://docs.moodysanalytics.com/moodys-edfx-climate/docs/retrieving-climate-adjusted-pds
+        within EDF-X API Hub
+
+        """
+
+        params = {"entities": [
+                    {
+                        "entityId": entityId,
+                        "entityName": entityName,
+                        "financialStatementDate": financialStatementDate,
+                        "pd": pd,
+                        "impliedRating": impliedRating,
+                        "asOfDate": asOfDate,
+                        "carbonEmissionDate": carbonEmissionDate,
+                        "qualitativeInputs": {
+                            "industriesDetails": [
+                                {
+                                    "industryWeight": industryWeight,
+                                    "primaryIndustry": primaryIndustry,
+                                    "primaryIndustryClassification": primaryIndustryClassification
+                                }
+                            ],
+                            "regionDetails": [
+                                {
+                                    "primaryCountry": primaryCountry,
+                                    "primaryCountryWeight": primaryCountryWeight
+                                }
+                            ]
+                        },
+                        "quantitativeInputs": {
+                            "carbonFootPrint": carbonFootPrint,
+                            "netSales": netSales,
+                            "scope1Emission": scope1Emission,
+                            "scope2Emission": scope2Emission,
+                            "totalAssets": totalAssets,
+                        },
+                        "physicalRiskScore": { "physicalRiskScoreOverwrite": physicalRiskScoreOverwrite }
+                    }
+                ],
+                "scenarios": { "scenarioCategory": scenarioCategory },
+                "riskTypes": {
+                    "combined": combined,
+                    "physical": physical,
+                    "transition": transition
+                },
+                "includeDetail": {
+                    "resultDetailMain": resultDetailMain,
+                    "resultDetailTransition": resultDetailTransition
+                }}
+
+        headers = self.EDFXHeaders()['JSONBasic']['headers']
+        endpoint = "/climate/v2/entities/pds"
+        url = urljoin(self.base_url, endpoint)
+        response = self.session.post(url, json=params, headers=headers)
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            print(f"Request failed with status code {response.status_code} {response.text}")
+            return None
+
+    def EDFXClimateIndustryTransitionRiskDrivers(self, industry:str, scenarioCategory:str,scenario:str=None):
+
+        """
+        The drivers for transition risk at region/country and
+        industry granularity level are pre-calculated and can be accessed using the following endpoints.
+
+        Required Params:
+
+            - industry  ex: 'N40'  ex: See Appendix Climate Sectors for the list of valid values.
+            - scenarioCategory  ex: 'NGFS' ; Valid values: "NGFS",”MAS”,”NGFS2”,"NGFS3","NGFS2_REMIND".
+            - senario ex: Valid for NGFS: “orderlyScenario”, “disorderlyScenario”, “hothouseScenario”, “hotHouseTailScenario”.
+        """
+        # Construct the endpoint
+        scenario_param = f"&scenario={scenario}" if scenario else ""
+        endpoint = f"/climate/v2/industry/industryTransitionPaths?scenarioCategory={scenarioCategory}&industry={industry}{scenario_param}"
+        headers = self.EDFXHeaders()["JSONGet"]['headers']
+        url = urljoin(self.base_url, endpoint)
+
+        try:
+            response = self.session.get(url, headers=headers)
+            response.raise_for_status()  # Raise an error for bad responses
+            return response.json()
+
+        except requests.RequestException as e:
+            # Handle the exception as you see fit
+            print(f"Error fetching data: {e}")
+            return None
+
+    def EDFXClimateRegionTransitionPaths(self,scenarioCategory:str,regionIndustry:tuple[str,str], industry: str, scenario:str=None):
+
+        """
+        The drivers for transition risk at region/country and industry
+        granularity level are pre-calculated and can be accessed using the following endpoints.
+
+        see appendix for full details here:
+        https://docs.moodysanalytics.com/moodys-edfx-climate/docs/retrieving-transition-risk-drivers-for-sector-and-region
+
+        params:
+            scenarioCategory: example => "NGFS"
+            regionIndustry: example => ("USA","N30") # no space
+            scenario: example => "noAdditionalPolicyScenario"
+            industry: example => "N13"
+        """
+
+        # Format the tuple
+        regionIndustry_str = f"({regionIndustry[0]},{regionIndustry[1]})"
+        # URL encode the tuple string
+        regionIndustry_encoded = quote_plus(regionIndustry_str)
+        endpoint = "/climate/v2/industry/industryTransitionPaths"
+        params = {
+            'scenarioCategory': scenarioCategory,
+            'regionIndustry': regionIndustry_encoded,
+            'industry': industry
+        }
+        params = self.create_params_dict(params)
+        if scenario:
+            params['scenario'] = scenario
+        headers = self.EDFXHeaders()["JSONGet"]['headers']
+        url = urljoin(self.base_url, endpoint)
+        # error handling
+        try:
+            response = self.session.get(url, headers=headers, params=params)
+            response.raise_for_status()  # Raise an error for bad responses
+            return response.json()
+
+        except requests.RequestException as e:
+            # Handle the exception as you see fit
+            print(f"Error fetching data: {e}")
+            return None
+
+    def EDFXClimateReportPublic(self,reportType:str,reportFormat:str,scenarioCategory:list[str],entities:list[dict[str:str]]):
+
+        """
+        The Reports endpoint allows access to PDF and CSV files that explains the analytics
+        and data available via other endpoints. These reports are pre-defined. As a user you can
+        request the download of the file but you cannot define the content yet.
+
+        Params:
+                ALL PARAMS REQUIRED:
+
+                reportType: example => 'climate'
+                scenarioCategory: example => 'NGFS3'
+                reportFormat: example => 'pdf'
+                entities: example => [{"entityId": "CN46262PC"]
+
+            Sample Json Request:
+
+                    {
+                        "reportType": "climate",
+                        "reportFormat": "pdf",
+                        "scenarioCategory": ["NGFS3"],
+                        "entities": [
+                            {
+                                "entityId": "CN46262PC"
+                            }
+                        ]
+                    }
+        """
+        #error handle entities variable
+        if isinstance(entities, dict):
+            for key, value in entities.items():
+                if not isinstance(key,str) or not isinstance(value,str):
+                    print("Error: you need to either feed a dictionary of 'EntityID' as key and an EDFX Qualified ID as the value." )
+                    return None
+            entities = [entities]
+
+            # Check if entities is a list of dictionaries with the key "entityId"
+        if not isinstance(entities, list) or not all(isinstance(e, dict) and "entityId" in e for e in entities):
+            print("Error: entities parameter must be a list of dictionaries with an 'entityId' key")
+            return None
+
+        endpoint = "/edfx/v1/reports"
+        url= urljoin(self.base_url, endpoint)
+        params = {
+            "reportType": reportType,
+            "reportFormat": reportFormat,
+            "scenarioCategory": scenarioCategory,
+            "entities": entities
+        }
+        params = self.create_params_dict(params)
+        headers = self.EDFXHeaders()['JSONBasic']['headers']
+        response = self.session.post(url, json=params, headers=headers)
+        return response.json()
+
+    def EDFXTemplateDownload(self, financialtemplate = 'Universal', output_format = 'Pandas', **export_options):
+
+
+        """
+        Specify what template you'd like to retrieve and the output format you'd like to use.
+
+        Proper FinancialTemplate options: FinancialTemplate.UNIVERSAL, FinancialTemplate.BANK
+        Proper OutputFormat: OutputFormat.PANDAS, OutputFormat.EXCEL, OutputFormat.CSV, OutputFormat.PARQUET, OutputFormat.FEATHER
+
+        """
+        financialtemplate = financialtemplate.title()
+        output_format = output_format.title()
+
+        if financialtemplate == FinancialTemplate.UNIVERSAL.value:
+            endpoint = '/edfx/v1/entities/financials/template/universal'
+        elif financialtemplate == FinancialTemplate.BANK.value:
+            endpoint = '/edfx/v1/entities/financials/template/bank'
+        else:
+            raise ValueError(f"Invalid financial template: {financialtemplate}")
+
+        base = self.base_url
+        url = urllib.parse.urljoin(base, endpoint)
+        headers = self.EDFXHeaders()['JSONGet']['headers']
+        response = self.session.get(url, headers=headers)
+        text = response.text
+        try:
+            # Convert text to a dataframe
+            data = io.StringIO(text)
+            df = pd.read_csv(data, sep=",")
+
+        except Exception as e:
+            print(f"Error: Unable to convert the response to a DataFrame/CSV. {e}")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, financialtemplate, **export_options)
+
+
+    def EDFXModelInputs(self, uploadFilename: str, localFilename: str, largeFile:bool = False, retries:int = 3,
+                        verify:bool = True) -> dict:
+
+        """
+        Allows the user to upload financials for either an existing BVDID or a company that is unknown to Orbis.
+
+        The API responds with a processId, which can be used in the following ways to check the process status and retrieve the value.
+
+        Requried Params:
+
+            uploadedFile: 'The template file containing the financial data'  ex: UniversalTemplateMyFinancials.csv
+
+
+        With the /processes/{processId}/status endpoint to access the status of the upload, when they are ready
+        the processId can be used as per point 2 and 3 below
+
+        In the /pds, /pds/riskcalc, /pds/creditedge endpoints as value for the parameter processId  Using it to access the PD, implied ratings, etc.
+        for all the companies in the uploaded file.
+
+        By combining the entityIdentifier provided as input with the processid
+        as follows: {entityIdentifiier}-{processId}. Using it as the identifier for the PD, trade credit limits, etc.,
+        endpoints to access the metrics calculated using the information uploaded for a subset of the companies in the
+        uploaded file (See Retrieving PD values page for more information).
+
+        If a process is started the method will return a dict containing processId and uploadLink
+
+        The file is streamed to the upload link with progress and throughput logging. Transient failures are retried
+        (retries times, with backoff) and with verify the MD5 of the file is checked against the stored object's ETag.
+        To split a large file into parts uploaded in parallel see EDFXModelInputsParallel.
+
+        """
+        payload = self._start_model_inputs(uploadFilename)
+        if payload is None:
+            return
+
+        process_id = payload['processId']
+        upload_link = payload['uploadLink']
+
+        upload_headers = self.EDFXHeaders(process_id=process_id)['ModelInputsUploadProcess']['headers']
+
+        #Upload local large file using the process id and upload link retrieved from last step.
+        progress = UploadProgress(os.path.getsize(localFilename), uploadFilename)
+        try:
+            response = put_file(self.session, upload_link, FileRangeReader(localFilename, progress=progress),
+                                headers=upload_headers, retries=retries, verify=verify)
+        except UploadError as e:
+            print(e)
+            return
+        print(response.status_code)
+        logger.info(f"Uploaded {uploadFilename}: {progress.report()}")
+        return payload
+
+    def _start_model_inputs(self, uploadFilename:str) -> dict:
+
+        """
+        Starts a model inputs process, returns its processId and uploadLink (None if the API refused it).
+        """
+        ## call model input profile
+        endpoint = "/edfx/v1/entities/modelInputs"
+        url = urljoin(self.base_url, endpoint)
+        payload = "-----011000010111000001101001\r\nContent-Disposition: form-data; name=\"uploadFilename\"\r\n\r\n" + uploadFilename + "\r\n-----011000010111000001101001\r\nContent-Disposition: form-data; name=\"largeFile\"\r\n\r\ntrue\r\n-----011000010111000001101001--\r\n\r\n"
+        headers = self.EDFXHeaders()['ModelInputsProcess']['headers']
+        response = self.session.post(url, data=payload, headers=headers)
+
+        if response.status_code == 200:
+            try:
+                payload = response.json()
+                if payload.get('message'):
+                    print(f"I'm sorry but the API Returned {payload} , which implies the server, for whatever reason did not like the payload. Please debug or check your input variables.")
+                    return
+            except:
+                print(f"An error occurred while processing the API response: {format_exc()}")
+                return
+            return payload
+        print(response.text)
+
+    def EDFXModelInputsParallel(self, uploadFilename:str, localFilename:str, part_size:int = 256 << 20,
+                                max_workers:int = 4, retries:int = 3, verify:bool = True, parts:list = None) -> list:
+
+        """
+        Uploads a large financials CSV as several parts sent in parallel. The presigned upload link of a process takes
+        a single PUT (it cannot be resumed or split), so every part of about part_size bytes, cut at line ends and
+        carrying the header line, is uploaded as its own model inputs process named <uploadFilename>_partNNN.csv.
+        A failure therefore only costs the failed part: each is retried on its own (retries, with backoff and MD5
+        verification as EDFXModelInputs) and a part still failing can be sent again later with parts=[its index].
+
+        Returns the process payloads (processId, uploadLink) in part order, None for the parts which failed. Every
+        processId covers the companies of its part; they can be tracked together with EDFXProcessManager.
+        """
+        header, ranges = csv_parts(localFilename, part_size)
+        indexes = range(len(ranges)) if parts is None else parts
+        stem, extension = os.path.splitext(uploadFilename)
+        progress = UploadProgress(sum(len(header) + ranges[index][1] for index in indexes), uploadFilename)
+
+        def upload(index):
+            name = f"{stem}_part{index:03d}{extension or '.csv'}"
+            payload = self._start_model_inputs(name)
+            if payload is None:
+                return None
+            headers = self.EDFXHeaders(process_id=payload['processId'])['ModelInputsUploadProcess']['headers']
+            offset, length = ranges[index]
+            try:
+                put_file(self.session, payload['uploadLink'], FileRangeReader(localFilename, offset, length, header, progress),
+                         headers=headers, retries=retries, verify=verify)
+            except UploadError as e:
+                logger.error(f"Part {index} of {uploadFilename} failed: {e}")
+                return None
+            return {**payload, 'part': index, 'uploadFilename': name}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            payloads = list(executor.map(upload, indexes))
+        failed = [index for index, payload in zip(indexes, payloads) if payload is None]
+        logger.info(f"Uploaded {len(payloads) - len(failed)} of {len(payloads)} parts of {uploadFilename}: {progress.report()}")
+        if failed:
+            logger.error(f"Parts {failed} of {uploadFilename} failed, send them again with parts={failed}.")
+        return payloads
+
+    def EDFXModelInputsFromFrame(self, financials:pd.DataFrame, uploadFilename:str, mapping:dict = None,
+                                 financialtemplate:str = 'Universal', builder:FinancialsTemplateBuilder = None,
+                                 parallel:bool = False, **upload_kwargs) -> tuple:
+
+        """
+        Uploads an internal financials DataFrame: it is mapped onto the template columns (EDFXTemplateDownload),
+        validated locally with vectorised checks (see EDFXTemplate.FinancialsTemplateBuilder), and only the valid rows
+        are written to a temporary CSV streamed into EDFXModelInputs (EDFXModelInputsParallel with parallel=True).
+
+        Params:
+            financials: Internal financials, one row per entity and statement date.
+            uploadFilename: Name of the upload, e.g. UniversalTemplateMyFinancials.csv.
+            mapping: {internal column: template column}.
+            builder: A configured FinancialsTemplateBuilder (required columns, rules, tolerance), else one is built
+                     from the downloaded template and mapping.
+            **upload_kwargs: retries, verify, part_size, ... of the upload method.
+
+        Returns (upload payload, issues DataFrame of the rejected or flagged rows); no upload is made when no row
+        is valid.
+        """
+        if builder is None:
+            template = self.EDFXTemplateDownload(financialtemplate)
+            if template is None:
+                return None, None
+            builder = FinancialsTemplateBuilder(template, mapping)
+        valid, issues = builder.prepare(financials)
+        if valid.empty:
+            logger.error(f"No valid rows to upload, see the {len(issues)} issues returned.")
+            return None, issues
+
+        handle, path = tempfile.mkstemp(prefix="edfx-", suffix=".csv")
+        os.close(handle)
+        try:
+            builder.to_csv(valid, path)
+            upload = self.EDFXModelInputsParallel if parallel else self.EDFXModelInputs
+            return upload(uploadFilename, path, **upload_kwargs), issues
+        finally:
+            os.remove(path)
+
+    def EDFXModelInputsGetStatus(self, processID: str, verbose:bool = True) -> dict:
+        """
+        Gets the status of a process that was started with the EDFXModelInputs() method
+        If the process is still running the method will return {'status': 'Processing'}
+        verbose: print the status (ProcessManager polls quietly, logging errors only).
+        """
+        endpoint = f"/edfx/v1/processes/{processID}/status"
+        url = urljoin(self.base_url, endpoint)
+        headers = self.EDFXHeaders()['JSONGet']['headers']
+        response = self.session.get(url, headers=headers)
+        try:
+            if response.status_code == 200:
+                status = response.json()
+                if verbose:
+                    print(status)
+                return status
+            elif verbose:
+                print(response.status_code)
+                print(response.text)
+            else:
+                logger.warning(f"Status of process {processID} returned {response.status_code}: {response.text}")
+        except:
+            print(f"An error occurred while processing the API response: {format_exc()}")
+
+    def EDFXProcessManager(self, max_workers:int = 16, poll_interval:float = 2.0, max_interval:float = 60.0,
+                           timeout:float = None, parse = None, on_complete = None, on_error = None) -> ProcessManager:
+        """
+        Returns a ProcessManager (see EDFXProcesses) of this client: it submits many server-side processes
+        (EDFXPD_Endpoint with asyncResponse=True, EDFXModelInputs uploads or processIds started elsewhere), polls their
+        statuses concurrently with backoff and downloads each result with EDFXModelInputsGetFiles once complete.
+
+            with endpoints.EDFXProcessManager(parse=EDFXEndpoints.EDFXPDParse) as manager:
+                futures = [manager.submit_pd(batch, startDate="2020-01-01") for batch in batches]
+        """
+        return ProcessManager(self, max_workers=max_workers, poll_interval=poll_interval, max_interval=max_interval,
+                              timeout=timeout, parse=parse, on_complete=on_complete, on_error=on_error)
+
+    def EDFXModelInputsGetFiles(self, processID: str, stream:bool = False, path:str = None) -> dict:
+        """
+        Gets the output/files of a process that was started with the EDFXModelInputs() method
+
+        Response
+
+        The JSON format response will contain a download link URL. A GET request with this URL will
+        return the results for the asynchronous request in JSON format. The response from the
+        download link will have the same structure as the equivalent synchronous data request.
+
+        stream: Write the result file in chunks to path (a temporary file by default) and return the path instead of
+                the loaded JSON, for results too large to load at once (see EDFXPDParseFile, EDFXModelInputsGetPDs).
+        """
+        endpoint = f"/edfx/v1/processes/{processID}/files"
+        url = urljoin(self.base_url, endpoint)
+        headers = self.EDFXHeaders()['JSONGet']['headers']
+        response = self.session.get(url, headers=headers)
+
+        try:
+            payload = response.json()
+            # 'downloadLink' boolean check is on the payload key as the payload is assumed to be a dictonary object.
+            if payload.get('message') or 'downloadLink' not in payload:
+                print(f"I'm sorry but the API Returned {payload} , which implies the server, for whatever reason did not like the payload. Please debug or check your input variables.")
+                return
+        except:
+            print(f"An error occurred while processing the API response: {format_exc()}")
+            return
+        download_link = payload['downloadLink']
+
+        try:
+            if stream:
+                return self.download_file(download_link, path)
+            file = self.session.get(download_link)
+            return json.loads(file.content)
+        except:
+            print(f"An error occurred while processing the API response: {format_exc()}")
+
+    def download_file(self, url:str, path:str = None, chunk_size:int = 1 << 20) -> str:
+
+        """
+        Streams url to path (a new temporary .json file by default) chunk by chunk and returns the path.
+        A partial file is removed if the download fails.
+        """
+        if path is None:
+            handle, path = tempfile.mkstemp(prefix="edfx-", suffix=".json")
+            os.close(handle)
+        try:
+            with self.session.get(url, stream=True) as response:
+                response.raise_for_status()
+                with open(path, 'wb') as file:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        file.write(chunk)
+        except:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        return path
+
+    def EDFXModelInputsGetPDs(self, processID:str, output_format:str = "pandas", file_name:str = "pd", sink = None,
+                              chunk_entities:int = 10_000, keep_file:bool = False):
+        """
+        Downloads the PD result of a server-side process (EDFXPD_Endpoint with asyncResponse=True) to a temporary file
+        and parses it entity by entity with EDFXPDParseFile, so the raw response is never held in memory. With a sink
+        (see EDFXSinks.as_sink) every chunk_entities entities are written out as they are parsed and memory stays flat
+        whatever the size of the result; the row count is returned. keep_file keeps the downloaded file.
+        """
+        path = self.EDFXModelInputsGetFiles(processID, stream=True)
+        if path is None:
+            return None
+        try:
+            return EDFXEndpoints.EDFXPDParseFile(path, output_format, file_name, sink=sink, chunk_entities=chunk_entities)
+        finally:
+            if not keep_file:
+                os.remove(path)
+
+
+    def EDFXRetrievinglimtsfortradecredit(self, entities:list[dict], startDate:str=None, endDate:str=None)->dict:
+
+        """
+        Required Params:
+        entities.
+
+        Use the /tools/creditLimit endpoint to access estimated limits for trade credit.
+        For each company except for financial institutions, we provide trade credit limits based on conservative,
+        balanced, and aggressive risk appetites. Limits provide corporate users with guidance on how much trade
+        credit to extend to a firm, and when to consider being paid upfront.
+
+        Limits are only implemented for entities that we have information on, either from Orbis or uploaded as custom
+        financials. It is not possible to calculate limits based on custom PD inputs.
+        """
+
+        if isinstance(entities, dict):
+            for key, value in entities.items():
+                if not isinstance(key,str) or not isinstance(value,str):
+                    print("Error: you need to either feed a dictionary of 'EntityID' as key and an EDFX Qualified ID as the value." )
+                    return None
+            entities = [entities]
+
+            # Check if entities is a list of dictionaries with the key "entityId"
+        if not isinstance(entities, list) or not all(isinstance(e, dict) and "entityId" in e for e in entities):
+            print("Error: entities parameter must be a list of dictionaries with an 'entityId' key")
+            return None
+
+        params = {
+                    "startDate": startDate,
+                    "endDate": endDate,
+                    "entities": entities
+                    }
+        endpoint = "/edfx/v1/tools/tradeCreditLimit"
+        if self.coalesce_window is not None:
+            return self.request_coalescer('tradecredit').request(canonical_key(endpoint, {**params, 'entities': None}),
+                                                                 params, entities, functools.partial(self._post_json, endpoint))
+        url = urljoin(self.base_url, endpoint)
+        headers = self.EDFXHeaders()["JSONBasic"]['headers']
+        response = self.session.post(url, json=params, headers=headers)
+        return response.json()
+
+    async def EDFXRetrievinglimtsfortradecredit_coalesced_async(self, entities:list[dict], startDate:str=None,
+                                                                endDate:str=None) -> dict:
+
+        """
+        EDFXRetrievinglimtsfortradecredit for asyncio callers, always through the request coalescer: concurrent
+        coroutines (and threads) asking for the same dates share one upstream call and each gets the credit limits of
+        its own entities.
+        """
+        if isinstance(entities, dict):
+            entities = [entities]
+        if not isinstance(entities, list) or not all(isinstance(e, dict) and "entityId" in e for e in entities):
+            print("Error: entities parameter must be a list of dictionaries with an 'entityId' key")
+            return None
+
+        params = {
+                    "startDate": startDate,
+                    "endDate": endDate,
+                    "entities": entities
+                    }
+        endpoint = "/edfx/v1/tools/tradeCreditLimit"
+        return await self.request_coalescer('tradecredit').request_async(canonical_key(endpoint, {**params, 'entities': None}),
+                                                                         params, entities, functools.partial(self._post_json, endpoint))
+
+    def EDFXRetrievingpeergroups_IDS(self,peerRegion:str, ownershipType:str, industryClassification:str=None, industryCode:str=None,
+                                     country:str=None) -> dict:
+
+        """
+        See Peer Groups - country to region mapping for more information:
+
+        Params: peerRegion: required
+                ownershipType: required
+                industryClassification: required
+                industryCode: required
+                country, Not required.
+
+            Sample JSON request:
+
+                                {
+                                "peerRegion":"WESTEUR",
+                                "industryClassification":"NDY",
+                                "industryCode":"N55",
+                                "ownershipType":"UNLISTED"
+                                }
+
+        """
+
+        params = {"peerRegion":peerRegion,
+                  "ownershipType":ownershipType,
+                  "industryClassification":industryClassification,
+                  "industryCode":industryCode,
+                  "country":country
+                  }
+
+        endpoint = "/edfx/v1/entities/peers/id"
+        url = urljoin(self.base_url, endpoint)
+        headers = self.EDFXHeaders()["JSONBasic"]['headers']
+        response = self.session.post(url, json=params, headers=headers)
+        return response.json()
+
+    def EDFXRetrievingpeergroups_Metrics(self, peerId:str, metrics:list[str], variables:list[str]=None,startDate:str=None,
+                                         endDate:str=None) -> dict:
+
+
+        """
+            Use this endpoint to retrieve metrics about variables (e.g. PD) within the peer group.
+
+            Method: POST
+
+            Params peerId: Required
+                   metrics: Required
+                   variables:Required
+                   startDate: Required
+                   endDate: Required
+
+            Sample Payload:
+                            payload = {
+                                "peerId": "832ec933-28e0-47c9-85a2-a8b5c2ca02b5",
+                                "variables": ["annualizedcumulativepd1y"],
+                                "metrics": ["P025", "P050"],
+                                "startDate": "2022-11-01",
+                                "endDate": "2023-01-01"
+                            }
+
+
+        """
+        params = {
+                    "peerId": peerId,
+                    "variables": variables,
+                    "metrics": metrics,
+                    "startDate": startDate,
+                    "endDate": endDate
+                }
+
+        headers = self.EDFXHeaders()["JSONBasic"]["headers"]
+        endpoint = "/edfx/v1/entities/peers/metrics"
+        url = urljoin(self.base_url, endpoint)
+        response = self.session.post(url, json=params, headers=headers)
+        return response.json()
+
+    def EDFXRetrievingpeergroups_Percentile(self,peerId:str,variableName:list[str], value:list[float]) -> dict:
+
+
+        """
+            For a specific variable, use this endpoint to retrieve the percentile of a given value.
+
+            Use this endpoint to retrieve metrics about variables (e.g. PD) within the peer group.
+
+            Params: peerId, variableName, value all required
+
+            sample payload:
+
+            payload = {
+                "peerId": "832ec933-28e0-47c9-85a2-a8b5c2ca02b5",
+                "request": {
+                    "variableName": ["annualizedcumulativepd1y"],
+                    "value": [0.023]
+                }
+            }
+
+        """
+        params = {
+                "peerId": peerId,
+                "request":
+                        {
+                        "variableName": variableName,
+                        "value": value
+                        }
+                    }
+        headers = self.EDFXHeaders()["JSONBasic"]["headers"]
+        endpoint = "/edfx/v1/entities/peers/percentile"
+        url = urljoin(self.base_url, endpoint)
+        response = self.session.post(url, json=params, headers=headers)
+        return response.json()
+
+    def EDFXRetrievingpeergroups_Metadata(self, peerId:str) -> dict:
+
+        """
+        Use this endpoint to retrieve information about a peer group.
+
+        Sample JSON Request
+
+
+                {
+                    "peerId":"6cef0ad5-5f1b-40bc-85a9-0a071143fd3b"
+                }
+        """
+
+
+        params =    {
+                    "peerId":peerId
+                    }
+        headers = self.EDFXHeaders()["JSONBasic"]['headers']
+        endpoint = "/edfx/v1/entities/peers/metadata"
+        url = urljoin(self.base_url, endpoint)
+        response = self.session.post(url, json=params, headers=headers)
+        return response.json()
+
+    def EDFXRetrievingpeergroups_Recommended(self,industryClassification:str,industryCode:str, ownershipType:str, country:str)->dict:
+
+        """
+        Params Required:
+
+            industryClassification
+            industryCode
+            ownershipType
+            country
+
+            Sample JSON request
+
+                    {
+                    "industryClassification":"NDY",
+                    "industryCode":"N17",
+                    "ownershipType":"UNLISTED",
+                    "country":"USA"
+                    }
+
+        Response Important Note:
+
+        Access the peer group ID that Moody's Analytics recommends as most appropriate according to both the criteria in the
+        request and some pre-set criteria. The pre-set criteria currently in place is:
+
+            - the recommended peer groups always include 10 or more constituents.
+
+        Given the Country, Industry and Ownership type in the request, this endpoint only returns the Country level peer group
+        that fits the criteria above; else the Region level peer group is looked up, and if that is not fitting the criteria
+        either then the Global-wide peer group is returned as the recommended one. In many cases, this response is the
+        same as /entity/peer/id.
+
+        """
+        params =    {
+                    "industryClassification":industryClassification,
+                    "industryCode":industryCode,
+                    "ownershipType":ownershipType,
+                    "country":country
+                    }
+
+        headers = self.EDFXHeaders()["JSONBasic"]['headers']
+        endpoint = "/edfx/v1/entities/peers/id/recommended"
+        url = urljoin(self.base_url, endpoint)
+        response = self.session.post(url, json=params, headers=headers)
+        return response.json()
+
+    def EDFXRetrievingpeergroups_Constituents(self, peerId:str)->dict:
+
+        """
+        Required Param:
+
+                peerId
+
+            The ID of the peer group for which you want to get information such as
+            - the number of companies in the peer group
+            - the country, in ISO code standard
+            - the industry, in NDY classification
+            - whether the peer groups concerns listed or not listed companies
+
+            The response is a pre-signed URL to the S3 bucket where the file with the constituents list is.
+
+        """
+        headers = self.EDFXHeaders()['JSONGet']['headers']
+        endpoint = f"/edfx/v1/entities/peers/{peerId}/constituents"
+        url = urljoin(self.base_url, endpoint)
+        response = self.session.get(url, headers=headers)
+        return response.text
+
+    def EDFXEarlyWarningScore(self, entities:list[dict[str,str]],asOfDate:str=None,prevAsOfDate:str=None,
+                               targetPercentile:float=None)->list:
+        """
+        The riskCategory endpoint allows you to access an early warning category for a given company.
+        This category is chosen based on changes in a company's risk, as indicated by its implied rating, and how it compares to its peers.
+        We use a target PD percentile of the peer group to define a trigger level and determine if a company's PD is above this level.
+        The trigger methodology uses a Bayesian-adjustment to leverage information from more broadly defined peer groups to control for situations
+        when a granular peer group has insufficient data. Additionally, it includes a procyclical adjustment that takes into account the position of
+        the industry in the credit cycle.
+
+        Possible risk categories are:
+            Severe: PD above triggerStable or worsening
+            High: PD above triggerImproving
+            Medium: PD at or below triggerWorsening
+            Low: PD at or below triggerStable or improving
+
+        Required Params:
+            entities: A list of either:
+                      - entityId. We support BvD IDs and CreditEdge PIDs and the API automatically determines which one is being used.
+                      − A dictionary of:
+                          1.entityId: A unique string used by requester to identify the entity.
+                          2.pd: A PD value for the as of date. PDs should be a number between 0 and 1.
+                          3.pdPrev: A PD value for a previous date (optional). PDs should be a number between 0 and 1.
+                          4.peerId: A valid peer group identifier. This can be generated using the /edfx/v1/entities/peers/id endpoint
+        Optional Params:
+            asOfDate: Date of PD value in the format YYYY-MM-DD. If this is not provided, this will default to the 1st day of the current month.
+            prevAsOfDate: Date of previous PD value in the format YYYY-MM-DD. This is used to calculate the change in implied rating
+            targetPercentile: Target percentile used for trigger level. Percentiles are represented as numbers i.e. the 63rd percentile is represented as 0.63.
+                              Values should be between 0.60 and 0.95 and given to two decimal place precision. This depends on the peer group chosen:
+                                  1.Private company peer group 0.80
+                                  2.Public financial company peer group 0.85
+                                  3.Public nonfinancial company peer group 0.75
+
+
+        """
+        headers = self.EDFXHeaders()['JSONGet']['headers']
+        endpoint = "/edfx/v1/tools/riskCategory"
+        url = urljoin(self.base_url, endpoint)
+        params = {
+            "entities": entities
+        }
+        if asOfDate:
+            params['asOfDate'] = asOfDate
+        if prevAsOfDate:
+            params['prevAsOfDate'] = prevAsOfDate
+        if targetPercentile:
+            params['targetPercentile'] = targetPercentile
+        response = self.session.post(url, headers=headers, json=params)
+        return response.json()
+
+    def EDFXEarlyWarningTriggers(self,peerId:str,endDate:str = None, startDate:str=None,targetPercentile:float=None)->dict:
+        """
+        The purpose of this endpoint to is provide a timeseries of triggers for a given peer group.
+
+        Sample Json:
+
+        {
+            "peerId":"89a28088-7952-4b15-8ff3-f963e36d7cfd",
+            "startDate":"2020-11-01",
+            "endDate":"2021-01-01",
+            "targetPercentile":0.80
+        }
+
+        """
+        headers = self.EDFXHeaders()['JSONGet']['headers']
+        endpoint = "/edfx/v1/tools/triggers"
+        url = urljoin(self.base_url, endpoint)
+        payload = {
+                    "peerId": peerId,
+                    "startDate": startDate,
+                    "endDate": endDate,
+                    "targetPercentile": targetPercentile
+                    }
+        response = self.session.post(url, json=payload, headers=headers)
+        return response.json()
+
+
+    def EDFXRetrievingStatements(self, entities: list, asOfDate: str = None, endData: str = None) -> list:
+        """
+        Access a summary of the financial statement for entities we have data on.
+
+        Required Params:
+            entities: A list of either:
+                      - entityId. We support BvD IDs and CreditEdge PIDs and the API automatically determines which one is being used.
+                      - A dictionary of:
+                          1.entityId: A unique string used by requester to identify the entity.
+                          2.pd: A PD value for the as of date. PDs should be a number between 0 and 1.
+                          3.pdPrev: A PD value for a previous date (optional). PDs should be a number between 0 and 1.
+                          4.peerId: A valid peer group identifier. This can be generated using the /edfx/v1/entities/peers/id endpoint
+        Optional Params:
+            asOfDate: If provided, generates a history of limit values to be generated in the format YYYY-MM-DD.
+            endData: The date of the limit you are retrieving in the format YYYY-MM-DD.
+
+
+        """
+        headers = self.EDFXHeaders()['JSONGet']['headers']
+        endpoint = "/edfx/v1/entities/financials/statements"
+        url = urljoin(self.base_url, endpoint)
+        params = {
+            "entities": entities
+        }
+        if asOfDate:
+            params['asOfDate'] = asOfDate
+        if endData:
+            params['endData'] = endData
+        response = self.session.post(url, headers=headers, json=params)
+        return response.json()
+
+    def EDFXRetrievingRatios(self, entities: list, asOfDate: str = None, endData: str = None) -> list:
+        """
+        Access key financial ratios for entities we have data on.
+
+        Required Params:
+            entities: A list of either:
+                      - entityId. We support BvD IDs and CreditEdge PIDs and the API automatically determines which one is being used.
+                      - A dictionary of:
+                          1.entityId: A unique string used by requester to identify the entity.
+                          2.pd: A PD value for the as of date. PDs should be a number between 0 and 1.
+                          3.pdPrev: A PD value for a previous date (optional). PDs should be a number between 0 and 1.
+                          4.peerId: A valid peer group identifier. This can be generated using the /edfx/v1/entities/peers/id endpoint
+        Optional Params:
+            asOfDate: If provided, generates a history of limit values to be generated in the format YYYY-MM-DD.
+            endData: The date of the limit you are retrieving in the format YYYY-MM-DD.
+
+
+        """
+        headers = self.EDFXHeaders()['JSONGet']['headers']
+        endpoint = "/edfx/v1/entities/financials/ratios"
+        url = urljoin(self.base_url, endpoint)
+        params = {
+            "entities": entities
+        }
+        if asOfDate:
+            params['asOfDate'] = asOfDate
+        if endData:
+            params['endData'] = endData
+        response = self.session.post(url, headers=headers, json=params)
+        return response.json()
+
+    def EDFXRetrievingRatioCalculations(self, statements: list) -> dict:
+        """
+        Calculate key ratios using your own financial statement inputs
+
+        Required Params:
+            statements: A list of statements. Each statement is a list of financial statement items
+            - financialStatementDate
+            - ebitda
+            - financeCosts
+            - grossIncome
+            - netIncome
+            - netSales
+            - netWorth
+            - profitBeforeTaxesAndExtraordinaryExpenses
+            - shortTermDebt
+            - totalAssets
+            - totalAssetsPreviousYear
+            - totalCostOfGoodsSold
+            - totalCurrentAssets
+            - totalCurrentLiabilities
+            - totalInventory
+            - totalInventoryPreviousYear
+            - totalLiabilities
+            - totalLongTermDebt
+            All items are optional. Missing values should not be sent and resulting ratios will be calculated as NA
+
+
+        """
+        headers = self.EDFXHeaders()['JSONGet']['headers']
+        endpoint = "/edfx/v1/entities/financials/ratios/calculate"
+        url = urljoin(self.base_url, endpoint)
+        params = {
+            "statements": statements
+        }
+        response = self.session.post(url, headers=headers, json=params)
+        return response.json()
+
+    def EDFXRetrievingSmartProjection(self, entities: list, projectionYears: int, assumptions: dict,
+                                      resultDetail: bool = False, inputDetail: bool = False, includeRatios: bool = False) -> dict:
+        """
+        Calculate key ratios using your own financial statement inputs
+
+        Required Params:
+            entities: A list of either:
+                      - entityId. We support BvD IDs and CreditEdge PIDs and the API automatically determines which one is being used.
+                      - A dictionary of:
+                          1.entityId: A unique string used by requester to identify the entity.
+                          2.pd: A PD value for the as of date. PDs should be a number between 0 and 1.
+                          3.pdPrev: A PD value for a previous date (optional). PDs should be a number between 0 and 1.
+                          4.peerId: A valid peer group identifier. This can be generated using the /edfx/v1/entities/peers/id endpoint
+            projectionYears: The number of years the projection is requested to cover. This must be whole years.
+            assumptions: Dict of assumtions, for example:
+                         {
+                            "sales": {
+                                "valuesType": "variable",
+                                "frequency": "annual",
+                                "value": [0.9, 1]
+                            },
+                            "newDebt": {
+                                "useProportion": {
+                                    "cash": 0.5,
+                                    "inventory": 0.25,
+                                    "fixedAssets": 0.25
+                                },
+                                "percentage": 0.03,
+                                "maturity": 60,
+                                "debtStart": 3,
+                                "interestRate": 0.03
+                            },
+                            "dividendPayoutRatio": {
+                                "valuesType": "fixed",
+                                "absChange": False,
+                                "value": 0.11
+                            }
+                        }
+            resultDetail: Should result detais be included in output
+            inputDetail: Should input details be included in output
+            includeRatios: Should ratios be included in output
+
+
+        """
+        headers = self.EDFXHeaders()['JSONGet']['headers']
+        endpoint = "/edfx/v1/entities/financials/smartProjection"
+        url = urljoin(self.base_url, endpoint)
+        params = {
+            "entities": entities,
+            "projectionYears": projectionYears,
+            "assumptions": assumptions,
+            "includeDetail": {
+                "resultDetail": resultDetail,
+                "inputDetail": inputDetail,
+                "includeRatios": includeRatios
+            }
+        }
+        response = self.session.post(url, headers=headers, json=params)
+        return response.json()
+
+    def EDFXScenarioConditionHelper(self, entity: dict) -> bool:
+
+        """ Helper Script To parse the entity Dictionary"""
+
+        required_fields = ['pd', 'pdPrev', 'primaryCountry', 'primaryIndustryClassification', 'primaryIndustry']
+        fields_present = [field for field in required_fields if field in entity and entity[field] is not None]
+
+        return len(fields_present) == 0 or len(fields_present) == len(required_fields)
+
+
+    def EDFXScenarioConditionedPds(self,includeScenario:list[dict[str,str]],entityId:str=None, projectionYear:int=None, pd:float=None,pdPrev:float=None,
+                                    primaryCountry:str=None, primaryIndustryClassification:str=None,primaryIndustry:str=None,resultDetail:bool=False,
+                                    inputDetail:bool=False, processId:str=None):
+
+
+        """
+        The endpoint provides the capability to observe PD stress evaluations aligned with Moody's economics scenarios.
+        You have the option to view the applied stress conditions for three distinct cases:
+
+            1- Orbis Entities: This refers to predefined entities available within the system.
+            2- Custom Entities from /modelInputs: users can apply stress conditions to custom entities they have previously established using the /modelInputs feature.
+            3- On-Demand Stress Testing Calculation: you have the flexibility to directly provide the necessary inputs for Stress PD calculations through the API;
+            you can provide your own credit risk metric, which will be stressed according to Moody’s Analytics Standard Global Scenarios.
+            This empowers you to perform stress testing calculations as needed.
+
+        Required Params:
+
+            includeScenario: The compilation of scenarios for which the user seeks to view PD results. Possible values: "Baseline", "S1", "S2", "S3", "S4".
+            entityId: The ID (BVD ID or PID) of the entities of interest. This should accept both the identifier mentioned above and custom companies.
+
+        Optional Params:
+
+            asOfDate: If provided, generates a history of limit values to be generated in the format YYYY-MM-DD.
+            projectionYears: Parameter to define the number of years of the projection. Ex. If the user selects 3, the response should only show 3 years of projections. Possible values: 1 to 5. Defaults to 5 if not provided.
+            pd_at_time_t: The PD at time t. This is the PD to which the macro stress test will be applied in on demand calculations. This input is only needed for Case 3.
+            pdLag: The PD at time t - 3 months. This input is only needed for Case 3. Only relevant if pd is also provided.
+            primaryCountry: The primary country for the entity's economic activity. Valid values are the three-letter country codes from ISO 3166. This input is only needed for Case 3.
+            primaryIndustryClassification: The primary industry code for the entity's economic activity. Possible values: NDY. Preset value: NDY. This input is only needed for Case 3
+            primaryIndustry: The primary industry code for the entity's economic activity. Possible values: NDY codes. This input is only needed for Case 3.
+
+        """
+
+        entity = {
+                "entityId": entityId,
+                "pd": pd,
+                "pdPrev": pdPrev,
+                "primaryCountry": primaryCountry,
+                "primaryIndustryClassification": primaryIndustryClassification,
+                "primaryIndustry": primaryIndustry
+                }
+        entity = self.create_params_dict(entity)
+        if not entity:
+            entity = None
+
+        params = {
+                "scenarios": {"includeScenario": includeScenario},
+                "projectionYear": projectionYear,
+                "includeDetail": {
+                    "resultDetail": resultDetail,
+                    "inputDetail": inputDetail
+                },
+                "processId": processId,
+                "entities": [entity] if entity else None
+                }
+
+        params = self.create_params_dict(params)
+
+        if 'entities' in params and 'entityId' in params['entities'][0] and 'processId' in params:
+            return "You cannot have both entityId and ProcessID as Params"
+        elif 'entities' in params and 'entityId' in params['entities'][0] and not self.EDFXScenarioConditionHelper(params['entities'][0]):
+            return "When entityId is provided, either none or all of the parameters (pd, pdPrev, primaryCountry, primaryIndustryClassification, primaryIndustry) must be included."
+        else:
+            headers = self.EDFXHeaders()['JSONGet']['headers']
+            endpoint = "/edfx/v1/tools/scenarioConditionedPds"
+            url = urljoin(self.base_url, endpoint)
+            try:
+
+                response = self.session.post(url, headers=headers, json=params)
+                response.raise_for_status()
+                return response.json()
+
+            except requests.RequestException as e:
+                return{f"There is an error:\n {e}"}
+
+    def EDFXCalculatingLGD(self, entities: list) -> dict:
+        """
+        Use this endpoint to calculate LGD in EDF-X API, the calculations are on-demand and use Loss Given Default 4.0 (LGD 4.0) model.
+        Suggest Edits The main metrics currently accessible are:
+        LGD (Loss Give Default) EL (Expected Loss) EL IR (Expected Loss Implied Rating)
+
+        Required Params:
+            entities: A list of entities.
+
+        Examples:
+        Minimum Inputs with Company & Loan Inputs
+        [
+            {
+                "entityId": "Custom Company",
+                "country": "USA",
+                "primaryIndustry": "N02",
+                "primaryIndustryClassification": "NDY",
+                "loans": [
+                    {
+                        "loanParameters": {
+                            "loanId": "loan1",
+                            "loanName": "loan1",
+                            "asOfDate": "2012-12-01",
+                            "instrumentType": "Senior Bond",
+                            "securedUnsecured": "Unsecured",
+                            "recoveryCalculationMode": "Ultimate Recovery",
+                            "capitalStructure": "Unknown"
+                        },
+                        "termStructureCumulativePd": { "cumulativePd1y": 0.0034 }
+                    }
+                ]
+            }
+        ]
+
+        Full Inputs all company and Loan Information
+        [
+            {
+                "entityId": "Custom Company",
+                "country": "USA",
+                "primaryIndustry": "N02",
+                "primaryIndustryClassification": "NDY",
+                "loans": [
+                    {
+                        "loanParameters": {
+                            "loanId": "loan1",
+                            "loanName": "loan1",
+                            "asOfDate": "2012-12-01",
+                            "exposure": 1000000,
+                            "originationDate": "2022-12-31",
+                            "maturityDate": "2025-06-30",
+                            "exposureCurrency": "USD",
+                            "instrumentType": "Senior Bond",
+                            "securedUnsecured": "Unsecured",
+                            "recoveryCalculationMode": "Ultimate Recovery",
+                            "capitalStructure": "Unknown"
+                        },
+                        "termStructureCumulativePd": {
+                            "cumulativePd1y": 0.0028,
+                            "cumulativePd2y": 0.0058,
+                            "cumulativePd3y": 0.0089,
+                            "cumulativePd4y": 0.012,
+                            "cumulativePd5y": 0.0152,
+                            "cumulativePd6y": 0.0184,
+                            "cumulativePd7y": 0.0216,
+                            "cumulativePd8y": 0.0248,
+                            "cumulativePd9y": 0.0279,
+                            "cumulativePd10y": 0.0311
+                        }
+                    }
+                ]
+            }
+        ]
+
+        Full Inputs all company, Loan Information, and Collateral
+        [
+            {
+                "entityId": "Custom Company",
+                "country": "USA",
+                "primaryIndustry": "N02",
+                "primaryIndustryClassification": "NDY",
+                "loans": [
+                    {
+                        "loanParameters": {
+                            "loanId": "1a19c5a4-67c8-441d-b3be-7fd150ab82fb",
+                            "loanName": "",
+                            "asOfDate": "2023-06-01",
+                            "originationDate": "2022-06-01",
+                            "maturityDate": "2023-06-01",
+                            "exposure": 1000000,
+                            "exposureCurrency": "USD",
+                            "instrumentType": "Term Loan",
+                            "securedUnsecured": "Secured",
+                            "recoveryCalculationMode": "Post-default Price",
+                            "capitalStructure": "Unknown",
+                            "loanScorecard": {
+                                "loanScorecardId": "2b77f0d7-b0e4-4dbc-844d-aabb4376a688",
+                                "blanketLien": "No",
+                                "collateral": [
+                                    {
+                                        "customCollateralId": "1234",
+                                        "loanId": "1a19c5a4-67c8-441d-b3be-7fd150ab82fb",
+                                        "collateralName": "",
+                                        "collateralType": "Accounts Receivable",
+                                        "amount": 100000,
+                                        "questionAnswers": [
+                                            {
+                                                "name": "Standard Payment Terms",
+                                                "value": "Not Available"
+                                            },
+                                            {
+                                                "name": "Customer Concentration",
+                                                "value": "Not Available"
+                                            },
+                                            {
+                                                "name": "Customer Credit Quality",
+                                                "value": "Not Available"
+                                            },
+                                            {
+                                                "name": "Borrowing Base",
+                                                "value": "Not Available"
+                                            },
+                                            {
+                                                "name": "Report Frequency",
+                                                "value": "Not Available"
+                                            },
+                                            {
+                                                "name": "Field Audit Frequency",
+                                                "value": "Not Available"
+                                            },
+                                            {
+                                                "name": "Dominion of Funds",
+                                                "value": "Not Available"
+                                            }
+                                        ]
+                                    }
+                                ],
+                                "guarantee": None,
+                                "lgdQualitativeFactors": {
+                                    "enterpriseValuation": None,
+                                    "covenantStructure": None
+                                }
+                            }
+                        },
+                        "termStructureCumulativePd": {
+                            "pdType": "pit",
+                            "cumulativePd1y": 0.0027,
+                            "cumulativePd2y": 0.0056,
+                            "cumulativePd3y": 0.0087,
+                            "cumulativePd4y": 0.0118,
+                            "cumulativePd5y": 0.015,
+                            "cumulativePd6y": 0.0181,
+                            "cumulativePd7y": 0.0213,
+                            "cumulativePd8y": 0.02439,
+                            "cumulativePd9y": 0.0275,
+                            "cumulativePd10y": 0.03062
+                        }
+                    }
+                ]
+            }
+        ]
+
+        """
+        headers = self.EDFXHeaders()['JSONGet']['headers']
+        endpoint = "/edfx/v1/entities/loans"
+        url = urljoin(self.base_url, endpoint)
+        params = {
+            "entities": entities
+        }
+        response = self.session.post(url, headers=headers, json=params)
+        assert response.status_code == 200, f"API call failed: {response.text}"
+        return response.json()
+
+    def EDFXRetrievingLoanMedianCreditSpreads(self, currency: str, referenceRate: str, rating: str, startDate: str, endDate: str, tenor: int) -> dict:
+        """
+        Use this endpoint to retrieve Moody's Implied Ratings Median Credit Spreads (MIR Credit Spreads) for a specific date and rating.
+        Provide information about the counterparty's loan(s) to calculate Loss Given Default metrics.
+        The calculations leverage the Loss Given Default 4.0 (LGD 4.0) model. In this same endpoint you can also use Moody’s Loan Scorecard.
+
+        Required Params:
+        currency
+        referenceRate
+        rating
+        startDate
+        endDate
+        tenor
+
+        """
+        headers = self.EDFXHeaders()['JSONGet']['headers']
+        endpoint = "/edfx/v1/tools/loanSpreads"
+        url = urljoin(self.base_url, endpoint)
+        params = {
+            "spreadCalculation": {
+                    "currency": currency,
+                    "referenceRate": referenceRate,
+                    "rating": rating,
+                    "startDate": startDate,
+                    "endDate": endDate,
+                    "tenor": tenor
+            }
+        }
+        params = self.create_params_dict(params)
+        response = self.session.post(url, headers=headers, json=params)
+        return response.json()
+
+    def EDFXDeteriorationProbability(self, entities:list[dict[str,str]],asyncResponse:bool=False,
+                                     startDate:str=None, endDate:str=None,
+                                     historyFrequency:str='monthly'):
+        """
+        Use this endpoint to access the latest available Deterioration Probability for the entity.
+
+        Understand in this current iteration Deterioration Probability DOES NOT allow for timeseries and/or a historyFrequency.
+        The values will be ignored if given however this is on the roadmap.  We will have this functionality
+        in the Coming 2024.
+
+        min sample request:
+        {
+            "asyncResponse":false,
+            "entities":[
+                {
+                    "entityId":"US942404110"
+                }
+            ]
+        }
+        """
+        headers = self.EDFXHeaders()['JSONBasic']['headers']
+        endpoint = "/edfx/v1/tools/deteriorationProbability"
+        url = urljoin(self.base_url, endpoint)
+        params = {
+                    "startDate": startDate,
+                    "endDate": endDate,
+                    "historyFrequency": historyFrequency,
+                    "asyncResponse": asyncResponse,
+                    "entities": entities
+                            }
+
+        params = self.create_params_dict(params)
+        response = self.session.post(url, headers=headers, json=params)
+        return response.json()
+
+    def EDFXMoodysRating(self,entities:list[dict[str,str]],ratingType:str="SRA"):
+
+        """
+        Use this endpoint to access the latest value available for Moody's Rating:
+
+        SRA rating.
+        In this payload it can handle ratingType as a param
+
+        Understand in this current iteration Moodys Rating DOES NOT allow for timeseries and/or a historyFrequency.
+
+        Entities: The object is a list of dictionary elements: value = [{'entityId': 'identifier'}]
+            multiple entities exmampe:
+            [{ "entityId": "DELEI421244" }, { "entityId": "US800890963" }, { "entityId": "FR813755949" }]
+
+
+        Sample Request:
+
+                {
+                "ratingType":"SRA",
+                "entities":[
+                    {
+                        "entityId":"US942404110"
+                    }
+                ]
+                }
+        """
+
+        if entities:
+            if isinstance(entities, dict):
+                for key, value in entities.items():
+                    if not isinstance(key,str) or not isinstance(value,str):
+                        print("Error: you need to either feed a dictionary of 'EntityID' as key and an EDFX Qualified ID as the value." )
+                        return None
+
+                entities = [entities]
+
+        headers = self.EDFXHeaders()['JSONBasic']['headers']
+        endpoint = "/edfx/v1/entities/moodysRating"
+        url = urljoin(self.base_url, endpoint)
+        params = {
+                    "ratingType": ratingType,
+                    "entities": entities
+                }
+        params = self.create_params_dict(params)
+        response = self.session.post(url, json=params, headers=headers)
+        return response.json()
+
+    def EDFXMoodysBondImpliedRating(self,entities:list[dict[str,str]],historyFrequency:str="monthly",
+                                    asyncResponse:bool=False,startDate:str=None, endDate:str=None):
+
+        """
+        This endpoint give access to the latest Bonds-implied Rating for the firm.
+        Sample JSON Request:
+
+        This endpoint Cannot handle ratingType as a param
+
+        {
+        "entities":[
+                        {
+                            "entityId":"US942404110"
+                        }
+                    ]
+                    }
+        """
+        headers = self.EDFXHeaders()['JSONBasic']['headers']
+        endpoint = "/edfx/v1/entities/bonds"
+        url = urljoin(self.base_url, endpoint)
+        params = {
+            "startDate": startDate,
+            "endDate": endDate,
+            "historyFrequency": historyFrequency,
+            "asyncResponse": asyncResponse,
+            "entities": entities
+        }
+        params = { key:value for key,value in params.items() if value is not None}
+        response = self.session.post(url, json=params, headers=headers)
+        return response.json()
+
+    def EDFXCDSImpliedRatings(self,entities:list[dict[str,str]],historyFrequency:str="monthly",
+                              asyncResponse:bool=False,startDate:str=None, endDate:str=None):
+
+        """
+        Access the latest CDS-Implied PD and IR for the firm under analysis using this endpoint.
+
+        {
+        "entities":[
+            {
+                "entityId":"34537A"
+            }
+        ]
+        }
+        """
+
+        headers = self.EDFXHeaders()['JSONBasic']['headers']
+        endpoint = "/edfx/v1/entities/cds"
+        url = urljoin(self.base_url, endpoint)
+        params = {
+                    "startDate": startDate,
+                    "endDate": endDate,
+                    "historyFrequency": historyFrequency,
+                    "asyncResponse": asyncResponse,
+                    "entities": entities
+                }
+        params = { key:value for key,value in params.items() if value is not None}
+        response = self.session.post(url, json=params, headers=headers)
+        return response.json()
+
+    @staticmethod
+    def EDFXExportData(df:pd.DataFrame, output_format:str, file_name:str, **export_options):
+        """
+        This is how we can export the data either in a pandas, csv, or excel dataframe
+        depending on what the user selects in their parse methods.
+
+        Parquet and Feather write columnar files through pyarrow, keeping the dtypes. export_options are the
+        compression, row_group_size and partition_by of write_columnar; every EDFX*Parse method passes its extra
+        keyword arguments on here:
+
+            EDFXEndpoints.EDFXPDParse(pd_json, output_format='parquet', file_name='PDHistory', compression='zstd',
+                                      row_group_size=500_000, partition_by='asOfDate')
+            # -> PDHistory/asOfDate=2024-01-31/part-0.parquet, ...
+        """
+        if output_format == OutputFormat.PANDAS.value:
+            return df
+
+        elif output_format == OutputFormat.EXCEL.value:
+            df.to_excel(f"{file_name}.xlsx", index=False)
+            print(f"Data saved as {file_name}.xlsx")
+
+        elif output_format == OutputFormat.CSV.value:
+            df.to_csv(f"{file_name}.csv", index=False)
+            print(f"Data Saved as {file_name}.csv")
+
+        elif output_format == OutputFormat.ARROW.value:
+            if pa is None:
+                raise ImportError("pyarrow is required for the Arrow output format: pip install pyarrow")
+            return pa.Table.from_pandas(df)
+
+        elif output_format in (OutputFormat.PARQUET.value, OutputFormat.FEATHER.value):
+            path = write_columnar(df, output_format.lower(), file_name, **export_options)
+            print(f"Data saved as {path}")
+
+        else:
+            raise ValueError(f"Unsupported OutputFormat: {output_format}.")
+
+    @staticmethod
+    def EDFXSearchParse(jsonresponse:dict, output_format:str = "pandas", file_name="SearchOutput", **export_options):
+
+        """
+        Flattens every entity into one column per key path (see flatten_dict), through the cached record layout of
+        the response shape.
+
+        """
+        output_format = output_format.title()
+        try:
+
+            if not isinstance(jsonresponse,dict) or not jsonresponse:
+                print(f"The API did not return a valid response or data. Response Below:\n {jsonresponse}")
+                return None
+            else:
+                entities = jsonresponse['entities']
+                frame = ColumnarFrame()
+                if entities:
+                    frame.extend_flattened(entities, record_layout(entities[0], 'entities/search'))
+                df = frame.to_pandas()
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occured while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+
+    @staticmethod
+    def EDFXBatchParse(batch:json, output_format:str = "pandas", file_name = "batchoutput", **export_options):
+        """
+        Parses the Json Batch output and transforms it to either a pandas dataframe, .csv, or .xlsx file.
+
+
+        Params:
+        - JSONB  EDFXBatchEntitySearch dictionary object: dict
+        - output_format:str (your choice of either'Pandas', 'Excel', 'Csv'), where csv and excel options save
+        to your local path.
+
+        THIS WILL BREAK IF MOODYS ANALYTICS CHANGES THE EDFX BATCH OUTPUT RESPONSE
+        Every nationalId item becomes a nationalId_<idName> column appended after the entity columns.
+
+        """
+
+        output_format = output_format.title()
+        try:
+            if not isinstance(batch,dict) or not batch:
+
+                print(f"The API did not return a valid response or data. Response Below:\n {batch}")
+                return None
+
+            else:
+
+                df = pd.DataFrame(batch['entities'])
+                if 'nationalId' in df.columns:
+                    # Explode the nationalId lists into (row, column, value) records in one pass, pivot them to one
+                    # column per idName (in order of first appearance, the last value wins) and join them back.
+                    records = [(index, 'nationalId_' + item['idName'], item['idValue'])
+                               for index, items in zip(df.index, df['nationalId']) if isinstance(items, list)
+                               for item in items]
+                    # drop the original nationalId col
+                    df = df.drop(columns=['nationalId'])
+                    if records:
+                        exploded = pd.DataFrame(records, columns=['row', 'column', 'value'])
+                        national_ids = (exploded.drop_duplicates(['row', 'column'], keep='last')
+                                                .pivot(index='row', columns='column', values='value')
+                                                .reindex(columns=exploded['column'].unique()))
+                        national_ids.columns.name = None
+                        existing = [column for column in national_ids.columns if column in df.columns]
+                        for column in existing:
+                            # an entity attribute already named like the id: only overwrite the rows having that id
+                            values = national_ids[column].dropna()
+                            df.loc[values.index, column] = values
+                        df = df.join(national_ids.drop(columns=existing))
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXPDParse(data: dict, output_format:str = "pandas", file_name = "pd", **export_options):
+
+        """
+        Parses the provided JSON data into a pandas DataFrame.
+
+        Parameters:
+        - data (dict): The JSON data to be parsed.
+        - TimeSeries: If set to True returned DataFrame will have datetime index
+        - output_format: pandas, csv, excel, parquet, feather or arrow. arrow returns a pyarrow.Table built straight
+                         from the columns (asOfDate stays a column).
+
+        Returns:
+        - DataFrame: A pandas DataFrame
+        """
+
+        output_format = output_format.title()
+        file_name = file_name.title()
+        try:
+            # Try seeing if there is an error.
+            if not isinstance(data,dict) or not data:
+                print(f"The API did not return a valid response or data. Response Below:\n {data}")
+                return None
+            # else perform the parse.
+            if "entities" not in data:
+                logger.error(f"Possible Serverside Issue:  Error message from server as: \n {data}")
+
+            else:
+                # one list per column filled in a single pass through the cached layout of the history records
+                frame = pd_columns(data['entities'])
+
+                if output_format == OutputFormat.ARROW.value:
+                    # straight from the column buffers, without going through pandas
+                    return frame.to_arrow()
+                df = frame.to_pandas()
+                df = df.set_index(pd.to_datetime(df['asOfDate']))
+                # TODO: Check if we need to drop asOfDate
+                # now just get rid of the column asOfDate
+                # df = df.drop(columns = ['asOfDate'])
+        # print API exception if a global error occurs
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while parsing.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXPDParseFile(path:str, output_format:str = "pandas", file_name = "pd", sink = None, chunk_entities:int = 10_000, **export_options):
+
+        """
+        EDFXPDParse of a PD result file (e.g. downloaded with EDFXModelInputsGetFiles(processId, stream=True)) read
+        incrementally with ijson: one entity at a time goes into the columnar parser, the file is never loaded whole.
+
+        Parameters:
+        - path: JSON file with the structure of the PD endpoint response.
+        - output_format, file_name: as EDFXPDParse.
+        - sink: Optional EDFXSinks sink (or path / callable, see as_sink). Every chunk_entities entities are parsed and
+                written to it, keeping memory flat; the number of rows written is returned.
+        - chunk_entities: Entities per parsed chunk when writing to a sink.
+        """
+
+        output_format = output_format.title()
+        file_name = file_name.title()
+        entities = iter_json_items(path, 'entities.item')
+        output = as_sink(sink)
+        try:
+            if output is not None:
+                for chunk in iter(lambda: list(itertools.islice(entities, chunk_entities)), []):
+                    frame = pd_columns(chunk)
+                    if frame.rows:
+                        df = frame.to_pandas()
+                        output.write(df.set_index(pd.to_datetime(df['asOfDate'])) if 'asOfDate' in df else df)
+                logger.info(f"{output.rows} rows written to {output}.")
+                return output.rows
+
+            frame = pd_columns(entities)
+            if not frame.rows:
+                logger.error(f"No PD entities were found in {path}.")
+                return None
+            if output_format == OutputFormat.ARROW.value:
+                return frame.to_arrow()
+            df = frame.to_pandas()
+            df = df.set_index(pd.to_datetime(df['asOfDate']))
+        except ImportError:
+            raise
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while parsing.")
+            return None
+        finally:
+            entities.close()
+            # sinks built here from a path are closed here, Sink instances belong to the caller
+            if output is not None and output is not sink:
+                output.close()
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXPD_DriversParse(json:dict, output_format:str = 'pandas', file_name="pdHistory", **export_options):
+
+        """
+        This parses, public, private, and multiple public and private Json Responses
+        """
+        # Extract data for all entities
+        output_format = output_format.title()
+        try:
+            if not isinstance(json,dict) or not json:
+                print(f"The API did not return a valid response or data. Response Below:\n {json}")
+                return None
+
+            else:
+                all_ratios = []
+                for entity in json['entities']:
+                    all_ratios.extend(PDDrivers_extract_ratios(entity))
+
+                # Convert the list of dictionaries into a DataFrame
+                df = pd.DataFrame(all_ratios)
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXParseTradeCredit(json:dict, output_format:str = "pandas", file_name = "TradeCredit", return_missing:bool = False, **export_options):
+
+        """
+        Parses the response of the EDFXRetrievinglimtsfortradecredit method to extract trade credit information
+        and returns either Pandas DF, CSV, or Excel file.
+
+        Parameters:
+        - response (dict): The response object returned by EDFXRetrievinglimtsfortradecredit method
+        - output_format: Pandas DataFrame, Excel, or Csv
+        - return_missing: True returns (output, missing_ids), missing_ids being the list of entityIds without credit
+          information.
+
+        Returns:
+        - DataFrame: A DataFrame with trade credit information. Missing values are NaN and every column has one type
+          (e.g. creditLimit float64), the frame concatenated per entity before kept None in object columns.
+        """
+        output_format = output_format.title()
+        try:
+            if not isinstance(json, dict) or not json:
+                print(f"The API did not return a valid response or data. Response Below:\n {json}")
+                return None
+            else:
+                # Extract the list of entities
+                entities = json.get("entities", [])
+                # One list per column, the DataFrame is built once at the end
+                frame = ColumnarFrame()
+                # entityIds without credit information
+                missing_data_ids = []
+                for entity_data in entities:
+                    credit_limits = entity_data.get("creditLimits", [])
+                    if credit_limits:
+                        entity_id = entity_data.get("entityId")
+                        # 'entityId' as the first column
+                        for credit_limit in credit_limits:
+                            frame.append_record({"entityId": entity_id, **credit_limit})
+                    else:
+                        missing_data_ids.append(entity_data.get("entityId"))
+
+                if missing_data_ids:
+                    print(f"Unfortunately: {len(missing_data_ids)} entities have no credit information.")
+                full_df = frame.to_pandas()
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        output = EDFXEndpoints.EDFXExportData(full_df, output_format, file_name, **export_options)
+        if return_missing:
+            return output, missing_data_ids
+        return output
+
+    @staticmethod
+    def EDFXParsePeerGroupMetrics(json:dict, output_format='pandas', file_name = "PeerGroupMetrics", return_missing:bool = False, **export_options):
+
+        """
+        Parses the json of the EDFXRetrievingpeergroups_Metrics method to extract peer group metrics
+        and return it as either a Pandas DataFrame, Excel or CSV file.
+
+        Required Params:
+        dictionary json response object and pandas Pd
+
+        return_missing: True returns (output, missing_variables), missing_variables being the list of variableNames
+        returned without metrics.
+
+        Missing values are NaN and every column has one type (e.g. unit and currency strings), the frame concatenated
+        per result before kept None in object columns.
+        """
+        output_format = output_format.title()
+        try:
+            if not isinstance(json, dict) or not json:
+                print(f"The API did not return a valid response or data. Response Below:\n {json}")
+                return None
+
+            else:
+                # Extract the list of results
+                results = json.get("results", [])
+                # Check if results are present
+                if not results:
+                    print(f"Unfortunately: No data found for peerId {json.get('peerId')}.")
+                    return (pd.DataFrame(), []) if return_missing else pd.DataFrame()
+                frame = ColumnarFrame()
+                missing_variables = []
+                # Loop through each result and extract relevant data
+                for result_data in results:
+                    metric_list = result_data.get("metricList", [])
+                    values = result_data.get("values", [])
+                    if not metric_list or not values:
+                        missing_variables.append(result_data.get("variableName"))
+                    # Convert metricList and values into a dictionary
+                    data_dict = dict(zip(metric_list, values))
+                    # Add other fields to this dictionary
+                    data_dict.update({
+                        "asOfDate": result_data.get("asOfDate"),
+                        "variableName": result_data.get("variableName"),
+                        "unit": result_data.get("unit"),
+                        "currency": result_data.get("currency")
+                    })
+                    frame.append_record(data_dict)
+
+                full_df = frame.to_pandas()
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        output = EDFXEndpoints.EDFXExportData(full_df, output_format, file_name, **export_options)
+        if return_missing:
+            return output, missing_variables
+        return output
+
+
+
+    @staticmethod
+    def EDFXParsePeerGroupPercentile(json:dict, output_format:str = 'Pandas', file_name = "PeerGroupPercentile", return_missing:bool = False, **export_options):
+
+        """
+        Parses the response of the EDFXRetrievingpeergroups_Percentile method to extract variable name and percentile
+        and return it as a Pandas DataFrame.
+
+        Parameters:
+
+        - response (dict): The response object returned by EDFXRetrievingpeergroups_Percentile method
+        - output_format: Pandas, Excel, Csv
+        - return_missing: True returns (output, missing_variables), missing_variables being the list of variableNames
+          returned without a percentile.
+
+        Returns:
+        - DataFrame: A DataFrame with variable name and percentile information, Excel or Csv File. A missing percentile
+          is NaN in a float64 column, the frame concatenated per result before kept None in an object column.
+        """
+        output_format = output_format.title()
+        try:
+
+            if not isinstance(json, dict) or not json:
+                print(f"The API did not return a valid response or data. Response Below:\n {json}")
+                return None
+
+            else:
+                # get me the value for the 'results' key if it exists, else return me an empty list.
+                #  Using "get" method with a default value avoids this potential KeyError issue thus is employed here.
+                results = json.get('results',[])
+                if not results:
+                    print(f"Unfortunately No data found for peerId {json.get('peerId')}.")
+                    return (pd.DataFrame(), []) if return_missing else pd.DataFrame()
+
+                variable_names = [result_data.get("variableName") for result_data in results]
+                percentiles = [result_data.get("percentile") for result_data in results]
+                missing_variables = [name for name, percentile in zip(variable_names, percentiles) if percentile is None]
+                full_df = pd.DataFrame({"variableName": variable_names, "percentile": percentiles})
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        output = EDFXEndpoints.EDFXExportData(full_df, output_format, file_name, **export_options)
+        if return_missing:
+            return output, missing_variables
+        return output
+
+
+    @staticmethod
+    def EDFXParsePeerGroupMetaData(json:dict, output_format:str = 'Pandas', file_name = "PeerGroupMetaData", **export_options):
+        """
+        Parses the response of the EDFXRetrievingpeergroups_MetaData method to extract variable name and percentile
+        and return it as a Pandas DataFrame.
+
+        Parameters:
+
+        - response (dict): The response object returned by EDFXRetrievingpeergroups_MetaData method
+        - output_format: Pandas, Excel, Csv
+
+        Returns:
+        - DataFrame: A DataFrame with variable name and percentile information, Excel or Csv File.
+        """
+        output_format = output_format.title()
+        try:
+            if not isinstance(json, dict) or not json:
+                print(f"The API did not return a valid response or data. Response Below:\n {json}")
+                return None
+            else:
+                keys = ["peerId", "peerName", "count", "country", "region", "industryCode", "ownershipType"]
+                # Check if peerId exists in the response
+                if not json.get("peerId"):
+                    print(f"Warning: No data found.")
+                    # return pd.DataFrame()
+                # Extract the metadata using list comprehension
+                metadata = {key: json.get(key) for key in keys}
+                # Convert the metadata dictionary into a DataFrame
+                df = pd.DataFrame([metadata])
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXParsePeerGroupRecommended(json:dict, output_format:str="Pandas", file_name="PeerGroupRecommended", **export_options):
+        """
+        Peer Group Parse.
+        """
+        output_format = output_format.title()
+
+        try:
+            if not isinstance(json, dict) or not json:
+                print(f"The API did not return a valid response or data. Response Below:\n {json}")
+                return None
+            else:
+                # Extracting the results: this is a list of a long dictionary so i'm just taking the entire dictionary
+                results = json.get("results", [{}])[0]
+                if not results:
+                    print(f"Warning: No data found.")
+                    return pd.DataFrame()
+                # Convert the results dictionary into a list of tuples (key, value) format
+                data = list(results.items())
+                # Convert the list into a DataFrame
+                df = pd.DataFrame(data, columns=['peerId_name', 'peerId_value'])
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXEarlyWarningScoreParse(EDFXEarlyWarningScoreJSON:dict, output_format='Pandas',
+                                   file_name = "EarlyWarningScore", **export_options):
+        """
+        Parses the provided JSON data into a pandas DataFrame.
+
+        Parameters:
+        - EDFXEarlyWarningScoreJSON (dict): The JSON data to be parsed.
+        - output_format (str): The putput format, can be "Pandas", "Excel", "CSV".
+
+        Returns:
+        - DataFrame: A pandas DataFrame.
+        """
+        # catches errors.
+        output_format = output_format.title()
+        try:
+            if not isinstance(EDFXEarlyWarningScoreJSON,dict) or not EDFXEarlyWarningScoreJSON:
+                print(f"The API did not return a valid response or data. Response Below:\n {EDFXEarlyWarningScoreJSON}")
+                return None
+            else:
+                 df = pd.DataFrame(EDFXEarlyWarningScoreJSON['entities'])
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+
+    @staticmethod
+    def EDFXEarlyWarningTriggersParse(TriggerJson:dict,output_format:str='pandas',file_name = 'EarlyWarningTrigger', **export_options):
+
+        """
+        Parses Triggers Dictionary
+        """
+        output_format = output_format.title()
+        try:
+            if not isinstance(TriggerJson,dict) or not TriggerJson:
+                print(f"The API did not return a valid response or data. Response Below:\n {TriggerJson}")
+                return None
+            else:
+                df = pd.DataFrame(TriggerJson['triggers'])
+                # Convert 'asOfDate' column to datetime format
+                df['asOfDate'] = pd.to_datetime(df['asOfDate'])
+                # # Sort the DataFrame based on 'asOfDate'
+                df = df.sort_values(by='asOfDate').reset_index(drop=True)
+                # Check OutputFormat
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXStatementsParse(StatementsJSON: dict, FormatType: str = 'Long', output_format='Pandas',
+                            file_name = 'FinancialStatement', **export_options):
+        """
+        Parses the provided JSON data into a pandas DataFrame.
+
+        Parameters:
+        - data (dict): The JSON data to be parsed.
+        - FormatType (str): The format to which the data should be parsed. Either "wide" or "long".
+
+        Returns:
+        - DataFrame: A pandas DataFrame in the specified format.
+        """
+        # catches errors.
+        FormatType = FormatType.title()
+        output_format = output_format.title()
+        try:
+            if not isinstance(StatementsJSON, dict) or not StatementsJSON:
+                print(f"The API did not return a valid response or data. Response Below:\n {StatementsJSON}")
+                return None
+
+            # Check for error response in JSON
+            elif 'message' in StatementsJSON:
+                print(f"Error in received data: {StatementsJSON['message']}")
+                return None
+            # Make sure 'entities' key exists in StatementsJSON
+            elif 'entities' not in StatementsJSON:
+                raise ValueError("The provided data does not contain 'entities'. Ensure the correct data format.")
+            else:
+                if FormatType not in ('Long', 'Wide'):
+                    raise ValueError("Invalid FormatType provided. Choose either 'Wide' or 'Long'.")
+                # Build Out
+                flat_data = []
+                for entity in StatementsJSON['entities']:
+                    if FormatType == 'Long':
+                        for statement in entity['statements']:
+                            # gives me key,value pairs as dictionary elements within the list that are not nested
+                            flat_data.append(filter_out_list_and_dict(entity))
+                            #flat_data[-1] maps to the last element (a dictionary) in the flat_data list and updates
+                            # that element
+                            flat_data[-1].update(filter_out_list_and_dict(statement, 'statement'))
+                            flat_data[-1].update(filter_out_list_and_dict(statement['balanceSheet'], 'balanceSheet'))
+                            flat_data[-1].update(filter_out_list_and_dict(statement['incomeStatement'], 'incomeStatement'))
+                    elif FormatType == 'Wide':
+                        flat_data.append(filter_out_list_and_dict(entity))
+                        for statement in entity['statements']:
+                            flat_data[-1].update(filter_out_list_and_dict(statement, f'{statement["financialStatementDate"]}_statement'))
+                            flat_data[-1].update(filter_out_list_and_dict(statement['balanceSheet'], f'{statement["financialStatementDate"]}_balanceSheet'))
+                            flat_data[-1].update(filter_out_list_and_dict(statement['incomeStatement'], f'{statement["financialStatementDate"]}_incomeStatement'))
+
+                df = pd.DataFrame(flat_data)
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXRatiosParse(RatiosJSON: dict, FormatType: str = 'Long', output_format='Pandas',
+                        file_name = "FinancialRatios", **export_options):
+        """
+        Parses the provided JSON data into a pandas DataFrame.
+
+        Parameters:
+        - data (dict): The JSON data to be parsed.
+        - FormatType (str): The format to which the data should be parsed. Either "wide" or "long".
+
+        Returns:
+        - DataFrame: A pandas DataFrame in the specified format.
+        """
+        # catches errors.
+        FormatType = FormatType.title()
+        output_format = output_format.title()
+
+        try:
+            if not isinstance(RatiosJSON, dict) or not RatiosJSON:
+                print(f"The API did not return a valid response or data. Response Below:\n {RatiosJSON}")
+                return None
+            # Make sure 'entities' key exists in StatementsJSON
+            elif 'entities' not in RatiosJSON:
+                raise ValueError("The provided data does not contain 'entities'. Ensure the correct data format.")
+
+            elif FormatType not in ('Long', 'Wide'):
+                raise ValueError("Invalid FormatType provided. Choose either 'Wide' or 'Long'.")
+            else:
+        # Build Out
+                flat_data = []
+                for entity in RatiosJSON['entities']:
+                    if FormatType == 'Long':
+                        for ratio in entity['ratios']:
+                            flat_data.append(filter_out_list_and_dict(entity))
+                            flat_data[-1].update(filter_out_list_and_dict(ratio['leverage'], 'leverage'))
+                            flat_data[-1].update(filter_out_list_and_dict(ratio['liquidity'], 'liquidity'))
+                            flat_data[-1].update(filter_out_list_and_dict(ratio['operational'], 'operational'))
+                            flat_data[-1].update(filter_out_list_and_dict(ratio['profitability'], 'profitability'))
+                    elif FormatType == 'Wide':
+                        flat_data.append(filter_out_list_and_dict(entity))
+                        for ratio in entity['ratios']:
+                            flat_data[-1].update(filter_out_list_and_dict(ratio['leverage'], f'{ratio["financialStatementDate"]}_leverage'))
+                            flat_data[-1].update(filter_out_list_and_dict(ratio['liquidity'], f'{ratio["financialStatementDate"]}_liquidity'))
+                            flat_data[-1].update(filter_out_list_and_dict(ratio['operational'], f'{ratio["financialStatementDate"]}_operational'))
+                            flat_data[-1].update(filter_out_list_and_dict(ratio['profitability'], f'{ratio["financialStatementDate"]}_profitability'))
+
+                df = pd.DataFrame(flat_data)
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXRatioCalculationsParse(RatiosCalculationJson: dict, FormatType: str = 'Long', output_format='Pandas',
+                                   file_name="RatioCalculations", **export_options):
+        """
+        Parses the provided JSON data into a pandas DataFrame.
+
+        Parameters:
+        - data (dict): The JSON data to be parsed.
+        - FormatType (str): The format to which the data should be parsed. Either "wide" or "long".
+
+        Returns:
+        - DataFrame: A pandas DataFrame in the specified format.
+        """
+        # catches errors.
+        FormatType = FormatType.title()
+        output_format = output_format.title()
+        try:
+            if not isinstance(RatiosCalculationJson, dict) or not RatiosCalculationJson:
+                    print(f"The API did not return a valid response or data. Response Below:\n {RatiosCalculationJson}")
+                    return None
+            else:
+                if FormatType not in ('Long', 'Wide'):
+                    raise ValueError("Invalid FormatType provided. Choose either 'Wide' or 'Long'.")
+
+                # Build Out
+                flat_data = []
+                if FormatType == 'Long':
+                    for ratio in RatiosCalculationJson['ratios']:
+                        flat_data.append(filter_out_list_and_dict(ratio))
+                        flat_data[-1].update(filter_out_list_and_dict(ratio['leverage'], 'leverage'))
+                        flat_data[-1].update(filter_out_list_and_dict(ratio['liquidity'], 'liquidity'))
+                        flat_data[-1].update(filter_out_list_and_dict(ratio['operational'], 'operational'))
+                        flat_data[-1].update(filter_out_list_and_dict(ratio['profitability'], 'profitability'))
+                elif FormatType == 'Wide':
+                    flat_data.append(filter_out_list_and_dict(ratio))
+                    for ratio in RatiosCalculationJson['ratios']:
+                        flat_data[-1].update(filter_out_list_and_dict(ratio['leverage'], f'{ratio["financialStatementDate"]}_leverage'))
+                        flat_data[-1].update(filter_out_list_and_dict(ratio['liquidity'], f'{ratio["financialStatementDate"]}_liquidity'))
+                        flat_data[-1].update(filter_out_list_and_dict(ratio['operational'], f'{ratio["financialStatementDate"]}_operational'))
+                        flat_data[-1].update(filter_out_list_and_dict(ratio['profitability'], f'{ratio["financialStatementDate"]}_profitability'))
+
+                df = pd.DataFrame(flat_data)
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+
+    @staticmethod
+    def EDFXSmartProjectionParse(SmartProjectionJSON: dict, FormatType: str = 'Long', output_format='Pandas',
+                                 file_name = "SmartProjects", **export_options):
+        """
+        Parses the provided JSON data into a pandas DataFrame.
+
+        Parameters:
+        - data (dict): The JSON data to be parsed.
+        - FormatType (str): The format to which the data should be parsed. Either "wide" or "long".
+
+        Returns:
+        - DataFrame: A pandas DataFrame in the specified format.
+        """
+        # catches errors.
+        FormatType = FormatType.title()
+        output_format = output_format.title()
+        try:
+            if not isinstance(SmartProjectionJSON, dict) or not SmartProjectionJSON:
+                    print(f"The API did not return a valid response or data. Response Below:\n {SmartProjectionJSON}")
+                    return None
+            else:
+
+                if FormatType not in ('Long', 'Wide'):
+                    raise ValueError("Invalid FormatType provided. Choose either 'Wide' or 'Long'.")
+                # Build Out
+                flat_data = []
+                for entity in SmartProjectionJSON['entities']:
+                    if FormatType == 'Long':
+                        for projection in entity['projections']:
+                            statement = projection['statement']
+                            flat_data.append(filter_out_list_and_dict(entity))
+                            flat_data[-1].update(filter_out_list_and_dict(projection, 'projection'))
+                            flat_data[-1].update(filter_out_list_and_dict(statement['balanceSheet'], 'balanceSheet'))
+                            flat_data[-1].update(filter_out_list_and_dict(statement['incomeStatement'], 'incomeStatement'))
+                    elif FormatType == 'Wide':
+                        flat_data.append(filter_out_list_and_dict(entity))
+                        for projection in entity['projections']:
+                            statement = projection['statement']
+                            flat_data[-1].update(filter_out_list_and_dict(projection, f'{projection["financialStatementDate"]}_projection'))
+                            flat_data[-1].update(filter_out_list_and_dict(statement['balanceSheet'], f'{projection["financialStatementDate"]}_balanceSheet'))
+                            flat_data[-1].update(filter_out_list_and_dict(statement['incomeStatement'], f'{projection["financialStatementDate"]}_incomeStatement'))
+
+                df = pd.DataFrame(flat_data)
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXScenarioPDParse(Scenariojson:dict, output_format:str = 'pandas', file_name="ScenarioConditionedPds", **export_options):
+
+        """Parses Dictionary output form EDFXScenarioConditionedPds endpoint"""
+        output_format = output_format.title()
+
+        try:
+            if not isinstance(Scenariojson,dict) or not Scenariojson:
+                print(f"The API did not return a valid response or data.  Response Below:\n {Scenariojson}.")
+            else:
+                data_list = []
+                for entity in Scenariojson['entities']:
+                    entityId = entity['entityId']
+                    for scenario_name, scenario_data in entity['scenarios'].items():
+                        for record in scenario_data:
+                            record_dict = {
+                                "asOfDate": record['asOfDate'],
+                                "Scenario": scenario_name,
+                                "PD1yr": record["pd"],
+                                "impliedRating": record['impliedRating'],
+                                'entityId': entityId
+                            }
+                            data_list.append(record_dict)
+
+                # Convert list of dictionaries to dataframe
+                df_long = pd.DataFrame(data_list)
+                df_wide = df_long.pivot(index=["asOfDate", "entityId"],
+                                        columns='Scenario',
+                                        values=["PD1yr", "impliedRating"]).reset_index()
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+        return EDFXEndpoints.EDFXExportData(df_wide, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXLGDParse(LGDJSON: dict, FormatType: str = 'Long', output_format='Pandas',file_name = "LGD", **export_options):
+
+        """
+        Parses the provided JSON data into a pandas DataFrame.
+
+        Parameters:
+        - data (dict): The JSON data to be parsed.
+        - FormatType (str): The format to which the data should be parsed. Either "wide" or "long".
+
+        Returns:
+        - DataFrame: A pandas DataFrame in the specified format.
+        """
+        # catches errors.
+        FormatType = FormatType.title()
+        output_format = output_format.title()
+        try:
+            if not isinstance(LGDJSON, dict) or not LGDJSON:
+                    logger.error(f"The API did not return a valid response or data. Response Below:\n {LGDJSON}")
+                    return None
+            if 'entities' not in LGDJSON:
+                logger.error(f"Possbile Server-side error message from server.  Description: \n {LGDJSON}.")
+            else:
+                if FormatType not in ('Long', 'Wide'):
+                    raise ValueError("Invalid FormatType provided. Choose either 'Wide' or 'Long'.")
+                # Build Out
+                flat_data = []
+                for entity in LGDJSON['entities']:
+                    if FormatType == 'Long':
+                        for loan in entity['loans']:
+                            flat_data.append(filter_out_list_and_dict(entity))
+                            flat_data[-1].update(filter_out_list_and_dict(loan['tenorMatchedResults'], 'tenorMatchedResults'))
+                            for term_structure in ('annualized', 'cumulative'):
+                                for inner_term_structure in loan['termStructureLgd'][term_structure]:
+                                    if loan['termStructureLgd'][term_structure][inner_term_structure]:
+                                        flat_data[-1].update(filter_out_list_and_dict(loan['termStructureLgd'][term_structure][inner_term_structure], f'termStructureLgd_{term_structure}_{inner_term_structure}'))
+
+                            if loan['termStructureLgd']['longRun']:
+                                flat_data[-1].update(filter_out_list_and_dict(loan['termStructureLgd']['longRun'], 'termStructureLgd_longRun'))
+                            if loan['termStructureCumulativePd']:
+                                flat_data[-1].update(filter_out_list_and_dict(loan['termStructureCumulativePd'], 'termStructureCumulativePd'))
+                            if loan['scoreCardResults']:
+                                flat_data[-1].update(filter_out_list_and_dict(loan['scoreCardResults'], 'scoreCardResults'))
+
+                    elif FormatType == 'Wide':
+                        flat_data.append(filter_out_list_and_dict(entity))
+                        for loan in entity['loans']:
+                            flat_data[-1].update(filter_out_list_and_dict(loan['tenorMatchedResults'], 'tenorMatchedResults'))
+                            for term_structure in ('annualized', 'cumulative'):
+                                for inner_term_structure in loan['termStructureLgd'][term_structure]:
+                                    if loan['termStructureLgd'][term_structure][inner_term_structure]:
+                                        flat_data[-1].update(filter_out_list_and_dict(loan['termStructureLgd'][term_structure][inner_term_structure], f'termStructureLgd_{term_structure}_{inner_term_structure}'))
+
+                            if loan['termStructureLgd']['longRun']:
+                                flat_data[-1].update(filter_out_list_and_dict(loan['termStructureLgd']['longRun'], 'termStructureLgd_longRun'))
+                            if loan['termStructureCumulativePd']:
+                                flat_data[-1].update(filter_out_list_and_dict(loan['termStructureCumulativePd'], 'termStructureCumulativePd'))
+                            if loan['scoreCardResults']:
+                                flat_data[-1].update(filter_out_list_and_dict(loan['scoreCardResults'], 'scoreCardResults'))
+
+                df = pd.DataFrame(flat_data)
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXClimateIndustryTransitionRiskDriversParse(data: dict, output_format: str = 'Pandas', file_name: str = 'ClimateIndustryTransitionRiskDriversParse', **export_options):
+
+        """
+        Parses Climate Transition Risk Drivers
+        """
+        try:
+            if not isinstance(data, dict) or not data:
+                print(f"The API did not return a valid response or data. Response Below:\n {data}")
+                return None
+            else:
+                flat_data = []
+                for scenario_name, scenario_items in data.items():
+                    for scenario_item in scenario_items:
+                        flat_data_item = {'scenario': scenario_name}
+                        flat_data_item.update(scenario_item)
+                        flat_data.append(flat_data_item)
+
+                df = pd.DataFrame(flat_data)
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXClimatePDParse(data: dict, output_format: str = 'Pandas', file_name: str = 'ClimatePD', **export_options):
+
+        """
+        Parses Climate PD
+        Parameters:
+        - data (dict): The JSON data to be parsed.
+        - output_format (str): The output format.
+        - file_name (str): Name of the file to be created.
+
+        Returns:
+        - DataFrame: A pandas DataFrame in the specified format.
+        """
+        try:
+            if not isinstance(data, dict) or not data:
+                print(f"The API did not return a valid response or data. Response Below:\n {data}")
+                return None
+            else:
+                entities = data['entities']
+                frame = ColumnarFrame()
+                if entities:
+                    frame.extend_flattened(entities, record_layout(entities[0], 'climate/pds'))
+                df = frame.to_pandas()
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+    @staticmethod
+    def EDFXClimateReportPublicParse(data: str, output_format: str = 'Pandas', file_name: str = 'ClimateReportPublic', **export_options):
+
+        """
+        Parses Climate Report Public
+        Parameters:
+        - data (str): CSV data retreived from EDFXClimateReportPublic
+        - output_format (str): The output format.
+        - file_name (str): Name of the file to be created.
+
+        Returns:
+        - DataFrame: A pandas DataFrame in the specified format.
+        """
+        try:
+            if not data:
+                print(f"The API did not return a valid response or data. Response Below:\n {data}")
+                return None
+            else:
+                df = pd.read_csv(io.StringIO(data), sep=',')
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("An error occurred while processing the API response.")
+            return None
+
+        return EDFXEndpoints.EDFXExportData(df, output_format, file_name, **export_options)
+
+
+
+if __name__ == "__main__":
+
+    public  = mk.EDF_X()['Client'],# EDFX public key
+    private = mk.EDF_X()['Client_Secret'], # EDFX private key.
+    endpoints = EDFXEndpoints(public, private)
+
+
+
+
+
+
+
+
+
+
+
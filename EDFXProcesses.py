@@ -0,0 +1,273 @@
+import time
+import heapq
+import random
+import asyncio
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from loguru import logger
+from traceback import format_exc
+
+# =============================================================================================================
+# ATTENTION: Before you continue UNDERSTAND:
+# Moodys Analytics DOES NOT support this code. This code is for assistance and demonstration purposes only.
+# Licensed Clients should reference https://hub.moodysanalytics.com/products
+# and the functional endpoint examples when formatting their exact questions to support.
+# ==============================================================================================================
+
+
+class ProcessFailed(RuntimeError):
+
+    """
+    Raised by the future of a server-side process which failed, timed out or returned no files.
+    """
+
+    def __init__(self, job, message:str):
+        super().__init__(f"Process {job.process_id} ({job.label}): {message}")
+        self.job = job
+
+
+class ProcessJob():
+
+    """
+    One server-side process tracked by a ProcessManager. future resolves to the downloaded (and parsed) result.
+    """
+
+    def __init__(self, label, future:Future):
+        self.label = label
+        self.future = future
+        self.process_id = None
+        self.status = None
+        self.state = 'submitting'
+        self.polls = 0
+        self.interval = None
+        self.deadline = None
+        self.submitted_at = time.monotonic()
+        self.completed_at = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.completed_at or time.monotonic()) - self.submitted_at
+
+    def __repr__(self):
+        return f"ProcessJob(label={self.label!r}, process_id={self.process_id!r}, state={self.state!r}, status={self.status!r})"
+
+
+class ProcessManager():
+
+    """
+    Runs many server-side (asynchronous) EDF-X processes at once: submits them, polls their status concurrently with
+    an exponential backoff and downloads the files of each process through EDFXModelInputsGetFiles as soon as it
+    completes, instead of submitting and waiting for one process at a time.
+
+        with endpoints.EDFXProcessManager(parse=EDFXEndpoints.EDFXPDParse) as manager:
+            futures = [manager.submit_pd(batch, startDate="2020-01-01") for batch in batches]
+            futures.append(manager.submit_model_inputs("MyFinancials.csv", "data/MyFinancials.csv"))
+            for future in manager.as_completed():
+                df = future.result()
+
+    Every submit returns a concurrent.futures.Future (await it with asyncio.wrap_future, or use gather_async).
+    on_complete(job, result) and on_error(job, exception) are called as each process finishes. A failed or timed out
+    process raises ProcessFailed from its future.
+
+    Params:
+        endpoints: EDFXEndpoints (or LGD) client.
+        max_workers: Submissions, status polls and downloads running at the same time.
+        poll_interval: Seconds before the first status poll of a process.
+        max_interval: Upper bound of the backoff between two polls of a process.
+        backoff: Multiplier of the poll interval after every pending status (with +-10% jitter).
+        timeout: Seconds after which a process still pending is given up, None waits forever.
+        parse: Optional parse(files) applied to the downloaded result, e.g. EDFXEndpoints.EDFXPDParse.
+    """
+
+    PENDING = ('Requested', 'Processing', 'Pending', 'Queued', 'Running', 'InProgress', 'In Progress')
+    FAILED = ('Failed', 'Error', 'Rejected', 'Cancelled', 'Canceled')
+
+    def __init__(self, endpoints, max_workers:int = 16, poll_interval:float = 2.0, max_interval:float = 60.0,
+                 backoff:float = 1.5, timeout:float = None, parse = None, on_complete = None, on_error = None):
+
+        self.endpoints = endpoints
+        self.poll_interval = poll_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.parse = parse
+        self.on_complete = on_complete
+        self.on_error = on_error
+        self.jobs = []
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="edfx-processes")
+        # (due time, sequence, job) of the next status polls, served by the scheduler thread
+        self.schedule = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.scheduler = threading.Thread(target=self._schedule_loop, name="edfx-process-scheduler", daemon=True)
+        self.scheduler.start()
+
+    def submit(self, start, *args, label = None, **kwargs) -> Future:
+
+        """
+        Starts a process with start(*args, **kwargs), any EDF-X call answering with a processId
+        (e.g. EDFXPD_Endpoint with asyncResponse=True), and tracks it. Returns the Future of its result.
+        """
+        job = ProcessJob(label, Future())
+        self.jobs.append(job)
+        self.executor.submit(self._start, job, start, args, kwargs)
+        return job.future
+
+    def submit_pd(self, entities:list, label = None, **pd_params) -> Future:
+
+        """
+        Server-side PD request: EDFXPD_Endpoint(entities, asyncResponse=True, **pd_params).
+        """
+        return self.submit(self.endpoints.EDFXPD_Endpoint, entities=entities, asyncResponse=True,
+                           label=label, **pd_params)
+
+    def submit_model_inputs(self, uploadFilename:str, localFilename:str, label = None, **kwargs) -> Future:
+
+        """
+        Financials upload through EDFXModelInputs, its process result is downloaded once the upload is processed.
+        """
+        return self.submit(self.endpoints.EDFXModelInputs, uploadFilename, localFilename,
+                           label=label or uploadFilename, **kwargs)
+
+    def track(self, processId:str, label = None) -> Future:
+
+        """
+        Tracks a process started elsewhere.
+        """
+        return self.submit(lambda: processId, label=label or processId)
+
+    def _start(self, job:ProcessJob, start, args:tuple, kwargs:dict):
+        try:
+            payload = start(*args, **kwargs)
+            process_id = payload if isinstance(payload, str) else (payload or {}).get('processId')
+        except Exception as e:
+            self._fail(job, e)
+            return
+        if not process_id:
+            self._fail(job, ProcessFailed(job, f"no processId was returned: {payload}"))
+            return
+        job.process_id = process_id
+        job.label = job.label or process_id
+        job.state = 'pending'
+        job.interval = self.poll_interval
+        if self.timeout is not None:
+            job.deadline = time.monotonic() + self.timeout
+        self._schedule(job, self.poll_interval)
+
+    def _schedule(self, job:ProcessJob, delay:float):
+        with self.condition:
+            heapq.heappush(self.schedule, (time.monotonic() + delay, next(self.sequence), job))
+            self.condition.notify()
+
+    def _schedule_loop(self):
+        while True:
+            with self.condition:
+                while not self.closed and (not self.schedule or self.schedule[0][0] > time.monotonic()):
+                    self.condition.wait(self.schedule[0][0] - time.monotonic() if self.schedule else None)
+                if self.closed:
+                    return
+                _, _, job = heapq.heappop(self.schedule)
+            self.executor.submit(self._poll, job)
+
+    def _poll(self, job:ProcessJob):
+        job.polls += 1
+        try:
+            status = self.endpoints.EDFXModelInputsGetStatus(job.process_id, verbose=False)
+        except Exception:
+            logger.warning(f"Status poll of process {job.process_id} failed: {format_exc()}")
+            status = None
+        job.status = status.get('status') if isinstance(status, dict) else None
+
+        if job.status in self.FAILED:
+            self._fail(job, ProcessFailed(job, f"status {status}"))
+        elif job.status is not None and job.status not in self.PENDING:
+            self._download(job)
+        elif job.deadline is not None and time.monotonic() >= job.deadline:
+            self._fail(job, ProcessFailed(job, f"still {job.status} after {self.timeout} seconds"))
+        else:
+            # pending, or the poll itself failed: back off before asking again
+            job.interval = min(job.interval * self.backoff, self.max_interval)
+            self._schedule(job, job.interval * random.uniform(0.9, 1.1))
+
+    def _download(self, job:ProcessJob):
+        job.state = 'downloading'
+        try:
+            result = self.endpoints.EDFXModelInputsGetFiles(job.process_id)
+            if result is None:
+                raise ProcessFailed(job, f"status {job.status} but no files could be downloaded")
+            if self.parse is not None:
+                result = self.parse(result)
+        except Exception as e:
+            self._fail(job, e)
+            return
+        job.state = 'done'
+        job.completed_at = time.monotonic()
+        job.future.set_result(result)
+        if self.on_complete is not None:
+            self.on_complete(job, result)
+
+    def _fail(self, job:ProcessJob, error:Exception):
+        job.state = 'failed'
+        job.completed_at = time.monotonic()
+        logger.error(f"Process {job.process_id} ({job.label}) failed: {error}")
+        job.future.set_exception(error)
+        if self.on_error is not None:
+            self.on_error(job, error)
+
+    def as_completed(self, timeout:float = None):
+
+        """
+        Futures of the submitted processes in completion order, as concurrent.futures.as_completed.
+        """
+        return as_completed([job.future for job in self.jobs], timeout)
+
+    def wait(self, timeout:float = None) -> list:
+
+        """
+        Waits for every submitted process and returns their results in submission order (the exception of a failed one).
+        """
+        results = []
+        for job in list(self.jobs):
+            try:
+                results.append(job.future.result(timeout))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def gather_async(self) -> list:
+
+        """
+        wait() for asyncio callers, without blocking the event loop.
+        """
+        return await asyncio.gather(*(asyncio.wrap_future(job.future) for job in list(self.jobs)),
+                                    return_exceptions=True)
+
+    def summary(self) -> dict:
+        summary = {'submitting': 0, 'pending': 0, 'downloading': 0, 'done': 0, 'failed': 0}
+        for job in self.jobs:
+            summary[job.state] += 1
+        return summary
+
+    def close(self, wait:bool = True):
+
+        """
+        Stops polling. With wait, the processes still running are waited for first.
+        """
+        if wait:
+            self.wait()
+        for job in self.jobs:
+            if not job.future.done():
+                self._fail(job, ProcessFailed(job, "the process manager was closed before it finished"))
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.scheduler.join()
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close(wait=exc[0] is None)
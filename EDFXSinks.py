@@ -0,0 +1,312 @@
+import os
+import uuid
+import sqlite3
+import pandas as pd
+from loguru import logger
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# =============================================================================================================
+# ATTENTION: Before you continue UNDERSTAND:
+# Moodys Analytics DOES NOT support this code. This code is for assistance and demonstration purposes only.
+# Licensed Clients should reference https://hub.moodysanalytics.com/products
+# and the functional endpoint examples when formatting their exact questions to support.
+# ==============================================================================================================
+
+
+def columnar_table(df:pd.DataFrame, partition_by:list = None):
+
+    """
+    Arrow table of df for the Parquet/Feather writers. Partition columns held in the index (the asOfDate index of the
+    PD history) are moved back to columns, and datetime partition columns are written as dates so the directory names
+    read asOfDate=2024-01-31.
+    """
+    partition_by = partition_by or []
+    if any(name in (df.index.names or []) and name not in df.columns for name in partition_by):
+        df = df.reset_index()
+    elif partition_by and df.index.name in df.columns:
+        # the PD history index repeats its asOfDate column, a dataset would carry it as __index_level_0__
+        df = df.reset_index(drop=True)
+    for name in partition_by:
+        if name not in df.columns:
+            raise KeyError(f"Cannot partition by {name}, the output has no such column.")
+        if pd.api.types.is_datetime64_any_dtype(df[name]):
+            df = df.assign(**{name: df[name].dt.date})
+    return pa.Table.from_pandas(df, preserve_index=None)
+
+def table_frame(df:pd.DataFrame) -> pd.DataFrame:
+
+    """
+    df as rows of a database table: a named index is kept as a column unless it repeats one (the asOfDate index of
+    the PD history), an unnamed one is dropped.
+    """
+    if df.index.name is None or df.index.name in df.columns:
+        return df.reset_index(drop=True)
+    return df.reset_index()
+
+
+class Sink():
+
+    """
+    Destination the bulk methods write each parsed batch to as soon as it completes, instead of keeping every batch
+    for a final pd.concat:
+
+        await endpoints.SynchronousBatchMVP_async(entities, 100, sink=ParquetDatasetSink("pd_history"))
+        await endpoints.SynchronousBatchMVP_async(entities, 100, sink="pd_history.csv")
+        await endpoints.SynchronousBatchMVP_async(entities, 100, sink=lambda df: queue.put(df))
+
+    Batches arrive in completion order. Every write is committed before the next batch so the results can be read
+    while the run goes on. A sink is also a callable (sink(df) writes df) and a context manager closing it.
+    See as_sink for the accepted shorthands.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.batches = 0
+
+    def write(self, df:pd.DataFrame):
+        if df is None or df.empty:
+            return
+        self._write(df)
+        self.rows += len(df)
+        self.batches += 1
+
+    def _write(self, df:pd.DataFrame):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __call__(self, df:pd.DataFrame):
+        self.write(df)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(rows={self.rows}, batches={self.batches})"
+
+
+class CallbackSink(Sink):
+
+    """
+    Hands every batch DataFrame to callback(df).
+    """
+
+    def __init__(self, callback):
+        super().__init__()
+        self.callback = callback
+
+    def _write(self, df:pd.DataFrame):
+        self.callback(df)
+
+
+class CSVSink(Sink):
+
+    """
+    Appends every batch to one CSV file, the header is written once. The columns of the first batch written fix the
+    layout of the file: later batches are aligned to it (missing columns left empty, new ones dropped with a warning).
+
+    Params:
+        path: CSV file.
+        overwrite: Truncate an existing file instead of appending to it.
+        index: Write the DataFrame index, as DataFrame.to_csv.
+    """
+
+    def __init__(self, path:str, overwrite:bool = True, index:bool = False, **to_csv_kwargs):
+        super().__init__()
+        self.path = path
+        self.index = index
+        self.to_csv_kwargs = to_csv_kwargs
+        self.columns = None
+        if overwrite and os.path.exists(path):
+            os.remove(path)
+        elif os.path.exists(path) and os.path.getsize(path):
+            self.columns = list(pd.read_csv(path, nrows=0).columns)
+            if index:
+                self.columns = self.columns[1:]
+
+    def _write(self, df:pd.DataFrame):
+        header = self.columns is None
+        if header:
+            self.columns = list(df.columns)
+        elif list(df.columns) != self.columns:
+            dropped = [column for column in df.columns if column not in self.columns]
+            if dropped:
+                logger.warning(f"Columns {dropped} are not in the header of {self.path} and are not written.")
+            df = df.reindex(columns=self.columns)
+        df.to_csv(self.path, mode='a', header=header, index=self.index, **self.to_csv_kwargs)
+
+
+class ParquetDatasetSink(Sink):
+
+    """
+    Writes every batch as new Parquet file(s) of one dataset directory, readable at any time with
+    pd.read_parquet(directory) or pyarrow.dataset.dataset(directory, partitioning='hive').
+
+    Params:
+        directory: Dataset folder.
+        partition_by: Column name or list of names (e.g. 'entityId', 'asOfDate') for a hive partitioned layout.
+        compression: Parquet codec, snappy by default.
+        row_group_size: Maximum rows per row group.
+        overwrite: Remove the existing Parquet files of the dataset first, otherwise the batches are added to them.
+    """
+
+    def __init__(self, directory:str, partition_by = None, compression:str = 'snappy', row_group_size:int = None,
+                 overwrite:bool = False):
+        super().__init__()
+        if pa is None:
+            raise ImportError("pyarrow is required for ParquetDatasetSink: pip install pyarrow")
+        import pyarrow.dataset as ds
+        self.ds = ds
+        self.directory = directory
+        self.partition_by = [partition_by] if isinstance(partition_by, str) else partition_by
+        self.file_options = ds.ParquetFileFormat().make_write_options(compression=compression)
+        self.group_options = {}
+        if row_group_size:
+            self.group_options = {'max_rows_per_group': row_group_size,
+                                  'min_rows_per_group': min(row_group_size, 1 << 14)}
+        if overwrite and os.path.isdir(directory):
+            # only the Parquet files, whatever else lives in the folder is left alone
+            for root, _, files in os.walk(directory):
+                for file in files:
+                    if file.endswith('.parquet'):
+                        os.remove(os.path.join(root, file))
+        os.makedirs(directory, exist_ok=True)
+        # a fresh prefix per sink so appending to an existing dataset never overwrites its files
+        self.prefix = f"part-{uuid.uuid4().hex[:12]}"
+
+    def _write(self, df:pd.DataFrame):
+        table = columnar_table(df, self.partition_by)
+        options = dict(self.group_options)
+        if self.partition_by:
+            partitions = table.select(self.partition_by).group_by(self.partition_by).aggregate([]).num_rows
+            options.update(partitioning=self.partition_by, partitioning_flavor='hive',
+                           max_partitions=max(partitions, 1024))
+        self.ds.write_dataset(table, self.directory, format='parquet', file_options=self.file_options,
+                              basename_template=f"{self.prefix}-{self.batches}-{{i}}.parquet",
+                              existing_data_behavior='overwrite_or_ignore', **options)
+
+
+class SQLiteSink(Sink):
+
+    """
+    Appends every batch to a SQLite table, committing after each batch. Columns appearing in later batches are added
+    to the table. A named DataFrame index is stored as a column (see table_frame).
+
+    Params:
+        path: SQLite database file (created if needed) or an open sqlite3.Connection.
+        table: Table name.
+        if_exists: 'append' keeps the rows already in the table, 'replace' drops the table first.
+    """
+
+    def __init__(self, path, table:str = 'results', if_exists:str = 'append'):
+        super().__init__()
+        self.owns_connection = not isinstance(path, sqlite3.Connection)
+        self.connection = sqlite3.connect(path) if self.owns_connection else path
+        self.table = table
+        if if_exists == 'replace':
+            with self.connection:
+                self.connection.execute(f'DROP TABLE IF EXISTS "{table}"')
+        self.columns = self._table_columns()
+
+    def _table_columns(self) -> list:
+        return [row[1] for row in self.connection.execute(f'PRAGMA table_info("{self.table}")')]
+
+    def _write(self, df:pd.DataFrame):
+        df = table_frame(df)
+        if self.columns:
+            for column in df.columns:
+                if column not in self.columns:
+                    self.connection.execute(f'ALTER TABLE "{self.table}" ADD COLUMN "{column}"')
+                    self.columns.append(column)
+        df.to_sql(self.table, self.connection, if_exists='append', index=False)
+        self.connection.commit()
+        if not self.columns:
+            self.columns = self._table_columns()
+
+    def close(self):
+        if self.owns_connection:
+            self.connection.close()
+
+
+class DuckDBSink(Sink):
+
+    """
+    Appends every batch to a DuckDB table (inserted by column name, new columns are added to the table).
+    Requires the optional duckdb package.
+
+    Params:
+        path: DuckDB database file or an open duckdb connection.
+        table: Table name.
+        if_exists: 'append' keeps the rows already in the table, 'replace' drops the table first.
+    """
+
+    def __init__(self, path, table:str = 'results', if_exists:str = 'append'):
+        super().__init__()
+        if duckdb is None:
+            raise ImportError("duckdb is required for DuckDBSink: pip install duckdb")
+        self.owns_connection = isinstance(path, str)
+        self.connection = duckdb.connect(path) if self.owns_connection else path
+        self.table = table
+        if if_exists == 'replace':
+            self.connection.execute(f'DROP TABLE IF EXISTS "{table}"')
+
+    def _write(self, df:pd.DataFrame):
+        chunk = table_frame(df)
+        self.connection.register('edfx_chunk', chunk)
+        try:
+            self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" AS SELECT * FROM edfx_chunk LIMIT 0')
+            columns = {row[0] for row in self.connection.execute(f'DESCRIBE "{self.table}"').fetchall()}
+            for name, column_type, *_ in self.connection.execute('DESCRIBE SELECT * FROM edfx_chunk').fetchall():
+                if name not in columns:
+                    self.connection.execute(f'ALTER TABLE "{self.table}" ADD COLUMN "{name}" {column_type}')
+            self.connection.execute(f'INSERT INTO "{self.table}" BY NAME SELECT * FROM edfx_chunk')
+        finally:
+            self.connection.unregister('edfx_chunk')
+
+    def close(self):
+        if self.owns_connection:
+            self.connection.close()
+
+
+def as_sink(sink) -> Sink:
+
+    """
+    Sink of the sink argument of the bulk methods:
+
+        Sink instance                 -> used as is
+        callable                      -> CallbackSink
+        'results.csv'                 -> CSVSink
+        'results.parquet' / 'folder/' -> ParquetDatasetSink
+        'results.sqlite' / '.db'      -> SQLiteSink (table 'results')
+        'results.duckdb'              -> DuckDBSink (table 'results')
+    """
+    if sink is None or isinstance(sink, Sink):
+        return sink
+    if isinstance(sink, (str, os.PathLike)):
+        path = os.fspath(sink)
+        extension = os.path.splitext(path.rstrip('/\\'))[1].lower()
+        if extension == '.csv':
+            return CSVSink(path)
+        if extension in ('.sqlite', '.sqlite3', '.db'):
+            return SQLiteSink(path)
+        if extension == '.duckdb':
+            return DuckDBSink(path)
+        if extension in ('.parquet', ''):
+            return ParquetDatasetSink(path)
+        raise ValueError(f"No sink for {path}, use a .csv, .parquet, .sqlite, .db or .duckdb path or a Sink.")
+    if callable(sink):
+        return CallbackSink(sink)
+    raise TypeError(f"Unsupported sink: {sink!r}")
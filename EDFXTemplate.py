@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+# =============================================================================================================
+# ATTENTION: Before you continue UNDERSTAND:
+# Moodys Analytics DOES NOT support this code. This code is for assistance and demonstration purposes only.
+# Licensed Clients should reference https://hub.moodysanalytics.com/products
+# and the functional endpoint examples when formatting their exact questions to support.
+# ==============================================================================================================
+
+# descriptive (non numeric) and date columns of the financials templates, every other template column is numeric
+TEXT_COLUMNS = frozenset({'entityInternationalName', 'entityIdentifierbvd', 'entityIdentifier', 'primaryIndustryClassification',
+                          'primaryIndustry', 'primaryCountry', 'primaryStateProvince', 'currency', 'entityLegalForm',
+                          'auditQuality', 'entityType', 'entityStatus'})
+DATE_COLUMNS = frozenset({'financialStatementDate', 'asOfDate', 'entityStatusDate'})
+
+# a tuple means at least one of its columns has to be filled
+REQUIRED_COLUMNS = (('entityIdentifierbvd', 'entityIdentifier', 'entityInternationalName'), 'financialStatementDate',
+                    'primaryCountry', 'currency')
+
+
+class AccountingRule():
+
+    """
+    Linear accounting identity or bound checked on whole columns at once:
+
+        AccountingRule('grossIncome', {'netSales': 1, 'totalCostOfGoodsSold': -1}, '==', {'grossIncome': 1})
+
+    reads netSales - totalCostOfGoodsSold == grossIncome. An empty right side is 0. Equalities hold within
+    tolerance (relative to the larger side, at least 1 unit). Rows missing any of the columns are not checked.
+    """
+
+    def __init__(self, name:str, left:dict, relation:str, right:dict = None):
+        if relation not in ('==', '<=', '>='):
+            raise ValueError(f"Unsupported relation {relation}, use '==', '<=' or '>='.")
+        self.name = name
+        self.left = left
+        self.relation = relation
+        self.right = right or {}
+
+    @property
+    def columns(self) -> list:
+        return list(dict.fromkeys([*self.left, *self.right]))
+
+    def violations(self, df:pd.DataFrame, tolerance:float) -> np.ndarray:
+
+        """
+        Boolean array of the rows breaking the rule.
+        """
+        values = {name: df[name].to_numpy(dtype=np.float64, na_value=np.nan) for name in self.columns}
+        left = sum(coefficient * values[name] for name, coefficient in self.left.items())
+        right = sum((coefficient * values[name] for name, coefficient in self.right.items()), np.zeros(len(df)))
+        slack = np.maximum(tolerance * np.maximum(np.abs(left), np.abs(right)), 1.0)
+        with np.errstate(invalid='ignore'):
+            if self.relation == '==':
+                broken = np.abs(left - right) > slack
+            elif self.relation == '<=':
+                broken = left - right > slack
+            else:
+                broken = right - left > slack
+        # NaN comparisons are False: rows with missing values are not flagged
+        return broken
+
+    def __repr__(self):
+        return f"AccountingRule({self.name}: {self.left} {self.relation} {self.right or 0})"
+
+
+UNIVERSAL_RULES = (
+    AccountingRule('grossIncome', {'netSales': 1, 'totalCostOfGoodsSold': -1}, '==', {'grossIncome': 1}),
+    AccountingRule('netWorth', {'totalAssets': 1, 'totalLiabilities': -1}, '==', {'netWorth': 1}),
+    AccountingRule('currentAssets', {'totalCurrentAssets': 1}, '<=', {'totalAssets': 1}),
+    AccountingRule('currentLiabilities', {'totalCurrentLiabilities': 1}, '<=', {'totalLiabilities': 1}),
+    AccountingRule('currentAssetItems', {'cashAndMarketableSecurities': 1, 'totalAccountsReceivable': 1,
+                                         'totalInventory': 1}, '<=', {'totalCurrentAssets': 1}),
+    AccountingRule('totalAssets', {'totalAssets': 1}, '>='),
+    AccountingRule('netSales', {'netSales': 1}, '>='),
+    AccountingRule('numberOfEmployees', {'numberOfEmployees': 1}, '>='),
+)
+
+
+class FinancialsTemplateBuilder():
+
+    """
+    Maps an internal financials DataFrame onto the columns of a financials template (EDFXTemplateDownload) and
+    validates it locally, so bad rows are rejected before an upload and a server side processing round trip.
+
+        template = endpoints.EDFXTemplateDownload('Universal')
+        builder = FinancialsTemplateBuilder(template, mapping={'Company': 'entityInternationalName', 'Sales': 'netSales'})
+        valid, issues = builder.prepare(internal_df)
+        builder.to_csv(valid, "UniversalTemplate.csv")
+
+    Every check runs on whole columns (no per row Python), so millions of rows are validated in seconds:
+
+        - types: numeric columns must parse as numbers, date columns as dates (written YYYY-MM-DD),
+        - required fields (REQUIRED_COLUMNS, a tuple meaning one of its columns),
+        - accounting identities and bounds (UNIVERSAL_RULES, see AccountingRule).
+
+    Rows failing a type or required check are rejected. Rows breaking an accounting rule are rejected with
+    identity_action='reject', otherwise ('warn', the default) they are kept and reported.
+
+    Params:
+        template: Template DataFrame (only its columns are used) or list of column names.
+        mapping: {internal column: template column}. Columns already named as the template need no mapping.
+        required: Required columns, REQUIRED_COLUMNS by default.
+        rules: Accounting rules, UNIVERSAL_RULES by default. Rules on columns missing from the template are skipped.
+        tolerance: Relative tolerance of the accounting equalities.
+        identity_action: 'warn' or 'reject'.
+    """
+
+    def __init__(self, template, mapping:dict = None, required:tuple = REQUIRED_COLUMNS, rules:tuple = UNIVERSAL_RULES,
+                 tolerance:float = 0.01, identity_action:str = 'warn'):
+        if identity_action not in ('warn', 'reject'):
+            raise ValueError("identity_action must be 'warn' or 'reject'")
+        self.columns = list(template.columns if isinstance(template, pd.DataFrame) else template)
+        self.mapping = mapping or {}
+        present = set(self.columns)
+        self.required = []
+        for entry in required:
+            group = tuple(name for name in ((entry,) if isinstance(entry, str) else entry) if name in present)
+            if group:
+                self.required.append(group)
+        self.rules = [rule for rule in rules if present.issuperset(rule.columns)]
+        self.tolerance = tolerance
+        self.identity_action = identity_action
+        self.date_columns = [name for name in self.columns if name in DATE_COLUMNS]
+        self.numeric_columns = [name for name in self.columns if name not in TEXT_COLUMNS and name not in DATE_COLUMNS]
+
+    def build(self, df:pd.DataFrame) -> pd.DataFrame:
+
+        """
+        Renames df through the mapping and lays it out as the template: template columns in template order (missing
+        ones empty), other columns dropped with a warning. Values are not converted yet, see validate.
+        """
+        df = df.rename(columns=self.mapping)
+        extra = [name for name in df.columns if name not in self.columns]
+        if extra:
+            logger.warning(f"Columns {extra} are not in the template and are dropped.")
+        return df.reindex(columns=self.columns).reset_index(drop=True)
+
+    def validate(self, frame:pd.DataFrame) -> tuple:
+
+        """
+        Converts the columns of a built frame to their template types and checks every row.
+        Returns (converted frame, issues) where issues has one row per problem: row, column, check, value.
+        """
+        frame = frame.copy()
+        issues = []
+
+        def report(mask, column, check, values):
+            rows = np.flatnonzero(mask)
+            if len(rows):
+                issues.append(pd.DataFrame({'row': rows, 'column': column, 'check': check,
+                                            'value': np.asarray(values, dtype=object)[rows]}))
+
+        for name in self.numeric_columns:
+            original = frame[name]
+            converted = pd.to_numeric(original, errors='coerce')
+            report((converted.isna() & original.notna()).to_numpy(), name, 'type', original)
+            frame[name] = converted
+        for name in self.date_columns:
+            original = frame[name]
+            converted = pd.to_datetime(original, errors='coerce', format='mixed')
+            report((converted.isna() & original.notna()).to_numpy(), name, 'type', original)
+            frame[name] = converted.dt.strftime('%Y-%m-%d')
+        for group in self.required:
+            missing = frame[list(group)].isna().all(axis=1).to_numpy()
+            report(missing, ' | '.join(group), 'required', np.full(len(frame), None))
+        for rule in self.rules:
+            broken = rule.violations(frame, self.tolerance)
+            report(broken, ', '.join(rule.columns), f"rule:{rule.name}", frame[rule.columns[0]])
+
+        if issues:
+            issues = pd.concat(issues, ignore_index=True).sort_values('row', kind='stable', ignore_index=True)
+        else:
+            issues = pd.DataFrame(columns=['row', 'column', 'check', 'value'])
+        return frame, issues
+
+    def prepare(self, df:pd.DataFrame) -> tuple:
+
+        """
+        build and validate df. Returns (valid rows, issues); the rejected rows are those in issues (with the 'warn'
+        identity_action, except the ones only breaking an accounting rule).
+        """
+        frame, issues = self.validate(self.build(df))
+        rejecting = issues if self.identity_action == 'reject' else issues[~issues['check'].str.startswith('rule:')]
+        rejected = np.zeros(len(frame), dtype=bool)
+        rejected[rejecting['row'].to_numpy(dtype=np.int64)] = True
+        if len(issues):
+            counts = issues.groupby('check').size().to_dict()
+            logger.warning(f"{int(rejected.sum())} of {len(frame)} rows rejected, issues by check: {counts}")
+        return frame[~rejected], issues
+
+    @staticmethod
+    def to_csv(frame:pd.DataFrame, path:str, chunk_rows:int = 500_000) -> str:
+
+        """
+        Writes a validated frame as the upload CSV, chunk_rows rows at a time (through the pyarrow CSV writer when
+        installed, several times faster than DataFrame.to_csv on wide numeric templates). Returns path.
+        """
+        if pa is None:
+            for start in range(0, max(len(frame), 1), chunk_rows):
+                frame.iloc[start:start + chunk_rows].to_csv(path, mode='w' if start == 0 else 'a', header=start == 0,
+                                                            index=False)
+            return path
+        schema = pa.Schema.from_pandas(frame.iloc[:0], preserve_index=False)
+        with pa_csv.CSVWriter(path, schema, write_options=pa_csv.WriteOptions(quoting_style='needed')) as writer:
+            for start in range(0, len(frame), chunk_rows):
+                writer.write_table(pa.Table.from_pandas(frame.iloc[start:start + chunk_rows], schema=schema,
+                                                        preserve_index=False))
+        return path
@@ -0,0 +1,708 @@
+import time
+import random
+import asyncio
+import functools
+import threading
+import aiohttp
+import requests
+from email.utils import parsedate_to_datetime
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from loguru import logger
+
+# =============================================================================================================
+# ATTENTION: Before you continue UNDERSTAND:
+# Moodys Analytics DOES NOT support this code. This code is for assistance and demonstration purposes only.
+# Licensed Clients should reference https://hub.moodysanalytics.com/products
+# and the functional endpoint examples when formatting their exact questions to support.
+# ==============================================================================================================
+
+
+class RequestOutcome():
+
+    """
+    Filled in by the caller inside a limiter slot so the limiter knows how the request went.
+
+        status: HTTP status of the response, if one was received.
+        error: Exception raised by the request, if any.
+    """
+
+    def __init__(self):
+        self.status = None
+        self.error = None
+
+
+class AdaptiveConcurrencyLimiter():
+
+    """
+    AIMD (additive increase, multiplicative decrease) concurrency limiter for the async PD and LGD fan-outs.
+
+    Instead of a fixed asyncio.Semaphore the number of requests in flight (the window) follows the server:
+
+        - Slow start: every healthy response widens the window by one until the first back off.
+        - Congestion avoidance: afterwards the window grows by about one per full window of healthy responses.
+        - Back off: a 429/5xx, a timeout or a connection error, a p95 latency rising over the target (or over
+          latency_tolerance times the best p95 seen so far) or a success rate under success_rate_target
+          multiplies the window by backoff_factor. At most one back off happens per cooldown so a burst of
+          failures from the same window counts once.
+
+    Params:
+        max_limit: Upper bound of the window (the old fixed semaphore value).
+        initial_limit: Window at start.
+        min_limit: Lower bound of the window.
+        backoff_factor: Multiplier applied to the window on overload.
+        latency_target: Optional p95 latency in seconds above which the window shrinks.
+        latency_tolerance: Without latency_target, p95 may rise up to this factor over its best observed value.
+        success_rate_target: Minimum rolling share of successful requests needed to widen the window.
+        window_size: Number of recent requests used for the p95 and the success rate.
+
+    Usage:
+        async with limiter.request() as outcome:
+            async with session.post(...) as response:
+                outcome.status = response.status
+
+    limiter.limit / limiter.snapshot() expose the current window for monitoring.
+    """
+
+    OVERLOAD_STATUSES = frozenset({429, 500, 502, 503, 504})
+    OVERLOAD_ERRORS = (asyncio.TimeoutError, aiohttp.ServerTimeoutError, aiohttp.ClientConnectionError)
+
+    def __init__(self, max_limit:int = 500, initial_limit:int = 20, min_limit:int = 1, backoff_factor:float = 0.5,
+                 latency_target:float = None, latency_tolerance:float = 2.0, success_rate_target:float = 0.9,
+                 window_size:int = 200):
+
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError(f"Expected 1 <= min_limit <= max_limit, got min_limit={min_limit}, max_limit={max_limit}.")
+
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.backoff_factor = backoff_factor
+        self.latency_target = latency_target
+        self.latency_tolerance = latency_tolerance
+        self.success_rate_target = success_rate_target
+        self.window_size = window_size
+
+        self.in_flight = 0
+        self.successes = 0
+        self.failures = 0
+        self.backoffs = 0
+        self.slow_start = True
+        self.p95_latency = None
+        self.best_p95_latency = None
+
+        self._waiters = deque()
+        self._latencies = deque(maxlen=window_size)
+        self._outcomes = deque(maxlen=window_size)
+        self._samples_since_check = 0
+        self._last_backoff = 0.0
+
+    @property
+    def window(self) -> int:
+        """Number of requests currently allowed in flight."""
+        return max(min(int(self.limit), self.max_limit), self.min_limit)
+
+    @property
+    def success_rate(self) -> float:
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 1.0
+
+    def snapshot(self) -> dict:
+        """Monitoring view of the limiter."""
+        return {
+                "window": self.window,
+                "in_flight": self.in_flight,
+                "queued": len(self._waiters),
+                "p95_latency": self.p95_latency,
+                "success_rate": self.success_rate,
+                "successes": self.successes,
+                "failures": self.failures,
+                "backoffs": self.backoffs,
+                "slow_start": self.slow_start
+                }
+
+    async def acquire(self):
+        if self.in_flight < self.window and not self._waiters:
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed over right before the cancellation, give it back
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        while self._waiters and self.in_flight < self.window:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    @asynccontextmanager
+    async def request(self):
+
+        """
+        Holds one slot of the window for the duration of the block and feeds the outcome back to the limiter.
+        An exception escaping the block is recorded as the outcome's error.
+        """
+        await self.acquire()
+        outcome = RequestOutcome()
+        start = time.monotonic()
+        try:
+            yield outcome
+        except Exception as e:
+            outcome.error = e
+            raise
+        finally:
+            self.record(outcome, time.monotonic() - start)
+            self.release()
+
+    def record(self, outcome:RequestOutcome, latency:float):
+
+        """
+        Updates the window from the outcome of one request.
+        """
+        overloaded = isinstance(outcome.error, self.OVERLOAD_ERRORS) or outcome.status in self.OVERLOAD_STATUSES
+        healthy = not overloaded and outcome.error is None and (outcome.status is None or outcome.status < 400)
+
+        self._outcomes.append(healthy)
+        if healthy:
+            self.successes += 1
+            self._latencies.append(latency)
+        else:
+            self.failures += 1
+
+        if overloaded:
+            self._backoff(f"overload signal ({outcome.status or type(outcome.error).__name__})")
+            return
+
+        self._samples_since_check += 1
+        if self._samples_since_check >= max(self.window_size // 4, 1) and len(self._latencies) >= 20:
+            self._samples_since_check = 0
+            if self._latency_is_rising():
+                self._backoff(f"p95 latency rising to {self.p95_latency:.2f}s")
+                return
+
+        if healthy and self.success_rate >= self.success_rate_target and self.in_flight >= self.window - 1:
+            # only widen when the window is actually used, otherwise there is no evidence it can be wider
+            self.limit = min(self.limit + (1.0 if self.slow_start else 1.0 / self.limit), float(self.max_limit))
+            self._wake_waiters()
+
+    def _latency_is_rising(self) -> bool:
+        latencies = sorted(self._latencies)
+        self.p95_latency = latencies[int(0.95 * (len(latencies) - 1))]
+        if self.latency_target is not None:
+            return self.p95_latency > self.latency_target
+
+        if self.best_p95_latency is None or self.p95_latency < self.best_p95_latency:
+            self.best_p95_latency = self.p95_latency
+            return False
+        return self.p95_latency > self.best_p95_latency * self.latency_tolerance
+
+    def _backoff(self, reason:str):
+        now = time.monotonic()
+        # one back off per cooldown, roughly the time requests of the current window need to come back
+        cooldown = self.p95_latency if self.p95_latency else 1.0
+        if now - self._last_backoff < cooldown:
+            return
+        self._last_backoff = now
+        self.slow_start = False
+        self.backoffs += 1
+        self.limit = max(self.limit * self.backoff_factor, float(self.min_limit))
+        logger.info(f"Concurrency window reduced to {self.window} after {reason}.")
+
+
+class SemaphoreLimiter():
+
+    """
+    Wraps a plain asyncio.Semaphore behind the AdaptiveConcurrencyLimiter.request() interface so callers that still
+    pass a fixed semaphore keep working.
+    """
+
+    def __init__(self, semaphore:asyncio.Semaphore):
+        self.semaphore = semaphore
+
+    @asynccontextmanager
+    async def request(self):
+        async with self.semaphore:
+            yield RequestOutcome()
+
+
+def as_concurrency_limiter(limiter):
+
+    """
+    Returns limiter as an object exposing request(): an AdaptiveConcurrencyLimiter as is, a Semaphore wrapped,
+    an int as a new AdaptiveConcurrencyLimiter with that max_limit.
+    """
+    if isinstance(limiter, (AdaptiveConcurrencyLimiter, SemaphoreLimiter)):
+        return limiter
+    if isinstance(limiter, asyncio.Semaphore):
+        return SemaphoreLimiter(limiter)
+    if isinstance(limiter, int):
+        return AdaptiveConcurrencyLimiter(max_limit=limiter)
+    raise TypeError(f"Expected an AdaptiveConcurrencyLimiter, an asyncio.Semaphore or an int, got {type(limiter)}.")
+
+
+class RetryBudget():
+
+    """
+    Global retry budget shared by every call of a client (threads and coroutines).
+
+    Each first attempt deposits `ratio` tokens and each retry withdraws one, so retries stay a bounded share of
+    the traffic: when the API is down, thousands of batches don't turn into thousands of retry storms.
+    The bucket starts (and is capped) at `reserve` tokens so a handful of failures can always be retried.
+    """
+
+    def __init__(self, ratio:float = 0.2, reserve:int = 100):
+        self.ratio = ratio
+        self.reserve = reserve
+        self.tokens = float(reserve)
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.tokens + self.ratio, float(self.reserve))
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.tokens < 1:
+                self.exhausted += 1
+                return False
+            self.tokens -= 1
+            return True
+
+
+class RetryPolicy():
+
+    """
+    Shared retry policy of the sync and async endpoint calls.
+
+        - Exponential backoff with full jitter: attempt n sleeps uniform(0, min(max_delay, base_delay * 2**n)), so
+          coroutines failing together don't come back together in waves.
+        - Per-request budget: at most max_attempts attempts per call.
+        - Global budget: a RetryBudget shared by all calls of the client.
+        - Classification: RETRYABLE_STATUSES and transient network errors are retried; any other 4xx/5xx is fatal.
+        - Rate limits: Retry-After (seconds or HTTP date) and exhausted X-RateLimit-Remaining/X-RateLimit-Reset
+          headers override the backoff and pause every caller of the policy until the server is ready.
+
+    Params:
+        max_attempts: Attempts per request, the first included.
+        base_delay: Backoff scale in seconds.
+        max_delay: Upper bound of the backoff in seconds.
+        max_retry_after: Upper bound in seconds of a server requested wait.
+        budget: RetryBudget shared across calls, one is created when omitted.
+    """
+
+    RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+    RETRYABLE_ERRORS = (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                        requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+    def __init__(self, max_attempts:int = 6, base_delay:float = 0.5, max_delay:float = 60.0,
+                 max_retry_after:float = 300.0, budget:RetryBudget = None):
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.budget = budget if budget is not None else RetryBudget()
+        # epoch seconds until which the server asked every caller to hold off
+        self.paused_until = 0.0
+
+    @staticmethod
+    def status_of(status:int = None, error:Exception = None):
+        if status is not None:
+            return status
+        # aiohttp.ClientResponseError carries .status, requests.HTTPError its .response
+        if getattr(error, 'status', None) is not None:
+            return error.status
+        response = getattr(error, 'response', None)
+        return getattr(response, 'status_code', None)
+
+    def is_retryable(self, status:int = None, error:Exception = None) -> bool:
+        status = self.status_of(status, error)
+        if status is not None and status >= 400:
+            return status in self.RETRYABLE_STATUSES
+        return isinstance(error, self.RETRYABLE_ERRORS)
+
+    def should_retry(self, attempt:int, status:int = None, error:Exception = None, max_attempts:int = None) -> bool:
+
+        """
+        attempt is zero based. Withdraws a token of the global budget when the answer is yes.
+        """
+        if attempt + 1 >= (max_attempts or self.max_attempts):
+            return False
+        if not self.is_retryable(status, error):
+            return False
+        if not self.budget.withdraw():
+            logger.warning("Global retry budget exhausted, not retrying.")
+            return False
+        return True
+
+    def record_request(self):
+        """Called once per call (not per attempt) to feed the global budget."""
+        self.budget.deposit()
+
+    def retry_after(self, headers) -> float:
+
+        """
+        Server requested wait in seconds from Retry-After or exhausted rate limit headers, None without one.
+        headers may be a requests or aiohttp header mapping (both case insensitive).
+        """
+        if not headers:
+            return None
+        wait = None
+        value = headers.get('Retry-After')
+        if value:
+            try:
+                wait = float(value)
+            except ValueError:
+                try:
+                    wait = parsedate_to_datetime(value).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    wait = None
+
+        remaining = headers.get('X-RateLimit-Remaining') or headers.get('RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset') or headers.get('RateLimit-Reset')
+        if wait is None and remaining is not None and reset is not None:
+            try:
+                if float(remaining) <= 0:
+                    reset = float(reset)
+                    # either seconds to wait or an epoch timestamp
+                    wait = reset - time.time() if reset > 1e9 else reset
+            except ValueError:
+                pass
+
+        if wait is None:
+            return None
+        return min(max(wait, 0.0), self.max_retry_after)
+
+    def backoff(self, attempt:int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def delay(self, attempt:int, headers = None) -> float:
+
+        """
+        Seconds to sleep before the next attempt. A server requested wait also pauses the other callers.
+        """
+        server_wait = self.retry_after(headers)
+        if server_wait is None:
+            return self.backoff(attempt)
+        self.paused_until = max(self.paused_until, time.time() + server_wait)
+        # a little jitter on top so the callers released together don't hit the API in the same instant
+        return server_wait + random.uniform(0, self.base_delay)
+
+    def pause_remaining(self) -> float:
+        return max(self.paused_until - time.time(), 0.0)
+
+    def wait_for_pause(self):
+        remaining = self.pause_remaining()
+        if remaining:
+            time.sleep(remaining)
+
+    async def wait_for_pause_async(self):
+        remaining = self.pause_remaining()
+        if remaining:
+            await asyncio.sleep(remaining)
+
+
+class RetryingSession(requests.Session):
+
+    """
+    requests.Session applying a RetryPolicy to the idempotent requests (GET, PUT, DELETE, ...), so each sync endpoint
+    call of the client retries the same way as the async paths. A POST is sent once unless the call opts in with
+    idempotent=True, for queries which are safe to send twice (PD, search):
+
+        session.post(url, json=params, idempotent=True)
+
+    Requests with a file like body are sent once since the body can't be replayed.
+    """
+
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'})
+
+    def __init__(self, retry_policy:RetryPolicy = None):
+        super().__init__()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+
+    def request(self, method, url, *args, idempotent:bool = None, **kwargs):
+        policy = self.retry_policy
+        if idempotent is None:
+            idempotent = method.upper() in self.IDEMPOTENT_METHODS
+        replayable = idempotent and not hasattr(kwargs.get('data'), 'read')
+        policy.record_request()
+        attempt = 0
+        while True:
+            policy.wait_for_pause()
+            response = error = None
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except requests.RequestException as e:
+                error = e
+            status = response.status_code if response is not None else None
+
+            if not replayable or not policy.should_retry(attempt, status=status, error=error):
+                if error is not None:
+                    raise error
+                return response
+
+            delay = policy.delay(attempt, response.headers if response is not None else None)
+            logger.warning(f"{method.upper()} {url} failed ({status or type(error).__name__}) | Attempt {attempt+1} of "
+                           f"{policy.max_attempts}, retrying in {delay:.1f}s")
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+
+class _CoalescedBatch():
+
+    """
+    Entities collected for one upstream call of a RequestCoalescer group.
+    """
+
+    def __init__(self, params:dict, fetch, split = None):
+        self.params = params
+        self.fetch = fetch
+        self.split = split
+        self.entities = []
+        self.futures = []
+        self.timer = None
+
+
+class RequestCoalescer():
+
+    """
+    Single-flight / dataloader layer merging concurrent per-entity requests into shared upstream calls.
+
+    Requests are grouped by a key of their parameters other than the entities (the same endpoint, dates and flags).
+    Within a group:
+
+        - An entity already in flight (in a call not yet answered) is not requested again, the caller waits for the
+          call in flight.
+        - New entities are collected for <window> seconds (or until max_batch of them) and then sent in one call.
+
+    Each caller gets back the response of its own entities only (in its order), so the merging is invisible to it.
+    An upstream response without 'entities' (an API error) is handed unchanged to every caller of the call.
+    Upstream calls run on a small thread pool, so threaded callers (request) and asyncio callers (request_async,
+    which does not block the event loop) can share the same calls.
+
+    Params:
+        window: Seconds new entities are collected before the call is sent.
+        max_batch: Entities per upstream call, a full batch is sent at once.
+        max_workers: Upstream calls running at the same time.
+    """
+
+    def __init__(self, window:float = 0.005, max_batch:int = 100, max_workers:int = 8):
+        self.window = window
+        self.max_batch = max_batch
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="edfx-coalescer")
+        self.lock = threading.Lock()
+        # (group, entityId) -> Future of the call fetching it
+        self.inflight = {}
+        # group -> batch still collecting entities
+        self.pending = {}
+        self.stats = {"requests": 0, "entities": 0, "coalesced": 0, "upstream_calls": 0, "upstream_entities": 0}
+
+    def submit(self, group, params:dict, entities:list, fetch, split = None) -> list:
+
+        """
+        Registers the entities of a request and returns one Future per entity resolving to (response, entity result).
+        fetch(params) performs the upstream call, params['entities'] being the merged entities of the call.
+        split(response) optionally returns the {entityId: result} of a response, by default its 'entities' records.
+        """
+        futures = []
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["entities"] += len(entities)
+            for entity in entities:
+                key = (group, entity['entityId'])
+                future = self.inflight.get(key)
+                if future is not None:
+                    self.stats["coalesced"] += 1
+                    futures.append(future)
+                    continue
+                batch = self.pending.get(group)
+                if batch is None:
+                    batch = self.pending[group] = _CoalescedBatch(params, fetch, split)
+                    batch.timer = threading.Timer(self.window, self._flush, (group, batch))
+                    batch.timer.daemon = True
+                    batch.timer.start()
+                future = self.inflight[key] = Future()
+                batch.entities.append(entity)
+                batch.futures.append((key, future))
+                futures.append(future)
+                if len(batch.entities) >= self.max_batch:
+                    self._dispatch(group)
+        return futures
+
+    def _flush(self, group, batch:_CoalescedBatch):
+        with self.lock:
+            if self.pending.get(group) is batch:
+                self._dispatch(group)
+
+    def _dispatch(self, group):
+        # called with the lock held
+        batch = self.pending.pop(group)
+        batch.timer.cancel()
+        self.stats["upstream_calls"] += 1
+        self.stats["upstream_entities"] += len(batch.entities)
+        self.executor.submit(self._run, batch)
+
+    def _run(self, batch:_CoalescedBatch):
+        error = None
+        try:
+            response = batch.fetch({**batch.params, 'entities': batch.entities})
+            results = {}
+            if batch.split is not None:
+                results = batch.split(response) or {}
+            elif isinstance(response, dict) and isinstance(response.get('entities'), list):
+                for entity in response['entities']:
+                    if isinstance(entity, dict):
+                        results.setdefault(entity.get('entityId'), entity)
+        except BaseException as e:
+            error = e
+        # the call leaves the in flight table before its callers wake up, a caller reacting to the result (e.g.
+        # retrying after an error) then starts a new call instead of joining the finished one
+        with self.lock:
+            for key, future in batch.futures:
+                if self.inflight.get(key) is future:
+                    del self.inflight[key]
+        for (_, entity_id), future in batch.futures:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result((response, results.get(entity_id)))
+
+    @staticmethod
+    def assemble(results:list):
+
+        """
+        Response of one caller from the (response, entity result) of its entities.
+        """
+        response = None
+        entities = []
+        for upstream, entity in results:
+            if not isinstance(upstream, dict) or 'entities' not in upstream:
+                return upstream
+            response = response or upstream
+            if entity is not None:
+                entities.append(entity)
+        if response is None:
+            return None
+        return {**{name: value for name, value in response.items() if name != 'entities'}, 'entities': entities}
+
+    def request(self, group, params:dict, entities:list, fetch, timeout:float = None):
+
+        """
+        Blocking request for threaded callers.
+        """
+        futures = self.submit(group, params, entities, fetch)
+        return self.assemble([future.result(timeout) for future in futures])
+
+    async def request_async(self, group, params:dict, entities:list, fetch):
+
+        """
+        Awaitable request for asyncio callers, the upstream call runs on the coalescer's threads.
+        """
+        futures = self.submit(group, params, entities, fetch)
+        return self.assemble(await asyncio.gather(*(asyncio.wrap_future(future) for future in futures)))
+
+    def close(self):
+        with self.lock:
+            for group in list(self.pending):
+                self._dispatch(group)
+        self.executor.shutdown(wait=True)
+
+
+class MicroBatchLoader():
+
+    """
+    Dataloader facade for callers asking for one entity at a time (e.g. a web tier). Each load() is queued for at most
+    max_wait_ms milliseconds, or until max_batch entities are waiting, and the queue is then sent as one batched call:
+
+        loader = endpoints.EDFXPDLoader(max_wait_ms=10, startDate="2024-01-01")
+        pd_row = loader.load("US942404110").result()      # threads
+        pd_row = await loader.load_async("US942404110")   # asyncio
+
+    The latency added to a request is bounded by max_wait_ms (plus the batched call itself) while one call serves up to
+    max_batch requests. An entity already queued or in flight is not requested twice. The response of every batch is
+    parsed once and each caller gets the part of its own entity (None when the API returned nothing for it).
+
+    Params:
+        fetch: fetch(entities) performs the batched call and returns its response.
+        parse: Optional parse(response) -> DataFrame of the whole batch, split by its entityId column.
+        max_wait_ms: Latency budget of the queue in milliseconds.
+        max_batch: Entities per batched call.
+        max_workers: Batched calls running at the same time.
+    """
+
+    def __init__(self, fetch, parse = None, max_wait_ms:float = 5, max_batch:int = 100, max_workers:int = 8):
+        self.fetch = fetch
+        self.parse = parse
+        self.coalescer = RequestCoalescer(window=max_wait_ms / 1000, max_batch=max_batch, max_workers=max_workers)
+
+    @property
+    def stats(self) -> dict:
+        return dict(self.coalescer.stats)
+
+    def _fetch(self, params:dict):
+        return self.fetch(params['entities'])
+
+    def _split(self, response) -> dict:
+        if self.parse is None:
+            if isinstance(response, dict) and isinstance(response.get('entities'), list):
+                return {entity.get('entityId'): entity for entity in response['entities'] if isinstance(entity, dict)}
+            return {}
+        df = self.parse(response)
+        if df is None or 'entityId' not in getattr(df, 'columns', ()):
+            return {}
+        return {entity_id: rows for entity_id, rows in df.groupby('entityId', sort=False)}
+
+    def load_many(self, entities:list) -> list:
+
+        """
+        One Future per entity (an entityId string or an {'entityId': ...} dict).
+        """
+        entities = [{'entityId': entity} if isinstance(entity, str) else entity for entity in entities]
+        futures = []
+        for upstream in self.coalescer.submit(None, {}, entities, self._fetch, self._split):
+            future = Future()
+            upstream.add_done_callback(functools.partial(self._resolve, future))
+            futures.append(future)
+        return futures
+
+    @staticmethod
+    def _resolve(future:Future, upstream:Future):
+        if upstream.exception() is not None:
+            future.set_exception(upstream.exception())
+        else:
+            future.set_result(upstream.result()[1])
+
+    def load(self, entity) -> Future:
+        return self.load_many([entity])[0]
+
+    async def load_async(self, entity):
+        return await asyncio.wrap_future(self.load(entity))
+
+    async def load_many_async(self, entities:list) -> list:
+        return await asyncio.gather(*(asyncio.wrap_future(future) for future in self.load_many(entities)))
+
+    def close(self):
+        self.coalescer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
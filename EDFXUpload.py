@@ -0,0 +1,198 @@
+import os
+import re
+import time
+import random
+import hashlib
+import threading
+import requests
+from loguru import logger
+
+# =============================================================================================================
+# ATTENTION: Before you continue UNDERSTAND:
+# Moodys Analytics DOES NOT support this code. This code is for assistance and demonstration purposes only.
+# Licensed Clients should reference https://hub.moodysanalytics.com/products
+# and the functional endpoint examples when formatting their exact questions to support.
+# ==============================================================================================================
+
+# statuses of a PUT worth sending again, anything else (e.g. 403 for an expired link) fails at once
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+
+
+class UploadError(RuntimeError):
+    pass
+
+
+class UploadProgress():
+
+    """
+    Bytes sent, elapsed time and throughput of an upload (shared by its parts), logged every log_every seconds.
+    """
+
+    def __init__(self, total:int, label:str = "upload", log_every:float = 5.0):
+        self.total = total
+        self.label = label
+        self.log_every = log_every
+        self.sent = 0
+        self.retries = 0
+        self.started = time.monotonic()
+        self.logged = self.started
+        self.lock = threading.Lock()
+
+    def update(self, count:int):
+        with self.lock:
+            self.sent += count
+            now = time.monotonic()
+            if self.log_every and now - self.logged >= self.log_every:
+                self.logged = now
+                logger.info(f"{self.label}: {self.percent:.1f}% of {self.total / 1e6:.1f} MB at {self.throughput:.2f} MB/s")
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def percent(self) -> float:
+        return 100.0 * self.sent / self.total if self.total else 100.0
+
+    @property
+    def throughput(self) -> float:
+        # MB per second since the start
+        return self.sent / 1e6 / max(self.elapsed, 1e-9)
+
+    def report(self) -> dict:
+        return {"bytes": self.total, "sent": self.sent, "seconds": round(self.elapsed, 3),
+                "MB/s": round(self.throughput, 3), "retries": self.retries}
+
+
+class FileRangeReader():
+
+    """
+    File-like request body of prefix + bytes [offset, offset + length) of a file, read block by block (the body is
+    never held in memory) and counted in an UploadProgress. len() gives requests the Content-Length.
+    """
+
+    def __init__(self, path:str, offset:int = 0, length:int = None, prefix:bytes = b"", progress:UploadProgress = None):
+        self.path = path
+        self.offset = offset
+        self.length = os.path.getsize(path) - offset if length is None else length
+        self.prefix = prefix
+        self.progress = progress
+        self.file = None
+        self.position = 0
+
+    def __len__(self):
+        return len(self.prefix) + self.length
+
+    def read(self, size:int = -1) -> bytes:
+        if self.file is None:
+            self.file = open(self.path, 'rb')
+            self.file.seek(self.offset)
+        remaining = len(self) - self.position
+        size = remaining if size is None or size < 0 else min(size, remaining)
+        chunk = b""
+        if self.position < len(self.prefix):
+            chunk = self.prefix[self.position:self.position + size]
+        if len(chunk) < size:
+            chunk += self.file.read(size - len(chunk))
+        self.position += len(chunk)
+        if self.progress is not None:
+            self.progress.update(len(chunk))
+        return chunk
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def checksum(self, chunk_size:int = 1 << 22) -> str:
+
+        """
+        Hex MD5 of the whole body, the ETag S3 returns for a single PUT.
+        """
+        md5 = hashlib.md5(self.prefix)
+        with open(self.path, 'rb') as file:
+            file.seek(self.offset)
+            remaining = self.length
+            while remaining:
+                chunk = file.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                md5.update(chunk)
+                remaining -= len(chunk)
+        return md5.hexdigest()
+
+
+def csv_parts(path:str, part_size:int) -> tuple:
+
+    """
+    Splits a CSV file into (offset, length) byte ranges of about part_size bytes, cut at line ends outside quoted
+    fields, and returns (header, parts): the header line is excluded from the ranges so it can be sent with each part.
+    """
+    size = os.path.getsize(path)
+    parts = []
+    with open(path, 'rb') as file:
+        header = file.readline()
+        start = len(header)
+        while start < size:
+            target = min(start + part_size, size)
+            position = start
+            quotes = 0
+            while position < target:
+                block = file.read(min(1 << 22, target - position))
+                quotes += block.count(b'"')
+                position += len(block)
+            # finish the current line, and the following ones while a quoted field is still open
+            while position < size:
+                line = file.readline()
+                quotes += line.count(b'"')
+                position += len(line)
+                if quotes % 2 == 0:
+                    break
+            parts.append((start, position - start))
+            start = position
+    return header, parts
+
+
+def put_file(session:requests.Session, url:str, body:FileRangeReader, headers:dict = None, retries:int = 3,
+             backoff:float = 1.0, verify:bool = True, timeout:float = None) -> requests.Response:
+
+    """
+    PUTs body to a presigned link, retrying connection errors and transient statuses with exponential backoff.
+    A presigned PUT cannot be resumed mid-object, so a retry sends the body again from its start (one part only
+    for a split upload). With verify, the MD5 of the body is checked against the ETag the storage returns.
+    """
+    checksum = body.checksum() if verify else None
+    progress = body.progress
+    error = None
+    for attempt in range(retries + 1):
+        body.position = 0
+        response = None
+        try:
+            response = session.put(url, data=body, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            body.close()
+
+        if response is not None and response.status_code < 400:
+            etag = response.headers.get('ETag', '').strip('"')
+            # an ETag other than the plain MD5 (e.g. of KMS encrypted objects) cannot be compared
+            if not verify or not re.fullmatch(r'[0-9a-f]{32}', etag) or etag == checksum:
+                return response
+            error = f"checksum mismatch: sent {checksum}, stored {etag}"
+        elif response is not None:
+            error = f"status {response.status_code}: {response.text[:200]}"
+            if response.status_code not in RETRY_STATUSES:
+                raise UploadError(f"Upload to {url.split('?')[0]} failed with {error}")
+
+        # what was sent by the failed attempt is not counted twice
+        if progress is not None:
+            progress.update(-body.position)
+        if attempt < retries:
+            if progress is not None:
+                with progress.lock:
+                    progress.retries += 1
+            delay = backoff * 2 ** attempt * random.uniform(0.8, 1.2)
+            logger.warning(f"Upload attempt {attempt + 1} failed ({error}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+    raise UploadError(f"Upload to {url.split('?')[0]} failed after {retries + 1} attempts: {error}")
@@ -0,0 +1,71 @@
+import time
+import jwt
+
+from EDFXAuthentication import EDFXClient, EDFXTokenCache
+
+
+def bearer(expires_in:int) -> str:
+    return jwt.encode({'exp': int(time.time()) + expires_in}, 'edfx-test-signing-key-of-32-bytes', algorithm='HS256')
+
+
+def test_token_round_trip(tmp_path):
+    path = str(tmp_path / 'token_cache.json')
+    cache = EDFXTokenCache(path)
+    expiration = int(time.time()) + 3600
+    with cache.lock():
+        cache.store('public-key', b'id-token', 'access-token', expiration)
+    # another process reads the same file
+    with EDFXTokenCache(path).lock():
+        assert EDFXTokenCache(path).load('public-key') == {'id_token': 'id-token', 'access_token': 'access-token',
+                                                            'exp': expiration}
+    assert EDFXTokenCache(path).load('other-key') is None
+    # the public key itself is never written
+    assert 'public-key' not in (tmp_path / 'token_cache.json').read_text()
+
+
+def test_expired_tokens_are_ignored(tmp_path):
+    cache = EDFXTokenCache(str(tmp_path / 'token_cache.json'), min_ttl_seconds=600)
+    now = int(time.time())
+    entry = {'id_token': 'id', 'access_token': 'access'}
+    # a cache file written earlier by another process
+    cache.write_entries({cache.cache_key('expired'): {**entry, 'exp': now - 1},
+                         cache.cache_key('due'): {**entry, 'exp': now + 300},
+                         cache.cache_key('valid'): {**entry, 'exp': now + 3600}})
+    assert cache.load('expired') is None
+    # still valid but due for renewal within min_ttl_seconds
+    assert cache.load('due') is None
+    assert cache.load('valid')['exp'] == now + 3600
+    # storing drops the expired entries only
+    cache.store('valid', 'id', 'access', now + 7200)
+    assert set(cache.read_entries()) == {cache.cache_key('due'), cache.cache_key('valid')}
+
+
+def test_encrypted_and_unreadable_cache(tmp_path):
+    path = tmp_path / 'token_cache.json'
+    flip = lambda content: bytes(byte ^ 0x5A for byte in content)
+    cache = EDFXTokenCache(str(path), encrypt=flip, decrypt=flip)
+    cache.store('public-key', 'id', 'access', int(time.time()) + 3600)
+    assert b'access' not in path.read_bytes()
+    assert cache.load('public-key')['access_token'] == 'access'
+    # a cache that can't be decoded is ignored, not raised
+    assert EDFXTokenCache(str(path)).load('public-key') is None
+
+
+def test_clients_share_cached_token(tmp_path):
+    path = str(tmp_path / 'token_cache.json')
+    requested = []
+
+    def client() -> EDFXClient:
+        edfx = EDFXClient('public-key', 'private-key', background_token_renewal=False, token_cache=path)
+        def request_new_bearer_token():
+            requested.append(edfx)
+            edfx.auth_token = 'access-token'
+            return bearer(3600)
+        edfx.request_new_bearer_token = request_new_bearer_token
+        return edfx
+
+    first, second = client(), client()
+    token = first.acquire_bearer_token()
+    assert second.acquire_bearer_token() == token
+    assert second.auth_token == 'access-token'
+    assert requested == [first]
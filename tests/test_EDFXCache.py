@@ -0,0 +1,211 @@
+import datetime
+import pandas as pd
+import pytest
+
+import EDFXCache
+from EDFXCache import MemoryCache, PDCache, PDHistoryStore, SQLiteCache, canonical_key
+from EDFXPrime import EDFXEndpoints
+
+
+class Clock():
+
+    # stands in for time.time so expiry and access order do not depend on the speed of the test
+    def __init__(self, now:float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds:float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(EDFXCache.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_cache(request, tmp_path):
+    caches = []
+    def make(**kwargs):
+        if request.param == 'memory':
+            cache = MemoryCache(**kwargs)
+        else:
+            cache = SQLiteCache(str(tmp_path / 'cache.sqlite'), **kwargs)
+        caches.append(cache)
+        return cache
+    yield make
+    for cache in caches:
+        if isinstance(cache, SQLiteCache):
+            cache.close()
+
+
+def test_entries_expire_after_ttl(make_cache, clock):
+    cache = make_cache(ttl=60)
+    cache.set('default', {'pd': 0.1})
+    cache.set('short', {'pd': 0.2}, ttl=10)
+    clock.advance(30)
+    assert cache.get_many(['default', 'short']) == {'default': {'pd': 0.1}}
+    clock.advance(30)
+    assert cache.get('default') is None
+    assert cache.stats.expired == 2
+    assert len(cache) == 0
+
+
+def test_least_recently_used_is_evicted(make_cache, clock):
+    cache = make_cache(maxsize=2)
+    cache.set('a', 1)
+    clock.advance(1)
+    cache.set('b', 2)
+    clock.advance(1)
+    # reading a makes b the least recently used entry
+    assert cache.get('a') == 1
+    clock.advance(1)
+    cache.set('c', 3)
+    assert cache.get_many(['a', 'b', 'c']) == {'a': 1, 'c': 3}
+    assert cache.stats.evictions == 1
+
+
+def test_sqlite_namespaces_are_kept_apart(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    mapping, search = SQLiteCache(path, namespace='mapping'), SQLiteCache(path, namespace='search')
+    mapping.set('key', 'mapped')
+    search.set('key', 'found')
+    assert (mapping.get('key'), search.get('key')) == ('mapped', 'found')
+    search.clear()
+    assert (mapping.get('key'), search.get('key')) == ('mapped', None)
+    mapping.close()
+    search.close()
+    # entries outlive the connection
+    reopened = SQLiteCache(path, namespace='mapping')
+    assert reopened.get('key') == 'mapped'
+    reopened.close()
+
+
+def test_canonical_key_ignores_dict_order():
+    params = {'startDate': '2024-01-31', 'includeDetail': {'resultDetail': True, 'modelDetail': False}}
+    reordered = {'includeDetail': {'modelDetail': False, 'resultDetail': True}, 'startDate': '2024-01-31'}
+    assert canonical_key('pds', params, {'entityId': 'US123'}) == canonical_key('pds', reordered, {'entityId': 'US123'})
+    assert canonical_key('pds', params) != canonical_key('pds/creditedge', params)
+    assert canonical_key('pds', params) != canonical_key('pds', {**params, 'startDate': '2024-02-29'})
+
+
+class PDResponse():
+
+    def __init__(self, payload:dict):
+        self.payload = payload
+        self.text = str(payload)
+
+    def json(self):
+        return self.payload
+
+
+def pd_client(cache:PDCache) -> EDFXEndpoints:
+    # PD endpoint answering every requested entity, the entities of each request are recorded in sent
+    endpoints = EDFXEndpoints('client', 'secret', pd_cache=cache)
+    endpoints.revoke_bearer_token = lambda: None
+    endpoints.EDFXHeaders = lambda: {'JSONBasic': {'headers': {}}}
+    endpoints.sent = []
+
+    def post(url, headers=None, json=None, timeout=None, idempotent=None):
+        ids = [entity['entityId'] for entity in json['entities']]
+        endpoints.sent.append(ids)
+        return PDResponse({'entities': [{'entityId': entity_id, 'history': [{'asOfDate': '2024-01-31', 'pd': 0.01}]}
+                                        for entity_id in ids]})
+
+    endpoints.session.post = post
+    return endpoints
+
+
+def test_partial_pd_cache_hit_sends_only_missing_entities():
+    endpoints = pd_client(PDCache())
+    window = {'startDate': '2024-01-01', 'endDate': '2024-01-31'}
+    endpoints.EDFXPD_Endpoint([{'entityId': 'A'}, {'entityId': 'B'}], **window)
+    response = endpoints.EDFXPD_Endpoint([{'entityId': 'C'}, {'entityId': 'A'}, {'entityId': 'D'}, {'entityId': 'B'}],
+                                         **window)
+    assert endpoints.sent == [['A', 'B'], ['C', 'D']]
+    # the cached and the fresh entities come back in request order
+    assert [entity['entityId'] for entity in response['entities']] == ['C', 'A', 'D', 'B']
+    assert endpoints.EDFXPD_Endpoint([{'entityId': 'D'}, {'entityId': 'C'}], **window)['entities'][0]['entityId'] == 'D'
+    assert len(endpoints.sent) == 2
+    # other parameters are other cache entries
+    endpoints.EDFXPD_Endpoint([{'entityId': 'A'}], startDate='2024-01-01', endDate='2024-02-29')
+    assert endpoints.sent[-1] == ['A']
+
+
+def test_pd_cache_merge_keeps_error_entities_out():
+    cache = PDCache()
+    params = {'startDate': '2024-01-01', 'endDate': '2024-01-31'}
+    lookup = cache.lookup('pds', params, [{'entityId': 'A'}, {'entityId': 'X'}])
+    cache.merge(lookup, {'entities': [{'entityId': 'A', 'history': []}, {'entityId': 'X', 'message': 'not found'}]})
+    _, cached, misses, _ = cache.lookup('pds', params, [{'entityId': 'A'}, {'entityId': 'X'}])
+    assert list(cached.values()) == [{'entityId': 'A', 'history': []}]
+    assert misses[0][1] == {'entityId': 'X'}
+
+
+def test_month_end_staleness_boundary():
+    cache = PDCache(recent_ttl=3600)
+    month_start = datetime.date.today().replace(day=1)
+    last_month_end = month_start - datetime.timedelta(days=1)
+    # a window closed before the current month is final, one reaching into it may still change
+    assert cache.month_end_staleness({'endDate': last_month_end.isoformat()}) is None
+    assert cache.month_end_staleness({'endDate': month_start.isoformat()}) == 3600
+    assert cache.month_end_staleness({}) == 3600
+    assert cache.lookup('pds', {'endDate': month_start.isoformat()}, [{'entityId': 'A'}])[3] == 3600
+    # a staleness rule returning 0 skips the cache
+    assert PDCache(staleness=lambda params: 0).lookup('pds', {}, [{'entityId': 'A'}]) is None
+
+
+def history(entity_id:str, dates:list) -> pd.DataFrame:
+    # rows shaped like the EDFXPDParse output
+    df = pd.DataFrame({'entityId': entity_id, 'asOfDate': dates, 'pd': [0.01 * (i + 1) for i in range(len(dates))]})
+    return df.set_index(pd.to_datetime(df['asOfDate']))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PDHistoryStore(str(tmp_path / 'history.sqlite'))
+    yield store
+    store.close()
+
+
+def test_history_gaps(store):
+    series = PDHistoryStore.series_key({'historyFrequency': 'monthly', 'startDate': '2024-01-01'})
+    months = ['2024-01-31', '2024-02-29', '2024-03-31']
+    # FULL: fetched since January up to March
+    store.write(series, history('FULL', months), '2024-01-01')
+    # TRAILING: fetched since January, stored up to February
+    store.write(series, history('TRAILING', months[:2]), '2024-01-01')
+    # LEADING: only fetched from February on
+    store.write(series, history('LEADING', months[1:]), '2024-02-01')
+    ids = ['FULL', 'TRAILING', 'LEADING', 'NEW']
+
+    assert store.gaps(series, ids, '2024-01-01', '2024-03-31') == {
+        ('2024-03-01', '2024-03-31'): ['TRAILING'],
+        # an entity not fetched since the start of the window is fetched again in full
+        ('2024-01-01', '2024-03-31'): ['LEADING', 'NEW'],
+    }
+    # a window inside what was fetched has no gaps left
+    assert store.gaps(series, ids[:2], '2024-01-01', '2024-02-29') == {}
+    # another series shares nothing
+    other = PDHistoryStore.series_key({'historyFrequency': 'daily'})
+    assert store.gaps(other, ['FULL'], '2024-01-01', '2024-03-31') == {('2024-01-01', '2024-03-31'): ['FULL']}
+
+
+def test_history_write_and_load(store):
+    series = PDHistoryStore.series_key({})
+    store.write(series, history('B', ['2024-01-31', '2024-02-29']), '2024-01-01')
+    store.write(series, history('A', ['2024-01-31', '2024-02-29', '2024-03-31']), '2024-01-01')
+    # rewriting a month replaces it
+    store.write(series, history('A', ['2024-03-31']).assign(pd=0.5), '2024-03-01')
+
+    df = store.load(series, ['A', 'B'], '2024-02-01', '2024-03-31')
+    assert list(zip(df['entityId'], df['asOfDate'], df['pd'])) == [
+        ('A', '2024-02-29', 0.02), ('A', '2024-03-31', 0.5), ('B', '2024-02-29', 0.02)]
+    assert list(df.index) == list(pd.to_datetime(df['asOfDate']))
+    # covered_from keeps the earliest fetch, the rewrite of March did not shrink it
+    assert store.gaps(series, ['A'], '2024-01-01', '2024-03-31') == {}
+    assert store.load(series, ['C'], '2024-01-01', '2024-03-31') is None
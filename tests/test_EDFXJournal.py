@@ -0,0 +1,56 @@
+import asyncio
+import pandas as pd
+
+from EDFXPrime import EDFXEndpoints
+from EDFXSinks import CSVSink
+
+
+def pd_client(failing:set) -> EDFXEndpoints:
+    # PD endpoint answering one history record per entity, batches holding a failing entity get no response
+    endpoints = EDFXEndpoints('client', 'secret')
+    endpoints.revoke_bearer_token = lambda: None
+    endpoints.sent = []
+
+    async def pd_endpoint(semaphore=None, entities=None, **params):
+        ids = [entity['entityId'] for entity in entities]
+        endpoints.sent.append(ids)
+        if failing.intersection(ids):
+            return None
+        return {'entities': [{'entityId': entity_id, 'history': [{'asOfDate': '2024-01-31', 'pd': 0.01}]}
+                             for entity_id in ids]}
+
+    endpoints.EDFXPD_Endpoint_async = pd_endpoint
+    return endpoints
+
+
+def run(endpoints:EDFXEndpoints, entities:list, **kwargs):
+    return asyncio.run(endpoints.SynchronousBatchMVP_async(entities, BatchSize=2, semaphore=2, startDate='2024-01-01',
+                                                           **kwargs))
+
+
+def test_resumed_run_replays_finished_batches_into_new_sink(tmp_path):
+    entities = [{'entityId': f'E{i}'} for i in range(6)]
+    journal_dir = str(tmp_path / 'journal')
+
+    first = pd_client(failing={'E3'})
+    assert run(first, entities, run_id='resume', journal_dir=journal_dir, sink=str(tmp_path / 'first.csv')) == 4
+
+    second = pd_client(failing=set())
+    assert run(second, entities, run_id='resume', journal_dir=journal_dir, sink=str(tmp_path / 'second.csv')) == 6
+    # only the failed batch is sent again, the finished ones come from the journal
+    assert second.sent == [['E2', 'E3']]
+    written = pd.read_csv(tmp_path / 'second.csv')
+    assert sorted(written['entityId']) == [f'E{i}' for i in range(6)]
+
+
+def test_resumed_run_appending_to_same_sink(tmp_path):
+    entities = [{'entityId': f'E{i}'} for i in range(6)]
+    journal_dir = str(tmp_path / 'journal')
+    path = str(tmp_path / 'pd.csv')
+
+    run(pd_client(failing={'E3'}), entities, run_id='resume', journal_dir=journal_dir, sink=path)
+    with CSVSink(path, overwrite=False) as sink:
+        run(pd_client(failing=set()), entities, run_id='resume', journal_dir=journal_dir, sink=sink,
+            replay_finished=False)
+    written = pd.read_csv(path)
+    assert sorted(written['entityId']) == [f'E{i}' for i in range(6)]
@@ -0,0 +1,114 @@
+import time
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from EDFXPrime import ColumnarFrame, flatten_dict, pd_columns, record_layout
+
+
+def flattened(records:list) -> pd.DataFrame:
+    # the frame the parsers built before the record layouts
+    return pd.DataFrame([flatten_dict(record) for record in records])
+
+
+def layout_frame(records:list) -> pd.DataFrame:
+    frame = ColumnarFrame()
+    frame.extend_flattened(records, record_layout(records[0], 'tests'))
+    return frame.to_pandas()
+
+
+def test_empty_container_filled_later():
+    records = [{'a': 1, 'ts': []}, {'a': 2, 'ts': [{'k': 1}, {'k': 2}]}, {'a': 3, 'ts': []}, {'a': 4, 'ts': {}},
+               {'a': 5, 'ts': {'k': 3}}]
+    assert_frame_equal(layout_frame(records), flattened(records))
+
+
+def test_scalar_then_container():
+    records = [{'x': 1, 'y': 'a'}, {'x': {'c': 2}, 'y': 'b'}, {'x': None, 'y': 'c'}, {'x': [1, 2], 'y': 'd'},
+               {'x': 5, 'y': 'e'}]
+    assert_frame_equal(layout_frame(records), flattened(records))
+
+
+def test_container_then_scalar():
+    records = [{'x': {'c': 1}}, {'x': 2}, {'x': {'c': 3, 'd': 4}}, {'x': {'c': 5}}]
+    assert_frame_equal(layout_frame(records), flattened(records))
+
+
+def pd_flattened(entities:list) -> pd.DataFrame:
+    # the rows EDFXPDParse built before the record layouts
+    rows = []
+    for entity in entities:
+        if 'history' not in entity:
+            rows.append(flatten_dict(entity))
+            continue
+        entity_data = flatten_dict({k: v for k, v in entity.items() if k != 'history' and k not in entity['history'][0]})
+        for record in entity['history']:
+            rows.append({**entity_data, **flatten_dict(record)})
+    return pd.DataFrame(rows)
+
+
+def pd_entities(count:int, length:int) -> list:
+    # every other entity has a detail dict in its history records, the others detail None
+    return [{'entityId': f'E{i}', 'history': [{'asOfDate': '2020-01-31', 'pd': 0.1 * k,
+                                               'detail': {'a': k, 'b': 0.5} if i % 2 else None}
+                                              for k in range(length)]}
+            for i in range(count)]
+
+
+def test_pd_history_with_deviating_records():
+    entities = [
+        {'entityId': 'A', 'name': 'a', 'history': [{'asOfDate': '2020-01-31', 'pd': 0.1, 'drivers': []},
+                                                  {'asOfDate': '2020-02-29', 'pd': 0.2, 'drivers': [{'d': 1}]}]},
+        {'entityId': 'B', 'history': [{'asOfDate': '2020-01-31', 'pd': None, 'drivers': []},
+                                      {'asOfDate': '2020-02-29', 'pd': {'value': 0.3}, 'drivers': []}]},
+        {'entityId': 'C'},
+    ]
+    assert_frame_equal(pd_columns(entities).to_pandas(), pd_flattened(entities))
+
+
+def test_pd_entities_of_different_shapes():
+    entities = pd_entities(20, 30)
+    assert_frame_equal(pd_columns(entities).to_pandas(), pd_flattened(entities))
+
+
+def test_pd_entities_of_different_shapes_scale_linearly():
+    def seconds(entities):
+        best = float('inf')
+        for _ in range(3):
+            started = time.perf_counter()
+            pd_columns(entities)
+            best = min(best, time.perf_counter() - started)
+        return best
+    # 8 times longer histories: linear is ~8x
+    short, long = seconds(pd_entities(200, 30)), seconds(pd_entities(200, 240))
+    assert long < 24 * short
+
+
+def search_entities(count:int) -> list:
+    # every third entity without national identifiers, the others with two
+    return [{'entityId': f'E{i}', 'internationalName': f'Name {i}', 'primaryIndustry': {'code': 'N01', 'name': 'x'},
+             'nationalIdentifiers': [] if i % 3 == 0 else [{'type': 'EIN', 'value': str(i)},
+                                                            {'type': 'DUNS', 'value': str(i * 7)}]}
+            for i in range(count)]
+
+
+def parse_seconds(entities:list) -> float:
+    best = float('inf')
+    for _ in range(3):
+        started = time.perf_counter()
+        layout_frame(entities)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def test_mixed_shapes_match_flatten_dict():
+    entities = search_entities(300)
+    assert_frame_equal(layout_frame(entities), flattened(entities))
+    # long runs of each shape go through their own layouts
+    entities = sorted(entities, key=lambda entity: len(entity['nationalIdentifiers']))
+    assert_frame_equal(layout_frame(entities), flattened(entities))
+
+
+def test_mixed_shapes_scale_linearly():
+    small, large = parse_seconds(search_entities(2_000)), parse_seconds(search_entities(16_000))
+    # 8 times the entities: linear is ~8x, the quadratic fallback was ~64x
+    assert large < 24 * small
@@ -0,0 +1,102 @@
+import sqlite3
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from EDFXSinks import CallbackSink, CSVSink, DuckDBSink, ParquetDatasetSink, SQLiteSink, as_sink
+
+
+def batch(*entity_ids) -> pd.DataFrame:
+    # rows shaped like the EDFXPDParse output: asOfDate index repeating the asOfDate column
+    df = pd.DataFrame({'entityId': [entity_id for entity_id in entity_ids for _ in range(2)],
+                       'asOfDate': ['2024-01-31', '2024-02-29'] * len(entity_ids),
+                       'pd': [0.01, 0.02] * len(entity_ids)})
+    return df.set_index(pd.to_datetime(df['asOfDate']))
+
+
+BATCHES = [batch('A', 'B'), batch('C'), batch('D', 'E')]
+
+
+def written(df:pd.DataFrame) -> pd.DataFrame:
+    # what a sink gives back: the rows of every batch, sorted
+    return df.reset_index(drop=True).sort_values(['entityId', 'asOfDate'], ignore_index=True)[['entityId', 'asOfDate', 'pd']]
+
+
+EXPECTED = written(pd.concat(BATCHES))
+
+
+def write_all(sink, batches:list = BATCHES):
+    with sink:
+        for df in batches:
+            sink.write(df)
+    return sink
+
+
+def test_csv_header_written_once(tmp_path):
+    path = tmp_path / 'pd.csv'
+    sink = write_all(CSVSink(str(path)))
+    assert (sink.rows, sink.batches) == (10, 3)
+    assert path.read_text().count('entityId') == 1
+    assert_frame_equal(written(pd.read_csv(path)), EXPECTED)
+
+    # appending to the file keeps its header, a batch with other columns is aligned to it
+    write_all(CSVSink(str(path), overwrite=False), [batch('F').assign(extra=1).drop(columns='pd')])
+    df = pd.read_csv(path)
+    assert path.read_text().count('entityId') == 1
+    assert list(df.columns) == ['entityId', 'asOfDate', 'pd']
+    assert df['pd'].isna().sum() == 2
+    # the default overwrites
+    write_all(CSVSink(str(path)), BATCHES[:1])
+    assert len(pd.read_csv(path)) == 4
+
+
+def test_parquet_dataset_round_trip(tmp_path):
+    directory = tmp_path / 'pd'
+    write_all(ParquetDatasetSink(str(directory)))
+    assert_frame_equal(written(pd.read_parquet(directory)), EXPECTED)
+    # a second run adds files next to the first ones
+    write_all(ParquetDatasetSink(str(directory)), BATCHES[:1])
+    assert len(pd.read_parquet(directory)) == 14
+
+    partitioned = tmp_path / 'partitioned'
+    write_all(ParquetDatasetSink(str(partitioned), partition_by='entityId'))
+    assert sorted(path.name for path in partitioned.iterdir()) == [f'entityId={name}' for name in 'ABCDE']
+    assert len(pd.read_parquet(partitioned)) == 10
+
+
+def test_sqlite_round_trip(tmp_path):
+    path = str(tmp_path / 'pd.sqlite')
+    write_all(SQLiteSink(path, table='pds'))
+    write_all(SQLiteSink(path, table='pds'), [batch('F').assign(extra=1)])
+    with sqlite3.connect(path) as connection:
+        df = pd.read_sql('SELECT * FROM pds', connection)
+    assert len(df) == 12
+    # the column of the later batch was added to the table
+    assert df['extra'].notna().sum() == 2
+    assert_frame_equal(written(df[df['entityId'] != 'F']), EXPECTED)
+
+    write_all(SQLiteSink(path, table='pds', if_exists='replace'), BATCHES[:1])
+    with sqlite3.connect(path) as connection:
+        assert connection.execute('SELECT COUNT(*) FROM pds').fetchone()[0] == 4
+
+
+def test_duckdb_round_trip(tmp_path):
+    path = str(tmp_path / 'pd.duckdb')
+    sink = DuckDBSink(path)
+    write_all(sink)
+    import duckdb
+    with duckdb.connect(path) as connection:
+        assert_frame_equal(written(connection.execute('SELECT * FROM results').df()), EXPECTED)
+
+
+def test_callback_and_shorthands(tmp_path):
+    received = []
+    sink = write_all(as_sink(received.append))
+    assert isinstance(sink, CallbackSink) and sink.rows == 10
+    assert [len(df) for df in received] == [4, 2, 4]
+    # empty batches are skipped
+    sink.write(batch())
+    assert len(received) == 3
+
+    for name, sink_type in [('pd.csv', CSVSink), ('pd.parquet', ParquetDatasetSink), ('pd.db', SQLiteSink)]:
+        with as_sink(str(tmp_path / name)) as sink:
+            assert isinstance(sink, sink_type)
@@ -0,0 +1,220 @@
+import time
+import types
+import asyncio
+import threading
+import pytest
+import requests
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+import EDFXTransport
+from EDFXTransport import AdaptiveConcurrencyLimiter, MicroBatchLoader, RequestCoalescer, RequestOutcome, RetryPolicy, RetryingSession
+
+
+class FlakyAdapter(requests.adapters.BaseAdapter):
+
+    # answers 503 to the first `failures` requests, 200 afterwards
+    def __init__(self, failures:int):
+        super().__init__()
+        self.failures = failures
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = 503 if self.calls <= self.failures else 200
+        response.request = request
+        response.url = request.url
+        response._content = b'{}'
+        return response
+
+    def close(self):
+        pass
+
+
+def flaky_session(failures:int) -> tuple:
+    session = RetryingSession(RetryPolicy(max_attempts=3, base_delay=0.0))
+    adapter = FlakyAdapter(failures)
+    session.mount("https://", adapter)
+    return session, adapter
+
+
+def test_get_is_retried():
+    session, adapter = flaky_session(1)
+    assert session.get("https://edfx.test/status").status_code == 200
+    assert adapter.calls == 2
+
+
+def test_post_is_sent_once():
+    session, adapter = flaky_session(1)
+    assert session.post("https://edfx.test/modelInputs", data="upload.csv").status_code == 503
+    assert adapter.calls == 1
+
+
+def test_post_opted_in_is_retried():
+    session, adapter = flaky_session(1)
+    assert session.post("https://edfx.test/pds", json={}, idempotent=True).status_code == 200
+    assert adapter.calls == 2
+
+
+def entities(*ids) -> list:
+    return [{'entityId': entity_id} for entity_id in ids]
+
+
+def test_overlapping_callers_share_one_upstream_call():
+    calls = []
+    release = threading.Event()
+
+    def fetch(params):
+        calls.append([entity['entityId'] for entity in params['entities']])
+        # hold the call in flight until every caller has asked
+        release.wait(5)
+        return {'entities': [{'entityId': entity['entityId'], 'pd': 0.01} for entity in params['entities']]}
+
+    # the batch is sent once it holds 3 distinct entities, the window never expires during the test
+    coalescer = RequestCoalescer(window=60, max_batch=3)
+    with ThreadPoolExecutor(3) as callers:
+        first = callers.submit(coalescer.request, 'pds', {}, entities('E1', 'E2'), fetch)
+        second = callers.submit(coalescer.request, 'pds', {}, entities('E2', 'E3'), fetch)
+        third = callers.submit(coalescer.request, 'pds', {}, entities('E3', 'E1'), fetch)
+        while coalescer.stats['requests'] < 3:
+            time.sleep(0.001)
+        release.set()
+        responses = [future.result(5) for future in (first, second, third)]
+    coalescer.close()
+
+    # the callers run in any order, the entities of the call follow it
+    assert [sorted(call) for call in calls] == [['E1', 'E2', 'E3']]
+    assert [[entity['entityId'] for entity in response['entities']] for response in responses] == \
+           [['E1', 'E2'], ['E2', 'E3'], ['E3', 'E1']]
+    assert coalescer.stats['upstream_calls'] == 1
+    assert coalescer.stats['coalesced'] == 3
+
+
+def test_upstream_error_reaches_every_caller():
+    calls = []
+
+    def fetch(params):
+        calls.append(len(params['entities']))
+        if len(calls) == 1:
+            raise ConnectionError("upstream down")
+        return {'entities': [{'entityId': entity['entityId']} for entity in params['entities']]}
+
+    coalescer = RequestCoalescer(window=60, max_batch=2)
+    futures = coalescer.submit('pds', {}, entities('E1'), fetch) + coalescer.submit('pds', {}, entities('E1', 'E2'), fetch)
+    for future in futures:
+        with pytest.raises(ConnectionError):
+            future.result(5)
+    # the failed call is no longer in flight, the next request is sent again
+    assert coalescer.request('pds', {}, entities('E1', 'E2'), fetch, timeout=5) == {'entities': entities('E1', 'E2')}
+    assert calls == [2, 2]
+    coalescer.close()
+
+
+def test_error_response_is_handed_to_every_caller():
+    error = {'message': 'Invalid startDate'}
+    coalescer = RequestCoalescer(window=60, max_batch=2)
+    futures = coalescer.submit('pds', {}, entities('E1'), lambda params: error) + \
+              coalescer.submit('pds', {}, entities('E2'), lambda params: error)
+    assert [RequestCoalescer.assemble([future.result(5)]) for future in futures] == [error, error]
+    coalescer.close()
+
+
+class RecordingFetch():
+
+    # batched PD call answering every entity but the unknown ones
+    def __init__(self, unknown:set = frozenset()):
+        self.unknown = unknown
+        self.calls = []
+
+    def __call__(self, entities:list) -> dict:
+        ids = [entity['entityId'] for entity in entities]
+        self.calls.append((time.monotonic(), ids))
+        return {'entities': [{'entityId': entity_id, 'history': [{'asOfDate': '2024-01-31', 'pd': 0.01}]}
+                             for entity_id in ids if entity_id not in self.unknown]}
+
+
+def test_loader_flushes_full_batch_at_once():
+    fetch = RecordingFetch()
+    with MicroBatchLoader(fetch, max_wait_ms=60_000, max_batch=3) as loader:
+        futures = [loader.load(entity_id) for entity_id in ('E1', 'E2', 'E1', 'E3')]
+        # the third distinct entity fills the batch, nobody waits for the 60 second window
+        assert [future.result(5)['entityId'] for future in futures] == ['E1', 'E2', 'E1', 'E3']
+    assert [ids for _, ids in fetch.calls] == [['E1', 'E2', 'E3']]
+    assert loader.stats['coalesced'] == 1
+
+
+def test_loader_flushes_after_wait():
+    fetch = RecordingFetch()
+    with MicroBatchLoader(fetch, max_wait_ms=50, max_batch=100) as loader:
+        started = time.monotonic()
+        futures = loader.load_many(['E1', 'E2'])
+        assert [future.result(5)['entityId'] for future in futures] == ['E1', 'E2']
+    assert [ids for _, ids in fetch.calls] == [['E1', 'E2']]
+    assert fetch.calls[0][0] - started >= 0.04
+
+
+def test_loader_returns_none_for_missing_entity():
+    fetch = RecordingFetch(unknown={'E2'})
+    with MicroBatchLoader(fetch, max_wait_ms=60_000, max_batch=2) as loader:
+        assert [future.result(5) is None for future in loader.load_many(['E1', 'E2'])] == [False, True]
+
+    def parse(response):
+        return pd.DataFrame([{'entityId': entity['entityId'], **record} for entity in response['entities']
+                             for record in entity['history']])
+    with MicroBatchLoader(fetch, parse=parse, max_wait_ms=60_000, max_batch=2) as loader:
+        found, missing = (future.result(5) for future in loader.load_many(['E1', 'E2']))
+    assert list(found['pd']) == [0.01]
+    assert missing is None
+
+
+def outcome(status:int = None, error:Exception = None) -> RequestOutcome:
+    result = RequestOutcome()
+    result.status, result.error = status, error
+    return result
+
+
+def test_limiter_aimd(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(EDFXTransport, 'time', types.SimpleNamespace(monotonic=lambda: clock[0]))
+    # 10 samples never reach the 20 the latency check needs, and the success rate target is off
+    limiter = AdaptiveConcurrencyLimiter(max_limit=8, initial_limit=4, min_limit=2, backoff_factor=0.5,
+                                         success_rate_target=0.0, window_size=10)
+
+    def succeed(times:int, used:bool = True):
+        for _ in range(times):
+            # the window only widens while it is used
+            limiter.in_flight = limiter.window if used else 0
+            limiter.record(outcome(200), 0.05)
+        limiter.in_flight = 0
+
+    # slow start: +1 per healthy response, up to max_limit
+    succeed(2)
+    assert limiter.limit == 6
+    succeed(1, used=False)
+    assert limiter.limit == 6
+    succeed(5)
+    assert (limiter.limit, limiter.window) == (8, 8)
+
+    # multiplicative decrease, a burst of failures within the cooldown counts once
+    clock[0] += 10
+    limiter.record(outcome(503), 0.05)
+    limiter.record(outcome(429), 0.05)
+    assert (limiter.limit, limiter.backoffs, limiter.slow_start) == (4, 1, False)
+    clock[0] += 10
+    limiter.record(outcome(error=asyncio.TimeoutError()), 0.05)
+    assert limiter.limit == 2
+    clock[0] += 10
+    limiter.record(outcome(500), 0.05)
+    assert (limiter.limit, limiter.window) == (2, 2)
+    # a client error is a failure but not an overload
+    limiter.record(outcome(404), 0.05)
+    assert limiter.backoffs == 3
+
+    # additive increase: about +1 per full window of healthy responses
+    succeed(2)
+    assert 2.8 < limiter.limit < 3 and limiter.window == 2
+    succeed(1)
+    assert limiter.window == 3
+    succeed(100)
+    assert limiter.window == 8